@@ -188,6 +188,8 @@ COR_SOMBRA = (0, 0, 0)
 
 # ---------- IA / Modo de jogo ----------
 USAR_IA_NO_CARRO_2 = False
+# Bots longe das câmeras e dos outros carros rodam um modelo cinemático a 30 Hz (core/lod_bots.py)
+LOD_BOTS = True
 
 TRILHAS_IA = [
     {"cor": (255, 170, 60), "tol": 40},   # laranja #FFAA3C
@@ -229,6 +231,19 @@ PP_RECOVER_STEER_DEG = 28
 # ---------- Efeitos / Partículas ----------
 DIR_EFFECTS = os.path.join(DIR_PROJETO, "assets", "images", "effects")
 CAMINHO_FUMACA = os.path.join(DIR_EFFECTS, "smoke", "pixels_00.png")  # coloque seu asset aqui
+# Marcas de pneu permanentes (False) ou desbotando aos poucos, chunk a chunk (True)
+MARCAS_PNEU_DESBOTAM = False
+
+# ---------- Registro (log) ----------
+# Nível geral e por módulo do registro (core/registro.py): "DEBUG", "INFO", "WARNING", "ERROR"
+# Ex.: NIVEIS_LOG_MODULOS = {"core.ia": "DEBUG"} mostra o estado periódico de cada bot
+NIVEL_LOG = "INFO"
+NIVEIS_LOG_MODULOS = {}
+
+# ---------- Replays ----------
+# Grava as entradas dos jogadores de cada corrida concluída em DIR_REPLAYS (tools/replay.py reproduz)
+GRAVAR_REPLAY = False
+DIR_REPLAYS = os.path.join(DIR_PROJETO, "data", "replays")
 
 # ---------- Modo Drift / Pontuação ----------
 MODO_DRIFT = True
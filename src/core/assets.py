@@ -0,0 +1,226 @@
+"""
+Cache de assets compartilhado pelo processo inteiro
+Imagens são identificadas pelo caminho + transformação (tamanho, filtro, rotação, modo de conversão);
+cada combinação é decodificada/transformada uma única vez e a mesma Surface é entregue a todos
+Superfícies entregues são compartilhadas: quem precisar alterá-las deve trabalhar em uma cópia
+"""
+import os
+import weakref
+import pygame
+from collections import OrderedDict
+
+# Memória máxima (bytes) mantida por imagens sem nenhuma referência ativa
+LIMITE_BYTES_LIVRES = 32 * 1024 * 1024
+# Atlas de rotação: quadros por volta e distância entre faixas de zoom (mesmo passo da pirâmide do mundo)
+ANGULOS_ATLAS = 256
+PASSO_ZOOM_ATLAS = 0.1
+# Memória máxima de um atlas; acima dela a faixa de zoom usada há mais tempo é descartada
+LIMITE_BYTES_ATLAS = 16 * 1024 * 1024
+
+class AtlasRotacao:
+    """
+    Quadros pré-rotacionados/escalados de uma imagem, em ANGULOS_ATLAS ângulos por faixa de zoom
+    Cada quadro é gerado uma única vez (preparar() gera faixas inteiras de uma vez) e compartilhado
+    por todos que desenham a mesma imagem; desenhar vira consulta + blit
+    """
+    def __init__(self, base, angulos=ANGULOS_ATLAS, passo_zoom=PASSO_ZOOM_ATLAS, limite_bytes=LIMITE_BYTES_ATLAS):
+        self.base = base
+        self.angulos = angulos
+        self.passo_zoom = passo_zoom
+        self.limite_bytes = limite_bytes
+        self._faixas = OrderedDict()  # zoom em passos -> [quadro ou None] * angulos
+        self.bytes = 0
+
+    def _faixa(self, zoom):
+        nivel = max(1, int(round(zoom / self.passo_zoom)))
+        faixa = self._faixas.get(nivel)
+        if faixa is None:
+            faixa = self._faixas[nivel] = [None] * self.angulos
+        else:
+            self._faixas.move_to_end(nivel)
+        return nivel, faixa
+
+    def _gerar(self, nivel, faixa, indice):
+        superficie = pygame.transform.rotozoom(self.base, indice * (360.0 / self.angulos), nivel * self.passo_zoom)
+        quadro = (superficie, superficie.get_width() // 2, superficie.get_height() // 2)
+        faixa[indice] = quadro
+        self.bytes += superficie.get_width() * superficie.get_height() * superficie.get_bytesize()
+        self._liberar_excedentes()
+        return quadro
+
+    def quadro(self, angulo, zoom=1.0):
+        """(Surface, meia largura, meia altura) do quadro mais próximo do ângulo (graus) e do zoom"""
+        nivel, faixa = self._faixa(zoom)
+        indice = int(round(angulo * self.angulos / 360.0)) % self.angulos
+        quadro = faixa[indice]
+        if quadro is None:
+            quadro = self._gerar(nivel, faixa, indice)
+        return quadro
+
+    def preparar(self, *zooms):
+        """Gera de uma vez todos os ângulos das faixas de zoom (ex.: no carregamento da corrida)"""
+        for zoom in zooms:
+            nivel, faixa = self._faixa(zoom)
+            for indice, quadro in enumerate(faixa):
+                if quadro is None:
+                    self._gerar(nivel, faixa, indice)
+
+    def _liberar_excedentes(self):
+        while self.bytes > self.limite_bytes and len(self._faixas) > 1:
+            _, faixa = self._faixas.popitem(last=False)
+            self.bytes -= sum(q[0].get_width() * q[0].get_height() * q[0].get_bytesize() for q in faixa if q is not None)
+
+class _Entrada:
+    __slots__ = ("superficie", "referencias", "bytes", "mtime")
+    def __init__(self, superficie, mtime):
+        self.superficie = superficie
+        self.referencias = 0
+        self.bytes = superficie.get_width() * superficie.get_height() * superficie.get_bytesize()
+        self.mtime = mtime
+
+class GerenciadorAssets:
+    """
+    Cache de imagens com contagem de referências
+    Entradas com referências ativas nunca são descartadas; as livres ficam em LRU até LIMITE_BYTES_LIVRES
+    """
+    def __init__(self, limite_bytes_livres=LIMITE_BYTES_LIVRES):
+        self.limite_bytes_livres = limite_bytes_livres
+        self._entradas = OrderedDict()  # chave -> _Entrada
+        self._atlas = {}  # chave da imagem -> [AtlasRotacao, referências]
+        self._bytes_livres = 0
+        self.decodificacoes = 0
+        self.acertos = 0
+
+    @staticmethod
+    def _chave(caminho, tamanho=None, suave=False, angulo=0.0, alpha=True):
+        tamanho = (int(tamanho[0]), int(tamanho[1])) if tamanho is not None else None
+        return (os.path.normcase(os.path.abspath(caminho)), tamanho, bool(suave), round(float(angulo), 2) % 360, bool(alpha))
+
+    def _decodificar(self, caminho, alpha):
+        imagem = pygame.image.load(caminho)
+        self.decodificacoes += 1
+        if pygame.display.get_surface() is None:
+            return imagem
+        return imagem.convert_alpha() if alpha else imagem.convert()
+
+    def _transformar(self, base, tamanho, suave, angulo):
+        superficie = base
+        if tamanho is not None and tamanho != superficie.get_size():
+            escalar = pygame.transform.smoothscale if suave else pygame.transform.scale
+            superficie = escalar(superficie, tamanho)
+        if angulo:
+            superficie = pygame.transform.rotate(superficie, angulo)
+        return superficie
+
+    def _obter_entrada(self, chave):
+        caminho, tamanho, suave, angulo, alpha = chave
+        mtime = os.stat(caminho).st_mtime_ns
+        entrada = self._entradas.get(chave)
+        if entrada is not None and entrada.mtime == mtime:
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return entrada
+        if entrada is not None:
+            # Arquivo alterado no disco: descartar a versão antiga (quem ainda a usa mantém a própria Surface)
+            self._remover(chave)
+
+        if tamanho is None and not angulo:
+            superficie = self._decodificar(caminho, alpha)
+        else:
+            # Variações transformadas partem da imagem original (também compartilhada)
+            base = self._obter_entrada((caminho, None, False, 0.0, alpha)).superficie
+            superficie = self._transformar(base, tamanho, suave, angulo)
+        entrada = _Entrada(superficie, mtime)
+        self._entradas[chave] = entrada
+        self._bytes_livres += entrada.bytes
+        self._liberar_excedentes()
+        return entrada
+
+    def obter_imagem(self, caminho, tamanho=None, suave=False, angulo=0.0, alpha=True, dono=None):
+        """
+        Retorna a Surface compartilhada de caminho com a transformação pedida
+        dono: objeto que usa a imagem; a referência é liberada automaticamente quando ele for coletado
+        Lança FileNotFoundError/pygame.error como pygame.image.load
+        """
+        chave = self._chave(caminho, tamanho, suave, angulo, alpha)
+        entrada = self._obter_entrada(chave)
+        if dono is not None:
+            if entrada.referencias == 0:
+                self._bytes_livres -= entrada.bytes
+            entrada.referencias += 1
+            weakref.finalize(dono, self._liberar_referencia, chave, entrada)
+        return entrada.superficie
+
+    def obter_atlas_rotacao(self, caminho, tamanho=None, suave=False, alpha=True, dono=None):
+        """
+        AtlasRotacao compartilhado da imagem (mesmos parâmetros de obter_imagem)
+        O atlas vive enquanto algum dono o usa; sem dono (ou sem referências) é descartado por limpar()
+        """
+        chave = self._chave(caminho, tamanho, suave, 0.0, alpha)
+        item = self._atlas.get(chave)
+        if item is None:
+            item = self._atlas[chave] = [AtlasRotacao(self.obter_imagem(caminho, tamanho, suave, alpha=alpha)), 0]
+        if dono is not None:
+            item[1] += 1
+            weakref.finalize(dono, self._liberar_atlas, chave, item)
+        return item[0]
+
+    def _liberar_atlas(self, chave, item):
+        item[1] -= 1
+        if item[1] <= 0 and self._atlas.get(chave) is item:
+            # Quadros são recriáveis a partir da imagem; não vale a pena mantê-los sem ninguém usando
+            del self._atlas[chave]
+
+    def _liberar_referencia(self, chave, entrada):
+        if entrada.referencias <= 0:
+            return
+        entrada.referencias -= 1
+        if entrada.referencias == 0 and self._entradas.get(chave) is entrada:
+            self._bytes_livres += entrada.bytes
+            self._liberar_excedentes()
+
+    def _remover(self, chave):
+        entrada = self._entradas.pop(chave)
+        if entrada.referencias == 0:
+            self._bytes_livres -= entrada.bytes
+
+    def _liberar_excedentes(self):
+        """Descarta as imagens livres menos usadas acima do limite de memória"""
+        if self._bytes_livres <= self.limite_bytes_livres:
+            return
+        for chave in list(self._entradas.keys()):
+            if self._bytes_livres <= self.limite_bytes_livres:
+                break
+            if self._entradas[chave].referencias == 0:
+                self._remover(chave)
+
+    def estatisticas(self):
+        """Uso de memória e eficiência do cache"""
+        bytes_total = sum(e.bytes for e in self._entradas.values())
+        return {
+            "imagens": len(self._entradas),
+            "bytes": bytes_total,
+            "bytes_livres": self._bytes_livres,
+            "referencias": sum(e.referencias for e in self._entradas.values()),
+            "atlas": len(self._atlas),
+            "bytes_atlas": sum(item[0].bytes for item in self._atlas.values()),
+            "decodificacoes": self.decodificacoes,
+            "acertos": self.acertos,
+        }
+
+    def limpar(self):
+        """Esquece todas as imagens (as Surfaces já entregues continuam válidas)"""
+        self._entradas.clear()
+        self._atlas.clear()
+        self._bytes_livres = 0
+
+# Instância única compartilhada pelo jogo e pelas ferramentas
+assets = GerenciadorAssets()
+
+def carregar_imagem(caminho, tamanho=None, suave=False, angulo=0.0, alpha=True, dono=None):
+    """Atalho para assets.obter_imagem"""
+    return assets.obter_imagem(caminho, tamanho=tamanho, suave=suave, angulo=angulo, alpha=alpha, dono=dono)
+
+def carregar_atlas_rotacao(caminho, tamanho=None, suave=False, alpha=True, dono=None):
+    """Atalho para assets.obter_atlas_rotacao"""
+    return assets.obter_atlas_rotacao(caminho, tamanho=tamanho, suave=suave, alpha=alpha, dono=dono)
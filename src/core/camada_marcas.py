@@ -0,0 +1,132 @@
+"""
+Camada de marcas de pneu no espaço do mundo
+Cada segmento é rasterizado uma única vez em chunks com alpha alinhados aos chunks do fundo
+e composto nos próprios chunks da pista: desenhar o fundo já desenha as marcas, sem custo por frame
+"""
+import pygame
+from collections import OrderedDict
+
+LARGURA_MARCA = 3
+COR_MARCA_PISTA = (0, 0, 0, 255)
+COR_MARCA_GRAMA = (139, 69, 19, 255)  # Marrom para marcas na grama
+# Máximo de chunks com marcas (1 MB cada); acima disso os menos recentes são esquecidos
+MAX_CHUNKS_MARCAS = 64
+# Desbotamento opcional: cada chunk perde FATOR_DESBOTAR do alpha a cada INTERVALO_DESBOTAR segundos
+INTERVALO_DESBOTAR = 3.0
+FATOR_DESBOTAR = 0.8
+ALPHA_MINIMO = 12
+
+class CamadaMarcas:
+    """
+    Decalques de marcas de pneu em chunks SRCALPHA (uma superfície por chunk do mundo que tem marcas)
+    O MundoChunks associado chama aplicar() ao montar um chunk; segmentos novos também são
+    desenhados diretamente nos chunks (e níveis de zoom) que já estão no cache
+    """
+    def __init__(self, desbotar=False, max_chunks=MAX_CHUNKS_MARCAS):
+        self.desbotar = desbotar
+        self.max_chunks = max_chunks
+        self.mundo = None
+        self._chunks = OrderedDict()  # (cx, cy) -> Surface SRCALPHA, menos recente primeiro
+        self._alpha = {}              # (cx, cy) -> alpha restante após o desbotamento
+        self._fila_desbotar = []
+        self._tempo_desbotar = 0.0
+        self.segmentos = 0
+
+    def associar(self, mundo):
+        """Passa a compor as marcas no MundoChunks dado (as marcas anteriores são apagadas)"""
+        self.limpar()
+        self.mundo = mundo
+        mundo.decalques = self
+
+    def limpar(self):
+        """Apaga todas as marcas (os chunks do fundo que as continham são remontados)"""
+        if self.mundo is not None:
+            for cx, cy in self._chunks:
+                self.mundo.descartar_chunk(cx, cy)
+        self._chunks.clear()
+        self._alpha.clear()
+        self._fila_desbotar = []
+        self._tempo_desbotar = 0.0
+        self.segmentos = 0
+
+    def tem_marcas(self, cx, cy):
+        return (cx, cy) in self._chunks
+
+    def aplicar(self, superficie, cx, cy):
+        """Compõe as marcas do chunk (cx, cy) sobre a superfície do fundo recém-montada"""
+        decalque = self._chunks.get((cx, cy))
+        if decalque is not None:
+            superficie.blit(decalque, (0, 0))
+
+    def _decalque(self, cx, cy):
+        decalque = self._chunks.get((cx, cy))
+        if decalque is not None:
+            self._chunks.move_to_end((cx, cy))
+            # Marca nova: o chunk volta a contar como recente para o desbotamento
+            self._alpha[(cx, cy)] = 255
+            return decalque
+        decalque = pygame.Surface(self.mundo.ret_chunk(cx, cy).size, pygame.SRCALPHA)
+        self._chunks[(cx, cy)] = decalque
+        self._alpha[(cx, cy)] = 255
+        while len(self._chunks) > self.max_chunks:
+            antigo, _ = self._chunks.popitem(last=False)
+            self._alpha.pop(antigo, None)
+            self.mundo.descartar_chunk(*antigo)
+        return decalque
+
+    def adicionar_segmento(self, x1, y1, x2, y2, na_grama=False):
+        """Rasteriza um segmento de marca (coordenadas do mundo) em todos os chunks que ele cruza"""
+        mundo = self.mundo
+        if mundo is None:
+            return
+        cor = COR_MARCA_GRAMA if na_grama else COR_MARCA_PISTA
+        tamanho = mundo.tamanho_chunk
+        margem = LARGURA_MARCA
+        cx0 = max(0, int(min(x1, x2) - margem) // tamanho)
+        cx1 = min(mundo.colunas - 1, int(max(x1, x2) + margem) // tamanho)
+        cy0 = max(0, int(min(y1, y2) - margem) // tamanho)
+        cy1 = min(mundo.linhas - 1, int(max(y1, y2) + margem) // tamanho)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                ox, oy = cx * tamanho, cy * tamanho
+                inicio = (int(x1) - ox, int(y1) - oy)
+                fim = (int(x2) - ox, int(y2) - oy)
+                pygame.draw.line(self._decalque(cx, cy), cor, inicio, fim, LARGURA_MARCA)
+                # Atualizar no lugar os chunks do fundo já montados (todos os níveis de zoom)
+                for nivel, superficie in mundo.chunks_em_cache(cx, cy):
+                    if nivel == 1.0:
+                        pygame.draw.line(superficie, cor, inicio, fim, LARGURA_MARCA)
+                        continue
+                    r = mundo.ret_chunk(cx, cy, nivel)
+                    pygame.draw.line(superficie, cor,
+                                     (round(x1 * nivel) - r.x, round(y1 * nivel) - r.y),
+                                     (round(x2 * nivel) - r.x, round(y2 * nivel) - r.y),
+                                     max(1, round(LARGURA_MARCA * nivel)))
+        self.segmentos += 1
+
+    def atualizar(self, dt):
+        """Desbotamento opcional, um chunk por vez para espalhar o custo de remontar o fundo"""
+        if not self.desbotar or not self._chunks:
+            return
+        self._tempo_desbotar += dt
+        # Cada chunk desbota uma vez por INTERVALO_DESBOTAR; no máximo um chunk por frame
+        if self._tempo_desbotar < INTERVALO_DESBOTAR / len(self._chunks):
+            return
+        self._tempo_desbotar = 0.0
+        if not self._fila_desbotar:
+            self._fila_desbotar = list(self._chunks.keys())
+        chave = self._fila_desbotar.pop()
+        decalque = self._chunks.get(chave)
+        if decalque is None:
+            return
+        alpha = int(self._alpha[chave] * FATOR_DESBOTAR)
+        if alpha < ALPHA_MINIMO:
+            del self._chunks[chave]
+            del self._alpha[chave]
+        else:
+            self._alpha[chave] = alpha
+            decalque.fill((255, 255, 255, int(255 * FATOR_DESBOTAR)), special_flags=pygame.BLEND_RGBA_MULT)
+        self.mundo.descartar_chunk(*chave)
+
+# Instância única: todos os carros marcam a mesma pista
+camada_marcas = CamadaMarcas()
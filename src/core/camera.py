@@ -1,5 +1,7 @@
 # src/core/camera.py
+import math
 import pygame
+from core.mundo_chunks import nivel_zoom, PASSO_NIVEL_ZOOM
 
 class Camera:
     def __init__(self, largura_tela, altura_tela, largura_mundo, altura_mundo, alvo=None, zoom=1.6):
@@ -9,6 +11,9 @@ class Camera:
         self.altura_mundo = altura_mundo
         self.alvo = alvo  # objeto com .x e .y
         self.zoom = float(zoom)
+        # Passo de quantização do zoom de renderização (None = zoom contínuo)
+        # Com o zoom quantizado nos níveis da pirâmide, o fundo é copiado sem escala por frame
+        self.passo_zoom = PASSO_NIVEL_ZOOM
 
         # Posição do centro da câmera no MUNDO
         self.cx = largura_mundo / 2
@@ -21,6 +26,19 @@ class Camera:
         self._visao_cache = None
         self._visao_cache_key = None
 
+    def configurar_qualidade(self, qualidade_alta):
+        """Qualidade alta: zoom contínuo (ajuste fino por frame); caso contrário, zoom preso aos níveis da pirâmide"""
+        self.passo_zoom = None if qualidade_alta else PASSO_NIVEL_ZOOM
+        self._visao_cache = None
+        self._visao_cache_key = None
+
+    @property
+    def zoom_efetivo(self):
+        """Zoom usado na renderização (self.zoom continua contínuo para a suavização do jogo)"""
+        if not self.passo_zoom:
+            return self.zoom
+        return round(max(self.passo_zoom, round(self.zoom / self.passo_zoom) * self.passo_zoom), 2)
+
     def set_alvo(self, alvo):
         self.alvo = alvo
 
@@ -99,8 +117,9 @@ class Camera:
         self._visao_cache_key = None
 
     def _clamp_centro(self):
-        vw = self.largura_tela / self.zoom
-        vh = self.altura_tela  / self.zoom
+        zoom = self.zoom_efetivo
+        vw = self.largura_tela / zoom
+        vh = self.altura_tela  / zoom
         half_w = vw / 2
         half_h = vh / 2
         self.cx = max(half_w, min(self.largura_mundo - half_w, self.cx))
@@ -109,12 +128,13 @@ class Camera:
     def ret_visao(self):
         """Retângulo da visão no MUNDO (não escalado) - com cache."""
         # Cache baseado em cx, cy e zoom
-        cache_key = (int(self.cx), int(self.cy), int(self.zoom * 100))
+        zoom = self.zoom_efetivo
+        cache_key = (int(self.cx), int(self.cy), int(zoom * 100))
         if self._visao_cache_key == cache_key and self._visao_cache is not None:
             return self._visao_cache
         
-        vw = self.largura_tela / self.zoom
-        vh = self.altura_tela  / self.zoom
+        vw = self.largura_tela / zoom
+        vh = self.altura_tela  / zoom
         left = int(self.cx - vw / 2)
         top  = int(self.cy - vh / 2)
         # garante que o rect está dentro do mundo
@@ -145,15 +165,17 @@ class Camera:
         y_camera = y - offset_y
         
         r = self.ret_visao()
-        sx = int((x_camera - r.left) * self.zoom)
-        sy = int((y_camera - r.top ) * self.zoom)
+        zoom = self.zoom_efetivo
+        sx = int((x_camera - r.left) * zoom)
+        sy = int((y_camera - r.top ) * zoom)
         return sx, sy
     
     def tela_para_mundo(self, sx, sy):
         """Converte coordenadas da tela para mundo (remove offset e zoom)."""
         r = self.ret_visao()
-        x_camera = (sx / self.zoom) + r.left
-        y_camera = (sy / self.zoom) + r.top
+        zoom = self.zoom_efetivo
+        x_camera = (sx / zoom) + r.left
+        y_camera = (sy / zoom) + r.top
         
         # Converter do sistema da câmera para o mundo original
         offset_x = getattr(self, 'offset_x', 0)
@@ -164,6 +186,11 @@ class Camera:
 
     def desenhar_fundo(self, superficie_tela, superficie_mundo):
         """Recorta a visão do mundo e escala para preencher a tela."""
+        if hasattr(superficie_mundo, 'desenhar_regiao'):
+            # Mundo em chunks: usar a pirâmide de zoom
+            self._desenhar_fundo_piramide(superficie_tela, superficie_mundo)
+            return
+
         # Obter retângulo de visão no sistema original
         r_original = self.ret_visao_original()
         r_camera = self.ret_visao()
@@ -190,9 +217,8 @@ class Camera:
         if clip_width > 0 and clip_height > 0:
             # Recortar a parte visível da superfície
             try:
-                recorte_original = superficie_mundo.subsurface(
-                    (int(clip_left), int(clip_top), int(clip_width), int(clip_height))
-                )
+                area = (int(clip_left), int(clip_top), int(clip_width), int(clip_height))
+                recorte_original = superficie_mundo.subsurface(area)
                 
                 # Escalar o recorte para o tamanho da tela
                 recorte_escalado = pygame.transform.scale(
@@ -228,6 +254,51 @@ class Camera:
                 # Se houver erro ao recortar, apenas não desenhar (já está preto)
                 pass
     
+    def _desenhar_fundo_piramide(self, superficie_tela, mundo_chunks):
+        """
+        Desenha o fundo a partir do nível da pirâmide de zoom mais próximo
+        Zoom em um nível exato: cópia direta dos chunks pré-escalados, sem escala por frame
+        Zoom entre níveis: compõe o nível abaixo (região do tamanho da tela) e amplia só o resíduo
+        """
+        r = self.ret_visao_original()
+        zoom = self.zoom_efetivo
+        nivel = nivel_zoom(zoom)
+        left, top = round(r.left * nivel), round(r.top * nivel)
+        try:
+            if abs(nivel - zoom) < 1e-6:
+                area = pygame.Rect(left, top, self.largura_tela, self.altura_tela)
+                limites = pygame.Rect(0, 0, round(mundo_chunks.get_width() * nivel), round(mundo_chunks.get_height() * nivel))
+                if not limites.contains(area):
+                    # Preencher com preto só quando parte da tela fica fora da pista
+                    superficie_tela.fill((0, 0, 0))
+                mundo_chunks.desenhar_regiao(superficie_tela, area, nivel=nivel)
+                return
+            area = pygame.Rect(left, top, max(1, math.ceil(r.width * nivel)), max(1, math.ceil(r.height * nivel)))
+            recorte = self._compor_recorte(mundo_chunks, area, nivel)
+            pygame.transform.scale(recorte, superficie_tela.get_size(), superficie_tela)
+        except (ValueError, pygame.error):
+            # Se houver erro ao recortar, apenas não desenhar (já está preto)
+            pass
+
+    def _compor_recorte(self, mundo_chunks, area, nivel=1.0):
+        """Compõe a área do mundo em um buffer reutilizado (só cresce, evita realocar a cada zoom)"""
+        largura, altura = area[2], area[3]
+        buffer = getattr(self, '_buffer_composicao', None)
+        if buffer is None or buffer.get_width() < largura or buffer.get_height() < altura:
+            tamanho = (max(largura, buffer.get_width() if buffer else 0),
+                       max(altura, buffer.get_height() if buffer else 0))
+            buffer = pygame.Surface(tamanho)
+            if pygame.display.get_surface() is not None:
+                buffer = buffer.convert()
+            self._buffer_composicao = buffer
+        recorte = buffer.subsurface((0, 0, largura, altura))
+        limites = pygame.Rect(0, 0, round(mundo_chunks.get_width() * nivel), round(mundo_chunks.get_height() * nivel))
+        if not limites.contains(pygame.Rect(area)):
+            # Parte da visão fora do mundo: limpar o que sobrou do frame anterior
+            recorte.fill((0, 0, 0))
+        mundo_chunks.desenhar_regiao(recorte, area, nivel=nivel)
+        return recorte
+    
     def esta_visivel(self, x_mundo, y_mundo, margem=0):
         """Verificar se um objeto está visível na tela (com margem)."""
         x_tela, y_tela = self.mundo_para_tela(x_mundo, y_mundo)
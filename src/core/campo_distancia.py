@@ -0,0 +1,194 @@
+"""
+Campo de distância com sinal até a borda da pista
+Grade de resolução reduzida (uma célula a cada ESCALA_CAMPO pixels do mundo) com a distância,
+em pixels, de cada ponto até a borda: positiva na pista, negativa na grama
+Consultas usam interpolação bilinear; o gradiente aponta para o interior da pista
+"""
+import math
+from array import array
+from core.pista_grip import MATERIAL_GRAMA, MATERIAL_DESCONHECIDO
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Pixels do mundo por célula do campo
+ESCALA_CAMPO = 8
+# Pesos da distância chanfrada (ortogonal e diagonal), em células
+_PASSO_RETO = 1.0
+_PASSO_DIAGONAL = math.sqrt(2.0)
+_INFINITO = 1e9
+
+class CampoDistancia:
+    """
+    Distância com sinal até a borda da pista (float32, uma célula a cada `escala` pixels)
+    Fora do mundo o valor da borda mais próxima é estendido
+    """
+    def __init__(self, largura, altura, escala, dados):
+        self.largura = largura  # Em células
+        self.altura = altura
+        self.escala = escala
+        self.dados = dados  # array('f') por linhas [y * largura + x]
+        self._grade = None  # Visão numpy 2D de dados, criada na primeira consulta vetorizada
+
+    def _valor(self, cx, cy):
+        if cx < 0:
+            cx = 0
+        elif cx >= self.largura:
+            cx = self.largura - 1
+        if cy < 0:
+            cy = 0
+        elif cy >= self.altura:
+            cy = self.altura - 1
+        return self.dados[cy * self.largura + cx]
+
+    def distancia(self, x, y):
+        """Distância (pixels) de (x, y) até a borda: > 0 na pista, < 0 fora dela"""
+        # Os valores ficam no centro das células
+        gx = x / self.escala - 0.5
+        gy = y / self.escala - 0.5
+        cx = math.floor(gx)
+        cy = math.floor(gy)
+        fx = gx - cx
+        fy = gy - cy
+        v00 = self._valor(cx, cy)
+        v10 = self._valor(cx + 1, cy)
+        v01 = self._valor(cx, cy + 1)
+        v11 = self._valor(cx + 1, cy + 1)
+        topo = v00 + (v10 - v00) * fx
+        base = v01 + (v11 - v01) * fx
+        return topo + (base - topo) * fy
+
+    def distancias(self, xs, ys):
+        """distancia() vetorizada: xs/ys arrays numpy com as coordenadas, retorna array float"""
+        grade = self._grade
+        if grade is None:
+            grade = self._grade = np.frombuffer(self.dados, dtype=np.float32).reshape(self.altura, self.largura)
+        gx = xs / self.escala - 0.5
+        gy = ys / self.escala - 0.5
+        cx = np.floor(gx)
+        cy = np.floor(gy)
+        fx = gx - cx
+        fy = gy - cy
+        x0 = np.clip(cx.astype(np.intp), 0, self.largura - 1)
+        x1 = np.clip(x0 + 1 - (cx < 0), 0, self.largura - 1)
+        y0 = np.clip(cy.astype(np.intp), 0, self.altura - 1)
+        y1 = np.clip(y0 + 1 - (cy < 0), 0, self.altura - 1)
+        v00 = grade[y0, x0]
+        v10 = grade[y0, x1]
+        v01 = grade[y1, x0]
+        v11 = grade[y1, x1]
+        topo = v00 + (v10 - v00) * fx
+        base = v01 + (v11 - v01) * fx
+        return topo + (base - topo) * fy
+
+    def gradiente(self, x, y):
+        """Direção unitária (gx, gy) em que a distância cresce (rumo ao meio da pista); (0, 0) se plano"""
+        h = self.escala
+        gx = self.distancia(x + h, y) - self.distancia(x - h, y)
+        gy = self.distancia(x, y + h) - self.distancia(x, y - h)
+        norma = math.hypot(gx, gy)
+        if norma < 1e-6:
+            return 0.0, 0.0
+        return gx / norma, gy / norma
+
+    def na_pista(self, x, y, margem=0.0):
+        """True se (x, y) estiver na pista com pelo menos `margem` pixels até a borda"""
+        return self.distancia(x, y) >= margem
+
+def _transformada_chanfrada_numpy(origem):
+    """Distância chanfrada (em células) de cada célula até a célula True mais próxima de origem"""
+    altura, largura = origem.shape
+    d = np.where(origem, 0.0, _INFINITO).astype(np.float32)
+    indices = np.arange(largura, dtype=np.float32) * _PASSO_RETO
+
+    def propagar_linha(linha):
+        # Propagação horizontal nos dois sentidos: d[x] = min_k d[k] + |x - k|
+        np.minimum(linha, np.minimum.accumulate(linha - indices) + indices, out=linha)
+        reverso = linha[::-1]
+        np.minimum(reverso, np.minimum.accumulate(reverso - indices) + indices, out=reverso)
+
+    def combinar(linha, anterior):
+        np.minimum(linha, anterior + _PASSO_RETO, out=linha)
+        np.minimum(linha[1:], anterior[:-1] + _PASSO_DIAGONAL, out=linha[1:])
+        np.minimum(linha[:-1], anterior[1:] + _PASSO_DIAGONAL, out=linha[:-1])
+        propagar_linha(linha)
+
+    propagar_linha(d[0])
+    for y in range(1, altura):
+        combinar(d[y], d[y - 1])
+    for y in range(altura - 2, -1, -1):
+        combinar(d[y], d[y + 1])
+    return d
+
+def _transformada_chanfrada_python(origem, largura, altura):
+    """Mesma transformada de _transformada_chanfrada_numpy em Python puro (lista de bools por linhas)"""
+    d = [0.0 if o else _INFINITO for o in origem]
+    reto, diag = _PASSO_RETO, _PASSO_DIAGONAL
+    for y in range(altura):
+        base = y * largura
+        for x in range(largura):
+            i = base + x
+            v = d[i]
+            if x > 0 and d[i - 1] + reto < v:
+                v = d[i - 1] + reto
+            if y > 0:
+                j = i - largura
+                if d[j] + reto < v:
+                    v = d[j] + reto
+                if x > 0 and d[j - 1] + diag < v:
+                    v = d[j - 1] + diag
+                if x < largura - 1 and d[j + 1] + diag < v:
+                    v = d[j + 1] + diag
+            d[i] = v
+    for y in range(altura - 1, -1, -1):
+        base = y * largura
+        for x in range(largura - 1, -1, -1):
+            i = base + x
+            v = d[i]
+            if x < largura - 1 and d[i + 1] + reto < v:
+                v = d[i + 1] + reto
+            if y < altura - 1:
+                j = i + largura
+                if d[j] + reto < v:
+                    v = d[j] + reto
+                if x > 0 and d[j - 1] + diag < v:
+                    v = d[j - 1] + diag
+                if x < largura - 1 and d[j + 1] + diag < v:
+                    v = d[j + 1] + diag
+            d[i] = v
+    return d
+
+def construir_campo_distancia(malha, escala=ESCALA_CAMPO):
+    """
+    Constrói o campo de distância a partir da malha de materiais
+    Uma célula é pista quando a maior parte dos seus pixels não é grama
+    """
+    largura = (malha.largura + escala - 1) // escala
+    altura = (malha.altura + escala - 1) // escala
+
+    if np is not None and MATERIAL_DESCONHECIDO not in malha.dados:
+        materiais = np.frombuffer(malha.dados, dtype=np.uint8).reshape(malha.altura, malha.largura)
+        # Completar as bordas para um múltiplo da escala (repetindo a última linha/coluna)
+        materiais = np.pad(materiais, ((0, altura * escala - malha.altura), (0, largura * escala - malha.largura)), mode='edge')
+        blocos = (materiais != MATERIAL_GRAMA).reshape(altura, escala, largura, escala)
+        pista = blocos.mean(axis=(1, 3)) >= 0.5
+        dentro = _transformada_chanfrada_numpy(~pista)
+        fora = _transformada_chanfrada_numpy(pista)
+        # A borda fica entre as células: descontar meia célula de cada lado
+        campo = np.where(pista, dentro - 0.5, 0.5 - fora) * escala
+        return CampoDistancia(largura, altura, escala, array('f', campo.astype(np.float32).tobytes()))
+
+    # Sem numpy (ou malha ainda não classificada): amostrar o centro de cada célula
+    pista = []
+    for cy in range(altura):
+        y = min(malha.altura - 1, cy * escala + escala // 2)
+        for cx in range(largura):
+            x = min(malha.largura - 1, cx * escala + escala // 2)
+            pista.append(malha.material_em(x, y) != MATERIAL_GRAMA)
+    dentro = _transformada_chanfrada_python([not p for p in pista], largura, altura)
+    fora = _transformada_chanfrada_python(pista, largura, altura)
+    dados = array('f', ((dentro[i] - 0.5) * escala if pista[i] else (0.5 - fora[i]) * escala
+                        for i in range(largura * altura)))
+    return CampoDistancia(largura, altura, escala, dados)
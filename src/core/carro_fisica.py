@@ -6,9 +6,11 @@ from config import (
     VEL_MAX, ACEL_BASE,
     TURBO_FORCA_IMPULSO, TURBO_FATOR, TURBO_DURACAO_S, TURBO_COOLDOWN_S
 )
+from core.assets import carregar_imagem, carregar_atlas_rotacao
 from core.pista_grip import eh_pixel_transitavel_grip, verificar_colisao_grip, verificar_na_grama_grip
 from core.particulas import EmissorNitro
 from core.skidmarks import GerenciadorSkidmarks
+from core.perfil_fisica import perfil_do_carro
 
 KEY_NAME_TO_CONST = {name: getattr(pygame, name) for name in dir(pygame) if name.startswith("K_")}
 
@@ -17,7 +19,11 @@ class CarroFisica:
     TRACAO_FRONTAL  = "front"
     TRACAO_INTEGRAL = "awd"
 
-    def __init__(self, x, y, prefixo_cor, controles, turbo_key=None, nome=None, tipo_tracao=None):
+    def __init__(self, x, y, prefixo_cor, controles, turbo_key=None, nome=None, tipo_tracao=None, renderizar=True):
+        # MundoFisica que integra este carro junto com os outros (MundoFisica.registrar)
+        self.fisica = None
+        self.indice_fisica = None
+
         # --- Estado global ---
         self.x = float(x); self.y = float(y)
         self.angulo = 0.0
@@ -26,6 +32,11 @@ class CarroFisica:
         
         # Flag para indicar se está na grama (estilo GRIP)
         self.na_grama = False
+        # Malha de materiais da pista (PistaTiles.malha_materiais); quando definida,
+        # a verificação de grama é feita na malha em vez de get_at na superfície
+        self.malha_materiais = None
+        # Campo de distância até a borda (PistaTiles.campo_distancia); tem prioridade sobre a malha
+        self.campo_distancia = None
 
         # --- Estado no frame do carro ---
         self.v_long = 0.0
@@ -37,67 +48,25 @@ class CarroFisica:
         self.turbo_key = KEY_NAME_TO_CONST.get(turbo_key) if isinstance(turbo_key, str) else turbo_key
         self.nome = nome or f"Carro {prefixo_cor}"
         self.tipo_tracao = tipo_tracao or self.TRACAO_TRASEIRA
-        self._carregar_sprite(prefixo_cor)
 
         # --- Parâmetros físicos ---
-        self.m  = 1200.0
-        self.g  = 9.81
-        self.L  = 2.5
-        self.b  = 1.55
-        self.a  = self.L - self.b
-        self.Iz = 2400.0
-
-        # pneus
-        self.Cf_base = 70000.0 if self.tipo_tracao != self.TRACAO_TRASEIRA else 68000.0
-        self.Cr_base = 50000.0 if self.tipo_tracao != self.TRACAO_TRASEIRA else 48000.0
-        self.mu_peak   = 1.05
-        self.mu_long   = 1.00
-        self.alpha_sat = math.radians(12.5)
-
-        # motor e resistências
+        # Tuning por carro em data/carros_fisica.json (core/perfil_fisica.py): massa, pneus, motor,
+        # direção, estabilidade e drift, mais os derivados (cargas por eixo, limites dos pneus)
+        self.perfil_fisica = perfil_do_carro(prefixo_cor)
+        self.perfil_fisica.aplicar(self)
+
+        # motor e resistências fora do perfil
         self.engine_force    = 12000.0
-        self.brake_force     = 11000.0
         self.handbrake_force = 12000.0
-        self.drag            = 0.0002  # Reduzido de 0.0009 para permitir velocidades maiores
-        self.roll_res        = 0.02    # Reduzido de 0.10 para permitir velocidades maiores
         self.downforce_k     = 0.0
-        # Atrito de rolamento base (sempre ativo, faz o carro desacelerar naturalmente)
-        # Reduzido para não limitar velocidade máxima
-        self.friction_base   = 0.02  # Reduzido de 0.05 para 0.02 para permitir velocidades maiores
-
-        # forças separadas p/ frente e ré + limite de ré
-        self.engine_force_fwd = 250000.0  # Aumentado para permitir velocidades de ~200 km/h
-        self.engine_force_rev = 8000.0  # Reduzido para acelerar mais devagar na ré
         # V_TOP_REV em px/s: para ~40 km/h máximo com ARCADE_SPEED_MULT=2.5 e PXPS_TO_KMH=1.0
         # 40 km/h / (2.5 * 1.0) = 16 px/s
         self.V_TOP_REV        = 16.0  # Limite máximo de 40 km/h (16 px/s * 2.5 = 40 km/h)
 
-        # power oversteer (mais contido)
-        self.power_oversteer_k = 0.12      # ★ antes 0.18: menos sobre-esterço só por acelerar
-        self.min_speed_oversteer = 100.0
-
-        # limites de velocidade
-        self.V_TOP  = 1200.0  # Aumentado para permitir velocidades de ~200 km/h
-        self.V_SOFT = 0.98 * self.V_TOP  # Aumentado de 0.95 para 0.98 para ser menos restritivo
-
-        # direção e estabilidade
-        self.steer_rad_max = math.radians(42.0)  # ★ antes 46: menos lock → mais estável
-        self.steer_rate    = math.radians(520.0)
-        self.speed_steer_k = 0.016               # ★ mais redução de lock com a velocidade
-        # ↑ (0.018) = menos lock em alta = mais estável; ↓ = mais lock em alta
+        # direção
         self._steer_wheel  = 0.0
         self._steer        = 0.0
 
-        self.counter_steer_assist   = 0.24       # ★ um pouco menor
-        self.rear_grip_cut_hb       = 0.45
-        self.rear_grip_cut_throttle = 0.97       # ★ quase não corta grip só por “dar pé”
-        self.stability_k            = 0.043     # ★ damping lateral um pouco mais forte
-        # ↑ (0.0033) = mais estável se parecer "sabão"; ↓ = menos damping
-
-        # amortecimento de guinada
-        self.yaw_damp_k      = 3.8              # ★ mais damping de yaw
-        self.engine_yaw_push = 0.0006           # ★ menos empurrão de guinada do motor
-
         # Anti-pêndulo
         self._low_speed_thresh  = 1.2
         self._stop_snap_thresh  = 0.10
@@ -110,8 +79,6 @@ class CarroFisica:
         self._turbo_mul   = 1.0
 
         # HUD/Efeitos
-        self.emissor_nitro  = EmissorNitro()
-        self.skidmarks      = GerenciadorSkidmarks()
         self.velocidade     = 0.0
         self.velocidade_kmh = 0.0
         self.marcha_atual   = 0
@@ -125,37 +92,37 @@ class CarroFisica:
         self._ultimo_skidmark  = 0.0  # Controle de frequência
         self.freio_mao_ativo   = False
 
-        # --- Drift tuning (fechar curva) ---
-        # === AJUSTES FINOS DE DRIFT ===
-        # Para lapidar o comportamento do drift, ajuste estes valores:
-        
-        self.drift_front_bias   = 1.10  # ↑ grip dianteiro em drift (frente morde mais)
-        # ↑ (1.12–1.15) = frente "morde" mais; ↓ se ficar "trocando de traseira"
-        
-        self.drift_rear_cut     = 0.72  # ↓ grip traseiro em drift (traseira mais solta)
-        # ↑ (0.75–0.80) = traseira menos solta; ↓ = mais solta
-        
-        self.drift_long_damp    = 0.80  # fator por segundo na vel. longitudinal em drift
-        # ↑ (0.88–0.92) = perde menos velocidade no drift (anda mais pra frente)
-        # ↓ (0.80–0.85) = fecha mais a curva
-        
-        self.drift_yaw_boost    = 0.0009  # empurrão de guinada extra proporcional ao slip
-        # ↓ (0.0007–0.0008) = gira menos; ↑ (0.0010) = gira mais
-
         # Internos
         self._bateu = False
+        # Força da última colisão com outro carro (0-1), escrita por ColisaoCarros.passo
+        self.forca_colisao = 0.0
         
         # Cache de performance
         self._vetor_frente_cache = None
         self._vetor_direita_cache = None
         self._angulo_cache = None
-        self._sprite_rot_cache = None
-        self._sprite_angulo_cache = None  # Inicializar como None para forçar primeiro cálculo
+
+        # --- Estado de renderização (sprite, partículas, marcas de pneu) ---
+        # Sem renderização (simulação sem janela) nenhuma textura é carregada e a física não muda
+        self.renderizar = renderizar
+        self.sprite_base = None
+        self.atlas_sprite = None  # Quadros pré-rotacionados, compartilhados pelos carros com o mesmo sprite
+        self.emissor_nitro = None
+        self.skidmarks = None
+        if renderizar:
+            self._iniciar_renderizacao(prefixo_cor)
 
     # ---------------- Sprites ----------------
-    def _carregar_sprite(self, prefixo_cor):
+    def _iniciar_renderizacao(self, prefixo_cor):
+        self._carregar_sprite(prefixo_cor)
+        self.emissor_nitro = EmissorNitro()
+        self.skidmarks = GerenciadorSkidmarks()
+
+    @staticmethod
+    def tamanho_sprite(prefixo_cor):
+        """Caminho e tamanho (área de ~48x48, lado máximo 64) do sprite de um carro"""
         caminho_sprite = os.path.join(DIR_SPRITES, f"{prefixo_cor}.png")
-        sprite = pygame.image.load(caminho_sprite).convert_alpha()
+        sprite = carregar_imagem(caminho_sprite)
         w0, h0 = sprite.get_size()
         # Tamanho original mantido
         area_max = 48 * 48
@@ -164,9 +131,13 @@ class CarroFisica:
             w = int((area_max * aspect) ** 0.5); h = int(w / aspect)
         else:
             h = int((area_max / aspect) ** 0.5); w = int(h * aspect)
-        w = min(w, 64); h = min(h, 64)
+        return caminho_sprite, (min(w, 64), min(h, 64))
+
+    def _carregar_sprite(self, prefixo_cor):
+        caminho_sprite, tamanho = self.tamanho_sprite(prefixo_cor)
         # Usar smoothscale ao invés de scale para melhor qualidade de interpolação
-        self.sprite_base = pygame.transform.smoothscale(sprite, (w, h))
+        self.sprite_base = carregar_imagem(caminho_sprite, tamanho=tamanho, suave=True, dono=self)
+        self.atlas_sprite = carregar_atlas_rotacao(caminho_sprite, tamanho=tamanho, suave=True, dono=self)
 
     # ---------------- Bases / transformações ---------------- 
     def _vetor_frente(self):
@@ -198,7 +169,7 @@ class CarroFisica:
     def _tire_lateral(self, slip_angle, Ca, Fz, mu_lat=None):
         if mu_lat is None:
             mu_lat = self.mu_peak
-        Fy_lin = Ca * math.tanh(slip_angle / self.alpha_sat)
+        Fy_lin = Ca * math.tanh(slip_angle * self.inv_alpha_sat)
         Fy_max = mu_lat * max(0.0, Fz)
         return max(-Fy_max, min(Fy_lin, Fy_max))
 
@@ -214,9 +185,7 @@ class CarroFisica:
         return Fx * k, Fy * k
 
     def _static_normal_loads(self):
-        Fzf = self.m * self.g * (self.b / self.L)
-        Fzr = self.m * self.g * (self.a / self.L)
-        return Fzf, Fzr
+        return self.Fzf, self.Fzr
 
     # ---------------- Métodos auxiliares ----------------
     def _decomp_vel(self):
@@ -269,6 +238,22 @@ class CarroFisica:
         self._step(acelerar, direita, esquerda, frear_re, turbo_pressed, superficie_mascara, dt, camera, superficie_pista_renderizada)
 
     def _step(self, acelerar, direita, esquerda, frear_re, turbo_pressed, superficie_mascara, dt, camera=None, superficie_pista_renderizada=None):
+        if self.fisica is not None:
+            # Em lote: o MundoFisica integra todos os carros juntos em passo()
+            self.fisica.comandar(self, acelerar, direita, esquerda, frear_re, turbo_pressed, dt, superficie_pista_renderizada)
+            return
+        self._integrar(acelerar, direita, esquerda, frear_re, turbo_pressed, superficie_mascara, dt, camera, superficie_pista_renderizada)
+
+    def _verificar_grama(self, superficie_pista_renderizada, x, y):
+        if self.campo_distancia is not None:
+            return verificar_na_grama_grip(self.campo_distancia, x, y, raio=15)
+        cx, cy = int(x), int(y)
+        if self.malha_materiais is not None:
+            return self.malha_materiais.na_grama(cx, cy, raio=15)
+        return verificar_na_grama_grip(superficie_pista_renderizada, cx, cy, raio=15)
+
+    def _integrar(self, acelerar, direita, esquerda, frear_re, turbo_pressed, superficie_mascara, dt, camera=None, superficie_pista_renderizada=None):
+        """Física de um carro sozinho (sem MundoFisica); core/fisica_lote.py replica este modelo em colunas"""
         # Escalas arcade
         TIME_SCALE        = 2.9
         ARCADE_SPEED_MULT = 2.5
@@ -283,8 +268,7 @@ class CarroFisica:
         na_grama = False
         if superficie_pista_renderizada is not None:
             # Sistema GRIP: verificar se está na grama
-            cx, cy = int(self.x), int(self.y)
-            na_grama = verificar_na_grama_grip(superficie_pista_renderizada, cx, cy, raio=15)
+            na_grama = self._verificar_grama(superficie_pista_renderizada, self.x, self.y)
             # Armazenar flag de grama para uso em outras partes do código
             self.na_grama = na_grama
 
@@ -326,9 +310,6 @@ class CarroFisica:
             target_counter = -math.radians(0.50 * slip)          # ★ um tico menos
             self._steer_wheel += self.counter_steer_assist * (target_counter - self._steer_wheel) * 6.0 * dt_fis
 
-        # cargas
-        Fzf, Fzr = self._static_normal_loads()
-
         # grip dependente da velocidade
         spd_k = min(1.0, speed_abs / 450.0)
         Cf_eff = self.Cf_base * (1.0 - 0.16*spd_k)               # ★ ligeiro ajuste
@@ -359,9 +340,10 @@ class CarroFisica:
         alpha_f = self._steer_wheel - math.atan2(v_lat + self.a*r, max(0.1, abs(v_long)))
         alpha_r = - math.atan2(v_lat - self.b*r, max(0.1, abs(v_long)))
 
-        # força lateral por eixo
-        Fy_f = max(-self.mu_peak*Fzf, min(Cf_eff * math.tanh(alpha_f / self.alpha_sat),  self.mu_peak*Fzf))
-        Fy_r = max(-self.mu_peak*Fzr, min(Cr_eff * math.tanh(alpha_r / self.alpha_sat),  self.mu_peak*Fzr))
+        # força lateral por eixo (cargas estáticas e limites mu_peak*Fz pré-calculados no perfil)
+        Fy_max_f, Fy_max_r = self.Fy_max_f, self.Fy_max_r
+        Fy_f = max(-Fy_max_f, min(Cf_eff * math.tanh(alpha_f * self.inv_alpha_sat), Fy_max_f))
+        Fy_r = max(-Fy_max_r, min(Cr_eff * math.tanh(alpha_r * self.inv_alpha_sat), Fy_max_r))
 
         # --- Longitudinal ---
         thr = 1.0 if acelerar else 0.0
@@ -484,8 +466,16 @@ class CarroFisica:
                     # Reduzir a força de ré aplicada
                     Fx_long *= fator_forca
 
-        Fx_f, Fy_f = self._ellipse_clamp(0.0, Fy_f, Fzf)
-        Fx_r, Fy_r = self._ellipse_clamp(Fx_long, Fy_r, Fzr)
+        # elipse de atrito: na dianteira (Fx = 0) |Fy_f| <= Fy_max_f já garante que está dentro
+        Fx_f = 0.0
+        ax = Fx_long * self.inv_Fx_max_r
+        ay = Fy_r * self.inv_Fy_max_r
+        elipse = ax * ax + ay * ay
+        if elipse > 1.0:
+            k = 1.0 / math.sqrt(elipse)
+            Fx_r, Fy_r = Fx_long * k, Fy_r * k
+        else:
+            Fx_r = Fx_long
 
         # somatório no chassi
         cs = math.cos(self._steer_wheel); sn = math.sin(self._steer_wheel)
@@ -908,48 +898,54 @@ class CarroFisica:
             # Usar a função dedicada para atualizar estado de drift
             self._atualizar_estado_drift(v_long, v_lat, dt_fis)
         
-        # Atualizar skidmarks
-        self.skidmarks.atualizar(dt_fis)
-
         # Turbo (hold) carga - estilo Need for Speed
-        # IMPORTANTE: Só spawnar partículas se turbo está REALMENTE ativo E tem carga disponível
         if self.turbo_ativo and self.turbo_carga > 0.0:
             # Consumir carga do turbo
             self.turbo_carga = max(0.0, self.turbo_carga - 25.0 * dt_fis)
-            
-            # Só spawnar partículas se ainda tem carga após consumir
-            if self.turbo_carga > 0.0:
-                # SEMPRE spawnar partículas quando turbo está ativo e há carga
-                # Dois escapamentos: esquerda e direita da traseira do carro
-                fx, fy = self._vetor_frente()
-                rx, ry = self._vetor_direita()
-                
-                # Ajustar posição de spawn para a traseira do carro (não no centro)
-                offset_traseira = 35.0  # pixels atrás do centro do carro
-                offset_lateral = 6.0  # pixels para os lados (esquerda e direita) - reduzido para aproximar
-                
-                # Escapamento esquerdo (visto de trás, esquerda do carro)
-                pos_x_nitro_esq = self.x - fx * offset_traseira - rx * offset_lateral
-                pos_y_nitro_esq = self.y - fy * offset_traseira - ry * offset_lateral
-                
-                # Escapamento direito (visto de trás, direita do carro)
-                pos_x_nitro_dir = self.x - fx * offset_traseira + rx * offset_lateral
-                pos_y_nitro_dir = self.y - fy * offset_traseira + ry * offset_lateral
-                
-                # Spawnar partículas nos dois escapamentos
-                # Usar dt_fis que já está escalado corretamente
-                self.emissor_nitro.spawn(pos_x_nitro_esq, pos_y_nitro_esq, -fx, -fy, 120.0, dt_fis)
-                self.emissor_nitro.spawn(pos_x_nitro_dir, pos_y_nitro_dir, -fx, -fy, 120.0, dt_fis)
         else:
             # Recarregar turbo quando não está ativo
             self.turbo_carga = min(100.0, self.turbo_carga + 12.0 * dt_fis)
-            # Resetar acumulador quando turbo não está ativo para evitar problemas
-            self.emissor_nitro._accum = 0.0
-            # Remover TODAS as partículas quando turbo para para evitar partículas "fantasma" no chão
+        self._emitir_nitro(dt_fis)
+
+    def _efeitos_pos_passo(self, dt_fis, criar_skidmark, ultimo_skidmark):
+        """Marcas de pneu e nitro de um passo integrado pelo MundoFisica (estado físico já atualizado)"""
+        if MODO_DRIFT and self._marcar_pneus(criar_skidmark, ultimo_skidmark):
+            self._ultimo_skidmark = dt_fis
+        self._emitir_nitro(dt_fis)
+
+    def _emitir_nitro(self, dt_fis):
+        # IMPORTANTE: Só spawnar partículas se turbo está REALMENTE ativo E tem carga disponível
+        if self.emissor_nitro is None:
+            return
+        if not self.turbo_ativo:
+            # Resetar acumulador e remover TODAS as partículas quando turbo para
             # Isso garante que não fiquem partículas soltas no chão
-            if len(self.emissor_nitro.ps) > 0:
-                # Remover todas as partículas quando turbo para
-                self.emissor_nitro.ps.clear()
+            self.emissor_nitro.limpar()
+            return
+        # Só spawnar partículas se ainda tem carga após consumir
+        if self.turbo_carga <= 0.0:
+            return
+        # Dois escapamentos: esquerda e direita da traseira do carro
+        fx, fy = self._vetor_frente()
+        rx, ry = self._vetor_direita()
+        
+        # Ajustar posição de spawn para a traseira do carro (não no centro)
+        offset_traseira = 35.0  # pixels atrás do centro do carro
+        offset_lateral = 6.0  # pixels para os lados (esquerda e direita) - reduzido para aproximar
+        x, y = self.x, self.y
+        
+        # Escapamento esquerdo (visto de trás, esquerda do carro)
+        pos_x_nitro_esq = x - fx * offset_traseira - rx * offset_lateral
+        pos_y_nitro_esq = y - fy * offset_traseira - ry * offset_lateral
+        
+        # Escapamento direito (visto de trás, direita do carro)
+        pos_x_nitro_dir = x - fx * offset_traseira + rx * offset_lateral
+        pos_y_nitro_dir = y - fy * offset_traseira + ry * offset_lateral
+        
+        # Spawnar partículas nos dois escapamentos
+        # Usar dt_fis que já está escalado corretamente
+        self.emissor_nitro.spawn(pos_x_nitro_esq, pos_y_nitro_esq, -fx, -fy, 120.0, dt_fis)
+        self.emissor_nitro.spawn(pos_x_nitro_dir, pos_y_nitro_dir, -fx, -fy, 120.0, dt_fis)
 
 
     def _verificar_colisao(self, superficie_mascara):
@@ -975,57 +971,69 @@ class CarroFisica:
                 self.drift_intensidade = min(1.0, max(0.3, abs(u) / 60.0))  # Mínimo de 0.3 na grama
             else:
                 self.drift_intensidade = min(1.0, abs(v) / 40.0)  # Mais sensível para intensidade
-            
-            # Criar skidmark quando derrapando OU na grama (com controle de frequência otimizado)
-            # Para bots, usar frequência menor para evitar lag (0.2s ao invés de 0.1s)
-            # Na grama, usar frequência um pouco maior para não sobrecarregar
-            if self.na_grama:
-                frequencia_skidmark = 0.15 if hasattr(self, 'eh_bot') and self.eh_bot else 0.08
-            else:
-                frequencia_skidmark = 0.2 if hasattr(self, 'eh_bot') and self.eh_bot else 0.1
-                
-            if self._ultimo_skidmark > frequencia_skidmark:
-                # Criar skidmarks dos 2 pneus traseiros paralelos
-                fx, fy = self._vetor_frente()
-                offset_tras = 12  # pixels atrás do carro (bem próximo)
-                offset_lateral = 10  # pixels para os lados (bem próximo das quinas)
-                
-                # Pneu traseiro esquerdo
-                pos_x_esq = self.x - fx * offset_tras - fy * offset_lateral
-                pos_y_esq = self.y - fy * offset_tras + fx * offset_lateral
-                self.skidmarks.adicionar_skidmark(pos_x_esq, pos_y_esq, self.angulo, self.drift_intensidade, "traseiro_esq", na_grama=self.na_grama)
-                
-                # Pneu traseiro direito
-                pos_x_dir = self.x - fx * offset_tras + fy * offset_lateral
-                pos_y_dir = self.y - fy * offset_tras - fx * offset_lateral
-                self.skidmarks.adicionar_skidmark(pos_x_dir, pos_y_dir, self.angulo, self.drift_intensidade, "traseiro_dir", na_grama=self.na_grama)
-                
-                # Se muito angular, criar marcas dos pneus dianteiros também
-                # Para bots, apenas criar pneus dianteiros em ângulos muito grandes (otimização)
-                # Na grama, sempre criar pneus dianteiros também
-                angulo_minimo_dianteiro = 1.0 if (hasattr(self, 'eh_bot') and self.eh_bot) else 0.5
-                if abs(self.angulo) > angulo_minimo_dianteiro or self.na_grama:
-                    offset_frente = 10  # pixels na frente do carro (bem próximo)
-                    
-                    # Pneu dianteiro esquerdo
-                    pos_x_frente_esq = self.x + fx * offset_frente - fy * offset_lateral
-                    pos_y_frente_esq = self.y + fy * offset_frente + fx * offset_lateral
-                    self.skidmarks.adicionar_skidmark(pos_x_frente_esq, pos_y_frente_esq, self.angulo, self.drift_intensidade * 0.7, "dianteiro_esq", na_grama=self.na_grama)
-                    
-                    # Pneu dianteiro direito
-                    pos_x_frente_dir = self.x + fx * offset_frente + fy * offset_lateral
-                    pos_y_frente_dir = self.y + fy * offset_frente - fx * offset_lateral
-                    self.skidmarks.adicionar_skidmark(pos_x_frente_dir, pos_y_frente_dir, self.angulo, self.drift_intensidade * 0.7, "dianteiro_dir", na_grama=self.na_grama)
-                
-                self._ultimo_skidmark = 0.0
         else:
             self.drift_intensidade *= 0.95
+        
+        if self._marcar_pneus(criar_skidmark, self._ultimo_skidmark):
+            self._ultimo_skidmark = 0.0
+        # Atualizar timer de skidmark
+        self._ultimo_skidmark += dt
+
+    def _marcar_pneus(self, criar_skidmark, ultimo_skidmark):
+        """Cria as marcas dos pneus quando o intervalo passou; True se criou (o timer recomeça)"""
+        if self.skidmarks is None:
+            return False
+        if not criar_skidmark:
             # Parar o rastro quando não estiver derrapando E não estiver na grama
             if not self.na_grama:
                 self.skidmarks.parar_rastro()
+            return False
         
-        # Atualizar timer de skidmark
-        self._ultimo_skidmark += dt
+        # Criar skidmark quando derrapando OU na grama (com controle de frequência otimizado)
+        # Para bots, usar frequência menor para evitar lag (0.2s ao invés de 0.1s)
+        # Na grama, usar frequência um pouco maior para não sobrecarregar
+        na_grama = self.na_grama
+        eh_bot = hasattr(self, 'eh_bot') and self.eh_bot
+        if na_grama:
+            frequencia_skidmark = 0.15 if eh_bot else 0.08
+        else:
+            frequencia_skidmark = 0.2 if eh_bot else 0.1
+        if ultimo_skidmark <= frequencia_skidmark:
+            return False
+        
+        # Criar skidmarks dos 2 pneus traseiros paralelos
+        fx, fy = self._vetor_frente()
+        x, y, angulo, intensidade = self.x, self.y, self.angulo, self.drift_intensidade
+        offset_tras = 12  # pixels atrás do carro (bem próximo)
+        offset_lateral = 10  # pixels para os lados (bem próximo das quinas)
+        
+        # Pneu traseiro esquerdo
+        pos_x_esq = x - fx * offset_tras - fy * offset_lateral
+        pos_y_esq = y - fy * offset_tras + fx * offset_lateral
+        self.skidmarks.adicionar_skidmark(pos_x_esq, pos_y_esq, angulo, intensidade, "traseiro_esq", na_grama=na_grama)
+        
+        # Pneu traseiro direito
+        pos_x_dir = x - fx * offset_tras + fy * offset_lateral
+        pos_y_dir = y - fy * offset_tras - fx * offset_lateral
+        self.skidmarks.adicionar_skidmark(pos_x_dir, pos_y_dir, angulo, intensidade, "traseiro_dir", na_grama=na_grama)
+        
+        # Se muito angular, criar marcas dos pneus dianteiros também
+        # Para bots, apenas criar pneus dianteiros em ângulos muito grandes (otimização)
+        # Na grama, sempre criar pneus dianteiros também
+        angulo_minimo_dianteiro = 1.0 if eh_bot else 0.5
+        if abs(angulo) > angulo_minimo_dianteiro or na_grama:
+            offset_frente = 10  # pixels na frente do carro (bem próximo)
+            
+            # Pneu dianteiro esquerdo
+            pos_x_frente_esq = x + fx * offset_frente - fy * offset_lateral
+            pos_y_frente_esq = y + fy * offset_frente + fx * offset_lateral
+            self.skidmarks.adicionar_skidmark(pos_x_frente_esq, pos_y_frente_esq, angulo, intensidade * 0.7, "dianteiro_esq", na_grama=na_grama)
+            
+            # Pneu dianteiro direito
+            pos_x_frente_dir = x + fx * offset_frente + fy * offset_lateral
+            pos_y_frente_dir = y + fy * offset_frente - fx * offset_lateral
+            self.skidmarks.adicionar_skidmark(pos_x_frente_dir, pos_y_frente_dir, angulo, intensidade * 0.7, "dianteiro_dir", na_grama=na_grama)
+        return True
 
     def _atualizar_velocimetro(self, u, dt):
         PXPS_TO_KMH = 0.35
@@ -1047,37 +1055,19 @@ class CarroFisica:
 
     # ---------------- Render ----------------
     def desenhar(self, superficie, camera=None):
+        if self.atlas_sprite is None:
+            return
         if camera is None:
-            # Cache de sprite rotacionado
-            # Arredondar ângulo para evitar recálculos frequentes que causam "flicando"
-            angulo_arredondado = round(self.angulo, 1)  # Arredondar para 1 casa decimal
-            if self._sprite_angulo_cache is None or self._sprite_angulo_cache != angulo_arredondado:
-                # Usar rotozoom com zoom=1.0 para melhor qualidade na rotação
-                self._sprite_rot_cache = pygame.transform.rotozoom(self.sprite_base, self.angulo, 1.0)
-                self._sprite_angulo_cache = angulo_arredondado
-            sprite_rot = self._sprite_rot_cache
-            rect = sprite_rot.get_rect(center=(self.x, self.y))
-            superficie.blit(sprite_rot, rect.topleft)
+            sprite_rot, meia_l, meia_a = self.atlas_sprite.quadro(self.angulo)
+            superficie.blit(sprite_rot, (int(self.x) - meia_l, int(self.y) - meia_a))
             self.emissor_nitro.draw(superficie, camera)
             return
         sx, sy = camera.mundo_para_tela(self.x, self.y)
-        # Cache com zoom (mais complexo, mas ainda vale a pena)
-        # Usar precisão menor no cache para evitar recálculos frequentes que causam "flicando"
-        # Arredondar ângulo e zoom para reduzir recálculos
-        angulo_arredondado = round(self.angulo, 1)  # Arredondar para 1 casa decimal
-        zoom_arredondado = round(camera.zoom, 2)  # Arredondar para 2 casas decimais
-        cache_key = (angulo_arredondado, zoom_arredondado)
-        if self._sprite_angulo_cache is None or self._sprite_angulo_cache != cache_key:
-            # rotozoom já usa interpolação suave, mas vamos garantir qualidade
-            # Se o zoom for muito diferente de 1.0, pode causar perda de qualidade
-            # Vamos usar rotozoom que já tem boa qualidade
-            self._sprite_rot_cache = pygame.transform.rotozoom(self.sprite_base, self.angulo, camera.zoom)
-            self._sprite_angulo_cache = cache_key
-        sprite_rot = self._sprite_rot_cache
-        rect = sprite_rot.get_rect(center=(sx, sy))
-        # Usar blit com flags para melhor qualidade (se disponível)
-        superficie.blit(sprite_rot, rect.topleft)
-        self.emissor_nitro.draw(superficie, camera)
+        # Quadro do atlas mais próximo do ângulo/zoom: sem rotozoom por frame
+        zoom = getattr(camera, "zoom_efetivo", camera.zoom)
+        sprite_rot, meia_l, meia_a = self.atlas_sprite.quadro(self.angulo, zoom)
+        superficie.blit(sprite_rot, (sx - meia_l, sy - meia_a))
+        # Com câmera, as partículas de todos os carros são desenhadas em lote por motor_particulas.desenhar
 
     # ---------------- API extra ----------------
     def usar_turbo(self):
@@ -2,6 +2,9 @@ import json
 import os
 import pygame
 from config import DIR_PROJETO, MAPAS_DISPONIVEIS, MAPA_ATUAL, obter_caminho_checkpoints
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
 
 class CheckpointManager:
     """Gerenciador de checkpoints com edição em tempo real para múltiplos mapas"""
@@ -27,7 +30,7 @@ class CheckpointManager:
             self.checkpoint_selecionado = -1
             self.checkpoint_em_arraste = -1
             self.carregar_checkpoints()
-            print(f"Trocado para mapa: {MAPAS_DISPONIVEIS[novo_mapa]['nome']}")
+            log.info("Trocado para mapa: %s", MAPAS_DISPONIVEIS[novo_mapa]['nome'])
             return True
         return False
     
@@ -37,12 +40,12 @@ class CheckpointManager:
             if os.path.exists(self.arquivo_checkpoints):
                 with open(self.arquivo_checkpoints, 'r', encoding='utf-8') as f:
                     self.checkpoints = json.load(f)
-                print(f"Carregados {len(self.checkpoints)} checkpoints do arquivo")
+                log.debug("Carregados %s checkpoints do arquivo", len(self.checkpoints))
             else:
-                print("Arquivo de checkpoints não encontrado, usando lista vazia")
+                log.debug("Arquivo de checkpoints não encontrado, usando lista vazia")
                 self.checkpoints = []
         except Exception as e:
-            print(f"Erro ao carregar checkpoints: {e}")
+            log.warning("Erro ao carregar checkpoints: %s", e)
             self.checkpoints = []
     
     def salvar_checkpoints(self):
@@ -55,22 +58,22 @@ class CheckpointManager:
             
             with open(self.arquivo_checkpoints, 'w', encoding='utf-8') as f:
                 json.dump(self.checkpoints, f, indent=2, ensure_ascii=False)
-            print(f"Salvos {len(self.checkpoints)} checkpoints no arquivo")
+            log.info("Salvos %s checkpoints no arquivo", len(self.checkpoints))
             return True
         except Exception as e:
-            print(f"Erro ao salvar checkpoints: {e}")
+            log.warning("Erro ao salvar checkpoints: %s", e)
             return False
     
     def adicionar_checkpoint(self, x, y):
         """Adiciona um novo checkpoint na posição especificada"""
         self.checkpoints.append([float(x), float(y)])
-        print(f"Checkpoint adicionado: ({x:.1f}, {y:.1f})")
+        log.info("Checkpoint adicionado: (%.1f, %.1f)", x, y)
     
     def remover_checkpoint(self, indice):
         """Remove checkpoint pelo índice"""
         if 0 <= indice < len(self.checkpoints):
             checkpoint = self.checkpoints.pop(indice)
-            print(f"Checkpoint removido: ({checkpoint[0]:.1f}, {checkpoint[1]:.1f})")
+            log.info("Checkpoint removido: (%.1f, %.1f)", checkpoint[0], checkpoint[1])
             return True
         return False
     
@@ -100,7 +103,7 @@ class CheckpointManager:
         """Alterna entre modo de edição e modo normal"""
         self.modo_edicao = not self.modo_edicao
         self.checkpoint_selecionado = -1
-        print(f"Modo de edição: {'ATIVADO' if self.modo_edicao else 'DESATIVADO'}")
+        log.info("Modo de edição: %s", 'ATIVADO' if self.modo_edicao else 'DESATIVADO')
     
     def processar_clique(self, x, y, camera=None):
         """Processa clique do mouse para edição de checkpoints"""
@@ -116,7 +119,7 @@ class CheckpointManager:
         if indice >= 0:
             # Clicou em checkpoint existente - selecionar para mover
             self.checkpoint_selecionado = indice
-            print(f"Checkpoint {indice} selecionado para mover")
+            log.info("Checkpoint %s selecionado para mover", indice)
         # Removido: adicionar checkpoint automaticamente em área vazia
         # Agora área vazia arrasta a câmera
     
@@ -128,7 +131,7 @@ class CheckpointManager:
         mundo_x, mundo_y = camera.tela_para_mundo(x, y)
         self.adicionar_checkpoint(mundo_x, mundo_y)
         self.checkpoint_selecionado = len(self.checkpoints) - 1
-        print(f"Checkpoint adicionado em ({mundo_x:.1f}, {mundo_y:.1f})")
+        log.info("Checkpoint adicionado em (%.1f, %.1f)", mundo_x, mundo_y)
     
     def processar_teclado(self, teclas):
         """Processa teclas para edição de checkpoints"""
@@ -152,37 +155,36 @@ class CheckpointManager:
         # F7 - Toggle modo edição
         if teclas[pygame.K_F7]:
             self.modo_edicao = not self.modo_edicao
-            print(f"Modo edição: {'ON' if self.modo_edicao else 'OFF'}")
+            log.info("Modo edição: %s", 'ON' if self.modo_edicao else 'OFF')
         
         # F5 - Salvar checkpoints
         if teclas[pygame.K_F5]:
             self.salvar_checkpoints()
-            print("Checkpoints salvos!")
+            log.info("Checkpoints salvos!")
         
         # F6 - Carregar checkpoints
         if teclas[pygame.K_F6]:
             self.carregar_checkpoints()
-            print("Checkpoints carregados!")
+            log.info("Checkpoints carregados!")
         
         # F8 - Limpar todos os checkpoints
         if teclas[pygame.K_F8]:
             self.checkpoints = []
             self.checkpoint_selecionado = -1
-            print("Todos os checkpoints removidos!")
+            log.info("Todos os checkpoints removidos!")
         
         # F9 - Próximo mapa (placeholder)
         if teclas[pygame.K_F9]:
-            print("F9 - Próximo mapa (não implementado)")
+            log.info("F9 - Próximo mapa (não implementado)")
         
         # F10 - Mostrar todos os checkpoints
         if teclas[pygame.K_F10]:
-            print(f"Checkpoints atuais: {len(self.checkpoints)}")
-            for i, (x, y) in enumerate(self.checkpoints):
-                print(f"  {i}: ({x:.1f}, {y:.1f})")
+            log.info("Checkpoints atuais: %s\n%s", len(self.checkpoints),
+                     "\n".join(f"  {i}: ({x:.1f}, {y:.1f})" for i, (x, y) in enumerate(self.checkpoints)))
         
         # F12 - Mostrar rota (placeholder)
         if teclas[pygame.K_F12]:
-            print("F12 - Mostrar rota (não implementado)")
+            log.info("F12 - Mostrar rota (não implementado)")
         
         # Ctrl+Clique - Adicionar checkpoint na posição do mouse
         if teclas[pygame.K_LCTRL] or teclas[pygame.K_RCTRL]:
@@ -0,0 +1,216 @@
+"""
+Colisão entre carros
+Broadphase: hash espacial em grade uniforme, remontado a cada passo fixo; cada carro entra na célula
+do seu centro e só é testado contra as células vizinhas, então o custo cresce com o número de carros
+e não com o número de pares
+Narrowphase: caixas orientadas (eixo separador nos 4 eixos das duas caixas)
+Resposta: impulso no ponto de contato (restituição + atrito) aplicado em vx/vy/yaw_rate, mais a
+correção de posição que desfaz a interpenetração
+"""
+import math
+from itertools import combinations, product
+
+# Caixa de colisão em px (meias medidas; os sprites dos carros têm 64 x ~32)
+MEIO_COMPRIMENTO = 30.0
+MEIA_LARGURA = 14.0
+RAIO_CAIXA = math.hypot(MEIO_COMPRIMENTO, MEIA_LARGURA)
+# Lado da célula: dois carros que se tocam estão a menos de 2 raios, logo em células vizinhas
+TAMANHO_CELULA = 2.0 * RAIO_CAIXA
+# Células vizinhas visitadas a partir de cada célula (metade da vizinhança: cada par uma vez só)
+_VIZINHAS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+RESTITUICAO = 0.3
+# Momento de inércia da caixa multiplicado por este fator: os pneus seguram a guinada, então um
+# toque de lado gira o carro bem menos que giraria um bloco solto
+FATOR_INERCIA = 2.0
+ATRITO_CONTATO = 0.3
+# Fração da interpenetração desfeita por passo e folga tolerada (px), para não tremer em contato
+CORRECAO_POSICAO = 0.8
+FOLGA_PENETRACAO = 0.5
+# Variação de velocidade (km/h) que corresponde a forca_colisao 1.0
+DELTA_KMH_FORCA_MAXIMA = 100.0
+# Mesma escala de CarroFisica._integrar: a posição anda vx * ARCADE_SPEED_MULT px por segundo de
+# física, que é também a velocidade em km/h do velocímetro; o impulso é calculado nessa unidade
+ARCADE_SPEED_MULT = 2.5
+
+
+class ColisaoCarros:
+    """
+    Colisões entre os carros registrados
+    passo() a cada passo fixo, depois da física de todos os carros; carros em `ignorar` não colidem
+    nesse passo (ex.: quem já terminou fica parado sobre a linha de chegada e não pode bloqueá-la)
+    Em cada carro, forca_colisao (0-1) fica com a maior força de colisão do último passo
+    """
+
+    def __init__(self, tamanho_celula=TAMANHO_CELULA):
+        self.carros = []
+        self.tamanho_celula = tamanho_celula
+        # Estatísticas do último passo
+        self.pares_testados = 0
+        self.contatos = 0
+
+    def __len__(self):
+        return len(self.carros)
+
+    def registrar(self, carro):
+        if carro not in self.carros:
+            self.carros.append(carro)
+
+    def remover(self, carro):
+        if carro in self.carros:
+            self.carros.remove(carro)
+
+    def limpar(self):
+        self.carros = []
+
+    def _celulas(self):
+        """Hash espacial: célula -> índices dos carros cujo centro está nela"""
+        tamanho = self.tamanho_celula
+        celulas = {}
+        for i, carro in enumerate(self.carros):
+            chave = (int(carro.x // tamanho), int(carro.y // tamanho))
+            indices = celulas.get(chave)
+            if indices is None:
+                celulas[chave] = [i]
+            else:
+                indices.append(i)
+        return celulas
+
+    def _pares_candidatos(self):
+        """Pares de índices na mesma célula ou em células vizinhas (cada par uma vez)"""
+        celulas = self._celulas()
+        pares = []
+        for (cx, cy), indices in celulas.items():
+            if len(indices) > 1:
+                pares.extend(combinations(indices, 2))
+            for dx, dy in _VIZINHAS:
+                outros = celulas.get((cx + dx, cy + dy))
+                if outros is not None:
+                    pares.extend(product(indices, outros))
+        return pares
+
+    def passo(self, ignorar=()):
+        carros = self.carros
+        for carro in carros:
+            carro.forca_colisao = 0.0
+        self.pares_testados = 0
+        self.contatos = 0
+        if len(carros) < 2:
+            return
+        distancia_max = (2.0 * RAIO_CAIXA) ** 2
+        caixas = {}
+        for i, j in self._pares_candidatos():
+            a, b = carros[i], carros[j]
+            dx, dy = b.x - a.x, b.y - a.y
+            if dx * dx + dy * dy >= distancia_max:
+                continue
+            if a in ignorar or b in ignorar:
+                continue
+            self.pares_testados += 1
+            # Eixos calculados uma vez por carro (a colisão muda posição e velocidades, não o ângulo)
+            caixa_a = caixas.get(i) or caixas.setdefault(i, _eixos(a))
+            caixa_b = caixas.get(j) or caixas.setdefault(j, _eixos(b))
+            contato = _contato_caixas(a, caixa_a, b, caixa_b)
+            if contato is not None:
+                self.contatos += 1
+                _resolver(a, b, *contato)
+
+
+def _eixos(carro):
+    """Eixos da caixa do carro no mundo: frente e direita (mesma convenção de CarroFisica)"""
+    rad = math.radians(carro.angulo)
+    fx, fy = -math.cos(rad), math.sin(rad)
+    return fx, fy, fy, -fx
+
+
+def _contato_caixas(a, caixa_a, b, caixa_b):
+    """
+    Eixo separador entre as duas caixas orientadas
+    Retorna (normal de a para b, penetração, ponto de contato) ou None se não se tocam
+    """
+    afx, afy, arx, ary = caixa_a
+    bfx, bfy, brx, bry = caixa_b
+    dx, dy = b.x - a.x, b.y - a.y
+    # |cossenos| entre os eixos das duas caixas: dão a projeção de uma caixa nos eixos da outra
+    c_ff = abs(afx * bfx + afy * bfy); c_fr = abs(afx * brx + afy * bry)
+    c_rf = abs(arx * bfx + ary * bfy); c_rr = abs(arx * brx + ary * bry)
+    penetracao = None
+    for eixo_de_a, ux, uy, raios in (
+        (True, afx, afy, MEIO_COMPRIMENTO + MEIO_COMPRIMENTO * c_ff + MEIA_LARGURA * c_fr),
+        (True, arx, ary, MEIA_LARGURA + MEIO_COMPRIMENTO * c_rf + MEIA_LARGURA * c_rr),
+        (False, bfx, bfy, MEIO_COMPRIMENTO * c_ff + MEIA_LARGURA * c_rf + MEIO_COMPRIMENTO),
+        (False, brx, bry, MEIO_COMPRIMENTO * c_fr + MEIA_LARGURA * c_rr + MEIA_LARGURA),
+    ):
+        distancia = dx * ux + dy * uy
+        sobreposicao = raios - abs(distancia)
+        if sobreposicao <= 0.0:
+            return None
+        if penetracao is None or sobreposicao < penetracao:
+            penetracao = sobreposicao
+            normal_de_a = eixo_de_a
+            nx, ny = (ux, uy) if distancia >= 0.0 else (-ux, -uy)
+    if normal_de_a:
+        # Face de a: o contato é o vértice de b mais fundo contra a normal
+        sf = MEIO_COMPRIMENTO if bfx * nx + bfy * ny > 0.0 else -MEIO_COMPRIMENTO
+        sr = MEIA_LARGURA if brx * nx + bry * ny > 0.0 else -MEIA_LARGURA
+        px, py = b.x - sf * bfx - sr * brx, b.y - sf * bfy - sr * bry
+    else:
+        sf = MEIO_COMPRIMENTO if afx * nx + afy * ny > 0.0 else -MEIO_COMPRIMENTO
+        sr = MEIA_LARGURA if arx * nx + ary * ny > 0.0 else -MEIA_LARGURA
+        px, py = a.x + sf * afx + sr * arx, a.y + sf * afy + sr * ary
+    return nx, ny, penetracao, px, py
+
+
+def _massas(carro):
+    """Inversos da massa e do momento de inércia (caixa uniforme, em px)"""
+    inercia = FATOR_INERCIA * carro.m * (MEIO_COMPRIMENTO ** 2 + MEIA_LARGURA ** 2) / 3.0
+    return 1.0 / carro.m, 1.0 / inercia
+
+
+def _resolver(a, b, nx, ny, penetracao, px, py):
+    inv_ma, inv_ia = _massas(a)
+    inv_mb, inv_ib = _massas(b)
+    inv_m = inv_ma + inv_mb
+
+    # Correção de posição ao longo da normal, proporcional ao inverso das massas
+    correcao = max(0.0, penetracao - FOLGA_PENETRACAO) * CORRECAO_POSICAO / inv_m
+    a.x -= nx * correcao * inv_ma; a.y -= ny * correcao * inv_ma
+    b.x += nx * correcao * inv_mb; b.y += ny * correcao * inv_mb
+
+    # Velocidades em px por segundo de física; guinada no sentido trigonométrico de (x, y)
+    # (angulo cresce com yaw_rate girando os vetores no sentido oposto, daí o sinal)
+    rax, ray = px - a.x, py - a.y
+    rbx, rby = px - b.x, py - b.y
+    wa, wb = -a.yaw_rate, -b.yaw_rate
+    vax, vay = a.vx * ARCADE_SPEED_MULT - wa * ray, a.vy * ARCADE_SPEED_MULT + wa * rax
+    vbx, vby = b.vx * ARCADE_SPEED_MULT - wb * rby, b.vy * ARCADE_SPEED_MULT + wb * rbx
+    vrx, vry = vbx - vax, vby - vay
+    v_normal = vrx * nx + vry * ny
+    if v_normal >= 0.0:
+        return  # Já se afastando: só a correção de posição
+
+    ra_n = rax * ny - ray * nx
+    rb_n = rbx * ny - rby * nx
+    j = -(1.0 + RESTITUICAO) * v_normal / (inv_m + ra_n * ra_n * inv_ia + rb_n * rb_n * inv_ib)
+
+    # Atrito no contato (Coulomb), limitado por ATRITO_CONTATO * impulso normal
+    tx, ty = vrx - v_normal * nx, vry - v_normal * ny
+    v_tangente = math.hypot(tx, ty)
+    jt = 0.0
+    if v_tangente > 1e-6:
+        tx /= v_tangente; ty /= v_tangente
+        ra_t = rax * ty - ray * tx
+        rb_t = rbx * ty - rby * tx
+        jt = -v_tangente / (inv_m + ra_t * ra_t * inv_ia + rb_t * rb_t * inv_ib)
+        jt = max(-ATRITO_CONTATO * j, min(jt, ATRITO_CONTATO * j))
+
+    ix, iy = j * nx + jt * tx, j * ny + jt * ty
+    a.vx -= ix * inv_ma / ARCADE_SPEED_MULT; a.vy -= iy * inv_ma / ARCADE_SPEED_MULT
+    b.vx += ix * inv_mb / ARCADE_SPEED_MULT; b.vy += iy * inv_mb / ARCADE_SPEED_MULT
+    a.yaw_rate += (rax * iy - ray * ix) * inv_ia
+    b.yaw_rate -= (rbx * iy - rby * ix) * inv_ib
+
+    # Força 0-1: variação de velocidade em km/h (mesma unidade do impulso / massa)
+    impulso = math.hypot(ix, iy)
+    a.forca_colisao = max(a.forca_colisao, min(1.0, impulso * inv_ma / DELTA_KMH_FORCA_MAXIMA))
+    b.forca_colisao = max(b.forca_colisao, min(1.0, impulso * inv_mb / DELTA_KMH_FORCA_MAXIMA))
@@ -0,0 +1,88 @@
+"""
+Presets de dificuldade da IA (data/ia_dificuldades.json)
+Sem arquivo valem os presets de PRESETS_PADRAO; no arquivo cada dificuldade só lista o que muda
+O arquivo é gerado por tools/torneio_ia.py (corridas sem janela em paralelo que ajustam os parâmetros)
+Os parâmetros de linha (fator_velocidade_linha, alcance_*, antecipacao_freio, velocidade_grama, usar_turbo)
+guiam a IA nas pistas com linha de corrida; os demais só valem no modo antigo, mirando os checkpoints
+"""
+import os
+import json
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
+
+DIR_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CAMINHO_PRESETS = os.path.join(DIR_PROJETO, "data", "ia_dificuldades.json")
+
+DIFICULDADES = ("facil", "medio", "dificil")
+
+# Presets ajustados à mão (usados sem arquivo ou para chaves ausentes nele)
+PRESETS_PADRAO = {
+    "facil": {
+        "velocidade_maxima": 5.0, "velocidade_curva": 2.5, "distancia_freio_curva": 80,
+        "distancia_freio_checkpoint": 60, "angulo_max_curva": 25, "velocidade_max_curva": 3.0,
+        "agressividade": 0.3, "precisao_curva": 0.8, "tempo_reacao": 0.15,
+        "fator_velocidade_linha": 0.7, "alcance_linha_min": 60.0, "alcance_linha_por_velocidade": 1.5,
+        "antecipacao_freio": 4, "velocidade_grama": 20.0, "usar_turbo": False,
+    },
+    "medio": {
+        "velocidade_maxima": 7.5, "velocidade_curva": 4.0, "distancia_freio_curva": 45,
+        "distancia_freio_checkpoint": 35, "angulo_max_curva": 45, "velocidade_max_curva": 5.5,
+        "agressividade": 0.75, "precisao_curva": 0.9, "tempo_reacao": 0.08,
+        "fator_velocidade_linha": 0.85, "alcance_linha_min": 60.0, "alcance_linha_por_velocidade": 1.5,
+        "antecipacao_freio": 4, "velocidade_grama": 20.0, "usar_turbo": False,
+    },
+    "dificil": {
+        "velocidade_maxima": 12.0, "velocidade_curva": 7.0, "distancia_freio_curva": 15,
+        "distancia_freio_checkpoint": 10, "angulo_max_curva": 80, "velocidade_max_curva": 9.0,
+        "agressividade": 1.0, "precisao_curva": 0.99, "tempo_reacao": 0.01,
+        "fator_velocidade_linha": 1.0, "alcance_linha_min": 60.0, "alcance_linha_por_velocidade": 1.5,
+        "antecipacao_freio": 4, "velocidade_grama": 20.0, "usar_turbo": True,
+    },
+}
+
+_presets = None
+
+
+def _converter(valores, padrao):
+    """Valores do arquivo com o tipo do padrão (int, float ou bool); chaves desconhecidas são ignoradas"""
+    return {chave: type(valor_padrao)(valores.get(chave, valor_padrao)) for chave, valor_padrao in padrao.items()}
+
+
+def carregar_presets(caminho=CAMINHO_PRESETS):
+    """Dificuldade -> {parâmetro: valor}, sempre com as três dificuldades e todos os parâmetros"""
+    dados = {}
+    if os.path.exists(caminho):
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f).get("dificuldades", {})
+        except Exception as e:
+            log.warning("Erro ao carregar presets da IA: %s", e)
+            dados = {}
+    return {nome: _converter(dados.get(nome, {}), padrao) for nome, padrao in PRESETS_PADRAO.items()}
+
+
+def salvar_presets(presets, caminho=CAMINHO_PRESETS, relatorio=None):
+    """Grava os presets (e, opcionalmente, o relatório do torneio que os gerou) no formato de carregar_presets"""
+    dados = {"dificuldades": {nome: dict(presets[nome]) for nome in DIFICULDADES if nome in presets}}
+    if relatorio is not None:
+        dados["torneio"] = relatorio
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    caminho_tmp = caminho + ".tmp"
+    with open(caminho_tmp, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+    os.replace(caminho_tmp, caminho)
+
+
+def presets_dificuldade():
+    """Presets do arquivo de dados, lidos uma vez"""
+    global _presets
+    if _presets is None:
+        _presets = carregar_presets()
+    return _presets
+
+
+def parametros_dificuldade(dificuldade, presets=None):
+    """Parâmetros de uma dificuldade (os do "medio" se ela não existir)"""
+    presets = presets if presets is not None else presets_dificuldade()
+    return presets.get(dificuldade, presets["medio"])
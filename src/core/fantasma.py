@@ -0,0 +1,163 @@
+"""
+Carro fantasma da melhor volta
+A volta é amostrada em taxa fixa (x, y, ângulo) e guardada em colunas inteiras: posições em uint16
+(meio pixel de resolução) e ângulo em int16; cada volta de ~1 min ocupa alguns KB comprimida
+O fantasma não tem física: só interpolação entre amostras e um blit do sprite pré-rotacionado
+"""
+import os
+import zlib
+import struct
+import pygame
+from array import array
+from core.assets import carregar_imagem, AtlasRotacao
+from core.carro_fisica import CarroFisica
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
+
+FANTASMA_MAGICO = b"TRGHOST\0"
+FANTASMA_VERSAO = 1
+# magico, versao, amostras por segundo, quantidade de amostras, tempo da volta, prefixo do carro
+_CABECALHO = struct.Struct("<8sHHIf16s")
+
+# Amostras por segundo (divide o passo fixo de 120 Hz)
+TAXA_AMOSTRAS = 20
+# Posições gravadas em unidades de 1/ESCALA_POSICAO px (uint16: mundo de até 32767 px)
+ESCALA_POSICAO = 2
+# Ângulo em int16: 180° = 32768
+ESCALA_ANGULO = 32768 / 180.0
+# Opacidade do fantasma (0-255)
+ALPHA_FANTASMA = 110
+
+class Fantasma:
+    """
+    Volta gravada: colunas array('H') xs/ys e array('h') angulos, amostradas a `taxa` por segundo
+    tempo: tempo da volta em segundos; prefixo: sprite do carro que fez a volta
+    """
+    def __init__(self, xs, ys, angulos, tempo, prefixo, taxa=TAXA_AMOSTRAS):
+        self.xs = xs
+        self.ys = ys
+        self.angulos = angulos
+        self.tempo = tempo
+        self.prefixo = prefixo
+        self.taxa = taxa
+        self._atlas = None
+
+    def __len__(self):
+        return len(self.xs)
+
+    def estado(self, t):
+        """(x, y, ângulo) interpolados no instante t da volta (preso ao início/fim)"""
+        n = len(self.xs)
+        pos = min(max(t * self.taxa, 0.0), n - 1.0)
+        i = min(int(pos), n - 2) if n > 1 else 0
+        f = pos - i
+        j = min(i + 1, n - 1)
+        x = (self.xs[i] + (self.xs[j] - self.xs[i]) * f) / ESCALA_POSICAO
+        y = (self.ys[i] + (self.ys[j] - self.ys[i]) * f) / ESCALA_POSICAO
+        # Ângulo pelo menor arco (o int16 dá a volta em ±180°)
+        delta = (self.angulos[j] - self.angulos[i] + 32768) % 65536 - 32768
+        angulo = (self.angulos[i] + delta * f) / ESCALA_ANGULO
+        return x, y, angulo
+
+    def desenhar(self, superficie, camera, t):
+        """Desenha o fantasma no instante t da volta (nada depois do fim da volta)"""
+        if t > self.tempo or not len(self.xs):
+            return
+        x, y, angulo = self.estado(t)
+        if not camera.esta_visivel(x, y, 40):
+            return
+        if self._atlas is None:
+            self._atlas = _atlas_translucido(self.prefixo)
+            if self._atlas is None:
+                return
+        sprite, meia_l, meia_a = self._atlas.quadro(angulo, getattr(camera, "zoom_efetivo", camera.zoom))
+        sx, sy = camera.mundo_para_tela(x, y)
+        superficie.blit(sprite, (sx - meia_l, sy - meia_a))
+
+    # ---------------- Arquivo ----------------
+    def salvar(self, caminho):
+        prefixo = self.prefixo.encode("utf-8")[:16]
+        colunas = array('H', self.xs).tobytes() + array('H', self.ys).tobytes() + array('h', self.angulos).tobytes()
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        caminho_tmp = caminho + ".tmp"
+        with open(caminho_tmp, 'wb') as f:
+            f.write(_CABECALHO.pack(FANTASMA_MAGICO, FANTASMA_VERSAO, self.taxa, len(self.xs), self.tempo, prefixo))
+            f.write(zlib.compress(colunas, 9))
+        os.replace(caminho_tmp, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Retorna o Fantasma ou None se o arquivo não existir ou estiver inválido"""
+        try:
+            with open(caminho, 'rb') as f:
+                magico, versao, taxa, n, tempo, prefixo = _CABECALHO.unpack(f.read(_CABECALHO.size))
+                if magico != FANTASMA_MAGICO or versao != FANTASMA_VERSAO:
+                    return None
+                colunas = zlib.decompress(f.read())
+            if len(colunas) != n * 6:
+                return None
+            xs, ys, angulos = array('H'), array('H'), array('h')
+            xs.frombytes(colunas[:2 * n])
+            ys.frombytes(colunas[2 * n:4 * n])
+            angulos.frombytes(colunas[4 * n:])
+            return cls(xs, ys, angulos, tempo, prefixo.rstrip(b"\0").decode("utf-8"), taxa)
+        except (OSError, struct.error, zlib.error, UnicodeDecodeError) as e:
+            log.warning("Erro ao carregar fantasma %s: %s", caminho, e)
+            return None
+
+def _atlas_translucido(prefixo):
+    """Atlas de rotação do sprite do carro (mesmo tamanho dos carros) com a opacidade do fantasma"""
+    try:
+        caminho, tamanho = CarroFisica.tamanho_sprite(prefixo)
+        # Cópia: a Surface do cache é compartilhada com os carros
+        base = carregar_imagem(caminho, tamanho=tamanho, suave=True).copy()
+    except (FileNotFoundError, pygame.error) as e:
+        log.warning("Sprite do fantasma indisponível (%s): %s", prefixo, e)
+        return None
+    base.fill((255, 255, 255, ALPHA_FANTASMA), special_flags=pygame.BLEND_RGBA_MULT)
+    return AtlasRotacao(base)
+
+class GravadorFantasma:
+    """
+    Grava as voltas de um carro durante a corrida
+    passo() a cada passo fixo com a corrida em andamento; ao completar uma volta, volta_concluida
+    guarda o Fantasma dela até ser consumida por quem chamou
+    """
+    def __init__(self, carro, prefixo, dt_fixo, taxa=TAXA_AMOSTRAS):
+        self.carro = carro
+        self.prefixo = prefixo
+        self.taxa = taxa
+        self.passos_por_amostra = max(1, int(round(1.0 / (dt_fixo * taxa))))
+        self.inicio_volta = 0.0
+        self.volta_concluida = None
+        self._voltas = 0
+        self._passos = 0
+        self._iniciar_colunas()
+
+    def _iniciar_colunas(self):
+        self._xs, self._ys, self._angulos = array('H'), array('H'), array('h')
+
+    def _amostrar(self):
+        carro = self.carro
+        self._xs.append(min(65535, max(0, int(round(carro.x * ESCALA_POSICAO)))))
+        self._ys.append(min(65535, max(0, int(round(carro.y * ESCALA_POSICAO)))))
+        self._angulos.append((int(round(carro.angulo * ESCALA_ANGULO)) + 32768) % 65536 - 32768)
+
+    def passo(self, corrida):
+        voltas = corrida.voltas.get(self.carro, 0)
+        if voltas == self._voltas and corrida.finalizou.get(self.carro, False):
+            return
+        if self._passos % self.passos_por_amostra == 0:
+            self._amostrar()
+        self._passos += 1
+        if voltas > self._voltas:
+            # Volta completa: última amostra no cruzamento, tempo pelo relógio da corrida
+            self._amostrar()
+            self._voltas = voltas
+            tempo = corrida.tempo_global - self.inicio_volta
+            self.volta_concluida = Fantasma(self._xs, self._ys, self._angulos, tempo, self.prefixo, self.taxa)
+            self.inicio_volta = corrida.tempo_global
+            self._passos = 1
+            self._iniciar_colunas()
+            self._amostrar()
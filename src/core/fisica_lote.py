@@ -0,0 +1,433 @@
+"""
+Física de todos os carros em lote
+MundoFisica guarda o estado dos carros registrados em colunas numpy (uma coluna por carro) e integra
+todos de uma vez, com o mesmo modelo de bicicleta/pneus de CarroFisica._integrar (ângulos de deriva,
+elipse de atrito, grama, turbo, limitadores). No passo fixo cada carro só registra os comandos
+(CarroFisica._step); MundoFisica.passo() lê o estado dos carros, integra e devolve o resultado
+Com poucos carros (ou sem numpy) cada carro é integrado sozinho, que nesse caso é mais barato
+"""
+from operator import attrgetter
+from config import LARGURA, ALTURA, MODO_DRIFT, TURBO_FATOR
+from core.pista_grip import FRACAO_RAIO_GRAMA
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Estado lido/escrito nos carros a cada passo (valores e flags)
+CAMPOS_ESTADO = (
+    "x", "y", "angulo", "vx", "vy", "yaw_rate", "_steer_wheel", "turbo_carga",
+    "velocidade", "velocidade_kmh", "drift_intensidade", "_ultimo_skidmark",
+)
+FLAGS_ESTADO = ("turbo_ativo", "na_grama", "freio_mao_ativo", "drift_ativado", "drifting")
+# Parâmetros de tuning copiados do carro ao registrar (atualizar_parametros após alterá-los)
+PARAMETROS = (
+    "m", "g", "L", "a", "b", "Iz", "Cf_base", "Cr_base", "mu_peak", "mu_long", "alpha_sat",
+    "engine_force_fwd", "engine_force_rev", "brake_force", "drag", "roll_res", "friction_base",
+    "V_TOP", "V_SOFT", "steer_rad_max", "steer_rate", "speed_steer_k", "counter_steer_assist",
+    "rear_grip_cut_hb", "rear_grip_cut_throttle", "stability_k", "yaw_damp_k", "engine_yaw_push",
+    "power_oversteer_k", "min_speed_oversteer", "drift_front_bias", "drift_rear_cut",
+    "drift_long_damp", "drift_yaw_boost",
+    # derivados pré-calculados no perfil (core/perfil_fisica.py)
+    "Fy_max_f", "Fy_max_r", "inv_alpha_sat", "inv_Fx_max_r", "inv_Fy_max_r",
+)
+_ler_estado = attrgetter(*CAMPOS_ESTADO)
+_ler_flags = attrgetter(*FLAGS_ESTADO)
+
+# Mesmas escalas arcade de CarroFisica._integrar
+TIME_SCALE = 2.9
+ARCADE_SPEED_MULT = 2.5
+RAIO_GRAMA = 15
+# A partir de quantos carros no passo a integração em colunas fica mais barata que carro a carro
+# (cada operação numpy custa ~1 µs qualquer que seja o número de carros; o passo em lote fica em ~0,6 ms)
+MIN_CARROS_LOTE = 32
+
+
+class MundoFisica:
+    """
+    Física de vários carros: estado em colunas (struct of arrays) e integração em lote
+    Uso por passo fixo: cada carro chama _step (direto ou pela IA), que só registra os comandos;
+    depois passo() integra de uma vez os carros que receberam comandos neste passo
+    estado/flags guardam as colunas do último passo integrado em lote (uma coluna por carro ativo)
+    """
+
+    def __init__(self, min_carros_lote=MIN_CARROS_LOTE):
+        self.carros = []
+        self.min_carros_lote = min_carros_lote
+        self._comandos = {}  # carro -> (acelerar, direita, esquerda, frear_re, turbo)
+        self._dt = None
+        self._superficie = None
+        self.estado = None
+        self.flags = None
+        self.parametros = None
+
+    def __len__(self):
+        return len(self.carros)
+
+    def registrar(self, carro):
+        """Passa a integrar o carro junto com os outros (o estado continua nos atributos do carro)"""
+        if carro.fisica is self:
+            return
+        if carro.fisica is not None:
+            carro.fisica.remover(carro)
+        carro.fisica = self
+        carro.indice_fisica = len(self.carros)
+        self.carros.append(carro)
+        self._montar_parametros()
+
+    def remover(self, carro):
+        if carro.fisica is not self:
+            return
+        self.carros.remove(carro)
+        self._comandos.pop(carro, None)
+        carro.fisica = None
+        carro.indice_fisica = None
+        for i, c in enumerate(self.carros):
+            c.indice_fisica = i
+        self._montar_parametros()
+
+    def limpar(self):
+        for carro in list(self.carros):
+            self.remover(carro)
+
+    def _montar_parametros(self):
+        if np is None:
+            return
+        self.parametros = np.array([[getattr(c, nome) for nome in PARAMETROS] for c in self.carros],
+                                   dtype=float).reshape(len(self.carros), len(PARAMETROS)).T.copy()
+
+    def atualizar_parametros(self, carro):
+        """Recopia o tuning do carro (chamar depois de alterar os parâmetros de um carro registrado)"""
+        if np is not None and carro.fisica is self:
+            self.parametros[:, carro.indice_fisica] = [getattr(carro, nome) for nome in PARAMETROS]
+
+    def comandar(self, carro, acelerar, direita, esquerda, frear_re, turbo_pressed, dt, superficie_pista_renderizada):
+        """Registra os comandos do carro para o próximo passo()"""
+        self._comandos[carro] = (acelerar, direita, esquerda, frear_re, turbo_pressed)
+        self._dt = dt
+        self._superficie = superficie_pista_renderizada
+
+    def passo(self):
+        """Integra um passo fixo de todos os carros que receberam comandos desde o último passo"""
+        if not self._comandos:
+            return
+        comandos = self._comandos
+        self._comandos = {}
+        dt, superficie = self._dt, self._superficie
+        if np is None or len(comandos) < self.min_carros_lote:
+            for carro, (acelerar, direita, esquerda, frear_re, turbo) in comandos.items():
+                carro._integrar(acelerar, direita, esquerda, frear_re, turbo, None, dt, None, superficie)
+            return
+
+        carros = list(comandos)
+        estado = np.array([_ler_estado(c) for c in carros], dtype=float).T
+        flags = np.array([_ler_flags(c) for c in carros], dtype=bool).T
+        entradas = np.array(list(comandos.values()), dtype=bool).T
+        if len(carros) == len(self.carros) and all(c.indice_fisica == i for i, c in enumerate(carros)):
+            parametros = self.parametros
+        else:
+            parametros = self.parametros[:, [c.indice_fisica for c in carros]]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            estado, flags, criar_marca, ultimo_skidmark = self._integrar(
+                estado, flags, parametros, entradas, carros, dt, superficie)
+        self.estado, self.flags = estado, flags
+
+        # Devolver o resultado aos carros (os atributos continuam sendo a interface do carro)
+        dt_fis = dt * TIME_SCALE
+        for carro, valores, bits, marca, timer in zip(carros, estado.T.tolist(), flags.T.tolist(),
+                                                      criar_marca.tolist(), ultimo_skidmark.tolist()):
+            atributos = carro.__dict__
+            atributos.update(zip(CAMPOS_ESTADO, valores))
+            atributos.update(zip(FLAGS_ESTADO, bits))
+            if carro.renderizar:
+                # Efeitos visuais (marcas de pneu, nitro) só nos carros que renderizam
+                carro._efeitos_pos_passo(dt_fis, marca, timer)
+
+    def _na_grama(self, carros, x, y, superficie):
+        campo = carros[0].campo_distancia
+        if campo is not None and all(c.campo_distancia is campo for c in carros):
+            return campo.distancias(x, y) < RAIO_GRAMA * FRACAO_RAIO_GRAMA
+        return np.array([c._verificar_grama(superficie, xi, yi)
+                         for c, xi, yi in zip(carros, x.tolist(), y.tolist())], dtype=bool)
+
+    def _integrar(self, estado, flags, parametros, entradas, carros, dt, superficie):
+        """
+        Mesma física de CarroFisica._integrar sobre colunas (um elemento por carro)
+        Ramos raros (grama, ré, turbo, limitador, paredes) só são calculados quando algum carro está neles
+        """
+        (x, y, angulo, vx, vy, r, steer, turbo_carga, _velocidade, _velocidade_kmh,
+         drift_intensidade, ultimo_skidmark) = estado
+        _turbo_ativo, na_grama_anterior, freio_mao, drift_ativado, _drifting = flags
+        (m, g, L, a, b, Iz, Cf_base, Cr_base, mu_peak, mu_long, alpha_sat,
+         engine_force_fwd, engine_force_rev, brake_force, drag, roll_res, friction_base,
+         V_TOP, V_SOFT, steer_rad_max, steer_rate, speed_steer_k, counter_steer_assist,
+         rear_grip_cut_hb, rear_grip_cut_throttle, stability_k, yaw_damp_k, engine_yaw_push,
+         power_oversteer_k, min_speed_oversteer, drift_front_bias, drift_rear_cut,
+         drift_long_damp, drift_yaw_boost,
+         lim_f, lim_r, inv_alpha_sat, inv_Fx_max_r, inv_Fy_max_r) = parametros
+        acelerar, direita, esquerda, frear_re, turbo_pressed = entradas
+        dt_fis = dt * TIME_SCALE
+        where, minimum, maximum = np.where, np.minimum, np.maximum
+
+        turbo_ativo = turbo_pressed & (turbo_carga > 0.0)
+        tem_turbo = turbo_ativo.any()
+        tem_freio = frear_re.any()
+        forcado = freio_mao | drift_ativado
+
+        # Grama antes das forças (sem superfície a flag anterior é mantida)
+        if superficie is not None:
+            na_grama = self._na_grama(carros, x, y, superficie)
+            flag_grama = na_grama
+        else:
+            na_grama = np.zeros_like(acelerar)
+            flag_grama = na_grama_anterior
+        tem_grama = na_grama.any()
+
+        rad = np.radians(angulo)
+        fx = -np.cos(rad); fy = np.sin(rad)
+        v_long = vx * fx + vy * fy
+        v_lat = vx * fy - vy * fx
+
+        # ======== DRIFT / ESTADO ========
+        abs_long = np.abs(v_long)
+        long_min = maximum(0.1, abs_long)
+        slip = np.degrees(np.arctan2(v_lat, long_min))
+        abs_slip = np.abs(slip)
+        escapando = (abs_slip > 12.0) | forcado
+        tem_escape = escapando.any()
+
+        steer_input = esquerda.astype(float) - direita * esquerda - direita  # direita tem prioridade
+        abs_input = np.abs(steer_input)
+        target_wheel = steer_rad_max * maximum(0.20, 1.0 - speed_steer_k * abs_long) * steer_input
+        passo_roda = steer_rate * dt_fis
+        steer = minimum(maximum(target_wheel, steer - passo_roda), steer + passo_roda)
+        drifteando = forcado | (acelerar & (abs_slip > 14.0) & (abs_long > 90.0))
+        steer = where(~drifteando & (abs_input < 0.5), steer * (1.0 - 2.0 * dt_fis), steer)
+        contra = (abs_slip > 9.0) & (acelerar | forcado)
+        if contra.any():
+            steer = where(contra, steer + counter_steer_assist * (-np.radians(0.50 * slip) - steer) * 6.0 * dt_fis, steer)
+
+        # grip dependente da velocidade
+        spd_k = minimum(1.0, abs_long / 450.0)
+        Cf_eff = Cf_base * (1.0 - 0.16 * spd_k) * where(escapando, drift_front_bias, 1.12)
+        Cr_eff = Cr_base * (1.0 - 0.04 * spd_k)
+        if tem_escape:
+            corte = drift_rear_cut * where(freio_mao, rear_grip_cut_hb, 1.0)
+            corte = where(acelerar & (abs_long > 0.5), corte * rear_grip_cut_throttle, corte)
+            Cr_eff = Cr_eff * where(escapando, corte, 1.18)
+        else:
+            Cr_eff = Cr_eff * 1.18
+        oversteer = acelerar & (abs_input > 0.15) & (abs_long > min_speed_oversteer)
+        if oversteer.any():
+            Cr_eff = where(oversteer, Cr_eff * maximum(0.70, 1.0 - power_oversteer_k * minimum(1.0, abs_input)), Cr_eff)
+
+        # slip e força lateral por eixo (limites mu_peak*Fz pré-calculados no perfil)
+        alpha_f = steer - np.arctan2(v_lat + a * r, long_min)
+        alpha_r = -np.arctan2(v_lat - b * r, long_min)
+        Fy_f = minimum(maximum(Cf_eff * np.tanh(alpha_f * inv_alpha_sat), -lim_f), lim_f)
+        Fy_r = minimum(maximum(Cr_eff * np.tanh(alpha_r * inv_alpha_sat), -lim_r), lim_r)
+
+        # --- Longitudinal ---
+        thr = acelerar.astype(float)
+        em_re = v_long < 0.0
+        tem_re = em_re.any()
+        Fx_long = engine_force_fwd * thr
+        if tem_turbo:
+            Fx_long = Fx_long * where(turbo_ativo, TURBO_FATOR, 1.0)
+        if tem_grama or tem_re:
+            vel_kmh = np.sqrt(v_long * v_long + v_lat * v_lat) * ARCADE_SPEED_MULT
+        fator_grama = 1.0
+        if tem_grama:
+            grama_re = where(vel_kmh <= 50.0, 0.90, maximum(0.60, 0.90 - ((vel_kmh - 50.0) / 10.0) * 0.30))
+            grama_frente = where(vel_kmh <= 100.0, 0.35, maximum(0.15, 0.35 - ((vel_kmh - 100.0) / 15.0) * 0.20))
+            fator_grama = where(na_grama, where(frear_re, grama_re, grama_frente), 1.0)
+            Fx_long = Fx_long * fator_grama
+        if tem_freio:
+            fator_re = where(na_grama & frear_re, fator_grama, 1.0) if tem_grama else 1.0
+            forca_re = -engine_force_rev * fator_re
+            freio = where(em_re | (abs_long <= 1.0), forca_re, -np.copysign(brake_force, v_long))
+            Fx_long = Fx_long + where(frear_re, freio, 0.0)
+        if tem_re:
+            Fx_long = where(em_re & acelerar, where(v_long < -1.0, brake_force * 1.6, brake_force), Fx_long)
+            if tem_freio:
+                # limitador suave de ré
+                fator_forca = where(vel_kmh < 38.0, 1.0 - ((vel_kmh - 35.0) / 3.0) * 0.5,
+                                    maximum(0.1, 0.5 - ((vel_kmh - 38.0) / 7.0) * 0.4))
+                Fx_long = where(em_re & (vel_kmh > 35.0) & frear_re, Fx_long * fator_forca, Fx_long)
+
+        # elipse de atrito: na dianteira (Fx = 0) |Fy_f| <= mu_peak*Fzf já garante s <= 1
+        ax = Fx_long * inv_Fx_max_r
+        ay = Fy_r * inv_Fy_max_r
+        k = 1.0 / maximum(1.0, np.sqrt(ax * ax + ay * ay))
+        Fx_r = Fx_long * k
+        Fy_r = Fy_r * k
+
+        cs = np.cos(steer); sn = np.sin(steer)
+        Fx = Fx_r - Fy_f * sn
+        Fy = Fy_f * cs + Fy_r - stability_k * v_lat * (1.0 + 0.6 * abs_long)
+
+        # resistências
+        drag_multiplier = where(turbo_ativo, 0.05, 1.0) if tem_turbo else 1.0
+        if tem_grama:
+            arrasto_re = 1.2 + where(vel_kmh > 50.0, minimum(0.6, (vel_kmh - 50.0) / 15.0), 0.0)
+            arrasto_frente = 2.0 + where(vel_kmh > 100.0, minimum(1.5, (vel_kmh - 100.0) / 10.0), 0.0)
+            drag_multiplier = drag_multiplier * where(na_grama, where(em_re | frear_re, arrasto_re, arrasto_frente), 1.0)
+        roll_res_multiplier = where(em_re, 0.3, 1.0) if tem_re else 1.0
+        speed_factor = maximum(0.2, minimum(1.0, 1.0 - ((abs_long - 100.0) / 200.0) * 0.8))
+        if tem_turbo:
+            speed_factor = speed_factor * where(turbo_ativo, 0.05, 1.0)
+        atrito = where(abs_long > 0.1, friction_base * m * speed_factor, 0.0)
+        Fx = Fx - drag * v_long * abs_long * drag_multiplier - roll_res * v_long * roll_res_multiplier - atrito * v_long
+
+        # integra (no frame do carro)
+        v_long = v_long + (Fx / m + v_lat * r) * dt_fis
+        v_lat = v_lat + (Fy / m - v_long * r) * dt_fis
+
+        # limite de velocidade total em ré
+        em_re = v_long < 0.0
+        if em_re.any():
+            vel_total = np.sqrt(v_long * v_long + v_lat * v_lat)
+            reducao = where(em_re & (vel_total * ARCADE_SPEED_MULT > 45.0), (45.0 / ARCADE_SPEED_MULT) / vel_total, 1.0)
+            v_long = v_long * reducao
+            v_lat = v_lat * reducao
+
+        abs_long = np.abs(v_long)
+        if tem_escape:
+            v_long = where(escapando, v_long * drift_long_damp ** dt_fis, v_long)
+            abs_long = np.abs(v_long)
+            preso = ~escapando
+        else:
+            preso = True
+        # anti-crab e baixa velocidade fora do drift
+        sangria = (2.6 + 0.008 * abs_long) * dt_fis
+        sangria_esterco = where(abs_input > 0.0, (1.2 + 0.004 * abs_long) * dt_fis, 0.0)
+        lento = preso & (abs_long < 80.0)
+        v_lat_preso = v_lat * (1.0 - sangria) * (1.0 - sangria_esterco) * where(lento, 1.0 - 10.0 * dt_fis, 1.0)
+        v_lat = where(preso, v_lat_preso, v_lat) if tem_escape else v_lat_preso
+        r = where(lento, r + (steer_rad_max * steer_input * 1.5 - r) * 0.5 * dt_fis, r)
+
+        # soft limiter + clamp duro (turbo: limites 2x/3x e corte mínimo)
+        speed = np.sqrt(v_long * v_long + v_lat * v_lat)
+        if tem_turbo:
+            v_top = where(turbo_ativo, V_TOP * 3.0, V_TOP)
+            v_soft = where(turbo_ativo, V_SOFT * 2.0, V_SOFT)
+        else:
+            v_top, v_soft = V_TOP, V_SOFT
+        acima = speed > v_soft
+        if acima.any():
+            corte = (speed - v_soft) / maximum(1e-6, v_top - v_soft)
+            k_corte = where(turbo_ativo, 0.05, 0.10) if tem_turbo else 0.10
+            fator = where(acima, 1.0 - k_corte * corte, 1.0) * where(speed > v_top, v_top / speed, 1.0)
+            v_long = v_long * fator
+            v_lat = v_lat * fator
+            abs_long = np.abs(v_long)
+
+        # guinada
+        Mz = a * (Fy_f * cs) - b * Fy_r - (0.28 + 0.24 * spd_k) * v_lat * maximum(60.0, abs_long)
+        Mz = Mz + where(acelerar & (abs_input > 0.15), engine_yaw_push * engine_force_fwd * np.sign(steer_input), 0.0)
+        if tem_escape:
+            Mz = Mz + where(escapando, drift_yaw_boost * v_lat * (abs_long + 60.0), 0.0)
+        r = (r + (Mz / Iz) * dt_fis) * (1.0 - yaw_damp_k * dt_fis)
+        yaw_max = 3.2 - 1.4 * minimum(1.0, abs_long / 380.0)
+        r = minimum(maximum(r, -yaw_max), yaw_max)
+        yaw_target = (v_long * np.tan(steer)) / maximum(0.1, L)
+        blend = where(escapando, 0.35, 0.7) if tem_escape else 0.7
+        r = r + (yaw_target - r) * blend * dt_fis
+
+        angulo = angulo + np.degrees(r) * dt_fis
+        angulo = angulo - 360.0 * (angulo > 180) + 360.0 * (angulo < -180)
+
+        # recompor mundo e avançar posição (movimento limitado por passo)
+        rad = np.radians(angulo)
+        fx = -np.cos(rad); fy = np.sin(rad)
+        vx = fx * v_long + fy * v_lat
+        vy = fy * v_long - fx * v_lat
+        speed_mult = where(escapando, ARCADE_SPEED_MULT * 0.88, ARCADE_SPEED_MULT) if tem_escape else ARCADE_SPEED_MULT
+        dx = vx * (dt_fis * speed_mult)
+        dy = vy * (dt_fis * speed_mult)
+        max_move = 200.0 * dt_fis
+        escala = minimum(1.0, max_move / np.sqrt(dx * dx + dy * dy))
+        x = x + dx * escala
+        y = y + dy * escala
+
+        # atrito da grama (por segundo de jogo)
+        if tem_grama:
+            em_re = (v_long < 0.0) | frear_re
+            vel_kmh = np.sqrt(v_long * v_long + v_lat * v_lat) * ARCADE_SPEED_MULT
+            alvo = where(em_re, 50.0, 100.0)
+            extra = minimum(0.10, (vel_kmh - alvo) / 30.0)
+            atrito = where(em_re, maximum(0.85, 0.95 - extra), maximum(0.75, 0.85 - extra))
+            atrito = where(vel_kmh > alvo, atrito ** dt, where(em_re, 0.99 ** dt, 0.95 ** dt))
+            atrito = where(na_grama, atrito, 1.0)
+            v_long = v_long * atrito
+            v_lat = v_lat * atrito
+            vx = fx * v_long + fy * v_lat
+            vy = fy * v_long - fx * v_lat
+
+        # Paredes invisíveis nos limites do mundo
+        if superficie is None:
+            x_lim = minimum(maximum(x, 0.0), float(LARGURA))
+            y_lim = minimum(maximum(y, 0.0), float(ALTURA))
+            vx = where(x_lim != x, 0.0, vx)
+            vy = where(y_lim != y, 0.0, vy)
+            x, y = x_lim, y_lim
+        else:
+            largura, altura = superficie.get_width(), superficie.get_height()
+            bordas = (
+                (x <= 0, True, -1.0, fx < 0),
+                (x >= largura, True, 1.0, fx > 0),
+                (y <= 0, False, -1.0, fy < 0),
+                (y >= altura, False, 1.0, fy > 0),
+            )
+            for na_borda, eixo_x, sentido, frente_fora in bordas:
+                if not na_borda.any():
+                    continue
+                # Parar a velocidade que aponta para fora (e a longitudinal se a frente aponta para fora)
+                bate = na_borda & ((vx if eixo_x else vy) * sentido > 0)
+                if bate.any():
+                    if eixo_x:
+                        vx = where(bate, 0.0, vx)
+                    else:
+                        vy = where(bate, 0.0, vy)
+                    u = where(frente_fora, 0.0, vx * fx + vy * fy)
+                    w = vx * fy - vy * fx
+                    vx = where(bate, fx * u + fy * w, vx)
+                    vy = where(bate, fy * u - fx * w, vy)
+                    v_long = where(bate, u, v_long)
+                    v_lat = where(bate, w, v_lat)
+                if eixo_x:
+                    x = minimum(maximum(x, 0.0), float(largura))
+                else:
+                    y = minimum(maximum(y, 0.0), float(altura))
+
+        velocidade = v_long
+        velocidade_kmh = np.abs(v_long) * ARCADE_SPEED_MULT
+
+        # Estado de drift (a criação das marcas fica com os carros que renderizam)
+        drifting = _drifting
+        criar_marca = np.zeros_like(acelerar)
+        timer_antes = ultimo_skidmark
+        if MODO_DRIFT:
+            abs_lat = np.abs(v_lat)
+            vel_sq = v_long * v_long + v_lat * v_lat
+            slip = np.degrees(np.arctan2(abs_lat, maximum(0.1, np.abs(v_long))))
+            drifting = freio_mao | ((vel_sq > 25.0) & ((slip > 0.5) | (abs_lat > 1.0)))
+            criar_marca = drifting | flag_grama
+            intensidade = where(freio_mao, 1.0,
+                                where(flag_grama, minimum(1.0, maximum(0.3, np.abs(v_long) / 60.0)),
+                                      minimum(1.0, abs_lat / 40.0)))
+            drift_intensidade = where(criar_marca, intensidade, drift_intensidade * 0.95)
+            ultimo_skidmark = ultimo_skidmark + dt_fis
+
+        # Turbo (hold): consome com o turbo ativo, recarrega sem ele
+        if tem_turbo:
+            turbo_carga = where(turbo_ativo, maximum(0.0, turbo_carga - 25.0 * dt_fis),
+                                minimum(100.0, turbo_carga + 12.0 * dt_fis))
+        else:
+            turbo_carga = minimum(100.0, turbo_carga + 12.0 * dt_fis)
+
+        estado = np.array((x, y, angulo, vx, vy, r, steer, turbo_carga, velocidade, velocidade_kmh,
+                           drift_intensidade, ultimo_skidmark))
+        flags = np.array((turbo_ativo, flag_grama, freio_mao, drift_ativado, drifting))
+        return estado, flags, criar_marca, timer_antes
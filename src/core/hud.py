@@ -2,6 +2,10 @@ import pygame
 import math
 import os
 from config import DIR_ICONS, LARGURA, ALTURA
+from core.assets import carregar_imagem
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
 
 class HUD:
     """
@@ -27,30 +31,30 @@ class HUD:
             caminho_nitro = os.path.join(DIR_ICONS, "nitro.png")
             
             if os.path.exists(caminho_velocimetro_sem_cor):
-                self.velocimetro_sem_cor = pygame.image.load(caminho_velocimetro_sem_cor).convert_alpha()
-                print(f"HUD: Carregado velocimetro_sem_cor: {caminho_velocimetro_sem_cor}")
+                self.velocimetro_sem_cor = carregar_imagem(caminho_velocimetro_sem_cor, dono=self)
+                log.debug("Carregado velocimetro_sem_cor: %s", caminho_velocimetro_sem_cor)
             else:
-                print(f"HUD: Arquivo não encontrado: {caminho_velocimetro_sem_cor}")
+                log.warning("Arquivo não encontrado: %s", caminho_velocimetro_sem_cor)
                 
             if os.path.exists(caminho_velocimetro_colorido):
-                self.velocimetro_colorido = pygame.image.load(caminho_velocimetro_colorido).convert_alpha()
-                print(f"HUD: Carregado velocimetro_colorido: {caminho_velocimetro_colorido}")
+                self.velocimetro_colorido = carregar_imagem(caminho_velocimetro_colorido, dono=self)
+                log.debug("Carregado velocimetro_colorido: %s", caminho_velocimetro_colorido)
             else:
-                print(f"HUD: Arquivo não encontrado: {caminho_velocimetro_colorido}")
+                log.warning("Arquivo não encontrado: %s", caminho_velocimetro_colorido)
                 
             if os.path.exists(caminho_nitro_vazio):
-                self.nitro_vazio = pygame.image.load(caminho_nitro_vazio).convert_alpha()
-                print(f"HUD: Carregado nitro_vazio: {caminho_nitro_vazio}")
+                self.nitro_vazio = carregar_imagem(caminho_nitro_vazio, dono=self)
+                log.debug("Carregado nitro_vazio: %s", caminho_nitro_vazio)
             else:
-                print(f"HUD: Arquivo não encontrado: {caminho_nitro_vazio}")
+                log.warning("Arquivo não encontrado: %s", caminho_nitro_vazio)
                 
             if os.path.exists(caminho_nitro):
-                self.nitro = pygame.image.load(caminho_nitro).convert_alpha()
-                print(f"HUD: Carregado nitro: {caminho_nitro}")
+                self.nitro = carregar_imagem(caminho_nitro, dono=self)
+                log.debug("Carregado nitro: %s", caminho_nitro)
             else:
-                print(f"HUD: Arquivo não encontrado: {caminho_nitro}")
+                log.warning("Arquivo não encontrado: %s", caminho_nitro)
         except Exception as e:
-            print(f"Erro ao carregar imagens do HUD: {e}")
+            log.warning("Erro ao carregar imagens do HUD: %s", e)
     
     def desenhar_hud_completo(self, superficie, carro, dt=0.016, offset_x=0):
         """
@@ -168,7 +172,7 @@ class HUD:
         else:
             # Debug: desenhar retângulo se imagens não carregaram
             if not hasattr(self, '_debug_mostrado'):
-                print(f"DEBUG HUD: velocimetro_sem_cor={self.velocimetro_sem_cor is not None}, velocimetro_colorido={self.velocimetro_colorido is not None}")
+                log.debug("velocimetro_sem_cor=%s, velocimetro_colorido=%s", self.velocimetro_sem_cor is not None, self.velocimetro_colorido is not None)
                 self._debug_mostrado = True
             # Fallback: desenhar retângulo simples
             pygame.draw.rect(superficie, (100, 100, 100), (pos_x_velocimetro, pos_y, 100, 50))
@@ -743,7 +747,7 @@ class HUD:
             caminho_retorne = os.path.join(DIR_ICONS, "retorne.png")
             if os.path.exists(caminho_retorne):
                 try:
-                    self.imagem_retorne = pygame.image.load(caminho_retorne).convert_alpha()
+                    self.imagem_retorne = carregar_imagem(caminho_retorne, dono=self)
                 except:
                     self.imagem_retorne = None
             else:
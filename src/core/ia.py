@@ -1,21 +1,33 @@
 import math
+import logging
 import pygame
 
+from core.portoes_checkpoint import compilar_portoes
+from core.dificuldade_ia import parametros_dificuldade
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
+
 class IA:
     _trig_cache = {}
     
-    def __init__(self, checkpoints, nome="IA-Melhorada-V2", dificuldade="medio"):
+    def __init__(self, checkpoints, nome="IA-Melhorada-V2", dificuldade="medio", linha_corrida=None, portoes=None,
+                 fase_decisao=0.0, presets=None):
         self.checkpoints = checkpoints if checkpoints else []
+        # Portões compartilhados com o GerenciadorCorrida (compilados aqui se não vierem prontos)
+        self.portoes = portoes if portoes is not None else compilar_portoes(self.checkpoints, linha_corrida)
         self.nome = nome
         self.checkpoint_atual = 0
         self.chegou = False
         self.debug = False
         self.dificuldade = dificuldade
+        # Dificuldade -> parâmetros; None usa os presets de data/ia_dificuldades.json (torneio e replays passam os seus)
+        self.presets = presets
         
         if not self.checkpoints or len(self.checkpoints) == 0:
-            print(f"AVISO: IA {self.nome} não recebeu checkpoints válidos!")
+            log.warning("IA %s não recebeu checkpoints válidos!", self.nome)
         else:
-            print(f"IA {self.nome} inicializada com {len(self.checkpoints)} checkpoints")
+            log.debug("IA %s inicializada com %s checkpoints", self.nome, len(self.checkpoints))
         
         self.pontos_navegacao = []
         self.ponto_navegacao_atual = 0
@@ -30,6 +42,27 @@ class IA:
         self.lookahead_distance = 120.0
         self.lookahead_points = 5
         
+        # Desvio da borda pelo campo de distância (carro.campo_distancia)
+        self.margem_borda = 40.0
+        self.sonda_borda_min = 40.0
+        self.sonda_borda_por_velocidade = 4.0
+        self.peso_desvio_borda = 2.0
+        
+        # Linha de corrida da pista (PistaTiles.linha_corrida); sem ela a IA mira o centro dos checkpoints
+        self.linha_corrida = linha_corrida
+        self.indice_linha = None  # Amostra da linha mais próxima do carro (None: localizar de novo)
+        # Alcance do ponto mirado (alcance_linha_min + alcance_linha_por_velocidade * |v| px), antecipação do
+        # freio (amostras à frente no perfil de velocidade) e velocidade na grama vêm do preset
+        
+        # Decisão a cada intervalo_decisao s (ver _configurar_dificuldade); entre decisões só a direção e o
+        # acelerador são refeitos; fase_decisao (0-1) defasa os bots para que poucos decidam no mesmo passo
+        self.fase_decisao = fase_decisao
+        self.passos_ate_decisao = 0
+        self.passos_desde_decisao = 0
+        self.entrada_mantida = None  # None: decidir no próximo passo
+        self.rumo_alvo = 0.0  # Rumo (graus) até o alvo na última decisão
+        self.seguir_alvo = False  # Entre decisões: True segue alvo/velocidade_alvo da linha, False repete a entrada
+        
         self.estado_curva = "reta"
         self.tempo_na_curva = 0.0
         self.curvatura_atual = 0.0
@@ -37,6 +70,7 @@ class IA:
         
         self.tempo_travado = 0.0
         self.max_tempo_travado = 3.0
+        self.travamentos = 0  # Vezes em que a IA se declarou travada (estatística do torneio)
         self.ultima_posicao = None
         self.tentativas_recuperacao = 0
         self.max_tentativas_recuperacao = 2
@@ -44,6 +78,13 @@ class IA:
         self.tempo_batido = 0.0
         self.max_tempo_batido = 1.0
         self.ultima_posicao_valida = None
+
+        # Preso em outro carro (ColisaoCarros): devagar e empurrando por max_tempo_preso_carro -> ré
+        self.tempo_preso_carro = 0.0
+        self.max_tempo_preso_carro = 0.6
+        self.tempo_re_carro = 0.0
+        self.duracao_re_carro = 0.8
+        self.velocidade_preso_carro = 4.0
         
         if self.checkpoints:
             self.alvo_x = self.checkpoints[0][0]
@@ -53,37 +94,11 @@ class IA:
             self.alvo_y = 360
     
     def _configurar_dificuldade(self):
-        """Configura os parâmetros baseados na dificuldade"""
-        if self.dificuldade == "facil":
-            self.velocidade_maxima = 5.0
-            self.velocidade_curva = 2.5
-            self.distancia_freio_curva = 80
-            self.distancia_freio_checkpoint = 60
-            self.angulo_max_curva = 25
-            self.velocidade_max_curva = 3.0
-            self.agressividade = 0.3
-            self.precisao_curva = 0.8
-            self.tempo_reacao = 0.15
-        elif self.dificuldade == "dificil":
-            self.velocidade_maxima = 12.0
-            self.velocidade_curva = 7.0
-            self.distancia_freio_curva = 15
-            self.distancia_freio_checkpoint = 10
-            self.angulo_max_curva = 80
-            self.velocidade_max_curva = 9.0
-            self.agressividade = 1.0
-            self.precisao_curva = 0.99
-            self.tempo_reacao = 0.01
-        else:
-            self.velocidade_maxima = 7.5
-            self.velocidade_curva = 4.0
-            self.distancia_freio_curva = 45
-            self.distancia_freio_checkpoint = 35
-            self.angulo_max_curva = 45
-            self.velocidade_max_curva = 5.5
-            self.agressividade = 0.75
-            self.precisao_curva = 0.9
-            self.tempo_reacao = 0.08
+        """Configura os parâmetros do preset da dificuldade (core/dificuldade_ia.py)"""
+        for nome, valor in parametros_dificuldade(self.dificuldade, self.presets).items():
+            setattr(self, nome, valor)
+        # Decisões a cada metade do tempo de reação, entre 30 Hz (dificil) e 20 Hz (facil)
+        self.intervalo_decisao = min(1.0 / 20, max(1.0 / 30, self.tempo_reacao / 2))
     
     def atualizar_pontos_navegacao(self):
         """Atualiza os pontos de navegação baseados nos checkpoints"""
@@ -235,13 +250,42 @@ class IA:
         fx, fy = self._vetor_frente(carro)
         return (fy, -fx)
     
+    def _desviar_da_borda(self, carro, campo, dx, dy, velocidade_atual, diff_angulo):
+        """
+        Corrige o ângulo até o alvo usando o campo de distância
+        Uma sonda à frente do carro (mais longe quanto maior a velocidade) mede a distância até a borda;
+        perto dela, o gradiente do campo empurra a direção desejada de volta para o meio da pista
+        Retorna (diff_angulo corrigido, distância da sonda até a borda)
+        """
+        fx, fy = self._vetor_frente(carro)
+        alcance = self.sonda_borda_min + velocidade_atual * self.sonda_borda_por_velocidade
+        sx = carro.x + fx * alcance
+        sy = carro.y + fy * alcance
+        distancia_sonda = campo.distancia(sx, sy)
+        if distancia_sonda >= self.margem_borda:
+            return diff_angulo, distancia_sonda
+        
+        gx, gy = campo.gradiente(sx, sy)
+        peso = min(1.0, (self.margem_borda - distancia_sonda) / self.margem_borda) * self.peso_desvio_borda
+        norma = math.hypot(dx, dy)
+        if norma < 1e-6:
+            return diff_angulo, distancia_sonda
+        tx = dx / norma + gx * peso
+        ty = dy / norma + gy * peso
+        angulo_alvo = math.degrees(math.atan2(ty, -tx))
+        return (angulo_alvo - carro.angulo + 180) % 360 - 180, distancia_sonda
+    
     @classmethod
     def limpar_cache_trig(cls):
         """Limpa o cache de cálculos trigonométricos"""
         cls._trig_cache.clear()
     
     def controlar(self, carro, superficie_mascara, is_on_track, dt, superficie_pista_renderizada=None, corrida_iniciada=True):
-        """Controla o carro com sistema inteligente"""
+        """
+        Controla o carro com sistema inteligente
+        A decisão roda a cada intervalo_decisao (defasada por fase_decisao); nos passos entre decisões o carro
+        segue o alvo e a velocidade alvo da última decisão (linha de corrida) ou repete a última entrada
+        """
         
         if not corrida_iniciada:
             return
@@ -249,16 +293,46 @@ class IA:
         if not self.checkpoints or len(self.checkpoints) == 0:
             return
         
+        self.passos_desde_decisao += 1
+        self.passos_ate_decisao -= 1
+        if self.passos_ate_decisao > 0 and self.entrada_mantida is not None:
+            if self.seguir_alvo:
+                vel_sq = carro.vx*carro.vx + carro.vy*carro.vy
+                self._atuar_pelo_alvo(carro, math.sqrt(vel_sq), superficie_mascara, dt, superficie_pista_renderizada)
+            else:
+                carro._step(*self.entrada_mantida, superficie_mascara, dt, None, superficie_pista_renderizada)
+            return
+        passos_por_decisao = max(1, round(self.intervalo_decisao / dt))
+        if self.entrada_mantida is None:
+            # Primeira decisão (ou depois do LOD): a próxima vem antes conforme a fase, defasando os bots
+            self.passos_ate_decisao = passos_por_decisao - int(self.fase_decisao * passos_por_decisao)
+        else:
+            self.passos_ate_decisao = passos_por_decisao
+        dt_decisao = self.passos_desde_decisao * dt
+        self.passos_desde_decisao = 0
+        self.seguir_alvo = False
+        self._decidir(carro, superficie_mascara, dt_decisao, dt, superficie_pista_renderizada)
+    
+    def _aplicar(self, carro, entrada, superficie_mascara, dt, superficie_pista_renderizada):
+        """Aplica a entrada (acelerar, direita, esquerda, frear_re, turbo) e a guarda até a próxima decisão"""
+        self.entrada_mantida = entrada
+        carro._step(*entrada, superficie_mascara, dt, None, superficie_pista_renderizada)
+    
+    def _decidir(self, carro, superficie_mascara, dt, dt_passo, superficie_pista_renderizada):
+        """Fase de decisão; dt é o tempo desde a decisão anterior e dt_passo o passo fixo da física"""
         vel_sq = carro.vx*carro.vx + carro.vy*carro.vy
         velocidade_atual = math.sqrt(vel_sq) if vel_sq > 0.01 else 0.0
         
         na_grama = getattr(carro, 'na_grama', False)
         
         posicao_atual = (carro.x, carro.y)
+        posicao_anterior = self.ultima_posicao
         if self.ultima_posicao is not None:
             dx = posicao_atual[0] - self.ultima_posicao[0]
             dy = posicao_atual[1] - self.ultima_posicao[1]
-            dist_movimento_sq = dx*dx + dy*dy
+            # Limiares de travamento são por passo fixo: escalar pelos passos desde a decisão anterior
+            passos = dt / dt_passo
+            dist_movimento_sq = (dx*dx + dy*dy) / (passos * passos)
             
             if na_grama:
                 limite_travamento_grama = 1.0
@@ -287,14 +361,30 @@ class IA:
             self.tempo_batido += dt
             
             if self.tempo_batido > self.max_tempo_batido:
-                carro._step(False, False, False, True, False, superficie_mascara, dt, None, superficie_pista_renderizada)
+                self._aplicar(carro, (False, False, False, True, False), superficie_mascara, dt_passo, superficie_pista_renderizada)
                 return
             else:
-                carro._step(False, False, False, True, False, superficie_mascara, dt, None, superficie_pista_renderizada)
+                self._aplicar(carro, (False, False, False, True, False), superficie_mascara, dt_passo, superficie_pista_renderizada)
                 return
         else:
             if self.tempo_batido > 0.0:
                 self.tempo_batido = 0.0
+
+        if self.tempo_re_carro > 0.0:
+            self.tempo_re_carro -= dt
+            self._aplicar(carro, (False, False, False, True, False), superficie_mascara, dt_passo, superficie_pista_renderizada)
+            return
+        if getattr(carro, 'forca_colisao', 0.0) > 0.0 and velocidade_atual < self.velocidade_preso_carro:
+            self.tempo_preso_carro += dt
+            if self.tempo_preso_carro > self.max_tempo_preso_carro:
+                self.tempo_preso_carro = 0.0
+                self.tempo_re_carro = self.duracao_re_carro
+        else:
+            self.tempo_preso_carro = max(0.0, self.tempo_preso_carro - dt * 0.5)
+        
+        if self.linha_corrida is not None:
+            self._controlar_pela_linha(carro, velocidade_atual, na_grama, superficie_mascara, dt_passo, superficie_pista_renderizada)
+            return
         
         if not self.checkpoints or len(self.checkpoints) == 0:
             return
@@ -305,90 +395,19 @@ class IA:
         
         if not hasattr(self, '_ultimo_debug_tempo'):
             self._ultimo_debug_tempo = 0.0
-        if pygame.time.get_ticks() / 1000.0 - self._ultimo_debug_tempo > 2.0:
-            print(f"[IA {self.nome}] Checkpoint atual: {checkpoint_idx}/{len(self.checkpoints)}")
-            print(f"[IA {self.nome}] Alvo: ({self.alvo_x:.1f}, {self.alvo_y:.1f})")
-            print(f"[IA {self.nome}] Carro pos: ({carro.x:.1f}, {carro.y:.1f})")
+        # Estado da IA a cada 2 s, só com o registro de core.ia em DEBUG
+        depurar = log.isEnabledFor(logging.DEBUG) and pygame.time.get_ticks() / 1000.0 - self._ultimo_debug_tempo > 2.0
+        if depurar:
+            log.debug("[IA %s] Checkpoint atual: %d/%d, alvo: (%.1f, %.1f), carro: (%.1f, %.1f)", self.nome,
+                      checkpoint_idx, len(self.checkpoints), self.alvo_x, self.alvo_y, carro.x, carro.y)
             self._ultimo_debug_tempo = pygame.time.get_ticks() / 1000.0
         
         checkpoint_idx = self.checkpoint_atual % len(self.checkpoints)
-        if checkpoint_idx < len(self.checkpoints):
-            cp = self.checkpoints[checkpoint_idx]
-            if len(cp) >= 3:
-                cx, cy, angulo_salvo = cp[0], cp[1], cp[2]
-                usar_angulo_salvo = True
-            else:
-                cx, cy = cp[0], cp[1]
-                angulo_salvo = None
-                usar_angulo_salvo = False
-            
-            CHECKPOINT_LARGURA = 300
-            CHECKPOINT_ESPESSURA = 1
-            
-            if usar_angulo_salvo:
-                angulo = angulo_salvo % 360
-                rad = math.radians(angulo)
-                cos_a = math.cos(rad)
-                sin_a = math.sin(rad)
-                
-                w_half = CHECKPOINT_LARGURA // 2
-                h_half = CHECKPOINT_ESPESSURA // 2
-                vertices = [
-                    (-w_half, -h_half),
-                    (w_half, -h_half),
-                    (w_half, h_half),
-                    (-w_half, h_half)
-                ]
-                
-                vertices_rot = []
-                for vx, vy in vertices:
-                    rx = vx * cos_a - vy * sin_a
-                    ry = vx * sin_a + vy * cos_a
-                    vertices_rot.append((rx, ry))
-                
-                xs = [v[0] for v in vertices_rot]
-                ys = [v[1] for v in vertices_rot]
-                min_x, max_x = min(xs), max(xs)
-                min_y, max_y = min(ys), max(ys)
-                
-                checkpoint_rect = pygame.Rect(
-                    cx + int(min_x),
-                    cy + int(min_y),
-                    int(max_x - min_x),
-                    int(max_y - min_y)
-                )
-            else:
-                if checkpoint_idx < len(self.checkpoints) - 1:
-                    proximo_cp = self.checkpoints[checkpoint_idx + 1]
-                    proximo_cx, proximo_cy = proximo_cp[0], proximo_cp[1]
-                else:
-                    proximo_cp = self.checkpoints[0]
-                    proximo_cx, proximo_cy = proximo_cp[0], proximo_cp[1]
-                
-                dx_checkpoint = proximo_cx - cx
-                dy_checkpoint = proximo_cy - cy
-                
-                if abs(dx_checkpoint) > abs(dy_checkpoint):
-                    checkpoint_rect = pygame.Rect(
-                        cx - 1,
-                        cy - CHECKPOINT_LARGURA // 2,
-                        2,
-                        CHECKPOINT_LARGURA
-                    )
-                else:
-                    checkpoint_rect = pygame.Rect(
-                        cx - CHECKPOINT_LARGURA // 2,
-                        cy - 1,
-                        CHECKPOINT_LARGURA,
-                        2
-                    )
-            
-            checkpoint_rect = checkpoint_rect.inflate(10, 10)
-            
-            if checkpoint_rect.collidepoint(carro.x, carro.y):
-                self.checkpoint_atual = (self.checkpoint_atual + 1) % len(self.checkpoints)
-                self.tempo_travado = 0.0
-                self.tentativas_recuperacao = 0
+        if posicao_anterior is not None and self.portoes[checkpoint_idx].cruzou(
+                posicao_anterior[0], posicao_anterior[1], carro.x, carro.y):
+            self.checkpoint_atual = (self.checkpoint_atual + 1) % len(self.checkpoints)
+            self.tempo_travado = 0.0
+            self.tentativas_recuperacao = 0
         
         checkpoint_idx = self.checkpoint_atual % len(self.checkpoints)
         self.alvo_x = self.checkpoints[checkpoint_idx][0]
@@ -402,6 +421,11 @@ class IA:
         angulo_alvo = math.degrees(math.atan2(dy, -dx))
         diff_angulo = (angulo_alvo - carro.angulo + 180) % 360 - 180
         
+        campo = getattr(carro, 'campo_distancia', None)
+        distancia_sonda = None
+        if campo is not None:
+            diff_angulo, distancia_sonda = self._desviar_da_borda(carro, campo, dx, dy, velocidade_atual, diff_angulo)
+        
         curvatura_futura_max = 0.0
         if len(self.checkpoints) >= 3:
             checkpoint_idx = self.checkpoint_atual % len(self.checkpoints)
@@ -426,10 +450,11 @@ class IA:
         realmente_travado = self.tempo_travado > self.max_tempo_travado and velocidade_atual < 0.3
         
         if self.tempo_travado > 2.0 and self.debug:
-            print(f"IA {self.nome}: Quase travado - tempo: {self.tempo_travado:.1f}s, velocidade: {velocidade_atual:.2f}, na_grama: {na_grama}, checkpoint: {self.checkpoint_atual + 1}")
+            log.debug("IA %s: Quase travado - tempo: %.1fs, velocidade: %.2f, na_grama: %s, checkpoint: %s", self.nome, self.tempo_travado, velocidade_atual, na_grama, self.checkpoint_atual + 1)
         
         if realmente_travado:
-            print(f"IA {self.nome}: TRAVADO detectado - tempo: {self.tempo_travado:.1f}s, velocidade: {velocidade_atual:.2f}, checkpoint atual: {self.checkpoint_atual + 1}, tentativas: {self.tentativas_recuperacao}")
+            self.travamentos += 1
+            log.debug("IA %s: TRAVADO detectado - tempo: %.1fs, velocidade: %.2f, checkpoint atual: %s, tentativas: %s", self.nome, self.tempo_travado, velocidade_atual, self.checkpoint_atual + 1, self.tentativas_recuperacao)
             if self.tentativas_recuperacao < self.max_tentativas_recuperacao:
                 self.tentativas_recuperacao += 1
                 
@@ -445,10 +470,10 @@ class IA:
                 
                 if checkpoint_mais_proximo != self.checkpoint_atual:
                     self.checkpoint_atual = checkpoint_mais_proximo
-                    print(f"IA {self.nome}: Recuperação - mudou para checkpoint mais próximo: {checkpoint_mais_proximo + 1}")
+                    log.debug("IA %s: Recuperação - mudou para checkpoint mais próximo: %s", self.nome, checkpoint_mais_proximo + 1)
                 else:
                     self.checkpoint_atual = (self.checkpoint_atual + 1) % len(self.checkpoints)
-                    print(f"IA {self.nome}: Recuperação - avançou para próximo checkpoint: {(self.checkpoint_atual % len(self.checkpoints)) + 1}")
+                    log.debug("IA %s: Recuperação - avançou para próximo checkpoint: %s", self.nome, (self.checkpoint_atual % len(self.checkpoints)) + 1)
                 
                 self.tempo_travado = 0.0
                 
@@ -475,7 +500,7 @@ class IA:
                 self.alvo_y = self.checkpoints[checkpoint_mais_proximo][1]
                 dx = self.alvo_x - carro.x
                 dy = self.alvo_y - carro.y
-                print(f"IA {self.nome}: Recuperação final - mudou para checkpoint mais próximo: {checkpoint_mais_proximo + 1} (não resetou para 0)")
+                log.debug("IA %s: Recuperação final - mudou para checkpoint mais próximo: %s (não resetou para 0)", self.nome, checkpoint_mais_proximo + 1)
         
         self.velocidade_alvo = self.calcular_velocidade_alvo(carro)
         self.atualizar_estado_curva(carro, dt)
@@ -622,6 +647,11 @@ class IA:
             acelerar = True
             frear_re = False
         
+        # Sonda já fora da pista em alta velocidade: frear antes de sair
+        if distancia_sonda is not None and distancia_sonda < 0 and velocidade_atual > self.velocidade_max_curva:
+            frear_re = True
+            acelerar = False
+        
         direita = diff_angulo < -2
         esquerda = diff_angulo > 2
         
@@ -670,11 +700,12 @@ class IA:
                 acelerar = True
                 frear_re = False
         
-        if pygame.time.get_ticks() / 1000.0 - self._ultimo_debug_tempo > 2.0:
-            print(f"[IA {self.nome}] Controles: acelerar={acelerar}, frear={frear_re}, direita={direita}, esquerda={esquerda}, turbo={turbo_pressed}")
-            print(f"[IA {self.nome}] Velocidade: {velocidade_atual:.2f}, diff_angulo: {diff_angulo:.1f}°, distancia: {distancia:.1f}")
+        if depurar:
+            log.debug("[IA %s] Controles: acelerar=%s, frear=%s, direita=%s, esquerda=%s, turbo=%s; velocidade: %.2f, "
+                      "diff_angulo: %.1f°, distancia: %.1f", self.nome, acelerar, frear_re, direita, esquerda,
+                      turbo_pressed, velocidade_atual, diff_angulo, distancia)
         
-        carro._step(acelerar, direita, esquerda, frear_re, turbo_pressed, superficie_mascara, dt, None, superficie_pista_renderizada)
+        self._aplicar(carro, (acelerar, direita, esquerda, frear_re, turbo_pressed), superficie_mascara, dt_passo, superficie_pista_renderizada)
         
         self.estado_freio = frear_re
         self.estado_aceleracao = acelerar
@@ -682,6 +713,73 @@ class IA:
         self.distancia_atual = distancia
         self.diff_angulo_atual = diff_angulo
     
+    def _controlar_pela_linha(self, carro, velocidade_atual, na_grama, superficie_mascara, dt_passo, superficie_pista_renderizada):
+        """
+        Segue a linha de corrida: mira uma amostra à frente (mais longe quanto maior a velocidade) e
+        acelera/freia pela velocidade do perfil, escalada pela aderência do carro e pela dificuldade
+        O índice da amostra do carro só anda para a frente a partir do anterior (O(1) por passo)
+        """
+        linha = self.linha_corrida
+        if self.indice_linha is None:
+            self.indice_linha = linha.mais_proxima(carro.x, carro.y)
+        anterior = self.indice_linha
+        self.indice_linha = linha.avancar(anterior, carro.x, carro.y)
+        self._avancar_checkpoints_linha(anterior, self.indice_linha)
+        
+        if self.tempo_travado > self.max_tempo_travado and velocidade_atual < 0.3:
+            self.travamentos += 1
+            log.debug("IA %s: TRAVADO detectado - tempo: %.1fs, dando ré e relocalizando na linha de corrida", self.nome, self.tempo_travado)
+            self.indice_linha = linha.mais_proxima(carro.x, carro.y)
+            self.tempo_travado = 0.0
+            self.tempo_re_carro = self.duracao_re_carro
+        
+        alcance = int((self.alcance_linha_min + velocidade_atual * self.alcance_linha_por_velocidade) / linha.espacamento) + 1
+        self.alvo_x, self.alvo_y = linha.ponto(self.indice_linha + alcance)
+        velocidade_alvo = (linha.velocidade(self.indice_linha + self.antecipacao_freio)
+                           * math.sqrt(getattr(carro, 'mu_peak', 1.0)) * self.fator_velocidade_linha)
+        if na_grama:
+            velocidade_alvo = min(velocidade_alvo, self.velocidade_grama)
+        self.velocidade_alvo = velocidade_alvo
+        dx = self.alvo_x - carro.x
+        dy = self.alvo_y - carro.y
+        self.rumo_alvo = math.degrees(math.atan2(dy, -dx))
+        self.distancia_atual = math.hypot(dx, dy)
+        self.seguir_alvo = True
+        self._atuar_pelo_alvo(carro, velocidade_atual, superficie_mascara, dt_passo, superficie_pista_renderizada)
+        
+        self.estado_aceleracao, _, _, self.estado_freio, _ = self.entrada_mantida
+        self.velocidade_atual = velocidade_atual
+        self.diff_angulo_atual = (self.rumo_alvo - carro.angulo + 180) % 360 - 180
+    
+    def _atuar_pelo_alvo(self, carro, velocidade_atual, superficie_mascara, dt_passo, superficie_pista_renderizada):
+        """
+        Direção e acelerador pelo rumo e pela velocidade alvo da última decisão, a cada passo fixo
+        Entre decisões o rumo até o alvo fica o da decisão; só o ângulo e a velocidade do carro mudam
+        """
+        velocidade_alvo = self.velocidade_alvo
+        diff_angulo = (self.rumo_alvo - carro.angulo + 180) % 360 - 180
+        
+        acelerar = velocidade_atual < velocidade_alvo
+        frear_re = velocidade_atual > velocidade_alvo * 1.02
+        turbo_pressed = (self.usar_turbo and abs(diff_angulo) < 10
+                         and velocidade_atual < velocidade_alvo * 0.85)
+        direita = diff_angulo < -2
+        esquerda = diff_angulo > 2
+        
+        self._aplicar(carro, (acelerar, direita, esquerda, frear_re, turbo_pressed), superficie_mascara, dt_passo, superficie_pista_renderizada)
+    
+    def _avancar_checkpoints_linha(self, anterior, atual):
+        """Checkpoint atual passa ao seguinte quando o índice na linha cruza a amostra dele"""
+        n = len(self.checkpoints)
+        if n == 0:
+            return
+        amostras = len(self.linha_corrida)
+        percorrido = (atual - anterior) % amostras
+        alvo = self.linha_corrida.indices_checkpoints[self.checkpoint_atual % n]
+        if 0 < (alvo - anterior) % amostras <= percorrido:
+            self.checkpoint_atual = (self.checkpoint_atual + 1) % n
+            self.tempo_travado = 0.0
+    
     def desenhar_debug(self, superficie, camera=None, mostrar_todos_checkpoints=False):
         """Desenha debug visual da IA"""
         if not self.debug or not camera:
@@ -752,4 +850,4 @@ class IA:
                 superficie.blit(texto_chegou, (10, 10))
                 
         except Exception as e:
-            print(f"Erro ao desenhar debug da IA: {e}")
+            log.warning("Erro ao desenhar debug da IA: %s", e)
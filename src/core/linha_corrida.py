@@ -0,0 +1,288 @@
+"""
+Linha de corrida e perfil de velocidade por pista (calculados offline, gravados no bundle da pista)
+1. Caminho inicial: A* na grade do campo de distância de um checkpoint ao seguinte, só por células de
+   pista e preferindo o meio dela (as vizinhanças dos outros checkpoints ficam bloqueadas para o caminho
+   não dar a volta ao contrário)
+2. Linha: o caminho, reamostrado por comprimento de arco, é relaxado como um elástico (suavização que
+   encurta e abre as curvas) preso dentro da pista com MARGEM_LINHA px até a borda
+3. Velocidade: limite de aderência lateral pela curvatura de cada amostra e passada para trás com a
+   desaceleração de frenagem, para mu = 1 (a IA escala por sqrt(mu_peak) do carro)
+A IA só consulta amostras por índice: ponto e velocidade alvo à frente custam O(1) por passo
+Os portões dos checkpoints sem ângulo salvo são orientados pela tangente da linha (portoes_checkpoint)
+"""
+import math
+import heapq
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
+
+# Distância em px entre amostras da linha
+ESPACAMENTO_LINHA = 16.0
+# Distância mínima em px da linha até a borda da pista (meia largura do carro + folga)
+MARGEM_LINHA = 45.0
+# Raio em px bloqueado em volta dos outros checkpoints na busca do caminho inicial
+RAIO_BLOQUEIO_CHECKPOINT = 160.0
+# Custo extra das células perto da borda no A* (até DISTANCIA_MEIO px da borda)
+PESO_BORDA = 2.0
+DISTANCIA_MEIO = 100.0
+# Relaxamento do elástico
+ITERACOES_LINHA = 600
+REAMOSTRAR_A_CADA = 100
+PASSO_SUAVIZACAO = 0.5
+# Amostras de cada lado usadas para medir a curvatura
+JANELA_CURVATURA = 3
+
+# Limites do carro nas unidades de CarroFisica (vx/vy por segundo de física, dt * TIME_SCALE)
+# Posição anda vx * ARCADE_SPEED_MULT px por segundo de física
+ESCALA_POSICAO = 2.5
+# Aceleração lateral por unidade de mu usada no perfil; em círculos de raio fixo o carro sustenta ~48
+# com mu 1,05, mas a curvatura medida em 3 amostras exagera os ápices: 80 foi ajustado por tempo de volta
+ACELERACAO_LATERAL = 80.0
+# Desaceleração da frenagem (freio sem ré, ~18 por segundo de jogo)
+DESACELERACAO_FREIO = 6.0
+# Teto do perfil nas retas (acima da velocidade final de qualquer carro)
+VELOCIDADE_MAXIMA_LINHA = 400.0
+
+_VIZINHOS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+             (1, 1, math.sqrt(2.0)), (1, -1, math.sqrt(2.0)), (-1, 1, math.sqrt(2.0)), (-1, -1, math.sqrt(2.0)))
+
+
+class LinhaCorrida:
+    """
+    Linha de corrida fechada amostrada a cada `espacamento` px de arco
+    dados: array('f') intercalado (x, y, velocidade para mu = 1) por amostra
+    indices_checkpoints: amostra mais próxima de cada checkpoint, na ordem dos checkpoints
+    """
+    def __init__(self, espacamento, dados, indices_checkpoints):
+        self.espacamento = espacamento
+        self.dados = dados
+        self.amostras = len(dados) // 3
+        self.indices_checkpoints = list(indices_checkpoints)
+
+    def __len__(self):
+        return self.amostras
+
+    def ponto(self, indice):
+        i = (indice % self.amostras) * 3
+        return self.dados[i], self.dados[i + 1]
+
+    def velocidade(self, indice):
+        return self.dados[(indice % self.amostras) * 3 + 2]
+
+    def mais_proxima(self, x, y):
+        """Índice da amostra mais próxima de (x, y) (percorre a linha toda: só para localizar o carro)"""
+        dados = self.dados
+        melhor, melhor_d = 0, float('inf')
+        for i in range(self.amostras):
+            dx = dados[3 * i] - x
+            dy = dados[3 * i + 1] - y
+            d = dx * dx + dy * dy
+            if d < melhor_d:
+                melhor, melhor_d = i, d
+        return melhor
+
+    def avancar(self, indice, x, y, maximo=16):
+        """A partir de `indice`, avança enquanto a amostra seguinte estiver mais perto de (x, y)"""
+        dados, n = self.dados, self.amostras
+        i = indice % n
+        dx, dy = dados[3 * i] - x, dados[3 * i + 1] - y
+        atual = dx * dx + dy * dy
+        for _ in range(maximo):
+            j = (i + 1) % n
+            dx, dy = dados[3 * j] - x, dados[3 * j + 1] - y
+            d = dx * dx + dy * dy
+            if d > atual:
+                break
+            i, atual = j, d
+        return i
+
+
+def construir_linha_corrida(campo, checkpoints):
+    """
+    Calcula a linha de corrida da pista a partir do campo de distância e dos checkpoints
+    ((x, y) ou (x, y, ângulo)); None se o caminho entre dois checkpoints não existir
+    """
+    if campo is None or not checkpoints or len(checkpoints) < 2:
+        return None
+    xs, ys = [], []
+    n = len(checkpoints)
+    for k in range(n):
+        trecho = _caminho_entre(campo, checkpoints, k, (k + 1) % n)
+        if trecho is None:
+            log.warning("Linha de corrida: sem caminho do checkpoint %d ao %d", k + 1, (k + 1) % n + 1)
+            return None
+        xs.extend(p[0] for p in trecho[:-1])
+        ys.extend(p[1] for p in trecho[:-1])
+    xs, ys = _reamostrar(xs, ys, ESPACAMENTO_LINHA)
+    if np is not None:
+        xs, ys = _relaxar_numpy(campo, xs, ys)
+    else:
+        xs, ys = _relaxar_python(campo, xs, ys)
+    velocidades = _perfil_velocidade(xs, ys)
+    dados = array('f')
+    for x, y, v in zip(xs, ys, velocidades):
+        dados.extend((x, y, v))
+    # Amostras já arredondadas para float32: a linha recém-calculada é igual à lida do bundle
+    linha = LinhaCorrida(ESPACAMENTO_LINHA, dados, [])
+    linha.indices_checkpoints = [linha.mais_proxima(cp[0], cp[1]) for cp in checkpoints]
+    return linha
+
+
+def _caminho_entre(campo, checkpoints, origem, destino):
+    """A* de um checkpoint a outro pelas células de pista; retorna [(x, y), ...] em px ou None"""
+    largura, altura, escala = campo.largura, campo.altura, campo.escala
+    dados = campo.dados
+
+    def celula(x, y):
+        cx = min(largura - 1, max(0, int(x // escala)))
+        cy = min(altura - 1, max(0, int(y // escala)))
+        return cx, cy
+
+    ox, oy = celula(checkpoints[origem][0], checkpoints[origem][1])
+    dx, dy = celula(checkpoints[destino][0], checkpoints[destino][1])
+    bloqueadas = set()
+    raio = int(RAIO_BLOQUEIO_CHECKPOINT / escala)
+    for k, cp in enumerate(checkpoints):
+        if k in (origem, destino):
+            continue
+        bx, by = celula(cp[0], cp[1])
+        # Checkpoint colado a uma das pontas: bloquear cortaria a própria saída/chegada
+        if min(math.hypot(bx - ox, by - oy), math.hypot(bx - dx, by - dy)) < raio * 1.5:
+            continue
+        for y in range(max(0, by - raio), min(altura, by + raio + 1)):
+            for x in range(max(0, bx - raio), min(largura, bx + raio + 1)):
+                if (x - bx) ** 2 + (y - by) ** 2 <= raio * raio:
+                    bloqueadas.add(y * largura + x)
+
+    inicio, fim = oy * largura + ox, dy * largura + dx
+    custo = {inicio: 0.0}
+    pai = {inicio: -1}
+    fila = [(0.0, 0.0, inicio)]
+    while fila:
+        _, g, i = heapq.heappop(fila)
+        if i == fim:
+            break
+        if g > custo[i]:
+            continue
+        x, y = i % largura, i // largura
+        for vx, vy, passo in _VIZINHOS:
+            nx, ny = x + vx, y + vy
+            if nx < 0 or ny < 0 or nx >= largura or ny >= altura:
+                continue
+            j = ny * largura + nx
+            distancia = dados[j]
+            if distancia <= 0.0 or j in bloqueadas:
+                continue
+            ng = g + passo * (1.0 + PESO_BORDA * max(0.0, 1.0 - distancia / DISTANCIA_MEIO))
+            if ng < custo.get(j, float('inf')):
+                custo[j] = ng
+                pai[j] = i
+                heapq.heappush(fila, (ng + math.hypot(nx - dx, ny - dy), ng, j))
+    if fim not in pai:
+        return None
+    caminho = []
+    i = fim
+    while i != -1:
+        caminho.append(((i % largura + 0.5) * escala, (i // largura + 0.5) * escala))
+        i = pai[i]
+    caminho.reverse()
+    return caminho
+
+
+def _reamostrar(xs, ys, espacamento):
+    """Reamostra a linha fechada em pontos igualmente espaçados por comprimento de arco"""
+    n = len(xs)
+    acumulado = [0.0]
+    for i in range(n):
+        j = (i + 1) % n
+        acumulado.append(acumulado[-1] + math.hypot(xs[j] - xs[i], ys[j] - ys[i]))
+    total = acumulado[-1]
+    quantidade = max(8, int(round(total / espacamento)))
+    passo = total / quantidade
+    novos_x, novos_y = [], []
+    segmento = 0
+    for k in range(quantidade):
+        s = k * passo
+        while acumulado[segmento + 1] < s:
+            segmento += 1
+        comprimento = acumulado[segmento + 1] - acumulado[segmento]
+        t = (s - acumulado[segmento]) / comprimento if comprimento > 1e-9 else 0.0
+        j = (segmento + 1) % n
+        novos_x.append(xs[segmento] + (xs[j] - xs[segmento]) * t)
+        novos_y.append(ys[segmento] + (ys[j] - ys[segmento]) * t)
+    return novos_x, novos_y
+
+
+def _relaxar_numpy(campo, xs, ys):
+    """Elástico: suavização + projeção para dentro da pista (colunas numpy)"""
+    h = float(campo.escala)
+    for _ in range(ITERACOES_LINHA // REAMOSTRAR_A_CADA):
+        x = np.array(xs, dtype=np.float64)
+        y = np.array(ys, dtype=np.float64)
+        for _ in range(REAMOSTRAR_A_CADA):
+            x += PASSO_SUAVIZACAO * (0.5 * (np.roll(x, 1) + np.roll(x, -1)) - x)
+            y += PASSO_SUAVIZACAO * (0.5 * (np.roll(y, 1) + np.roll(y, -1)) - y)
+            falta = MARGEM_LINHA - campo.distancias(x, y)
+            perto = falta > 0.0
+            if perto.any():
+                px, py, pf = x[perto], y[perto], falta[perto]
+                gx = campo.distancias(px + h, py) - campo.distancias(px - h, py)
+                gy = campo.distancias(px, py + h) - campo.distancias(px, py - h)
+                norma = np.maximum(np.hypot(gx, gy), 1e-6)
+                x[perto] = px + gx / norma * pf
+                y[perto] = py + gy / norma * pf
+        xs, ys = _reamostrar(x.tolist(), y.tolist(), ESPACAMENTO_LINHA)
+    return xs, ys
+
+
+def _relaxar_python(campo, xs, ys):
+    """Mesmo elástico de _relaxar_numpy em Python puro"""
+    for _ in range(ITERACOES_LINHA // REAMOSTRAR_A_CADA):
+        n = len(xs)
+        for _ in range(REAMOSTRAR_A_CADA):
+            novos_x = [xs[i] + PASSO_SUAVIZACAO * (0.5 * (xs[i - 1] + xs[(i + 1) % n]) - xs[i]) for i in range(n)]
+            novos_y = [ys[i] + PASSO_SUAVIZACAO * (0.5 * (ys[i - 1] + ys[(i + 1) % n]) - ys[i]) for i in range(n)]
+            for i in range(n):
+                falta = MARGEM_LINHA - campo.distancia(novos_x[i], novos_y[i])
+                if falta > 0.0:
+                    gx, gy = campo.gradiente(novos_x[i], novos_y[i])
+                    novos_x[i] += gx * falta
+                    novos_y[i] += gy * falta
+            xs, ys = novos_x, novos_y
+        xs, ys = _reamostrar(xs, ys, ESPACAMENTO_LINHA)
+    return xs, ys
+
+
+def _perfil_velocidade(xs, ys):
+    """Velocidade por amostra (mu = 1): limite lateral pela curvatura e passada para trás da frenagem"""
+    n = len(xs)
+    k = JANELA_CURVATURA
+    velocidades = []
+    for i in range(n):
+        x1, y1 = xs[i - k], ys[i - k]
+        x2, y2 = xs[i], ys[i]
+        x3, y3 = xs[(i + k) % n], ys[(i + k) % n]
+        # Curvatura do círculo pelos três pontos: 4 * área / produto dos lados
+        area2 = abs((x2 - x1) * (y3 - y1) - (x3 - x1) * (y2 - y1))
+        lados = math.hypot(x2 - x1, y2 - y1) * math.hypot(x3 - x2, y3 - y2) * math.hypot(x3 - x1, y3 - y1)
+        curvatura = 2.0 * area2 / lados if lados > 1e-9 else 0.0
+        if curvatura > 1e-9:
+            velocidades.append(min(VELOCIDADE_MAXIMA_LINHA, math.sqrt(ACELERACAO_LATERAL / (ESCALA_POSICAO * curvatura))))
+        else:
+            velocidades.append(VELOCIDADE_MAXIMA_LINHA)
+    # Frenagem: v² pode cair no máximo 2 * desaceleração * distância percorrida (em unidades de velocidade)
+    freio = 2.0 * DESACELERACAO_FREIO / ESCALA_POSICAO
+    inicio = min(range(n), key=velocidades.__getitem__)
+    for passo in range(1, n + 1):
+        i = (inicio - passo) % n
+        j = (i + 1) % n
+        ds = math.hypot(xs[j] - xs[i], ys[j] - ys[i])
+        velocidades[i] = min(velocidades[i], math.sqrt(velocidades[j] * velocidades[j] + freio * ds))
+    return velocidades
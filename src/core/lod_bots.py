@@ -0,0 +1,195 @@
+"""
+Nível de detalhe (LOD) da simulação dos bots
+Bots longe de todas as câmeras e de todos os outros carros saem da física completa e da IA a 120 Hz e
+passam a um modelo cinemático em passos de PASSOS_POR_LOD passos fixos (30 Hz): seguem os checkpoints
+da própria IA a uma velocidade de cruzeiro medida enquanto corriam com a física completa
+Perto de uma câmera ou de outro carro voltam à física completa com posição, ângulo e velocidade contínuos
+A decisão (atualizar) é separada do estado (simplificados): o jogo decide pelas câmeras e grava as
+mudanças no replay; a simulação sem janela só as aplica
+"""
+import math
+
+# Passos fixos (120 Hz) por passo cinemático: 4 -> 30 Hz; os bots simplificados são distribuídos
+# entre os passos para o custo não se concentrar em um só
+PASSOS_POR_LOD = 4
+# Margem em px de tela além da visão de cada câmera em que o bot continua completo
+MARGEM_TELA = 300
+# Distância em px do mundo a outro carro abaixo da qual o bot continua completo (colisões, disputa)
+DISTANCIA_CARROS = 500.0
+# Histerese: para sair do nível completo o bot precisa estar esta fração além das margens
+HISTERESE = 1.25
+
+# Modelo cinemático (mesmas unidades de vx/vy do carro)
+VELOCIDADE_MINIMA = 30.0
+ACELERACAO = 40.0            # por segundo de jogo
+GIRO_MAXIMO = 270.0          # graus por segundo de jogo
+REDUCAO_CURVA = 0.5          # fração da velocidade perdida com o alvo a 90° ou mais
+RAIO_CHECKPOINT = 60.0       # px: checkpoint alcançado
+MEIA_LARGURA_CHECKPOINT = 150.0
+# Média móvel da velocidade no nível completo, com constantes de tempo (s) diferentes para subir e
+# descer: a arrancada da largada e as freadas das curvas não derrubam a velocidade de cruzeiro
+TEMPO_MEDIA_SUBIDA = 1.0
+TEMPO_MEDIA_DESCIDA = 6.0
+# Mesma escala de CarroFisica._integrar: posição anda vx * TIME_SCALE * ARCADE_SPEED_MULT px por s de jogo
+TIME_SCALE = 2.9
+ARCADE_SPEED_MULT = 2.5
+
+
+class LodBots:
+    """
+    Bots registrados com a sua IA; simplificados é o conjunto dos que estão no modelo cinemático
+    Por passo fixo: atualizar() (opcional, decide pelas câmeras), a IA só dos bots completos
+    (simplificado(carro) diz quem pular) e depois passo(dt), que avança os simplificados da vez
+    """
+
+    def __init__(self, passos_por_lod=PASSOS_POR_LOD):
+        self.bots = []                   # [(carro, ia)], na ordem de registro
+        self.simplificados = set()
+        self.velocidade_cruzeiro = {}    # carro -> média de |v| no nível completo
+        self.passos_por_lod = passos_por_lod
+        self._passos = 0
+
+    def __len__(self):
+        return len(self.bots)
+
+    def registrar(self, carro, ia):
+        if all(c is not carro for c, _ in self.bots):
+            self.bots.append((carro, ia))
+
+    def remover(self, carro):
+        self.bots = [(c, ia) for c, ia in self.bots if c is not carro]
+        self.simplificados.discard(carro)
+        self.velocidade_cruzeiro.pop(carro, None)
+
+    def limpar(self):
+        self.bots = []
+        self.simplificados = set()
+        self.velocidade_cruzeiro = {}
+
+    def simplificado(self, carro):
+        return carro in self.simplificados
+
+    def definir_simplificados(self, carros):
+        """Aplica um conjunto de bots simplificados (ex.: vindo do replay); os demais voltam ao completo"""
+        novos = set(carros)
+        for carro, ia in self.bots:
+            if carro in self.simplificados and carro not in novos:
+                _voltar_ao_completo(carro, ia)
+        self.simplificados = novos
+
+    def atualizar(self, cameras, carros, ignorar=()):
+        """
+        Decide o nível de cada bot pelas câmeras (as que estão sendo desenhadas) e pelos outros carros
+        Reavalia uma vez a cada passos_por_lod passos; retorna True se o conjunto de simplificados mudou
+        Bots em `ignorar` (ex.: já terminaram) ficam completos
+        """
+        if self._passos % self.passos_por_lod:
+            return False
+        celulas = {}
+        for carro in carros:
+            chave = (int(carro.x // DISTANCIA_CARROS), int(carro.y // DISTANCIA_CARROS))
+            celulas.setdefault(chave, []).append(carro)
+        novos = set()
+        for carro, _ in self.bots:
+            if carro in ignorar:
+                continue
+            fator = HISTERESE if carro not in self.simplificados else 1.0
+            if any(camera.esta_visivel(carro.x, carro.y, MARGEM_TELA * fator) for camera in cameras):
+                continue
+            if _carro_proximo(carro, celulas, DISTANCIA_CARROS * fator):
+                continue
+            novos.add(carro)
+        if novos == self.simplificados:
+            return False
+        self.definir_simplificados(novos)
+        return True
+
+    def passo(self, dt, ignorar=()):
+        """Avança um passo fixo: média de velocidade dos completos e passo cinemático dos simplificados da vez"""
+        alfa_subida = min(1.0, dt / TEMPO_MEDIA_SUBIDA)
+        alfa_descida = min(1.0, dt / TEMPO_MEDIA_DESCIDA)
+        vez = self._passos % self.passos_por_lod
+        self._passos += 1
+        for i, (carro, ia) in enumerate(self.bots):
+            if carro in ignorar:
+                continue
+            if carro not in self.simplificados:
+                velocidade = math.hypot(carro.vx, carro.vy)
+                media = self.velocidade_cruzeiro.get(carro, velocidade)
+                alfa = alfa_subida if velocidade > media else alfa_descida
+                self.velocidade_cruzeiro[carro] = media + (velocidade - media) * alfa
+            elif i % self.passos_por_lod == vez:
+                _passo_cinematico(carro, ia, self.velocidade_cruzeiro.get(carro, VELOCIDADE_MINIMA),
+                                  dt * self.passos_por_lod)
+
+
+def _carro_proximo(carro, celulas, distancia):
+    """Algum outro carro a menos de `distancia` (células do hash com lado DISTANCIA_CARROS)"""
+    alcance = int(math.ceil(distancia / DISTANCIA_CARROS))
+    cx, cy = int(carro.x // DISTANCIA_CARROS), int(carro.y // DISTANCIA_CARROS)
+    limite = distancia * distancia
+    for dx in range(-alcance, alcance + 1):
+        for dy in range(-alcance, alcance + 1):
+            for outro in celulas.get((cx + dx, cy + dy), ()):
+                if outro is not carro and (outro.x - carro.x) ** 2 + (outro.y - carro.y) ** 2 < limite:
+                    return True
+    return False
+
+
+def _passo_cinematico(carro, ia, cruzeiro, dt):
+    """Segue os checkpoints da IA: gira para o alvo com taxa limitada e ajusta a velocidade ao ângulo"""
+    checkpoints = ia.checkpoints
+    if not checkpoints:
+        return
+    n = len(checkpoints)
+    alvo = checkpoints[ia.checkpoint_atual % n]
+    if _passou_checkpoint(carro, alvo, checkpoints[(ia.checkpoint_atual - 1) % n]):
+        ia.checkpoint_atual = (ia.checkpoint_atual + 1) % n
+        alvo = checkpoints[ia.checkpoint_atual % n]
+    ia.alvo_x, ia.alvo_y = alvo[0], alvo[1]
+
+    dx, dy = alvo[0] - carro.x, alvo[1] - carro.y
+    # Mesma convenção da IA/CarroFisica: frente = (-cos a, sin a)
+    diff = (math.degrees(math.atan2(dy, -dx)) - carro.angulo + 180.0) % 360.0 - 180.0
+    giro = GIRO_MAXIMO * dt
+    carro.angulo = (carro.angulo + max(-giro, min(giro, diff))) % 360.0
+
+    velocidade = math.hypot(carro.vx, carro.vy)
+    alvo_velocidade = max(VELOCIDADE_MINIMA, cruzeiro) * (1.0 - REDUCAO_CURVA * min(1.0, abs(diff) / 90.0))
+    passo_velocidade = ACELERACAO * dt
+    velocidade += max(-passo_velocidade, min(passo_velocidade, alvo_velocidade - velocidade))
+
+    rad = math.radians(carro.angulo)
+    carro.vx, carro.vy = -math.cos(rad) * velocidade, math.sin(rad) * velocidade
+    carro.yaw_rate = 0.0
+    carro.x += carro.vx * dt * TIME_SCALE * ARCADE_SPEED_MULT
+    carro.y += carro.vy * dt * TIME_SCALE * ARCADE_SPEED_MULT
+    carro.velocidade_kmh = velocidade * ARCADE_SPEED_MULT
+
+
+def _passou_checkpoint(carro, checkpoint, anterior):
+    """Perto do centro, ou além da linha do checkpoint (no sentido anterior -> checkpoint) dentro da largura"""
+    dx, dy = carro.x - checkpoint[0], carro.y - checkpoint[1]
+    if dx * dx + dy * dy < RAIO_CHECKPOINT * RAIO_CHECKPOINT:
+        return True
+    sx, sy = checkpoint[0] - anterior[0], checkpoint[1] - anterior[1]
+    comprimento = math.hypot(sx, sy)
+    if comprimento < 1e-6:
+        return False
+    sx, sy = sx / comprimento, sy / comprimento
+    return dx * sx + dy * sy >= 0.0 and abs(dx * sy - dy * sx) < MEIA_LARGURA_CHECKPOINT
+
+
+def _voltar_ao_completo(carro, ia):
+    """Zera o que a física e a IA acumulam entre passos, para a volta ao nível completo não dar saltos"""
+    carro.yaw_rate = 0.0
+    skidmarks = getattr(carro, "skidmarks", None)
+    if skidmarks is not None:
+        skidmarks.parar_rastro()
+    ia.ultima_posicao = None
+    ia.indice_linha = None
+    ia.entrada_mantida = None
+    ia.tempo_travado = 0.0
+    ia.tempo_batido = 0.0
+    ia.tempo_preso_carro = 0.0
+    ia.tempo_re_carro = 0.0
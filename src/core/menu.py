@@ -12,6 +12,7 @@ from core.musica import gerenciador_musica
 from core.popup_musica import popup_musica
 from core.game_modes import ModoJogo, TipoJogo
 from core.progresso import gerenciador_progresso
+from core.assets import carregar_imagem
 
 def scale_to_cover(img_surf, target_w, target_h):
     iw, ih = img_surf.get_size()
@@ -336,7 +337,7 @@ class Escolha(Enum):
 
 def splash_screen(screen) -> bool:
     """Tela de splash com 'Aperte qualquer botão para iniciar'"""
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
     
     clock = pygame.time.Clock()
@@ -382,7 +383,7 @@ def splash_screen(screen) -> bool:
         pygame.display.flip()
 
 def menu_loop(screen) -> Escolha:
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
 
     # Ordem visual (da esquerda para a direita)
@@ -685,7 +686,7 @@ def menu_loop(screen) -> Escolha:
         pygame.display.flip()
 
 def selecionar_mapas_loop(screen):
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
     
     from config import obter_lista_mapas, obter_nome_mapa, recarregar_mapas
@@ -845,7 +846,7 @@ def selecionar_mapas_loop(screen):
 
 def selecionar_carros_loop(screen):
     from config import CAMINHO_OFICINA, DIR_SPRITES, DIR_CAR_SELECTION
-    bg_raw = pygame.image.load(CAMINHO_OFICINA).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_OFICINA)
     # Usar scale simples (como no editor) para mostrar a imagem completa sem cortar
     bg = pygame.transform.scale(bg_raw, (LARGURA, ALTURA))
     
@@ -869,9 +870,7 @@ def selecionar_carros_loop(screen):
     icone_cadeado = None
     caminho_cadeado = os.path.join("assets", "images", "icons", "Locked.png")
     if os.path.exists(caminho_cadeado):
-        icone_cadeado = pygame.image.load(caminho_cadeado).convert_alpha()
-        # Redimensionar para tamanho adequado
-        icone_cadeado = pygame.transform.scale(icone_cadeado, (80, 80))
+        icone_cadeado = carregar_imagem(caminho_cadeado, tamanho=(80, 80))
     
     # Carregar sprites dos carros para seleção (usando pasta car_selection)
     sprites_carros = {}
@@ -883,7 +882,7 @@ def selecionar_carros_loop(screen):
                 # Se não existir, usa o sprite normal
                 sprite_path = os.path.join(DIR_SPRITES, f"{carro['prefixo_cor']}.png")
             
-            sprite = pygame.image.load(sprite_path).convert_alpha()
+            sprite = carregar_imagem(sprite_path)
             # Usar tamanho e posição individuais para cada carro
             tamanho_oficina = carro.get('tamanho_oficina', (600, 300))  # Padrão se não especificado
             canvas_largura, canvas_altura = tamanho_oficina
@@ -1443,7 +1442,7 @@ def selecionar_carros_loop(screen):
 def submenu_audio(screen):
     """Submenu de configurações de áudio"""
     from config import CONFIGURACOES, salvar_configuracoes
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
 
     opcoes_audio = [
@@ -1613,7 +1612,7 @@ def submenu_audio(screen):
 
 def submenu_controles(screen):
     """Submenu de configurações de controles"""
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
 
     opcoes_controles = [
@@ -1790,7 +1789,7 @@ def submenu_controles(screen):
 def submenu_video(screen):
     """Submenu de configurações de vídeo"""
     from config import CONFIGURACOES, salvar_configuracoes
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
 
     opcoes_video = [
@@ -2006,7 +2005,7 @@ def submenu_video(screen):
 
 def submenu_idioma(screen):
     """Submenu de configurações de idioma"""
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
 
     opcoes_idioma = [
@@ -2151,7 +2150,7 @@ def submenu_idioma(screen):
 def opcoes_loop(screen):
     """Tela de opções do jogo com design pixel art centralizado"""
     from config import CAMINHO_MENU, CONFIGURACOES, salvar_configuracoes
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
 
     opcoes_principais = [
@@ -2338,7 +2337,7 @@ def opcoes_loop(screen):
 
 def modo_jogo_loop(screen):
     """Menu de seleção de modo de jogo"""
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
     
     # Configurações atuais (podem ser salvas em CONFIGURACOES)
@@ -2800,7 +2799,7 @@ def modo_jogo_loop(screen):
 
 def selecionar_fase_loop(screen):
     """Menu de seleção de fase com minimapas"""
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
     
     # Carregar e redimensionar minimapas das 9 pistas (fazer apenas uma vez)
@@ -2814,15 +2813,11 @@ def selecionar_fase_loop(screen):
     from config import CAMINHO_TROFEU_OURO, CAMINHO_TROFEU_PRATA, CAMINHO_TROFEU_BRONZE, CAMINHO_TROFEU_VAZIO
     trofeus_cache = {}
     try:
-        trofeu_ouro = pygame.image.load(CAMINHO_TROFEU_OURO).convert_alpha()
-        trofeu_prata = pygame.image.load(CAMINHO_TROFEU_PRATA).convert_alpha()
-        trofeu_bronze = pygame.image.load(CAMINHO_TROFEU_BRONZE).convert_alpha()
-        trofeu_vazio = pygame.image.load(CAMINHO_TROFEU_VAZIO).convert_alpha()
         tamanho_trofeu = (25, 25)
-        trofeus_cache["ouro"] = pygame.transform.scale(trofeu_ouro, tamanho_trofeu)
-        trofeus_cache["prata"] = pygame.transform.scale(trofeu_prata, tamanho_trofeu)
-        trofeus_cache["bronze"] = pygame.transform.scale(trofeu_bronze, tamanho_trofeu)
-        trofeus_cache["vazio"] = pygame.transform.scale(trofeu_vazio, tamanho_trofeu)
+        trofeus_cache["ouro"] = carregar_imagem(CAMINHO_TROFEU_OURO, tamanho=tamanho_trofeu)
+        trofeus_cache["prata"] = carregar_imagem(CAMINHO_TROFEU_PRATA, tamanho=tamanho_trofeu)
+        trofeus_cache["bronze"] = carregar_imagem(CAMINHO_TROFEU_BRONZE, tamanho=tamanho_trofeu)
+        trofeus_cache["vazio"] = carregar_imagem(CAMINHO_TROFEU_VAZIO, tamanho=tamanho_trofeu)
     except Exception as e:
         print(f"Erro ao carregar troféus: {e}")
         trofeus_cache = {}
@@ -3038,20 +3033,16 @@ def recordes_loop(screen):
     from core.progresso import gerenciador_progresso
     from config import CAMINHO_TROFEU_OURO, CAMINHO_TROFEU_PRATA, CAMINHO_TROFEU_BRONZE, CAMINHO_TROFEU_VAZIO
     
-    bg_raw = pygame.image.load(CAMINHO_MENU).convert_alpha()
+    bg_raw = carregar_imagem(CAMINHO_MENU)
     bg = scale_to_cover(bg_raw, LARGURA, ALTURA)
     
     # Carregar imagens de troféus
     try:
-        trofeu_ouro = pygame.image.load(CAMINHO_TROFEU_OURO).convert_alpha()
-        trofeu_prata = pygame.image.load(CAMINHO_TROFEU_PRATA).convert_alpha()
-        trofeu_bronze = pygame.image.load(CAMINHO_TROFEU_BRONZE).convert_alpha()
-        trofeu_vazio = pygame.image.load(CAMINHO_TROFEU_VAZIO).convert_alpha()
         tamanho_trofeu = (40, 40)
-        trofeu_ouro = pygame.transform.scale(trofeu_ouro, tamanho_trofeu)
-        trofeu_prata = pygame.transform.scale(trofeu_prata, tamanho_trofeu)
-        trofeu_bronze = pygame.transform.scale(trofeu_bronze, tamanho_trofeu)
-        trofeu_vazio = pygame.transform.scale(trofeu_vazio, tamanho_trofeu)
+        trofeu_ouro = carregar_imagem(CAMINHO_TROFEU_OURO, tamanho=tamanho_trofeu)
+        trofeu_prata = carregar_imagem(CAMINHO_TROFEU_PRATA, tamanho=tamanho_trofeu)
+        trofeu_bronze = carregar_imagem(CAMINHO_TROFEU_BRONZE, tamanho=tamanho_trofeu)
+        trofeu_vazio = carregar_imagem(CAMINHO_TROFEU_VAZIO, tamanho=tamanho_trofeu)
     except:
         trofeu_ouro = trofeu_prata = trofeu_bronze = trofeu_vazio = None
     
@@ -0,0 +1,174 @@
+"""
+Mundo da pista dividido em chunks
+Em vez de uma única superfície gigante, a pista é dividida em blocos de tamanho fixo
+que são montados sob demanda e mantidos em um cache LRU com limite de memória
+Cada chunk também pode ser obtido em níveis de zoom pré-escalados (pirâmide de zoom)
+"""
+import math
+import pygame
+from collections import OrderedDict
+
+TAMANHO_CHUNK = 512
+# Limite do cache LRU em bytes (chunks base + níveis de zoom), independente do tamanho da pista
+MAX_BYTES_PADRAO = 48 * 1024 * 1024
+# Distância entre níveis da pirâmide de zoom
+PASSO_NIVEL_ZOOM = 0.1
+
+def nivel_zoom(zoom, passo=PASSO_NIVEL_ZOOM):
+    """Maior nível da pirâmide que não ultrapassa o zoom (o ajuste final é sempre uma ampliação)"""
+    nivel = math.floor(zoom / passo + 1e-6) * passo
+    return round(max(passo, nivel), 2)
+
+class MundoChunks:
+    """
+    Superfície virtual do mundo composta por chunks
+    assar_chunk(superficie, x0, y0) desenha na superfície a região do mundo que começa em (x0, y0)
+    """
+    def __init__(self, largura, altura, assar_chunk, tamanho_chunk=TAMANHO_CHUNK, max_bytes=MAX_BYTES_PADRAO):
+        self.largura = int(largura)
+        self.altura = int(altura)
+        self.tamanho_chunk = int(tamanho_chunk)
+        self.max_bytes = max_bytes
+        self.assar_chunk = assar_chunk
+        self.colunas = (self.largura + self.tamanho_chunk - 1) // self.tamanho_chunk
+        self.linhas = (self.altura + self.tamanho_chunk - 1) // self.tamanho_chunk
+        # (nivel em centésimos, cx, cy) -> superfície
+        self._chunks = OrderedDict()
+        self._bytes_em_cache = 0
+        self._niveis_usados = set()
+        # Camada opcional composta sobre cada chunk montado (ex.: marcas de pneu)
+        # Precisa de aplicar(superficie, cx, cy) e tem_marcas(cx, cy)
+        self.decalques = None
+
+    def get_width(self):
+        return self.largura
+
+    def get_height(self):
+        return self.altura
+
+    def get_size(self):
+        return (self.largura, self.altura)
+
+    def ret_chunk(self, cx, cy, nivel=1.0):
+        """Retângulo do chunk (cx, cy) no mundo escalado pelo nível (chunks da borda podem ser menores)"""
+        x0 = cx * self.tamanho_chunk
+        y0 = cy * self.tamanho_chunk
+        x1 = min(self.largura, x0 + self.tamanho_chunk)
+        y1 = min(self.altura, y0 + self.tamanho_chunk)
+        if nivel == 1.0:
+            return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+        # Arredondar as bordas (e não o tamanho) garante que chunks vizinhos se encaixem sem frestas
+        nx0, ny0 = round(x0 * nivel), round(y0 * nivel)
+        return pygame.Rect(nx0, ny0, round(x1 * nivel) - nx0, round(y1 * nivel) - ny0)
+
+    def _montar_chunk(self, cx, cy):
+        r = self.ret_chunk(cx, cy)
+        superficie = pygame.Surface(r.size)
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert()
+        self.assar_chunk(superficie, r.x, r.y)
+        return superficie
+
+    def _guardar(self, chave, superficie):
+        self._chunks[chave] = superficie
+        self._niveis_usados.add(chave[0])
+        self._bytes_em_cache += superficie.get_width() * superficie.get_height() * superficie.get_bytesize()
+
+    def obter_chunk(self, cx, cy, nivel=1.0):
+        """Retorna a superfície do chunk no nível de zoom pedido, montando-a se não estiver no cache"""
+        chave = (int(round(nivel * 100)), cx, cy)
+        superficie = self._chunks.get(chave)
+        if superficie is not None:
+            self._chunks.move_to_end(chave)
+            return superficie
+        if chave[0] == 100:
+            superficie = self._montar_chunk(cx, cy)
+            if self.decalques is not None:
+                self.decalques.aplicar(superficie, cx, cy)
+        else:
+            base = self.obter_chunk(cx, cy)
+            superficie = pygame.transform.scale(base, self.ret_chunk(cx, cy, nivel).size)
+        self._guardar(chave, superficie)
+        return superficie
+
+    def _liberar_excedentes(self, minimo_chunks):
+        """Descarta os chunks menos usados acima do limite de memória, preservando os mais recentes"""
+        while self._bytes_em_cache > self.max_bytes and len(self._chunks) > minimo_chunks:
+            _, superficie = self._chunks.popitem(last=False)
+            self._bytes_em_cache -= superficie.get_width() * superficie.get_height() * superficie.get_bytesize()
+
+    def chunks_em_cache(self, cx, cy):
+        """Gera (nivel, superficie) para cada nível do chunk (cx, cy) presente no cache"""
+        for nivel_centesimos in self._niveis_usados:
+            superficie = self._chunks.get((nivel_centesimos, cx, cy))
+            if superficie is not None:
+                yield nivel_centesimos / 100.0, superficie
+
+    def descartar_chunk(self, cx, cy):
+        """Remove todos os níveis do chunk (cx, cy) do cache; serão remontados no próximo uso"""
+        for nivel_centesimos in self._niveis_usados:
+            superficie = self._chunks.pop((nivel_centesimos, cx, cy), None)
+            if superficie is not None:
+                self._bytes_em_cache -= superficie.get_width() * superficie.get_height() * superficie.get_bytesize()
+
+    def iterar_regioes(self):
+        """
+        Percorre o mundo inteiro chunk a chunk sem encher o cache
+        Gera (x0, y0, superficie) - usado para classificar a malha e compilar o bundle
+        """
+        for cy in range(self.linhas):
+            for cx in range(self.colunas):
+                superficie = self._chunks.get((100, cx, cy))
+                if superficie is None or (self.decalques is not None and self.decalques.tem_marcas(cx, cy)):
+                    # Só o fundo da pista, sem decalques
+                    superficie = self._montar_chunk(cx, cy)
+                r = self.ret_chunk(cx, cy)
+                yield r.x, r.y, superficie
+
+    def desenhar_regiao(self, destino, rect, pos=(0, 0), nivel=1.0):
+        """
+        Copia a região rect (em coordenadas do mundo escalado pelo nível) para destino em pos
+        Usa só os chunks que cruzam a região; partes fora do mundo não são desenhadas
+        """
+        rect = pygame.Rect(rect)
+        dx = pos[0] - rect.left
+        dy = pos[1] - rect.top
+        limites = pygame.Rect(0, 0, round(self.largura * nivel), round(self.altura * nivel))
+        rect = rect.clip(limites)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        passo = self.tamanho_chunk * nivel
+        # Margem de um chunk por causa do arredondamento das bordas nos níveis escalados
+        cx0 = max(0, int(rect.left / passo) - 1)
+        cx1 = min(self.colunas - 1, int((rect.right - 1) / passo) + 1)
+        cy0 = max(0, int(rect.top / passo) - 1)
+        cy1 = min(self.linhas - 1, int((rect.bottom - 1) / passo) + 1)
+
+        blits = []
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                r = self.ret_chunk(cx, cy, nivel)
+                area = r.clip(rect)
+                if area.width <= 0 or area.height <= 0:
+                    continue
+                area_local = area.move(-r.x, -r.y)
+                blits.append((self.obter_chunk(cx, cy, nivel), (area.x + dx, area.y + dy), area_local))
+        destino.blits(blits, doreturn=False)
+        # Nunca descartar chunks que acabaram de ser usados neste desenho
+        self._liberar_excedentes(len(blits))
+
+    def get_at(self, pos):
+        """Cor de um pixel do mundo (compatível com Surface.get_at)"""
+        x, y = int(pos[0]), int(pos[1])
+        if x < 0 or y < 0 or x >= self.largura or y >= self.altura:
+            raise IndexError("pixel fora do mundo")
+        t = self.tamanho_chunk
+        cx, cy = x // t, y // t
+        superficie = self.obter_chunk(cx, cy)
+        self._liberar_excedentes(1)
+        return superficie.get_at((x - cx * t, y - cy * t))
+
+    def limpar(self):
+        """Descarta todos os chunks montados (serão remontados sob demanda)"""
+        self._chunks.clear()
+        self._bytes_em_cache = 0
@@ -1,10 +1,27 @@
-# src/core/particulas.py
-import math, random, pygame, os
+import math, random, pygame, os, itertools, weakref
+from collections import OrderedDict
 from config import DIR_EFFECTS
+from core.assets import carregar_imagem
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Máximo de partículas vivas somando todos os carros; ao estourar, as mais velhas dão lugar às novas
+ORCAMENTO_PARTICULAS = 1500
+# Quantização do atlas de quadros pré-transformados
+ANGULOS_ATLAS = 8
+PASSO_ESCALA_ATLAS = 0.25
+NIVEIS_ALPHA_ATLAS = 8
+LIMITE_QUADROS_ATLAS = 8192
+# Partículas fora da tela por mais que isso (pixels) não são desenhadas
+MARGEM_TELA = 50
 
 class Particula:
-    __slots__ = ("x","y","vx","vy","life","t","ang","scale0","scale1","alpha0","alpha1","tipo","tex_index")
-    def __init__(self, x, y, vx, vy, life, ang, scale0, scale1, alpha0, alpha1, tipo="fumaca"):
+    """Partícula individual (usada pelo motor quando o numpy não está disponível)"""
+    __slots__ = ("x","y","vx","vy","life","t","ang","scale0","scale1","alpha0","alpha1","tipo","tex_index","dono")
+    def __init__(self, x, y, vx, vy, life, ang, scale0, scale1, alpha0, alpha1, tipo=0, dono=0):
         self.x, self.y = float(x), float(y)
         self.vx, self.vy = float(vx), float(vy)
         self.life = float(life)
@@ -13,7 +30,8 @@ class Particula:
         self.scale0, self.scale1 = float(scale0), float(scale1)
         self.alpha0, self.alpha1 = int(alpha0), int(alpha1)
         self.tipo = tipo
-        self.tex_index = 0  # Cada partícula tem seu próprio índice de textura
+        self.tex_index = 0
+        self.dono = dono
 
     def alive(self): return self.t < self.life
     def update(self, dt):
@@ -22,8 +40,6 @@ class Particula:
         self.t += dt
         self.x += self.vx * dt
         self.y += self.vy * dt
-        # Atualizar índice de textura individual (animação mais lenta)
-        self.tex_index = int((self.t * 0.05) % 12)  # 12 texturas disponíveis
         return True  # Retornar True se ainda está vivo
     def interp(self):
         k = max(0.0, min(1.0, self.t / self.life))
@@ -34,53 +50,336 @@ class Particula:
         alpha = int(self.alpha0 * fade_curve)
         return scale, alpha
 
-class EmissorFumaca:
-    def __init__(self):
-        # Carregar texturas de fumaça
-        self.tex_fumaca = []
-        for i in range(12):  # pixels_00.png a pixels_11.png
-            caminho = os.path.join(DIR_EFFECTS, "smoke", f"pixels_{i:02d}.png")
-            if os.path.exists(caminho):
-                try:
-                    img = pygame.image.load(caminho).convert_alpha()
-                    # Redimensionar para tamanho adequado
-                    img = pygame.transform.scale(img, (16, 16))
-                    self.tex_fumaca.append(img)
-                except Exception as e:
-                    pass  # Silenciar erros de carregamento
-        
-        if not self.tex_fumaca:
-            # Fallback se não encontrar as texturas
-            self.tex_fumaca = [pygame.Surface((16, 16), pygame.SRCALPHA)]
-            self.tex_fumaca[0].fill((100, 100, 100, 128))
-        
-        self.ps = []
+class _TipoParticula:
+    __slots__ = ("nome", "texturas", "quadros_por_segundo")
+    def __init__(self, nome, texturas, quadros_por_segundo):
+        self.nome = nome
+        self.texturas = texturas
+        self.quadros_por_segundo = quadros_por_segundo
+
+class MotorParticulas:
+    """
+    Motor de partículas compartilhado por todos os carros
+    Com numpy as partículas ficam em colunas (estrutura de arrays) atualizadas de forma vetorizada;
+    o desenho usa quadros pré-rotacionados/escalados de um atlas e um único Surface.blits
+    """
+    _COLUNAS = ("x", "y", "vx", "vy", "t", "vida", "ang", "escala0", "escala1", "alpha0")
+
+    def __init__(self, orcamento=ORCAMENTO_PARTICULAS):
+        self.orcamento = orcamento
+        self._tipos = []
+        self._indices_tipo = {}
+        self._pendentes = []       # Emissões do quadro ainda não copiadas para as colunas
+        self._por_dono = {}        # dono -> partículas vivas (inclui pendentes)
+        self._atlas = OrderedDict()  # (tipo, textura, ângulo, escala, alpha) -> (Surface, meia largura, meia altura)
+        self._quadros = OrderedDict()  # (tipo, textura, ângulo, escala) -> Surface rotacionada/escalada
+        self.n = 0
+        if np is not None:
+            for nome in self._COLUNAS:
+                setattr(self, nome, np.zeros(orcamento, dtype=np.float32))
+            self.tipo = np.zeros(orcamento, dtype=np.uint8)
+            self.dono = np.zeros(orcamento, dtype=np.int32)
+        else:
+            self._ps = []
+
+    # ---------------- Tipos ----------------
+    def registrar_tipo(self, nome, texturas, quadros_por_segundo=0.0):
+        """Registra (uma única vez) um tipo de partícula e suas texturas; retorna o índice do tipo"""
+        indice = self._indices_tipo.get(nome)
+        if indice is None:
+            indice = len(self._tipos)
+            self._tipos.append(_TipoParticula(nome, list(texturas), quadros_por_segundo))
+            self._indices_tipo[nome] = indice
+        return indice
+
+    def indice_tipo(self, nome):
+        return self._indices_tipo.get(nome)
+
+    # ---------------- Emissão ----------------
+    def emitir(self, tipo, dono, x, y, vx, vy, vida, ang, escala0, escala1, alpha0):
+        """Agenda uma partícula; ela entra nas colunas na próxima atualização ou desenho"""
+        self._pendentes.append((x, y, vx, vy, 0.0, vida, ang, escala0, escala1, alpha0, tipo, dono))
+        self._por_dono[dono] = self._por_dono.get(dono, 0) + 1
+
+    def quantidade(self, dono=None):
+        """Partículas vivas de um dono (ou de todos)"""
+        if dono is None:
+            vivas = self.n if np is not None else len(self._ps)
+            return vivas + len(self._pendentes)
+        return self._por_dono.get(dono, 0)
+
+    def _descontar(self, donos):
+        for dono in donos:
+            restante = self._por_dono.get(dono, 0) - 1
+            if restante > 0:
+                self._por_dono[dono] = restante
+            else:
+                self._por_dono.pop(dono, None)
+
+    def _descontar_array(self, donos):
+        if len(donos) == 0:
+            return
+        valores, contagens = np.unique(donos, return_counts=True)
+        for dono, quantidade in zip(valores.tolist(), contagens.tolist()):
+            restante = self._por_dono.get(dono, 0) - quantidade
+            if restante > 0:
+                self._por_dono[dono] = restante
+            else:
+                self._por_dono.pop(dono, None)
+
+    def _manter(self, vivos):
+        """Compacta as colunas mantendo só as partículas marcadas em vivos (máscara sobre [0:n])"""
+        n = self.n
+        self._descontar_array(self.dono[:n][~vivos])
+        m = int(np.count_nonzero(vivos))
+        for nome in self._COLUNAS + ("tipo", "dono"):
+            coluna = getattr(self, nome)
+            coluna[:m] = coluna[:n][vivos]
+        self.n = m
+
+    def _descarregar_pendentes(self):
+        pendentes = self._pendentes
+        if not pendentes:
+            return
+        self._pendentes = []
+        if len(pendentes) > self.orcamento:
+            self._descontar(p[11] for p in pendentes[:-self.orcamento])
+            pendentes = pendentes[-self.orcamento:]
+
+        if np is None:
+            excesso = len(self._ps) + len(pendentes) - self.orcamento
+            if excesso > 0:
+                # As partículas mais adiantadas na vida dão lugar às novas
+                self._ps.sort(key=lambda p: p.t / p.life)
+                self._descontar(p.dono for p in self._ps[-excesso:])
+                del self._ps[-excesso:]
+            for x, y, vx, vy, t, vida, ang, e0, e1, a0, tipo, dono in pendentes:
+                self._ps.append(Particula(x, y, vx, vy, vida, ang, e0, e1, a0, 0, tipo, dono))
+            return
+
+        k = len(pendentes)
+        excesso = self.n + k - self.orcamento
+        if excesso > 0:
+            n = self.n
+            progresso = self.t[:n] / self.vida[:n]
+            vivos = np.ones(n, dtype=bool)
+            vivos[np.argpartition(progresso, n - excesso)[n - excesso:]] = False
+            self._manter(vivos)
+
+        dados = np.array(pendentes, dtype=np.float64)
+        inicio, fim = self.n, self.n + k
+        for i, nome in enumerate(self._COLUNAS):
+            getattr(self, nome)[inicio:fim] = dados[:, i]
+        self.tipo[inicio:fim] = dados[:, 10]
+        self.dono[inicio:fim] = dados[:, 11]
+        self.n = fim
+
+    # ---------------- Atualização ----------------
+    def atualizar(self, dt):
+        """Avança todas as partículas de todos os carros (chamar uma vez por quadro)"""
+        self._descarregar_pendentes()
+        if np is None:
+            vivos = []
+            for p in self._ps:
+                if p.update(dt) and p.alive():
+                    vivos.append(p)
+                else:
+                    self._descontar((p.dono,))
+            self._ps = vivos
+            return
+        n = self.n
+        if n == 0:
+            return
+        self.t[:n] += dt
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        vivos = self.t[:n] < self.vida[:n]
+        if not vivos.all():
+            self._manter(vivos)
+
+    def descartar_dono(self, dono):
+        """Remove todas as partículas de um dono"""
+        self._descarregar_pendentes()
+        if self._por_dono.pop(dono, None) is None:
+            return
+        if np is None:
+            self._ps = [p for p in self._ps if p.dono != dono]
+            return
+        self._manter(self.dono[:self.n] != dono)
+
+    def limpar(self):
+        """Remove todas as partículas (o atlas é mantido)"""
+        self._pendentes = []
+        self._por_dono.clear()
+        self.n = 0
+        if np is None:
+            self._ps = []
+
+    # ---------------- Desenho ----------------
+    def _quadro(self, chave):
+        tipo, textura, q_ang, q_escala, q_alpha = chave
+        chave_quadro = chave[:4]
+        quadro = self._quadros.get(chave_quadro)
+        if quadro is None:
+            base = self._tipos[tipo].texturas[textura]
+            quadro = pygame.transform.rotozoom(base, q_ang * (360.0 / ANGULOS_ATLAS), q_escala * PASSO_ESCALA_ATLAS)
+            self._quadros[chave_quadro] = quadro
+            if len(self._quadros) > LIMITE_QUADROS_ATLAS:
+                self._quadros.popitem(last=False)
+        img = quadro.copy()
+        img.set_alpha(min(255, int((q_alpha + 0.5) * 256 / NIVEIS_ALPHA_ATLAS)))
+        item = (img, img.get_width() // 2, img.get_height() // 2)
+        self._atlas[chave] = item
+        if len(self._atlas) > LIMITE_QUADROS_ATLAS:
+            self._atlas.popitem(last=False)
+        return item
+
+    def _amostras_python(self, camera, dono):
+        """Colunas das partículas visíveis no modo sem numpy"""
+        for p in self._ps:
+            if dono is not None and p.dono != dono:
+                continue
+            escala, alpha = p.interp()
+            yield p.x, p.y, escala, alpha, p.ang, p.t, p.tipo
+
+    def desenhar(self, superficie, camera=None, dono=None):
+        """Desenha as partículas (de um dono, ou todas) com um único blits"""
+        self._descarregar_pendentes()
+        if self.quantidade(dono) == 0:
+            return
+        zoom = getattr(camera, "zoom_efetivo", getattr(camera, "zoom", 1.0)) if camera else 1.0
+        esquerda, topo = 0.0, 0.0
+        if camera:
+            r = camera.ret_visao()
+            esquerda = r.left + getattr(camera, 'offset_x', 0)
+            topo = r.top + getattr(camera, 'offset_y', 0)
+        largura_tela = superficie.get_width()
+        altura_tela = superficie.get_height()
+
+        tipos = self._tipos
+        if np is None:
+            chaves = []
+            posicoes = []
+            for x, y, escala, alpha, ang, t, tipo in self._amostras_python(camera, dono):
+                sx = int((x - esquerda) * zoom)
+                sy = int((y - topo) * zoom)
+                q_alpha = alpha * NIVEIS_ALPHA_ATLAS // 256
+                if q_alpha <= 0 or sx < -MARGEM_TELA or sx > largura_tela + MARGEM_TELA or sy < -MARGEM_TELA or sy > altura_tela + MARGEM_TELA:
+                    continue
+                info = tipos[tipo]
+                chaves.append((tipo, int(t * info.quadros_por_segundo) % len(info.texturas),
+                               int(ang % 360.0 * ANGULOS_ATLAS / 360.0) % ANGULOS_ATLAS,
+                               max(1, round(escala * zoom / PASSO_ESCALA_ATLAS)), q_alpha))
+                posicoes.append((sx, sy))
+        else:
+            n = self.n
+            if dono is None:
+                indices = slice(0, n)
+            else:
+                indices = np.flatnonzero(self.dono[:n] == dono)
+            x = self.x[indices]
+            y = self.y[indices]
+            t = self.t[indices]
+            k = np.clip(t / self.vida[indices], 0.0, 1.0)
+            e0 = self.escala0[indices]
+            escala = e0 + (self.escala1[indices] - e0) * k
+            alpha = self.alpha0[indices] * (1.0 - k * k)
+            # Mesma truncagem de int() usada por camera.mundo_para_tela
+            sx = ((x - esquerda) * zoom).astype(np.int32)
+            sy = ((y - topo) * zoom).astype(np.int32)
+            q_alpha = (alpha * (NIVEIS_ALPHA_ATLAS / 256.0)).astype(np.int32)
+            visiveis = ((sx >= -MARGEM_TELA) & (sx <= largura_tela + MARGEM_TELA) &
+                        (sy >= -MARGEM_TELA) & (sy <= altura_tela + MARGEM_TELA) & (q_alpha > 0))
+            if not visiveis.any():
+                return
+            tipo = self.tipo[indices][visiveis]
+            fps = np.array([info.quadros_por_segundo for info in tipos], dtype=np.float32)[tipo]
+            num_texturas = np.array([len(info.texturas) for info in tipos], dtype=np.int32)[tipo]
+            textura = (t[visiveis] * fps).astype(np.int32) % num_texturas
+            q_ang = (np.mod(self.ang[indices][visiveis], 360.0) * (ANGULOS_ATLAS / 360.0)).astype(np.int32) % ANGULOS_ATLAS
+            q_escala = np.maximum(1, np.rint(escala[visiveis] * (zoom / PASSO_ESCALA_ATLAS))).astype(np.int32)
+            chaves = zip(tipo.tolist(), textura.tolist(), q_ang.tolist(), q_escala.tolist(), q_alpha[visiveis].tolist())
+            posicoes = zip(sx[visiveis].tolist(), sy[visiveis].tolist())
+
+        atlas = self._atlas
+        blits = []
+        for chave, (sx, sy) in zip(chaves, posicoes):
+            item = atlas.get(chave)
+            if item is None:
+                item = self._quadro(chave)
+            img, meia_l, meia_a = item
+            blits.append((img, (sx - meia_l, sy - meia_a)))
+        superficie.blits(blits, doreturn=False)
+
+# Instância única usada por todos os carros
+motor_particulas = MotorParticulas()
+_ids_donos = itertools.count(1)
+
+def _carregar_texturas(pasta, quantidade, cor_fallback):
+    texturas = []
+    for i in range(quantidade):
+        caminho = os.path.join(DIR_EFFECTS, pasta, f"pixels_{i:02d}.png")
+        if os.path.exists(caminho):
+            try:
+                # Textura compartilhada por todos os emissores (decodificada uma única vez)
+                texturas.append(carregar_imagem(caminho, tamanho=(16, 16), dono=motor_particulas))
+            except Exception as e:
+                print(f"Erro ao carregar partícula {caminho}: {e}")
+    if not texturas:
+        # Fallback se não encontrar as texturas
+        fallback = pygame.Surface((16, 16), pygame.SRCALPHA)
+        fallback.fill(cor_fallback)
+        texturas.append(fallback)
+    return texturas
+
+class _Emissor:
+    """Base dos emissores: cada carro é um dono no motor compartilhado"""
+    def __init__(self, motor=None):
+        self.motor = motor if motor is not None else motor_particulas
+        self.dono = next(_ids_donos)
         self._accum = 0.0
+        # As partículas saem do motor junto com o emissor
+        weakref.finalize(self, self.motor.descartar_dono, self.dono)
+
+    @property
+    def quantidade(self):
+        return self.motor.quantidade(self.dono)
+
+    def limpar(self):
+        """Remove as partículas deste emissor e zera o acumulador de emissão"""
+        self._accum = 0.0
+        if self.motor.quantidade(self.dono):
+            self.motor.descartar_dono(self.dono)
+
+    def draw(self, surface, camera=None):
+        self.motor.desenhar(surface, camera, dono=self.dono)
+
+class EmissorFumaca(_Emissor):
+    def __init__(self, motor=None):
+        super().__init__(motor)
+        self.tipo = self.motor.indice_tipo("fumaca")
+        if self.tipo is None:
+            self.tipo = self.motor.registrar_tipo("fumaca", _carregar_texturas("smoke", 12, (100, 100, 100, 128)), 0.05)
         self.max_particulas = 80  # Equilibrado para boa performance e efeitos visuais
         self._particulas_por_frame = 2  # 2 partículas por frame para efeitos visuais
-        self._frame_atual = 0
 
     def spawn(self, x, y, dirx, diry, taxa_qps, dt):
         # Limitar número de partículas para performance
-        if len(self.ps) >= self.max_particulas:
+        if self.quantidade >= self.max_particulas:
             return
-            
+
         # Reduzir taxa de spawn para boa performance
         self._accum += taxa_qps * dt * 0.4  # Reduzir para 40% da taxa original
         n = int(self._accum)
-        if n <= 0: 
+        if n <= 0:
             return
         self._accum -= n
-        
+
         # Limitar número de partículas criadas por frame
-        n = min(n, self._particulas_por_frame)
-        
+        n = min(n, self._particulas_por_frame, self.max_particulas - self.quantidade)
+
         base_ang = math.atan2(diry, dirx) + math.pi
         for _ in range(n):
-            # Verificar limite novamente dentro do loop
-            if len(self.ps) >= self.max_particulas:
-                break
-                
             ang = base_ang + random.uniform(-0.05, 0.05)  # Dispersão ainda menor
             v = random.uniform(20, 35)  # Velocidade mais concentrada
             vx, vy = math.cos(ang)*v, math.sin(ang)*v
@@ -90,119 +389,37 @@ class EmissorFumaca:
             scale0 = random.uniform(1.5, 2.5)  # Tamanho menor inicial
             scale1 = scale0 * random.uniform(1.5, 2.0)  # Crescimento menor
             alpha0 = random.randint(120, 180)  # Menos opaco inicial
-            p = Particula(x, y, vx, vy, life, random.uniform(0,360), scale0, scale1, alpha0, 0, "fumaca")
-            self.ps.append(p)
-
-    def update(self, dt):
-        # Atualizar partículas e remover as que morreram
-        for p in self.ps:
-            p.update(dt)
-        self.ps = [p for p in self.ps if p.alive()]
-        self._frame_atual += 1
+            self.motor.emitir(self.tipo, self.dono, x, y, vx, vy, life, random.uniform(0, 360), scale0, scale1, alpha0)
 
-    def draw(self, surface, camera=None):
-        # Otimização: pré-calcular zoom e limites da tela
-        zoom = getattr(camera, "zoom", 1.0) if camera else 1.0
-        largura_tela = surface.get_width()
-        altura_tela = surface.get_height()
-        margem = 50
-        
-        for p in self.ps:
-            scale, alpha = p.interp()
-            x, y = p.x, p.y
-            if camera:
-                x, y = camera.mundo_para_tela(x, y)
-            
-            # Verificar se a partícula está dentro da tela (otimizado)
-            if x < -margem or x > largura_tela + margem or y < -margem or y > altura_tela + margem:
-                continue  # Pular partículas fora da tela
-            
-            # Usar textura de fumaça se disponível
-            if self.tex_fumaca:
-                # Usar índice individual de cada partícula (sem loop global)
-                tex_index = p.tex_index % len(self.tex_fumaca)
-                # Cache de transformações (limitado para não crescer muito)
-                if not hasattr(self, '_transform_cache'):
-                    self._transform_cache = {}
-                    self._cache_size_limit = 50
-                
-                cache_key = (tex_index, int(p.ang), int(scale * zoom * 10))
-                if cache_key not in self._transform_cache:
-                    if len(self._transform_cache) > self._cache_size_limit:
-                        # Limpar cache antigo (FIFO)
-                        oldest_key = next(iter(self._transform_cache))
-                        del self._transform_cache[oldest_key]
-                    img = pygame.transform.rotozoom(self.tex_fumaca[tex_index], p.ang, scale * zoom)
-                    self._transform_cache[cache_key] = img
-                else:
-                    img = self._transform_cache[cache_key]
-                
-                img.set_alpha(alpha)
-                surface.blit(img, img.get_rect(center=(int(x), int(y))))
-            else:
-                # Fallback: círculos coloridos mais visíveis
-                raio = max(8, int(scale * 20 * zoom))  # Raio maior e mínimo de 8 pixels
-                # Círculo externo cinza
-                pygame.draw.circle(surface, (150, 150, 150), (int(x), int(y)), raio)
-                # Círculo interno branco para contraste
-                pygame.draw.circle(surface, (255, 255, 255), (int(x), int(y)), max(2, raio // 2))
-                # Ponto central para máxima visibilidade
-                pygame.draw.circle(surface, (0, 0, 0), (int(x), int(y)), 1)
-
-class EmissorNitro:
-    def __init__(self):
-        # Carregar texturas de nitro
-        self.tex_nitro = []
-        for i in range(4):  # pixels_00.png a pixels_03.png
-            caminho = os.path.join(DIR_EFFECTS, "nitro", f"pixels_{i:02d}.png")
-            if os.path.exists(caminho):
-                try:
-                    img = pygame.image.load(caminho).convert_alpha()
-                    # Redimensionar para tamanho adequado
-                    img = pygame.transform.scale(img, (16, 16))
-                    self.tex_nitro.append(img)
-                    print(f"Nitro carregado: {caminho}")
-                except Exception as e:
-                    print(f"Erro ao carregar nitro {caminho}: {e}")
-        
-        if not self.tex_nitro:
-            # Fallback se não encontrar as texturas
-            print("Criando fallback para nitro")
-            self.tex_nitro = [pygame.Surface((16, 16), pygame.SRCALPHA)]
-            self.tex_nitro[0].fill((0, 255, 255, 200))
-        
-        self.ps = []
-        self._accum = 0.0
+class EmissorNitro(_Emissor):
+    def __init__(self, motor=None):
+        super().__init__(motor)
+        self.tipo = self.motor.indice_tipo("nitro")
+        if self.tipo is None:
+            self.tipo = self.motor.registrar_tipo("nitro", _carregar_texturas("nitro", 4, (0, 255, 255, 200)), 12.0)
         self.max_particulas = 30  # Aumentado para mais partículas visíveis
         self._particulas_por_frame = 2  # 2 partículas por frame para nitro mais visível
-        self._frame_atual = 0
 
     def spawn(self, x, y, dirx, diry, taxa_qps, dt):
         # Para nitro, sempre spawnar pelo menos uma partícula se chamado
         # Garantir que partículas sempre apareçam quando turbo está ativo
-        if len(self.ps) >= self.max_particulas:
-            # Se está cheio, remover partículas antigas para fazer espaço
-            # Manter apenas as mais recentes
-            self.ps = self.ps[-self.max_particulas//2:]  # Manter metade das mais recentes
-            
         # Sistema de acumulação melhorado para garantir spawn consistente
         self._accum += taxa_qps * dt
         n = int(self._accum)
-        
+
         # Garantir que pelo menos 1 partícula seja spawnada se acumulou algo
         if n <= 0 and self._accum > 0.01:
             n = 1
             self._accum = 0.0
-        
+
         if n > 0:
             self._accum -= n
             n = min(n, self._particulas_por_frame * 3)  # Permitir mais partículas por frame
-            
+            # Cheio: as partículas mais antigas somem com o tempo de vida; não passar do limite do carro
+            n = min(n, self.max_particulas - self.quantidade)
+
             base_ang = math.atan2(diry, dirx)
             for _ in range(n):
-                if len(self.ps) >= self.max_particulas:
-                    break
-                    
                 ang = base_ang + random.uniform(-0.2, 0.2)  # Menos dispersão para nitro mais concentrado
                 v = random.uniform(100, 200)  # Mais rápido que fumaça (aumentado)
                 vx, vy = math.cos(ang)*v, math.sin(ang)*v
@@ -210,33 +427,4 @@ class EmissorNitro:
                 scale0 = random.uniform(0.6, 1.0)  # Tamanho maior para melhor visibilidade
                 scale1 = scale0 * random.uniform(1.5, 2.5)  # Crescimento maior
                 alpha0 = random.randint(220, 255)  # Muito opaco para melhor visibilidade
-                p = Particula(x, y, vx, vy, life, random.uniform(0,360), scale0, scale1, alpha0, 0, "nitro")
-                self.ps.append(p)
-
-    def update(self, dt):
-        # Atualizar partículas e remover as que morreram
-        # Usar list comprehension que já filtra partículas mortas
-        self.ps = [p for p in self.ps if p.update(dt)]
-        self._frame_atual += 1
-
-    def draw(self, surface, camera=None):
-        zoom = getattr(camera, "zoom", 1.0) if camera else 1.0
-        largura_tela = surface.get_width()
-        altura_tela = surface.get_height()
-        margem = 50
-        
-        for p in self.ps:
-            scale, alpha = p.interp()
-            x, y = p.x, p.y
-            if camera:
-                x, y = camera.mundo_para_tela(x, y)
-            
-            # Verificar se está visível
-            if x < -margem or x > largura_tela + margem or y < -margem or y > altura_tela + margem:
-                continue
-            
-            # Usar textura animada de nitro
-            tex_index = int((self._frame_atual * 0.2) % len(self.tex_nitro))
-            img = pygame.transform.rotozoom(self.tex_nitro[tex_index], p.ang, scale * zoom)
-            img.set_alpha(alpha)
-            surface.blit(img, img.get_rect(center=(int(x), int(y))))
+                self.motor.emitir(self.tipo, self.dono, x, y, vx, vy, life, random.uniform(0, 360), scale0, scale1, alpha0)
@@ -0,0 +1,101 @@
+"""
+Perfis de física dos carros (data/carros_fisica.json)
+"padrao" tem todos os parâmetros de tuning; cada carro (por prefixo de cor) só lista o que muda
+Ângulos ficam em graus no arquivo (chaves *_graus) e em radianos no carro
+Na carga também são calculados os valores derivados que a física usava a cada passo: cargas estáticas
+por eixo, limites de força lateral dos pneus (mu_peak * Fz) e inversos usados na curva e na elipse
+"""
+import os
+import json
+import math
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
+
+DIR_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CAMINHO_PERFIS = os.path.join(DIR_PROJETO, "data", "carros_fisica.json")
+
+GRAVIDADE = 9.81
+
+# Valores usados sem arquivo (ou para chaves ausentes nele)
+PERFIL_PADRAO = {
+    "m": 1200.0, "L": 2.5, "b": 1.55, "Iz": 2400.0,
+    "Cf_base": 70000.0, "Cr_base": 50000.0, "mu_peak": 1.05, "mu_long": 1.0, "alpha_sat_graus": 12.5,
+    "engine_force_fwd": 250000.0, "engine_force_rev": 8000.0, "brake_force": 11000.0,
+    "drag": 0.0002, "roll_res": 0.02, "friction_base": 0.02, "V_TOP": 1200.0,
+    "steer_max_graus": 42.0, "steer_rate_graus": 520.0, "speed_steer_k": 0.016,
+    "counter_steer_assist": 0.24, "rear_grip_cut_hb": 0.45, "rear_grip_cut_throttle": 0.97,
+    "stability_k": 0.043, "yaw_damp_k": 3.8, "engine_yaw_push": 0.0006,
+    "power_oversteer_k": 0.12, "min_speed_oversteer": 100.0,
+    "drift_front_bias": 1.10, "drift_rear_cut": 0.72, "drift_long_damp": 0.80, "drift_yaw_boost": 0.0009,
+}
+# Chave do arquivo (graus) -> atributo do carro (radianos)
+_EM_GRAUS = {"alpha_sat_graus": "alpha_sat", "steer_max_graus": "steer_rad_max", "steer_rate_graus": "steer_rate"}
+
+_perfis = None
+
+
+class PerfilFisica:
+    """Parâmetros de um carro já convertidos para os atributos de CarroFisica, mais os derivados"""
+
+    def __init__(self, nome, valores):
+        self.nome = nome
+        parametros = {"g": GRAVIDADE}
+        for chave, padrao in PERFIL_PADRAO.items():
+            valor = float(valores.get(chave, padrao))
+            if chave in _EM_GRAUS:
+                parametros[_EM_GRAUS[chave]] = math.radians(valor)
+            else:
+                parametros[chave] = valor
+        parametros.update(derivados(parametros))
+        self.parametros = parametros
+
+    def aplicar(self, carro):
+        for nome, valor in self.parametros.items():
+            setattr(carro, nome, valor)
+
+
+def derivados(p):
+    """Valores fixos por carro calculados a partir dos parâmetros (recalcular se o tuning mudar)"""
+    m, g, L, b = p["m"], p["g"], p["L"], p["b"]
+    a = L - b
+    Fzf = m * g * (b / L)
+    Fzr = m * g * (a / L)
+    return {
+        "a": a,
+        "V_SOFT": 0.98 * p["V_TOP"],
+        "Fzf": Fzf,
+        "Fzr": Fzr,
+        # Saturação da força lateral por eixo e inversos da curva tanh(alpha / alpha_sat) e da elipse traseira
+        "Fy_max_f": p["mu_peak"] * Fzf,
+        "Fy_max_r": p["mu_peak"] * Fzr,
+        "inv_alpha_sat": 1.0 / p["alpha_sat"],
+        "inv_Fx_max_r": 1.0 / (p["mu_long"] * Fzr),
+        "inv_Fy_max_r": 1.0 / (p["mu_peak"] * Fzr),
+    }
+
+
+def carregar_perfis(caminho=CAMINHO_PERFIS):
+    """Prefixo -> PerfilFisica; "padrao" sempre existe (sem arquivo, com os valores de PERFIL_PADRAO)"""
+    dados = {}
+    if os.path.exists(caminho):
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            log.warning("Erro ao carregar perfis de física: %s", e)
+            dados = {}
+    padrao = dict(PERFIL_PADRAO)
+    padrao.update(dados.get("padrao", {}))
+    perfis = {"padrao": PerfilFisica("padrao", padrao)}
+    for prefixo, valores in dados.get("carros", {}).items():
+        perfis[prefixo] = PerfilFisica(prefixo, {**padrao, **valores})
+    return perfis
+
+
+def perfil_do_carro(prefixo_cor):
+    """Perfil do carro pelo prefixo do sprite (o padrão se ele não tiver um); o arquivo é lido uma vez"""
+    global _perfis
+    if _perfis is None:
+        _perfis = carregar_perfis()
+    return _perfis.get(prefixo_cor, _perfis["padrao"])
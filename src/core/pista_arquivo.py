@@ -0,0 +1,89 @@
+"""
+Arquivos de definição de pista (data/pistas/pista_N.json)
+Cada arquivo descreve uma pista completa: tiles, checkpoints, spawn points e posição de largada
+"""
+import os
+import json
+import hashlib
+
+DIR_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DIR_PISTAS_DADOS = os.path.join(DIR_PROJETO, "data", "pistas")
+
+CENTRO_PADRAO = (2500, 2500)
+POSICAO_INICIAL_PADRAO = (150, 50)
+
+def caminho_arquivo_pista(numero_pista):
+    """Retorna o caminho do arquivo de definição da pista"""
+    return os.path.join(DIR_PISTAS_DADOS, f"pista_{numero_pista}.json")
+
+def _normalizar(dados, numero_pista):
+    """Converte listas do JSON para as tuplas usadas pelo jogo e preenche campos ausentes"""
+    centro = dados.get("centro", CENTRO_PADRAO)
+    posicao_inicial = dados.get("posicao_inicial", POSICAO_INICIAL_PADRAO)
+    return {
+        "numero_pista": int(dados.get("numero_pista", numero_pista)),
+        "nome": dados.get("nome", f"Pista {numero_pista}"),
+        "centro": (int(centro[0]), int(centro[1])),
+        "posicao_inicial": (posicao_inicial[0], posicao_inicial[1]),
+        "tiles": [(str(t[0]), int(t[1]), int(t[2])) for t in dados.get("tiles", []) if len(t) >= 3],
+        # Checkpoints: (x, y, angulo) ou (x, y) para cálculo automático do ângulo
+        "checkpoints": [tuple(cp[:3]) for cp in dados.get("checkpoints", []) if len(cp) >= 2],
+        "spawn_points": [(float(sp[0]), float(sp[1])) for sp in dados.get("spawn_points", []) if len(sp) >= 2],
+    }
+
+def carregar_arquivo_pista(numero_pista):
+    """
+    Carrega a definição da pista do disco
+    Retorna um dicionário normalizado ou None se o arquivo não existir ou for inválido
+    """
+    caminho = caminho_arquivo_pista(numero_pista)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        return _normalizar(dados, numero_pista)
+    except Exception as e:
+        print(f"Erro ao carregar arquivo da pista {numero_pista}: {e}")
+        return None
+
+def _formatar_lista(itens):
+    """Uma entrada por linha: mantém o arquivo legível e fácil de comparar em diffs"""
+    if not itens:
+        return "[]"
+    linhas = [json.dumps(list(item), ensure_ascii=False) for item in itens]
+    return "[\n    " + ",\n    ".join(linhas) + "\n  ]"
+
+def salvar_arquivo_pista(numero_pista, dados):
+    """Salva a definição da pista (mesmo formato lido por carregar_arquivo_pista)"""
+    dados = _normalizar(dados, numero_pista)
+    os.makedirs(DIR_PISTAS_DADOS, exist_ok=True)
+    conteudo = (
+        "{\n"
+        f'  "numero_pista": {dados["numero_pista"]},\n'
+        f'  "nome": {json.dumps(dados["nome"], ensure_ascii=False)},\n'
+        f'  "centro": {json.dumps(list(dados["centro"]))},\n'
+        f'  "posicao_inicial": {json.dumps(list(dados["posicao_inicial"]))},\n'
+        f'  "tiles": {_formatar_lista(dados["tiles"])},\n'
+        f'  "checkpoints": {_formatar_lista(dados["checkpoints"])},\n'
+        f'  "spawn_points": {_formatar_lista(dados["spawn_points"])}\n'
+        "}\n"
+    )
+    with open(caminho_arquivo_pista(numero_pista), 'w', encoding='utf-8') as f:
+        f.write(conteudo)
+    return True
+
+def hash_definicao_pista(dados):
+    """Hash do conteúdo da definição (chave do bundle compilado)"""
+    canonico = json.dumps(
+        {
+            "centro": list(dados["centro"]),
+            "posicao_inicial": list(dados["posicao_inicial"]),
+            "tiles": [list(t) for t in dados["tiles"]],
+            "checkpoints": [list(cp) for cp in dados["checkpoints"]],
+            "spawn_points": [list(sp) for sp in dados["spawn_points"]],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(canonico.encode("utf-8")).hexdigest()
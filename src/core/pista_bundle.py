@@ -0,0 +1,182 @@
+"""
+Bundle compilado de pista
+Guarda em um único arquivo binário o raster da pista já montado (comprimido por chunk),
+a malha de materiais, o campo de distância até a borda, a linha de corrida e os checkpoints, identificado pelo hash do conteúdo da definição
+"""
+import os
+import sys
+import json
+import zlib
+import struct
+import pygame
+from array import array
+from core.pista_arquivo import DIR_PISTAS_DADOS, hash_definicao_pista
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
+
+# Usado quando o cache do usuário não pode ser criado
+DIR_BUNDLES_PROJETO = os.path.join(DIR_PISTAS_DADOS, "cache")
+NOME_APLICACAO = "TurboRacer"
+_dir_bundles = None
+
+BUNDLE_MAGICO = b"TRPISTA\0"
+# Incrementar quando o formato ou a montagem da pista mudar (invalida bundles antigos)
+BUNDLE_VERSAO = 4
+# magico, versao, tamanho dos metadados, tamanho do raster, tamanho da malha, tamanho do campo de distância,
+# tamanho da linha de corrida
+_CABECALHO = struct.Struct("<8sHIIIII")
+
+def diretorio_cache_usuario():
+    """Diretório de cache do usuário (TURBO_RACER_CACHE, %LOCALAPPDATA%, ~/Library/Caches ou XDG_CACHE_HOME)"""
+    personalizado = os.environ.get("TURBO_RACER_CACHE")
+    if personalizado:
+        return personalizado
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, NOME_APLICACAO, "cache")
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~/Library/Caches"), NOME_APLICACAO)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "turbo-racer")
+
+def diretorio_bundles():
+    """Pasta dos bundles: cache do usuário, ou data/pistas/cache se ele não for gravável"""
+    global _dir_bundles
+    if _dir_bundles is None:
+        _dir_bundles = DIR_BUNDLES_PROJETO
+        for candidato in (os.path.join(diretorio_cache_usuario(), "pistas"), DIR_BUNDLES_PROJETO):
+            try:
+                os.makedirs(candidato, exist_ok=True)
+            except OSError:
+                continue
+            if os.access(candidato, os.W_OK):
+                _dir_bundles = candidato
+                break
+    return _dir_bundles
+
+def chave_bundle(dados_pista, posicao_centro, tamanho_base, assinatura_assets=""):
+    """
+    Chave do bundle: hash da definição + parâmetros de montagem + versão do formato
+    assinatura_assets identifica os arquivos de tile (nome, tamanho, mtime): editar uma PNG invalida o bundle
+    """
+    base = hash_definicao_pista(dados_pista)
+    extra = f"{BUNDLE_VERSAO}:{posicao_centro[0]},{posicao_centro[1]}:{tamanho_base[0]}x{tamanho_base[1]}:{assinatura_assets}"
+    return f"pista_{dados_pista['numero_pista']}_{base[:16]}_{zlib.crc32(extra.encode('utf-8')):08x}"
+
+def caminho_bundle(chave):
+    return os.path.join(diretorio_bundles(), f"{chave}.bin")
+
+def comprimir_chunk(superficie):
+    """Comprime o raster RGB de um chunk para o bundle"""
+    # O fundo é uma tile repetida: zlib rápido comprime o raster ~20x
+    return zlib.compress(pygame.image.tobytes(superficie, "RGB"), 1)
+
+def descomprimir_chunk(dados, tamanho):
+    """Reconstrói a superfície de um chunk comprimido por comprimir_chunk"""
+    return pygame.image.frombytes(zlib.decompress(dados), tamanho, "RGB")
+
+def salvar_bundle(chave, metadados, largura, altura, tamanho_chunk, chunks, malha, campo=None, linha=None):
+    """
+    Grava o bundle em disco; falhas apenas desativam o cache
+    chunks: dicionário (cx, cy) -> bytes de comprimir_chunk
+    campo: CampoDistancia opcional (gravado como float32)
+    linha: LinhaCorrida opcional (amostras x, y, velocidade em float32)
+    """
+    try:
+        os.makedirs(diretorio_bundles(), exist_ok=True)
+        indice = sorted(chunks.keys())
+        metadados = dict(metadados, largura=largura, altura=altura, chave=chave,
+                         tamanho_chunk=tamanho_chunk,
+                         chunks=[[cx, cy, len(chunks[(cx, cy)])] for cx, cy in indice])
+        bytes_campo = b""
+        if campo is not None:
+            metadados["campo"] = [campo.largura, campo.altura, campo.escala]
+            bytes_campo = zlib.compress(campo.dados.tobytes(), 6)
+        bytes_linha = b""
+        if linha is not None:
+            metadados["linha"] = {"espacamento": linha.espacamento, "amostras": linha.amostras,
+                                  "checkpoints": linha.indices_checkpoints}
+            bytes_linha = zlib.compress(linha.dados.tobytes(), 6)
+        bytes_meta = json.dumps(metadados).encode("utf-8")
+        bytes_raster = b"".join(chunks[c] for c in indice)
+        bytes_malha = zlib.compress(bytes(malha.dados), 6)
+
+        caminho = caminho_bundle(chave)
+        caminho_tmp = caminho + ".tmp"
+        with open(caminho_tmp, 'wb') as f:
+            f.write(_CABECALHO.pack(BUNDLE_MAGICO, BUNDLE_VERSAO, len(bytes_meta), len(bytes_raster), len(bytes_malha), len(bytes_campo), len(bytes_linha)))
+            f.write(bytes_meta)
+            f.write(bytes_raster)
+            f.write(bytes_malha)
+            f.write(bytes_campo)
+            f.write(bytes_linha)
+        os.replace(caminho_tmp, caminho)
+        _remover_bundles_antigos(metadados.get("numero_pista"), chave)
+        return True
+    except Exception as e:
+        log.warning("Erro ao salvar bundle da pista: %s", e)
+        return False
+
+def _remover_bundles_antigos(numero_pista, chave_atual):
+    """Remove bundles de versões anteriores da mesma pista"""
+    prefixo = f"pista_{numero_pista}_"
+    diretorio = diretorio_bundles()
+    for nome in os.listdir(diretorio):
+        if nome.startswith(prefixo) and nome.endswith(".bin") and nome != f"{chave_atual}.bin":
+            try:
+                os.remove(os.path.join(diretorio, nome))
+            except OSError:
+                pass
+
+def carregar_bundle(chave):
+    """
+    Carrega um bundle compilado
+    Retorna (metadados, chunks, dados_malha, dados_campo, dados_linha) ou None se não existir ou estiver inválido
+    chunks: dicionário (cx, cy) -> bytes comprimidos (descomprimidos sob demanda)
+    dados_campo: array('f') do campo de distância (dimensões em metadados["campo"]) ou None
+    dados_linha: array('f') da linha de corrida (x, y, velocidade por amostra; metadados["linha"]) ou None
+    """
+    caminho = caminho_bundle(chave)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, 'rb') as f:
+            magico, versao, n_meta, n_raster, n_malha, n_campo, n_linha = _CABECALHO.unpack(f.read(_CABECALHO.size))
+            if magico != BUNDLE_MAGICO or versao != BUNDLE_VERSAO:
+                return None
+            metadados = json.loads(f.read(n_meta).decode("utf-8"))
+            bytes_raster = f.read(n_raster)
+            dados_malha = bytearray(zlib.decompress(f.read(n_malha)))
+            bytes_campo = zlib.decompress(f.read(n_campo)) if n_campo else b""
+            bytes_linha = zlib.decompress(f.read(n_linha)) if n_linha else b""
+
+        largura, altura = metadados["largura"], metadados["altura"]
+        if len(dados_malha) != largura * altura:
+            return None
+
+        chunks = {}
+        posicao = 0
+        for cx, cy, tamanho in metadados["chunks"]:
+            chunks[(cx, cy)] = bytes_raster[posicao:posicao + tamanho]
+            posicao += tamanho
+        if posicao != len(bytes_raster):
+            return None
+        
+        dados_campo = None
+        if bytes_campo and "campo" in metadados:
+            dados_campo = array('f')
+            dados_campo.frombytes(bytes_campo)
+            if len(dados_campo) != metadados["campo"][0] * metadados["campo"][1]:
+                dados_campo = None
+        
+        dados_linha = None
+        if bytes_linha and "linha" in metadados:
+            dados_linha = array('f')
+            dados_linha.frombytes(bytes_linha)
+            if len(dados_linha) != metadados["linha"]["amostras"] * 3:
+                dados_linha = None
+        return metadados, chunks, dados_malha, dados_campo, dados_linha
+    except Exception as e:
+        log.warning("Erro ao carregar bundle da pista (%s): %s", caminho, e)
+        return None
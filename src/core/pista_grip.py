@@ -3,6 +3,11 @@ import os
 import math
 from config import LARGURA, ALTURA
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 COR_PISTA_CINZA_MIN = 88
 COR_PISTA_CINZA_MAX = 91
 COR_PISTA_ESPECIAL = 165
@@ -11,11 +16,196 @@ COR_GRAMA_VERDE = (0, 200, 0)
 
 TOLERANCIA_COR = 10
 
+# Materiais da malha pré-calculada (um byte por pixel do mundo)
+MATERIAL_GRAMA = 0
+MATERIAL_ASFALTO = 1
+MATERIAL_ZEBRA = 2      # Zebras vermelhas e faixas brancas
+MATERIAL_LARGADA = 3    # Faixa branca da tile de largada/chegada
+MATERIAL_DESCONHECIDO = 255  # Ainda não classificado (modo sem numpy)
+
+# Com o campo de distância, o carro está na grama quando o centro fica a menos de
+# raio * FRACAO_RAIO_GRAMA da borda (equivale a ~30% do anel de 8 amostras fora da pista)
+FRACAO_RAIO_GRAMA = 0.6
+
+# Largura das faixas de colunas processadas por vez ao classificar com numpy
+COLUNAS_POR_FAIXA = 512
+
 def _cor_proxima(cor, alvo, tol):
     r, g, b = cor[0], cor[1], cor[2]
     ar, ag, ab = alvo[0], alvo[1], alvo[2]
     return abs(r - ar) <= tol and abs(g - ag) <= tol and abs(b - ab) <= tol
 
+def _classificar_cor(r, g, b):
+    """Classifica uma cor da pista em um material (mesmas heurísticas de eh_pixel_grama_grip)"""
+    if COR_PISTA_CINZA_MIN <= r <= COR_PISTA_CINZA_MAX:
+        return MATERIAL_ASFALTO
+    if r == COR_PISTA_ESPECIAL or r == COR_BRANCO:
+        return MATERIAL_ZEBRA
+    
+    if g > r + 30 and g > b + 30:
+        return MATERIAL_GRAMA
+    
+    if abs(r - g) < 10 and abs(g - b) < 10:
+        return MATERIAL_ASFALTO
+    
+    return MATERIAL_GRAMA
+
+def _offsets_anel(raio, num_pontos=8):
+    """Offsets inteiros do anel de amostragem usado por verificar_na_grama_grip"""
+    offsets = []
+    for i in range(num_pontos):
+        angulo = (2 * math.pi * i) / num_pontos
+        ox = raio * math.cos(angulo)
+        oy = raio * math.sin(angulo)
+        # Mesmo truncamento de int(x + ox) para x inteiro positivo (ruído de ponto flutuante vira 0)
+        ox = round(ox) if abs(ox - round(ox)) < 1e-9 else math.floor(ox)
+        oy = round(oy) if abs(oy - round(oy)) < 1e-9 else math.floor(oy)
+        offsets.append((ox, oy))
+    return tuple(offsets)
+
+class MalhaMateriais:
+    """
+    Malha compacta (uint8, uma célula por pixel) com o material de cada ponto do mundo.
+    Construída uma vez por pista; consultas de grama/pista viram um acesso O(1) a um bytearray.
+    """
+    def __init__(self, largura, altura, dados, superficie=None):
+        self.largura = largura
+        self.altura = altura
+        self.dados = dados
+        # Sem numpy a malha é preenchida sob demanda a partir da superfície
+        self._superficie = superficie
+        self._cache_aneis = {}
+    
+    def get_width(self):
+        return self.largura
+    
+    def get_height(self):
+        return self.altura
+    
+    def material_em(self, x, y):
+        """Retorna o material em (x, y) ou None se estiver fora do mundo"""
+        x = int(x)
+        y = int(y)
+        if x < 0 or y < 0 or x >= self.largura or y >= self.altura:
+            return None
+        indice = y * self.largura + x
+        material = self.dados[indice]
+        if material == MATERIAL_DESCONHECIDO:
+            cor = self._superficie.get_at((x, y))
+            material = _classificar_cor(cor[0], cor[1], cor[2])
+            self.dados[indice] = material
+        return material
+    
+    def eh_grama(self, x, y):
+        """Equivalente a eh_pixel_grama_grip: fora do mundo não conta como grama"""
+        return self.material_em(x, y) == MATERIAL_GRAMA
+    
+    def na_grama(self, x, y, raio=15):
+        """Equivalente a verificar_na_grama_grip: centro ou mais de 30% do anel na grama"""
+        if self.eh_grama(x, y):
+            return True
+        offsets = self._cache_aneis.get(raio)
+        if offsets is None:
+            offsets = _offsets_anel(raio)
+            self._cache_aneis[raio] = offsets
+        x = int(x)
+        y = int(y)
+        grama_count = 0
+        for ox, oy in offsets:
+            if self.material_em(x + ox, y + oy) == MATERIAL_GRAMA:
+                grama_count += 1
+        return grama_count > len(offsets) * 0.3
+    
+    def marcar_largada(self, x, y, largura, altura):
+        """Converte as faixas brancas dentro do retângulo dado em linha de largada"""
+        x0 = max(0, int(x))
+        y0 = max(0, int(y))
+        x1 = min(self.largura, int(x + largura))
+        y1 = min(self.altura, int(y + altura))
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self._superficie is not None:
+            # Garantir que a região esteja classificada antes de converter
+            for py in range(y0, y1):
+                for px in range(x0, x1):
+                    self.material_em(px, py)
+        tabela = bytearray(range(256))
+        tabela[MATERIAL_ZEBRA] = MATERIAL_LARGADA
+        tabela = bytes(tabela)
+        for py in range(y0, y1):
+            inicio = py * self.largura + x0
+            fim = py * self.largura + x1
+            self.dados[inicio:fim] = self.dados[inicio:fim].translate(tabela)
+
+def _classificar_pixels(pixels):
+    """Classifica um array (w, h, 3) de pixels com numpy; retorna materiais indexados [y, x]"""
+    r = pixels[..., 0].astype(np.int16)
+    g = pixels[..., 1].astype(np.int16)
+    b = pixels[..., 2].astype(np.int16)
+    
+    material = np.full(r.shape, MATERIAL_GRAMA, dtype=np.uint8)
+    cinza = (np.abs(r - g) < 10) & (np.abs(g - b) < 10)
+    verde = (g > r + 30) & (g > b + 30)
+    material[cinza & ~verde] = MATERIAL_ASFALTO
+    material[(r >= COR_PISTA_CINZA_MIN) & (r <= COR_PISTA_CINZA_MAX)] = MATERIAL_ASFALTO
+    material[(r == COR_PISTA_ESPECIAL) | (r == COR_BRANCO)] = MATERIAL_ZEBRA
+    
+    # surfarray é indexado como [x, y]; a malha é armazenada por linhas [y, x]
+    return material.T
+
+def nova_malha_materiais(fonte):
+    """
+    Cria uma malha vazia para a fonte (Surface ou MundoChunks)
+    Células não classificadas são resolvidas na primeira consulta a partir da fonte
+    """
+    largura, altura = fonte.get_size()
+    dados = bytearray([MATERIAL_DESCONHECIDO]) * (largura * altura)
+    return MalhaMateriais(largura, altura, dados, superficie=fonte)
+
+def classificar_regiao(malha, surface, x0, y0):
+    """
+    Classifica de uma vez os pixels de surface, posicionada em (x0, y0) no mundo
+    Sem numpy não faz nada: a malha continua sendo preenchida sob demanda
+    """
+    if np is None:
+        return False
+    
+    largura, altura = surface.get_size()
+    x1 = min(malha.largura, x0 + largura)
+    y1 = min(malha.altura, y0 + altura)
+    if x1 <= x0 or y1 <= y0:
+        return True
+    
+    # Visão numpy (sem cópia) do bytearray da malha
+    destino = np.frombuffer(malha.dados, dtype=np.uint8).reshape(malha.altura, malha.largura)
+    pixels = pygame.surfarray.pixels3d(surface)
+    try:
+        for fx in range(x0, x1, COLUNAS_POR_FAIXA):
+            fx1 = min(x1, fx + COLUNAS_POR_FAIXA)
+            destino[y0:y1, fx:fx1] = _classificar_pixels(pixels[fx - x0:fx1 - x0, 0:y1 - y0])
+    finally:
+        del pixels
+        del destino
+    return True
+
+def construir_malha_materiais(fonte):
+    """
+    Classifica todos os pixels da fonte (Surface ou MundoChunks) de uma vez.
+    Com numpy usa acesso em bloco (surfarray); sem numpy a malha começa
+    vazia e cada pixel é classificado na primeira consulta.
+    """
+    malha = nova_malha_materiais(fonte)
+    if np is None:
+        return malha
+    
+    if hasattr(fonte, 'iterar_regioes'):
+        regioes = fonte.iterar_regioes()
+    else:
+        regioes = [(0, 0, fonte)]
+    for x0, y0, superficie in regioes:
+        classificar_regiao(malha, superficie, x0, y0)
+    return malha
+
 def eh_pixel_transitavel_grip(surface, x, y):
     return True
 
@@ -29,23 +219,17 @@ def eh_pixel_grama_grip(surface, x, y):
     except (IndexError, ValueError):
         return False
     
-    if (COR_PISTA_CINZA_MIN <= r <= COR_PISTA_CINZA_MAX) or \
-       (r == COR_PISTA_ESPECIAL) or \
-       (r == COR_BRANCO):
-        return False
-    
-    if g > r + 30 and g > b + 30:
-        return True
-    
-    if abs(r - g) < 10 and abs(g - b) < 10:
-        return False
-    
-    return True
+    return _classificar_cor(r, g, b) == MATERIAL_GRAMA
 
 def verificar_colisao_grip(surface, x, y, raio=15):
     return False
 
 def verificar_na_grama_grip(surface, x, y, raio=15):
+    if hasattr(surface, 'distancia'):
+        # Campo de distância: uma única amostra substitui o anel de 8 pontos
+        return surface.distancia(x, y) < raio * FRACAO_RAIO_GRAMA
+    if isinstance(surface, MalhaMateriais):
+        return surface.na_grama(x, y, raio)
     if eh_pixel_grama_grip(surface, x, y):
         return True
     pontos_verificacao = []
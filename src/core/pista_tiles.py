@@ -5,13 +5,39 @@ Carrega tiles de assets/pistas/ e monta a pista baseado em definições
 import pygame
 import os
 import json
-from config import LARGURA, ALTURA
+import hashlib
+from collections import OrderedDict
+from core.pista_grip import (MalhaMateriais, nova_malha_materiais, classificar_regiao,
+                             MATERIAL_GRAMA, MATERIAL_DESCONHECIDO)
+from core.pista_arquivo import carregar_arquivo_pista, caminho_arquivo_pista
+from core.pista_bundle import chave_bundle, carregar_bundle, salvar_bundle, comprimir_chunk, descomprimir_chunk
+from core.mundo_chunks import MundoChunks
+from core.assets import carregar_imagem
+from core.campo_distancia import CampoDistancia, construir_campo_distancia
+from core.linha_corrida import LinhaCorrida, construir_linha_corrida
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
 
 # Caminhos
 DIR_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DIR_PISTAS = os.path.join(DIR_PROJETO, "assets", "images", "pistas")
 DIR_LAPS = os.path.join(DIR_PROJETO, "data", "laps")
 
+# Pistas já compiladas no processo (reiniciar a corrida não relê o bundle): chave -> estado
+_PISTAS_EM_MEMORIA = OrderedDict()
+MAX_PISTAS_EM_MEMORIA = 2
+
+def assinatura_tiles():
+    """Assinatura dos arquivos de tile (nome, tamanho, mtime) usada na chave do bundle"""
+    h = hashlib.sha1()
+    if os.path.isdir(DIR_PISTAS):
+        for nome in sorted(os.listdir(DIR_PISTAS)):
+            if nome.lower().endswith(".png"):
+                info = os.stat(os.path.join(DIR_PISTAS, nome))
+                h.update(f"{nome}:{info.st_size}:{info.st_mtime_ns};".encode("utf-8"))
+    return h.hexdigest()[:16]
+
 class GerenciadorTiles:
     """Gerencia o carregamento e acesso às tiles de pista"""
     
@@ -31,10 +57,10 @@ class GerenciadorTiles:
                 caminho = os.path.join(DIR_PISTAS, nome)
                 if os.path.exists(caminho):
                     chave = f"b-{b}-{c}"
-                    self.tiles[chave] = pygame.image.load(caminho).convert_alpha()
+                    self.tiles[chave] = carregar_imagem(caminho, dono=self)
                     tiles_carregadas += 1
                 else:
-                    print(f"AVISO: Tile não encontrada: {caminho}")
+                    log.warning("Tile não encontrada: %s", caminho)
         
         # Tiles retas horizontais (st-h-3)
         for k in range(1, 5):
@@ -42,29 +68,29 @@ class GerenciadorTiles:
             caminho = os.path.join(DIR_PISTAS, nome)
             if os.path.exists(caminho):
                 chave = f"st-h-3-k{k}"
-                self.tiles[chave] = pygame.image.load(caminho).convert_alpha()
+                self.tiles[chave] = carregar_imagem(caminho, dono=self)
                 tiles_carregadas += 1
             else:
-                print(f"AVISO: Tile não encontrada: {caminho}")
+                log.warning("Tile não encontrada: %s", caminho)
         
         # Tile reta horizontal base
         nome = "st-h-3.png"
         caminho = os.path.join(DIR_PISTAS, nome)
         if os.path.exists(caminho):
-            self.tiles["st-h-3"] = pygame.image.load(caminho).convert_alpha()
+            self.tiles["st-h-3"] = carregar_imagem(caminho, dono=self)
             tiles_carregadas += 1
         else:
-            print(f"AVISO: Tile não encontrada: {caminho}")
+            log.warning("Tile não encontrada: %s", caminho)
         
         # Tile reta horizontal com listra (largada/chegada)
         nome = "st-h-3-ch.png"
         caminho = os.path.join(DIR_PISTAS, nome)
         if os.path.exists(caminho):
-            self.tiles["st-h-3-ch"] = pygame.image.load(caminho).convert_alpha()
+            self.tiles["st-h-3-ch"] = carregar_imagem(caminho, dono=self)
             tiles_carregadas += 1
-            print(f"Tile de largada/chegada carregada: {caminho}")
+            log.debug("Tile de largada/chegada carregada: %s", caminho)
         else:
-            print(f"AVISO: Tile de largada/chegada não encontrada: {caminho}")
+            log.warning("Tile de largada/chegada não encontrada: %s", caminho)
         
         # Tiles retas verticais (st-v-3)
         for k in range(1, 5):
@@ -72,32 +98,32 @@ class GerenciadorTiles:
             caminho = os.path.join(DIR_PISTAS, nome)
             if os.path.exists(caminho):
                 chave = f"st-v-3-k{k}"
-                self.tiles[chave] = pygame.image.load(caminho).convert_alpha()
+                self.tiles[chave] = carregar_imagem(caminho, dono=self)
                 tiles_carregadas += 1
             else:
-                print(f"AVISO: Tile não encontrada: {caminho}")
+                log.warning("Tile não encontrada: %s", caminho)
         
         # Tile reta vertical base
         nome = "st-v-3.png"
         caminho = os.path.join(DIR_PISTAS, nome)
         if os.path.exists(caminho):
-            self.tiles["st-v-3"] = pygame.image.load(caminho).convert_alpha()
+            self.tiles["st-v-3"] = carregar_imagem(caminho, dono=self)
             tiles_carregadas += 1
         else:
-            print(f"AVISO: Tile não encontrada: {caminho}")
+            log.warning("Tile não encontrada: %s", caminho)
         
         # Tile overhead (fundo)
         nome = "overhead_tile.png"
         caminho = os.path.join(DIR_PISTAS, nome)
         if os.path.exists(caminho):
-            self.overhead_tile = pygame.image.load(caminho).convert_alpha()
+            self.overhead_tile = carregar_imagem(caminho, dono=self)
             tiles_carregadas += 1
-            print(f"Tile de fundo carregada: {caminho}")
+            log.debug("Tile de fundo carregada: %s", caminho)
         else:
-            print(f"ERRO: Tile de fundo não encontrada: {caminho}")
+            log.error("Tile de fundo não encontrada: %s", caminho)
         
-        print(f"Total de tiles carregadas: {tiles_carregadas}")
-        print(f"Tiles disponíveis: {list(self.tiles.keys())}")
+        log.debug("Total de tiles carregadas: %s", tiles_carregadas)
+        log.debug("Tiles disponíveis: %s", list(self.tiles.keys()))
     
     def obter_tile(self, nome):
         """Obtém uma tile pelo nome"""
@@ -107,6 +133,40 @@ class GerenciadorTiles:
         """Obtém a tile de fundo"""
         return self.overhead_tile
 
+class IndiceTiles:
+    """
+    Índice espacial (grade uniforme) das tiles posicionadas no mundo
+    Cada célula guarda os índices das tiles que a cruzam; consultas devolvem as tiles na ordem de desenho
+    """
+    def __init__(self, tiles_posicionadas, tamanho_celula=512):
+        self.tiles_posicionadas = tiles_posicionadas
+        self.tamanho_celula = tamanho_celula
+        self.celulas = {}
+        for indice, (_, rect) in enumerate(tiles_posicionadas):
+            for celula in self._celulas_do_rect(rect):
+                self.celulas.setdefault(celula, []).append(indice)
+
+    def _celulas_do_rect(self, rect):
+        t = self.tamanho_celula
+        for cy in range(rect.top // t, (rect.bottom - 1) // t + 1):
+            for cx in range(rect.left // t, (rect.right - 1) // t + 1):
+                yield cx, cy
+
+    def consultar(self, area):
+        """Retorna [(tile, rect)] das tiles que cruzam a área, na ordem de desenho"""
+        area = pygame.Rect(area)
+        if area.width <= 0 or area.height <= 0:
+            return []
+        indices = set()
+        for celula in self._celulas_do_rect(area):
+            indices.update(self.celulas.get(celula, ()))
+        resultado = []
+        for indice in sorted(indices):
+            tile, rect = self.tiles_posicionadas[indice]
+            if rect.colliderect(area):
+                resultado.append((tile, rect))
+        return resultado
+
 class PistaTiles:
     """
     Gerencia a construção e renderização de pistas usando tiles
@@ -118,404 +178,222 @@ class PistaTiles:
         """
         self.largura = largura
         self.altura = altura
-        self.gerenciador_tiles = GerenciadorTiles()
-        self.surface_pista = None
+        # Tamanho pedido (antes da expansão do layout) e centro da última pista construída; refazem o layout
+        # sob demanda quando a pista veio da memória ou do bundle
+        self._tamanho_pedido = (largura, altura)
+        self._posicao_centro = None
+        self._layout_calculado = False
+        self._gerenciador_tiles = None  # Tiles carregadas só quando a pista precisa ser desenhada/compilada
+        self.mundo_chunks = None  # Mundo da pista em chunks (substitui a superfície única)
+        self.tiles_posicionadas = []  # (tile, Rect no mundo) na ordem de desenho
+        self.offset_x_superficie = 0  # Deslocamento do mundo expandido em relação ao tamanho pedido
+        self.offset_y_superficie = 0
+        self.indice_tiles = IndiceTiles([])
+        self._chunks_bundle = None
+        self.malha_materiais = None  # Malha uint8 de materiais (grama/asfalto/zebra/largada)
+        self.campo_distancia = None  # Distância com sinal até a borda da pista (resolução reduzida)
+        self.linha_corrida = None  # Linha de corrida e perfil de velocidade da IA (LinhaCorrida)
         self.definicao_pista = None
-        self.posicao_inicial = (0, 0)  # Posição inicial do jogador
+        self.dados_pista = None  # Conteúdo de data/pistas/pista_N.json
         
+    @property
+    def gerenciador_tiles(self):
+        if self._gerenciador_tiles is None:
+            self._gerenciador_tiles = GerenciadorTiles()
+        return self._gerenciador_tiles
+
     def carregar_definicao_pista(self, numero_pista):
         """
-        Carrega a definição de uma pista (hardcoded por enquanto, como no GRIP)
+        Carrega a definição de uma pista de data/pistas/pista_N.json
         Retorna uma lista de tuplas: (nome_tile, offset_x, offset_y)
         """
-        # Por enquanto, vamos usar as definições do GRIP
-        # Futuramente pode ser carregado de JSON
-        definicoes = {
-            1: self._definicao_pista_1,
-            2: self._definicao_pista_2,
-            3: self._definicao_pista_3,
-            4: self._definicao_pista_4,
-            5: self._definicao_pista_5,
-            6: self._definicao_pista_6,
-            7: self._definicao_pista_7,
-            8: self._definicao_pista_8,
-            9: self._definicao_pista_9,
-        }
-        
-        if numero_pista in definicoes:
-            return definicoes[numero_pista]()
-        return []
-    
-    def _definicao_pista_1(self):
-        """Definição da pista 1 (baseada no GRIP)"""
-        # Posição inicial relativa ao centro da pista
-        # A tile "st-h-3-ch" (linha de largada/chegada) está em (0, -100) relativa ao centro
-        # No GRIP, a linha de largada está em (position[0]+50, position[1]-100)
-        # Mas a tile horizontal está centrada em (0, -100)
-        # Para centralizar os carros na largura da pista, vamos usar a posição do GRIP ajustada
-        # A linha de largada no GRIP é vertical em x+50, mas a tile é horizontal
-        # Vamos posicionar no centro da tile horizontal, que está em (0, -100)
-        # Mas precisamos ajustar o Y para ficar mais centralizado na altura da pista
-        # A tile está em y=-100, mas podemos ajustar um pouco para centralizar melhor
-        # No GRIP, a linha de largada está em (position[0]+50, position[1]-100)
-        # A tile st-h-3-ch está em (0, -100) relativa ao centro
-        # Vamos usar a posição do GRIP (x+50) mas ajustar Y para centralizar melhor na altura da pista
-        # Isso coloca os carros na linha de largada, mas mais centralizados verticalmente
-        self.posicao_inicial_relativa = (50, -50)  # Relativo ao centro (2500, 2500) - alinhado com linha de largada do GRIP, mais centralizado
-        
-        return [
-            ("st-h-3-k2", -1000, -115),
-            ("st-h-3", -700, -100),
-            ("st-h-3", -400, -100),
-            ("st-h-3", -100, -100),
-            ("st-h-3-ch", 0, -100),  # Tile de largada/chegada com listra branca
-            ("st-h-3-k4", 300, -100),
-            ("b-4-1", 600, -100),
-            ("b-3-1", 600, 300),
-            ("st-h-3-k3", 300, 385),
-            ("st-h-3", 0, 400),
-            ("st-h-3", -300, 400),
-            ("st-h-3-k1", -600, 400),
-            ("b-1-2", -1100, 400),
-            ("b-2-2", -1100, 900),
-            ("st-h-3-k2", -600, 1085),
-            ("st-h-3", -300, 1100),
-            ("st-h-3", 0, 1100),
-            ("st-h-3", 300, 1100),
-            ("st-h-3", 600, 1100),
-            ("st-h-3-k3", 900, 1085),
-            ("b-3-4", 1200, 700),
-            ("st-v-3-k3", 1585, 400),
-            ("st-v-3-k4", 1585, 100),
-            ("b-4-1", 1500, -300),
-            ("b-2-1", 1100, -400),
-            ("b-4-4", 700, -1100),
-            ("b-1-1", 300, -1100),
-            ("b-3-1", 200, -700),
-            ("st-h-3-k3", -100, -615),
-            ("st-h-3-k2", -100, -615),
-            ("b-2-2", -600, -800),
-            ("b-4-1", -700, -1200),
-            ("st-h-3-k4", -1000, -1200),
-            ("st-h-3-k1", -1000, -1200),
-            ("b-1-4", -1700, -1200),
-            ("b-2-4", -1700, -500),
-        ]
-    
-    def _definicao_pista_2(self):
-        """Definição da pista 2"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("st-h-3-k4", -100, -100),
-            ("b-4-1", 200, -100),
-            ("b-3-2", 100, 300),
-            ("b-1-1", -300, 500),
-            ("b-2-2", -300, 900),
-            ("st-h-3-k2", 200, 1085),
-            ("st-h-3-k3", 500, 1085),
-            ("b-3-1", 800, 1000),
-            ("st-v-3-k3", 885, 700),
-            ("st-v-3", 900, 400),
-            ("st-v-3", 900, 100),
-            ("st-v-3-k4", 885, -200),
-            ("b-4-2", 700, -700),
-            ("b-2-1", 300, -800),
-            ("b-4-2", 100, -1300),
-            ("b-1-1", -300, -1300),
-            ("b-3-2", -500, -900),
-            ("st-h-3-k3", -800, -715),
-            ("st-h-3", -1100, -700),
-            ("st-h-3-k1", -1400, -700),
-            ("b-1-1", -1800, -700),
-            ("st-v-3-k1", -1800, -300),
-            ("st-v-3-k2", -1800, 0),
-            ("b-2-2", -1800, 300),
-            ("st-h-3-k2", -1300, 485),
-            ("b-3-1", -1000, 400),
-            ("b-1-2", -900, -100),
-            ("st-h-3-k1", -400, -100),
-        ]
-    
-    def _definicao_pista_3(self):
-        """Definição da pista 3"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("st-h-3-k1", -900, -100),
-            ("st-h-3", -600, -100),
-            ("st-h-3", -300, -100),
-            ("st-h-3", 0, -100),
-            ("st-h-3-k4", 200, -100),
-            ("b-4-1", 500, -100),
-            ("b-3-1", 500, 300),
-            ("b-1-1", 100, 400),
-            ("b-2-1", 100, 800),
-            ("st-h-3-k2", 500, 885),
-            ("b-3-1", 800, 800),
-            ("b-1-1", 900, 400),
-            ("b-4-1", 1300, 400),
-            ("st-v-3-k4", 1385, 800),
-            ("st-v-3-k3", 1385, 900),
-            ("b-3-4", 1000, 1200),
-            ("st-h-3-k3", 700, 1585),
-            ("st-h-3-k2", 400, 1585),
-            ("b-2-1", 0, 1500),
-            ("b-4-1", -100, 1100),
-            ("b-1-1", -500, 1100),
-            ("b-3-1", -600, 1500),
-            ("b-2-2", -1100, 1400),
-            ("b-1-2", -1100, 900),
-            ("b-3-1", -600, 800),
-            ("b-4-1", -600, 400),
-            ("st-h-3-k4", -900, 400),
-            ("st-h-3-k2", -900, 385),
-            ("b-2-1", -1300, 300),
-            ("b-1-1", -1300, -100),
-        ]
-    
-    def _definicao_pista_4(self):
-        """Definição da pista 4"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("st-h-3-k1", -100, -100),
-            ("st-h-3", 100, -100),
-            ("st-h-3", 400, -100),
-            ("st-h-3", 700, -100),
-            ("st-h-3", 1000, -100),
-            ("st-h-3-k4", 1200, -100),
-            ("b-4-1", 1500, -100),
-            ("b-2-2", 1600, 300),
-            ("b-3-2", 2100, 300),
-            ("b-1-1", 2300, -100),
-            ("b-4-3", 2700, -100),
-            ("st-v-3-k4", 2985, 500),
-            ("b-3-3", 2700, 800),
-            ("st-h-3-k3", 2400, 1085),
-            ("st-h-3", 2100, 1100),
-            ("st-h-3-k2", 1800, 1085),
-            ("b-2-2", 1300, 900),
-            ("b-4-2", 1100, 400),
-            ("b-1-1", 700, 400),
-            ("st-v-3-k1", 700, 800),
-            ("b-2-2", 700, 1100),
-            ("b-4-1", 1200, 1300),
-            ("b-3-3", 1000, 1700),
-            ("b-2-1", 600, 1900),
-            ("b-4-1", 500, 1500),
-            ("b-2-1", 100, 1400),
-            ("st-v-3-k2", 100, 1100),
-            ("b-4-1", 0, 700),
-            ("b-2-3", -600, 400),
-            ("b-1-2", -600, -100),
-        ]
-    
-    def _definicao_pista_5(self):
-        """Definição da pista 5"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("b-1-1", -1300, -100),
-            ("st-h-3-k1", -900, -100),
-            ("st-h-3", -600, -100),
-            ("st-h-3", -300, -100),
-            ("st-h-3", 0, -100),
-            ("st-h-3", 300, -100),
-            ("st-h-3", 600, -100),
-            ("st-h-3-k4", 900, -100),
-            ("b-4-4", 1200, -100),
-            ("st-v-3-k4", 1585, 600),
-            ("b-3-1", 1500, 900),
-            ("b-2-1", 1100, 900),
-            ("b-4-1", 1000, 500),
-            ("st-h-3-k4", 700, 500),
-            ("st-h-3-k1", 400, 500),
-            ("b-1-1", 0, 500),
-            ("b-2-1", 0, 900),
-            ("b-4-1", 400, 1000),
-            ("st-v-3-k4", 485, 1400),
-            ("b-3-3", 200, 1700),
-            ("st-h-3-k3", -100, 1985),
-            ("st-h-3", -300, 2000),
-            ("st-h-3-k2", -600, 1985),
-            ("b-2-1", -1000, 1900),
-            ("b-1-1", -1000, 1500),
-            ("b-3-1", -600, 1400),
-            ("st-v-3-k3", -515, 1100),
-            ("st-v-3-k4", -515, 800),
-            ("b-4-1", -600, 400),
-            ("st-h-3-k4", -900, 400),
-            ("st-h-3-k2", -900, 385),
-            ("b-2-1", -1300, 300),
-            ("b-1-1", -1300, -100),
-        ]
-    
-    def _definicao_pista_6(self):
-        """Definição da pista 6"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("b-1-2", -1800, -100),
-            ("st-h-3-k1", -1300, -100),
-            ("st-h-3", -1200, -100),
-            ("st-h-3", -900, -100),
-            ("st-h-3", -600, -100),
-            ("st-h-3", -300, -100),
-            ("st-h-3", 0, -100),
-            ("st-h-3", 300, -100),
-            ("st-h-3-k4", 600, -100),
-            ("b-4-2", 900, -100),
-            ("st-v-3-k4", 1085, 400),
-            ("st-v-3", 1100, 700),
-            ("st-v-3", 1100, 1000),
-            ("st-v-3", 1100, 1300),
-            ("st-v-3", 1100, 1600),
-            ("st-v-3-k3", 1085, 1900),
-            ("b-3-4", 700, 2200),
-            ("b-2-2", 200, 2400),
-            ("st-v-3-k2", 200, 2100),
-            ("st-v-3", 200, 1800),
-            ("st-v-3-k4", 185, 1500),
-            ("b-4-4", -200, 800),
-            ("st-h-3-k4", -500, 800),
-            ("st-h-3", -800, 800),
-            ("st-h-3-k2", -1100, 785),
-            ("b-2-4", -1800, 400),
-        ]
-    
-    def _definicao_pista_7(self):
-        """Definição da pista 7"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("b-1-1", -700, -100),
-            ("st-h-3-k1", -300, -100),
-            ("st-h-3-k4", 0, -100),
-            ("b-4-1", 300, -100),
-            ("b-3-2", 200, 300),
-            ("b-1-1", -200, 500),
-            ("b-2-3", -200, 900),
-            ("b-3-4", 400, 800),
-            ("st-v-3-k3", 785, 500),
-            ("st-v-3-k1", 800, 400),
-            ("b-1-4", 800, -300),
-            ("b-3-4", 1500, -700),
-            ("b-4-4", 1500, -1400),
-            ("b-1-3", 900, -1400),
-            ("b-3-2", 700, -800),
-            ("b-2-1", 300, -700),
-            ("b-4-3", 0, -1300),
-            ("b-1-4", -700, -1300),
-            ("b-3-4", -1100, -600),
-            ("b-1-1", -1500, -200),
-            ("b-2-3", -1500, 200),
-            ("b-3-2", -900, 300),
-            ("b-1-1", -700, -100),
-        ]
-    
-    def _definicao_pista_8(self):
-        """Definição da pista 8"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("b-1-4", -1200, -100),
-            ("st-h-3-k1", -500, -100),
-            ("st-h-3", -200, -100),
-            ("st-h-3-k3", 100, -115),
-            ("b-3-1", 400, -200),
-            ("b-1-4", 500, -900),
-            ("b-4-4", 1200, -900),
-            ("b-3-4", 1200, -200),
-            ("b-1-1", 800, 200),
-            ("st-v-3-k1", 800, 600),
-            ("st-v-3-k2", 800, 600),
-            ("b-2-1", 800, 900),
-            ("b-3-2", 1200, 800),
-            ("b-1-1", 1400, 400),
-            ("st-h-3-k1", 1800, 400),
-            ("st-h-3", 2100, 400),
-            ("st-h-3-k3", 2400, 385),
-            ("b-3-3", 2700, 100),
-            ("b-1-1", 3000, -300),
-            ("b-4-4", 3400, -300),
-            ("b-3-4", 3400, 400),
-            ("b-1-4", 2700, 800),
-            ("b-3-3", 2400, 1500),
-            ("st-h-3-k3", 2100, 1785),
-            ("st-h-3", 1800, 1800),
-            ("st-h-3", 1500, 1800),
-            ("st-h-3", 1200, 1800),
-            ("st-h-3-k2", 900, 1785),
-            ("b-2-1", 500, 1700),
-            ("b-4-1", 400, 1300),
-            ("st-h-3-k4", 100, 1300),
-            ("st-h-3", -200, 1300),
-            ("st-h-3-k2", -500, 1285),
-            ("b-2-4", -1200, 900),
-            ("st-v-3-k2", -1200, 600),
-            ("st-v-3-k1", -1200, 600),
-        ]
-    
-    def _definicao_pista_9(self):
-        """Definição da pista 9"""
-        centro_x, centro_y = LARGURA // 2, ALTURA // 2
-        self.posicao_inicial = (centro_x + 50, centro_y - 50)
-        
-        return [
-            ("b-1-1", -800, -100),
-            ("st-h-3-k1", -400, -100),
-            ("st-h-3", -100, -100),
-            ("st-h-3-k3", 200, -115),
-            ("b-3-1", 500, -200),
-            ("b-1-1", 600, -600),
-            ("b-4-4", 1000, -600),
-            ("st-v-3-k4", 1385, 100),
-            ("st-v-3-k3", 1385, 100),
-            ("b-3-4", 1000, 400),
-            ("b-2-1", 600, 700),
-            ("b-4-1", 500, 300),
-            ("b-1-3", -100, 300),
-            ("b-2-3", -100, 900),
-            ("b-4-2", 500, 1200),
-            ("st-v-3-k4", 685, 1700),
-            ("st-v-3-k2", 700, 1700),
-            ("b-2-2", 700, 2000),
-            ("b-4-1", 1200, 2200),
-            ("b-3-2", 1100, 2600),
-            ("st-h-3-k3", 800, 2785),
-            ("st-h-3", 500, 2800),
-            ("st-h-3-k2", 200, 2785),
-            ("b-2-4", -500, 2400),
-            ("st-v-3-k2", -500, 2100),
-            ("st-v-3", -500, 1800),
-            ("st-v-3-k4", -515, 1600),
-            ("b-4-2", -700, 1100),
-            ("b-2-3", -1300, 800),
-            ("b-1-1", -1300, 400),
-            ("b-3-1", -900, 300),
-        ]
+        self.dados_pista = carregar_arquivo_pista(numero_pista)
+        if self.dados_pista is None:
+            log.warning("Definição da pista %s não encontrada em %s",
+                        numero_pista, caminho_arquivo_pista(numero_pista))
+            return []
+        
+        self.posicao_inicial_relativa = self.dados_pista["posicao_inicial"]
+        return self.dados_pista["tiles"]
     
     def construir_pista(self, numero_pista, posicao_centro=None):
         """
-        Constrói uma superfície grande para a pista (estilo GRIP)
-        No GRIP, a pista é desenhada dinamicamente, mas precisamos de uma superfície
-        para verificação de colisão
+        Constrói o mundo da pista (estilo GRIP) dividido em chunks
+        Os chunks são montados sob demanda a partir das tiles (ou do bundle compilado)
+        e mantidos em cache LRU; a malha de materiais cobre o mundo inteiro
+        Retorna o MundoChunks (mesma interface de tamanho de uma Surface)
         """
         if posicao_centro is None:
             posicao_centro = (self.largura // 2, self.altura // 2)
         
         # Carregar definição da pista primeiro para calcular limites reais
         self.definicao_pista = self.carregar_definicao_pista(numero_pista)
-        print(f"Definição da pista {numero_pista} carregada: {len(self.definicao_pista)} tiles")
-        
+        log.debug("Definição da pista %s carregada: %s tiles", numero_pista, len(self.definicao_pista))
+        
+        chave = None
+        if self.dados_pista is not None:
+            chave = chave_bundle(self.dados_pista, posicao_centro, self._tamanho_pedido, assinatura_tiles())
+        self._posicao_centro = posicao_centro
+        self._layout_calculado = False
+        self._chunks_bundle = None
+        
+        # Pista já compilada: tamanho e offsets vêm dela; as tiles só são carregadas se algo precisar delas
+        if chave is not None and self._restaurar_da_memoria(chave, adotar_layout=True):
+            log.info("Pista %s reaproveitada da memória (%sx%s)", numero_pista, self.largura, self.altura)
+            return self.mundo_chunks
+        
+        if chave is not None and self._carregar_do_bundle(chave, numero_pista, adotar_layout=True):
+            return self.mundo_chunks
+        
+        self._calcular_layout(posicao_centro)
+        self.mundo_chunks = MundoChunks(self.largura, self.altura, self._assar_chunk)
+        
+        # Montar cada chunk uma vez: classificar a malha e comprimir o raster para o bundle
+        self.malha_materiais = nova_malha_materiais(self.mundo_chunks)
+        tamanho_chunk = self.mundo_chunks.tamanho_chunk
+        chunks_comprimidos = {}
+        for x0, y0, superficie in self.mundo_chunks.iterar_regioes():
+            classificar_regiao(self.malha_materiais, superficie, x0, y0)
+            if chave is not None:
+                chunks_comprimidos[(x0 // tamanho_chunk, y0 // tamanho_chunk)] = comprimir_chunk(superficie)
+        
+        for tile, rect in self.tiles_posicionadas:
+            if tile is self.gerenciador_tiles.obter_tile("st-h-3-ch"):
+                self.malha_materiais.marcar_largada(rect.x, rect.y, rect.width, rect.height)
+        log.debug("Malha de materiais construída: %sx%s", self.malha_materiais.largura, self.malha_materiais.altura)
+        self.campo_distancia = construir_campo_distancia(self.malha_materiais)
+        log.debug("Campo de distância construído: %sx%s (escala %s)",
+                  self.campo_distancia.largura, self.campo_distancia.altura, self.campo_distancia.escala)
+        self._construir_linha_corrida()
+        
+        if chave is not None:
+            metadados = {
+                "numero_pista": numero_pista,
+                "offset_x_superficie": self.offset_x_superficie,
+                "offset_y_superficie": self.offset_y_superficie,
+                "posicao_inicial": list(self.dados_pista["posicao_inicial"]),
+                "checkpoints": [list(cp) for cp in self.dados_pista["checkpoints"]],
+                "spawn_points": [list(sp) for sp in self.dados_pista["spawn_points"]],
+            }
+            if salvar_bundle(chave, metadados, self.largura, self.altura, tamanho_chunk,
+                             chunks_comprimidos, self.malha_materiais, self.campo_distancia, self.linha_corrida):
+                log.info("Bundle da pista %s compilado: %s", numero_pista, chave)
+            self._chunks_bundle = chunks_comprimidos
+            self._guardar_na_memoria(chave)
+        else:
+            # Sem arquivo de definição: tentar encontrar o centro real na largada
+            log.debug("Tentando encontrar centro real da pista na largada...")
+            centro_largada = self.encontrar_centro_pista_na_largada()
+            if centro_largada:
+                log.debug("Centro encontrado! Atualizando posição inicial para: %s", centro_largada)
+                self.posicao_inicial_relativa = centro_largada
+        
+        return self.mundo_chunks
+    
+    def construir_dados_fisicos(self, numero_pista, posicao_centro=None):
+        """
+        Prepara só o que a física, a IA e a corrida usam: malha de materiais, campo de distância e
+        dados da pista (checkpoints, spawn points, posição inicial)
+        Com a pista em memória ou no bundle compilado nenhuma textura é carregada; sem eles a pista
+        é compilada uma vez (o bundle gerado serve às próximas execuções)
+        Retorna a malha de materiais
+        """
+        if posicao_centro is None:
+            posicao_centro = (self.largura // 2, self.altura // 2)
+        self.definicao_pista = self.carregar_definicao_pista(numero_pista)
+        if self.dados_pista is not None:
+            chave = chave_bundle(self.dados_pista, posicao_centro, self._tamanho_pedido, assinatura_tiles())
+            self._posicao_centro = posicao_centro
+            self._layout_calculado = False
+            # Sem as tiles o layout (tamanho expandido e offsets) vem da pista compilada
+            if (self._restaurar_da_memoria(chave, adotar_layout=True) or
+                    self._carregar_do_bundle(chave, numero_pista, adotar_layout=True)):
+                return self.malha_materiais
+        self.construir_pista(numero_pista, posicao_centro)
+        return self.malha_materiais
+
+    def _carregar_do_bundle(self, chave, numero_pista, adotar_layout=False):
+        """
+        Carrega raster, malha e campo do bundle compilado; False se não houver bundle válido
+        adotar_layout: usa o tamanho do mundo e os offsets gravados no bundle em vez de exigir os de _calcular_layout
+        """
+        bundle = carregar_bundle(chave)
+        if bundle is None:
+            return False
+        metadados, chunks, dados_malha, dados_campo, dados_linha = bundle
+        if adotar_layout:
+            self.largura, self.altura = metadados["largura"], metadados["altura"]
+            self.offset_x_superficie = metadados["offset_x_superficie"]
+            self.offset_y_superficie = metadados["offset_y_superficie"]
+        elif (metadados["largura"], metadados["altura"]) != (self.largura, self.altura):
+            return False
+        self._chunks_bundle = chunks
+        self.mundo_chunks = MundoChunks(self.largura, self.altura, self._assar_chunk,
+                                        tamanho_chunk=metadados["tamanho_chunk"])
+        # Malha construída sem numpy pode ter células ainda não classificadas
+        fonte_lazy = self.mundo_chunks if MATERIAL_DESCONHECIDO in dados_malha else None
+        self.malha_materiais = MalhaMateriais(self.largura, self.altura, dados_malha, superficie=fonte_lazy)
+        if dados_campo is not None:
+            largura_campo, altura_campo, escala_campo = metadados["campo"]
+            self.campo_distancia = CampoDistancia(largura_campo, altura_campo, escala_campo, dados_campo)
+        else:
+            self.campo_distancia = construir_campo_distancia(self.malha_materiais)
+        if dados_linha is not None:
+            info_linha = metadados["linha"]
+            self.linha_corrida = LinhaCorrida(info_linha["espacamento"], dados_linha, info_linha["checkpoints"])
+        else:
+            self._construir_linha_corrida()
+        log.info("Pista %s carregada do bundle compilado (%sx%s)", numero_pista, self.largura, self.altura)
+        self._guardar_na_memoria(chave)
+        return True
+
+    def _construir_linha_corrida(self):
+        """Calcula a linha de corrida pelos checkpoints do arquivo da pista (None sem arquivo ou sem caminho)"""
+        self.linha_corrida = None
+        if self.dados_pista is not None and self.campo_distancia is not None:
+            self.linha_corrida = construir_linha_corrida(self.campo_distancia, self.dados_pista["checkpoints"])
+            if self.linha_corrida is not None:
+                log.info("Linha de corrida calculada: %s amostras", len(self.linha_corrida))
+
+    def _guardar_na_memoria(self, chave):
+        """Mantém a pista compilada no processo para reinícios instantâneos"""
+        _PISTAS_EM_MEMORIA[chave] = (self.mundo_chunks, self._chunks_bundle, self.malha_materiais,
+                                     self.campo_distancia, self.linha_corrida,
+                                     (self.offset_x_superficie, self.offset_y_superficie))
+        _PISTAS_EM_MEMORIA.move_to_end(chave)
+        while len(_PISTAS_EM_MEMORIA) > MAX_PISTAS_EM_MEMORIA:
+            _PISTAS_EM_MEMORIA.popitem(last=False)
+    
+    def _restaurar_da_memoria(self, chave, adotar_layout=False):
+        """
+        Reaproveita a pista compilada por uma PistaTiles anterior (chunks já montados continuam no cache)
+        adotar_layout: como em _carregar_do_bundle
+        """
+        estado = _PISTAS_EM_MEMORIA.get(chave)
+        if estado is None:
+            return False
+        mundo_chunks, chunks_bundle, malha, campo, linha, offsets = estado
+        if adotar_layout:
+            self.largura, self.altura = mundo_chunks.get_size()
+            self.offset_x_superficie, self.offset_y_superficie = offsets
+        elif mundo_chunks.get_size() != (self.largura, self.altura):
+            return False
+        _PISTAS_EM_MEMORIA.move_to_end(chave)
+        # Os chunks ainda não montados passam a ser assados por esta instância
+        mundo_chunks.assar_chunk = self._assar_chunk
+        self.mundo_chunks = mundo_chunks
+        self._chunks_bundle = chunks_bundle
+        self.malha_materiais = malha
+        self.campo_distancia = campo
+        self.linha_corrida = linha
+        return True
+    
+    def _calcular_layout(self, posicao_centro):
+        """
+        Calcula o tamanho do mundo e a posição absoluta de cada tile
+        Preenche self.largura/altura, offsets da superfície e self.tiles_posicionadas
+        """
+        self.largura, self.altura = self._tamanho_pedido
         # Calcular limites reais das tiles para expandir a superfície se necessário
         centro_x, centro_y = posicao_centro
         min_x = float('inf')
@@ -545,14 +423,15 @@ class PistaTiles:
         largura_expandida = int(max_x - min_x)
         altura_expandida = int(max_y - min_y)
         
-        # Limitar tamanho máximo para evitar problemas de memória (pygame tem limite de ~32767 pixels)
+        # Limitar tamanho máximo (coordenadas de Rect do pygame são limitadas)
         tamanho_maximo = 30000
         if largura_expandida > tamanho_maximo or altura_expandida > tamanho_maximo:
-            print(f"AVISO: Pista muito grande ({largura_expandida}x{altura_expandida}), limitando a {tamanho_maximo}")
+            log.warning("Pista muito grande (%sx%s), limitando a %s",
+                        largura_expandida, altura_expandida, tamanho_maximo)
             largura_expandida = min(largura_expandida, tamanho_maximo)
             altura_expandida = min(altura_expandida, tamanho_maximo)
         
-        # Atualizar dimensões da superfície
+        # Atualizar dimensões do mundo
         self.largura = largura_expandida
         self.altura = altura_expandida
         
@@ -566,131 +445,111 @@ class PistaTiles:
         self.offset_x_superficie = offset_x_superficie
         self.offset_y_superficie = offset_y_superficie
         
-        print(f"Superfície expandida: {largura_expandida}x{altura_expandida} (original: {self.largura}x{self.altura})")
-        print(f"Limites das tiles: min_x={min_x:.0f}, max_x={max_x:.0f}, min_y={min_y:.0f}, max_y={max_y:.0f}")
-        print(f"Offset da superfície: ({offset_x_superficie:.0f}, {offset_y_superficie:.0f})")
+        log.debug("Mundo expandido: %sx%s", largura_expandida, altura_expandida)
+        log.debug("Offset da superfície: (%.0f, %.0f)", offset_x_superficie, offset_y_superficie)
         
-        # Criar superfície expandida para a pista
-        self.surface_pista = pygame.Surface((largura_expandida, altura_expandida))
-        
-        # Preencher com fundo verde usando overhead_tile repetida (estilo GRIP)
-        overhead = self.gerenciador_tiles.obter_overhead()
-        if overhead:
-            tile_w, tile_h = overhead.get_size()
-            print(f"Desenhando fundo com tile {tile_w}x{tile_h}")
-            # Preencher toda a superfície expandida com tiles de fundo
-            for y in range(0, altura_expandida + tile_h, tile_h):
-                for x in range(0, largura_expandida + tile_w, tile_w):
-                    self.surface_pista.blit(overhead, (x, y))
-            print(f"Fundo verde desenhado em superfície {largura_expandida}x{altura_expandida}")
-        else:
-            # Fallback: preencher com verde sólido
-            print("AVISO: Usando verde sólido (overhead_tile não encontrada)")
-            self.surface_pista.fill((0, 200, 0))
-        
-        # Renderizar todas as tiles da pista no novo sistema de coordenadas
-        tiles_desenhadas = 0
+        # Posicionar as tiles no novo sistema de coordenadas (na ordem de desenho)
+        self.tiles_posicionadas = []
         tiles_fora_limites = 0
-        
         for nome_tile, offset_x, offset_y in self.definicao_pista:
             tile = self.gerenciador_tiles.obter_tile(nome_tile)
             if tile:
-                # Calcular posição absoluta na superfície expandida
-                # Ajustar para o novo sistema de coordenadas
                 x = centro_x_ajustado + offset_x
                 y = centro_y_ajustado + offset_y
                 
                 # Verificar se está dentro dos limites da superfície expandida
                 if 0 <= x < largura_expandida and 0 <= y < altura_expandida:
-                    self.surface_pista.blit(tile, (int(x), int(y)))
-                    tiles_desenhadas += 1
+                    self.tiles_posicionadas.append((tile, pygame.Rect(int(x), int(y), *tile.get_size())))
                 else:
                     tiles_fora_limites += 1
-                    print(f"AVISO: Tile {nome_tile} fora dos limites expandidos: ({x}, {y})")
+                    log.warning("Tile %s fora dos limites expandidos: (%s, %s)", nome_tile, x, y)
             else:
-                print(f"ERRO: Tile não encontrada: {nome_tile}")
-        
-        print(f"Tiles da pista desenhadas: {tiles_desenhadas}/{len(self.definicao_pista)} (fora dos limites: {tiles_fora_limites})")
-        print(f"Centro da pista: ({centro_x}, {centro_y})")
-        if self.definicao_pista:
-            print(f"Primeira tile em: ({centro_x + self.definicao_pista[0][1]}, {centro_y + self.definicao_pista[0][2]})")
-        
-        # Após construir a pista, tentar encontrar o centro real na largada
-        # Isso garante que a posição inicial seja calculada corretamente
-        print("Tentando encontrar centro real da pista na largada...")
-        centro_largada = self.encontrar_centro_pista_na_largada()
-        if centro_largada:
-            print(f"Centro encontrado! Atualizando posição inicial para: {centro_largada}")
-            self.posicao_inicial_relativa = centro_largada
-        
-        return self.surface_pista
+                log.error("Tile não encontrada: %s", nome_tile)
+        
+        self.indice_tiles = IndiceTiles(self.tiles_posicionadas)
+        self._layout_calculado = True
+        log.debug("Tiles da pista posicionadas: %s/%s (fora dos limites: %s)",
+                  len(self.tiles_posicionadas), len(self.definicao_pista), tiles_fora_limites)
     
-    def desenhar_pista_dinamica(self, surface_destino, posicao_jogador):
+    def _garantir_layout(self):
+        """Posiciona as tiles (carregando-as) quando a pista veio da memória ou do bundle e algo vai desenhá-las"""
+        if not self._layout_calculado and self._posicao_centro is not None and self.definicao_pista:
+            self._calcular_layout(self._posicao_centro)
+    
+    def _assar_chunk(self, superficie, x0, y0):
+        """Desenha na superfície do chunk a região do mundo que começa em (x0, y0)"""
+        if self._chunks_bundle is not None:
+            tamanho_chunk = self.mundo_chunks.tamanho_chunk
+            dados = self._chunks_bundle.get((x0 // tamanho_chunk, y0 // tamanho_chunk))
+            if dados is not None:
+                superficie.blit(descomprimir_chunk(dados, superficie.get_size()), (0, 0))
+                return
+        
+        self.desenhar_regiao_tiles(superficie, pygame.Rect(x0, y0, *superficie.get_size()))
+    
+    def desenhar_regiao_tiles(self, surface_destino, rect_mundo):
         """
-        Desenha a pista dinamicamente baseada na posição do jogador (estilo GRIP)
-        posicao_jogador: (x, y) - posição atual do jogador no mundo
+        Desenha a região do mundo direto das tiles (fundo + tiles que cruzam a região)
+        rect_mundo é desenhado em (0, 0) da superfície de destino, em escala 1:1
         """
-        # Desenhar fundo verde usando overhead_tile repetida
+        x0, y0 = rect_mundo.x, rect_mundo.y
+        largura, altura = rect_mundo.size
+        self._garantir_layout()
+        
+        # Fundo verde usando overhead_tile repetida, alinhada à origem do mundo (estilo GRIP)
         overhead = self.gerenciador_tiles.obter_overhead()
         if overhead:
             tile_w, tile_h = overhead.get_size()
-            # Calcular offset do fundo baseado na posição (estilo GRIP)
-            bg_x = int(posicao_jogador[0]) % tile_w
-            bg_y = int(posicao_jogador[1]) % tile_h
-            
-            # Desenhar tiles de fundo cobrindo toda a tela visível
-            for y in range(-tile_h, surface_destino.get_height() + tile_h, tile_h):
-                for x in range(-tile_w, surface_destino.get_width() + tile_w, tile_w):
-                    surface_destino.blit(overhead, (x - bg_x, y - bg_y))
+            surface_destino.blits(
+                [(overhead, (x, y))
+                 for y in range(-(y0 % tile_h), altura, tile_h)
+                 for x in range(-(x0 % tile_w), largura, tile_w)],
+                doreturn=False)
         else:
-            # Fallback: preencher com verde
+            # Fallback: preencher com verde sólido
             surface_destino.fill((0, 200, 0))
         
-        # Desenhar tiles da pista baseadas na posição do jogador
-        if self.definicao_pista:
-            px, py = posicao_jogador
-            for nome_tile, offset_x, offset_y in self.definicao_pista:
-                tile = self.gerenciador_tiles.obter_tile(nome_tile)
-                if tile:
-                    # Calcular posição relativa ao jogador (estilo GRIP)
-                    x = px + offset_x
-                    y = py + offset_y
-                    # Converter para coordenadas de tela
-                    # No GRIP, position[0] e position[1] são a posição do jogador
-                    # e as tiles são desenhadas relativas a essa posição
-                    screen_x = x - px + surface_destino.get_width() // 2
-                    screen_y = y - py + surface_destino.get_height() // 2
-                    surface_destino.blit(tile, (screen_x, screen_y))
+        # Só as tiles da pista que cruzam a região (consulta no índice espacial)
+        surface_destino.blits(
+            [(tile, (rect.x - x0, rect.y - y0)) for tile, rect in self.indice_tiles.consultar(rect_mundo)],
+            doreturn=False)
+    
+    def desenhar_pista_dinamica(self, surface_destino, posicao_jogador):
+        """
+        Desenha a pista dinamicamente baseada na posição do jogador (estilo GRIP)
+        posicao_jogador: (x, y) - posição atual do jogador no mundo, desenhada no centro da superfície
+        O custo depende do tamanho da tela, não do tamanho da pista
+        """
+        largura, altura = surface_destino.get_size()
+        px, py = int(posicao_jogador[0]), int(posicao_jogador[1])
+        self.desenhar_regiao_tiles(surface_destino, pygame.Rect(px - largura // 2, py - altura // 2, largura, altura))
     
     def desenhar_pista(self, surface_destino, camera=None, posicao_centro=None):
         """
         Desenha a pista na superfície de destino
-        camera: objeto Camera para culling
+        camera: objeto Camera para culling (apenas os chunks visíveis são usados)
         posicao_centro: (x, y) - posição do centro (atualizada dinamicamente)
         """
-        if self.surface_pista is None:
+        if self.mundo_chunks is None:
             return
         
         if camera is None:
             # Desenhar toda a pista (não recomendado para pistas grandes)
-            surface_destino.blit(self.surface_pista, (0, 0))
+            self.mundo_chunks.desenhar_regiao(surface_destino, (0, 0, self.largura, self.altura))
         else:
-            # Desenhar apenas a parte visível
-            # Por enquanto, desenhamos toda a pista
-            # TODO: Implementar culling baseado na câmera
-            surface_destino.blit(self.surface_pista, (0, 0))
+            camera.desenhar_fundo(surface_destino, self.mundo_chunks)
     
     def encontrar_centro_tile_largada(self):
         """Encontra o centro da tile st-h-3-ch (linha de largada)"""
         # Obter a tile st-h-3-ch
         tile = self.gerenciador_tiles.obter_tile("st-h-3-ch")
         if tile is None:
-            print("AVISO: Tile st-h-3-ch não encontrada")
+            log.warning("Tile st-h-3-ch não encontrada")
             return None
         
         # Obter dimensões da tile
         tile_w, tile_h = tile.get_size()
-        print(f"Tile st-h-3-ch: {tile_w}x{tile_h} pixels")
+        log.debug("Tile st-h-3-ch: %sx%s pixels", tile_w, tile_h)
         
         # A tile está posicionada em (0, -100) relativa ao centro
         # O canto superior esquerdo da tile está em (centro_x + 0, centro_y - 100)
@@ -705,7 +564,7 @@ class PistaTiles:
         offset_x = tile_center_x - centro_x
         offset_y = tile_center_y - centro_y
         
-        print(f"Centro da tile st-h-3-ch: ({tile_center_x}, {tile_center_y}) (relativo: ({offset_x}, {offset_y}))")
+        log.debug("Centro da tile st-h-3-ch: (%s, %s) (relativo: (%s, %s))", tile_center_x, tile_center_y, offset_x, offset_y)
         return (offset_x, offset_y)
     
     def encontrar_centro_pista_na_largada(self):
@@ -716,12 +575,7 @@ class PistaTiles:
             return centro_tile
         
         # Fallback: procurar o centro da pista verificando pixels
-        if self.surface_pista is None:
-            return None
-        
-        try:
-            from core.pista_grip import eh_pixel_grama_grip
-        except:
+        if self.malha_materiais is None:
             return None
         
         # A tile st-h-3-ch está em (0, -100) relativa ao centro
@@ -734,13 +588,10 @@ class PistaTiles:
         # Verificar uma faixa de Y ao redor da linha de largada
         for y_offset in range(-10, 11, 1):
             y = int(tile_y + y_offset)
-            if 0 <= y < self.surface_pista.get_height():
-                for x in range(0, self.surface_pista.get_width(), 2):
-                    try:
-                        if not eh_pixel_grama_grip(self.surface_pista, x, y):
-                            pontos_pista.append(x)
-                    except:
-                        continue
+            if 0 <= y < self.malha_materiais.altura:
+                for x in range(0, self.malha_materiais.largura, 2):
+                    if not self.malha_materiais.eh_grama(x, y):
+                        pontos_pista.append(x)
         
         if pontos_pista:
             pontos_pista.sort()
@@ -760,18 +611,22 @@ class PistaTiles:
             
             centro_real_x = (min_x + max_x) // 2
             offset_x = centro_real_x - centro_x
-            print(f"Centro real da pista na largada (fallback): X={centro_real_x} (relativo: {offset_x}), largura={max_x - min_x}")
+            log.debug("Centro real da pista na largada (fallback): X=%s (relativo: %s), largura=%s",
+                      centro_real_x, offset_x, max_x - min_x)
             return (offset_x, -100)
         
-        print("AVISO: Não foi possível encontrar o centro da pista na largada")
+        log.warning("Não foi possível encontrar o centro da pista na largada")
         return None
     
     def obter_posicao_inicial(self):
         """Retorna a posição inicial do jogador (relativa ao centro)"""
+        if self.dados_pista is not None:
+            return self.dados_pista["posicao_inicial"]
+        
         # Tentar encontrar o centro real da pista na linha de largada
         centro_real = self.encontrar_centro_pista_na_largada()
         if centro_real:
-            print(f"Centro real da pista na largada encontrado: {centro_real}")
+            log.debug("Centro real da pista na largada encontrado: %s", centro_real)
             return centro_real
         
         # Retorna posição relativa ao centro da pista
@@ -782,22 +637,16 @@ class PistaTiles:
     
     def verificar_se_na_pista(self, x, y):
         """Verifica se uma posição (absoluta) está na pista"""
-        if self.surface_pista is None:
-            return False
-        
-        if x < 0 or y < 0 or x >= self.surface_pista.get_width() or y >= self.surface_pista.get_height():
+        if self.malha_materiais is None:
             return False
         
-        try:
-            from core.pista_grip import eh_pixel_grama_grip
-            # Se não está na grama, está na pista
-            return not eh_pixel_grama_grip(self.surface_pista, x, y)
-        except:
-            return True
+        # Fora do mundo não é pista; dentro, qualquer material que não seja grama é pista
+        material = self.malha_materiais.material_em(x, y)
+        return material is not None and material != MATERIAL_GRAMA
     
     def obter_surface_pista(self):
-        """Retorna a superfície renderizada da pista"""
-        return self.surface_pista
+        """Retorna o mundo da pista (MundoChunks)"""
+        return self.mundo_chunks
     
     def carregar_minimapa(self, numero_pista):
         """
@@ -809,14 +658,14 @@ class PistaTiles:
         
         if os.path.exists(caminho_arquivo):
             try:
-                minimapa = pygame.image.load(caminho_arquivo).convert_alpha()
-                print(f"Minimapa carregado: {nome_arquivo} ({minimapa.get_width()}x{minimapa.get_height()})")
+                minimapa = carregar_imagem(caminho_arquivo)
+                log.debug("Minimapa carregado: %s (%sx%s)", nome_arquivo, minimapa.get_width(), minimapa.get_height())
                 return minimapa
             except Exception as e:
-                print(f"Erro ao carregar minimapa: {e}")
+                log.warning("Erro ao carregar minimapa: %s", e)
                 return None
         else:
-            print(f"Minimapa não encontrado: {caminho_arquivo}")
+            log.warning("Minimapa não encontrado: %s", caminho_arquivo)
             return None
     
     def calcular_limites_reais_pista(self, numero_pista):
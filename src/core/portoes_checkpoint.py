@@ -0,0 +1,111 @@
+"""
+Portões dos checkpoints, compilados uma vez por corrida
+Cada checkpoint vira um segmento orientado de LARGURA_PORTAO px (a largura dos tiles de pista) com a
+normal no sentido da corrida e a caixa envolvente já calculadas; passar pelo checkpoint é cruzar o
+segmento entre a posição anterior e a atual do carro, então nenhum passo longo pula o portão
+Compartilhados por GerenciadorCorrida (voltas, contra mão) e pela IA (checkpoint alvo)
+"""
+import math
+
+# Largura do portão em px (largura dos tiles de pista)
+LARGURA_PORTAO = 300.0
+# Folga em px além de cada ponta do portão (meia largura do carro)
+FOLGA_PORTAO = 25.0
+# Deslocamento em um passo acima disto é reposicionamento, não cruzamento
+DESLOCAMENTO_MAXIMO = 200.0
+
+
+class PortaoCheckpoint:
+    """
+    Segmento imutável centrado em (cx, cy), ao longo de (tx, ty), com normal (nx, ny) no sentido da corrida
+    Sem sentido conhecido (um único checkpoint) o cruzamento conta nos dois sentidos
+    """
+    __slots__ = ("indice", "cx", "cy", "tx", "ty", "nx", "ny", "meio", "sentido",
+                 "min_x", "min_y", "max_x", "max_y")
+
+    def __init__(self, indice, cx, cy, tx, ty, nx, ny, sentido=True):
+        meio = LARGURA_PORTAO / 2 + FOLGA_PORTAO
+        valores = {
+            "indice": indice, "cx": cx, "cy": cy, "tx": tx, "ty": ty, "nx": nx, "ny": ny,
+            "meio": meio, "sentido": sentido,
+            "min_x": cx - abs(tx) * meio, "max_x": cx + abs(tx) * meio,
+            "min_y": cy - abs(ty) * meio, "max_y": cy + abs(ty) * meio,
+        }
+        for nome, valor in valores.items():
+            object.__setattr__(self, nome, valor)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("PortaoCheckpoint é imutável")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def extremos(self):
+        """Pontas do portão ((x0, y0), (x1, y1)), sem a folga"""
+        meio = LARGURA_PORTAO / 2
+        return ((self.cx - self.tx * meio, self.cy - self.ty * meio),
+                (self.cx + self.tx * meio, self.cy + self.ty * meio))
+
+    def cruzou(self, xa, ya, xb, yb):
+        """
+        Cruzamento do deslocamento (xa, ya) -> (xb, yb): 1 no sentido da corrida, -1 no contrário, 0 sem cruzar
+        """
+        if (max(xa, xb) < self.min_x or min(xa, xb) > self.max_x or
+                max(ya, yb) < self.min_y or min(ya, yb) > self.max_y):
+            return 0
+        lado_a = (xa - self.cx) * self.nx + (ya - self.cy) * self.ny
+        lado_b = (xb - self.cx) * self.nx + (yb - self.cy) * self.ny
+        if (lado_a < 0.0) == (lado_b < 0.0):
+            return 0
+        dx, dy = xb - xa, yb - ya
+        if dx * dx + dy * dy > DESLOCAMENTO_MAXIMO * DESLOCAMENTO_MAXIMO:
+            return 0
+        # Ponto em que o deslocamento corta a reta do portão, medido ao longo dele
+        t = lado_a / (lado_a - lado_b)
+        ao_longo = (xa + dx * t - self.cx) * self.tx + (ya + dy * t - self.cy) * self.ty
+        if abs(ao_longo) > self.meio:
+            return 0
+        if lado_b >= 0.0 or not self.sentido:
+            return 1
+        return -1
+
+
+def compilar_portoes(checkpoints, linha_corrida=None):
+    """
+    Portões dos checkpoints ((x, y) ou (x, y, ângulo)), na mesma ordem
+    Com ângulo salvo o portão segue o ângulo; sem ele fica perpendicular à linha de corrida no checkpoint
+    ou, sem linha, alinhado ao eixo mais perpendicular à direção do checkpoint seguinte
+    O sentido da corrida vem da linha de corrida ou, sem ela, da direção até o checkpoint seguinte
+    """
+    portoes = []
+    n = len(checkpoints)
+    usar_linha = linha_corrida is not None and len(linha_corrida.indices_checkpoints) == n
+    for i, cp in enumerate(checkpoints):
+        cx, cy = float(cp[0]), float(cp[1])
+        if usar_linha:
+            k = linha_corrida.indices_checkpoints[i]
+            ax, ay = linha_corrida.ponto(k - 1)
+            bx, by = linha_corrida.ponto(k + 1)
+            sx, sy = bx - ax, by - ay
+        else:
+            proximo = checkpoints[(i + 1) % n]
+            sx, sy = proximo[0] - cx, proximo[1] - cy
+        if len(cp) >= 3:
+            rad = math.radians(cp[2] % 360)
+            tx, ty = math.cos(rad), math.sin(rad)
+        elif usar_linha and (sx or sy):
+            norma = math.hypot(sx, sy)
+            tx, ty = -sy / norma, sx / norma
+        elif abs(sx) > abs(sy):
+            tx, ty = 0.0, 1.0  # Movimento horizontal -> portão vertical
+        else:
+            tx, ty = 1.0, 0.0
+        nx, ny = -ty, tx
+        if nx * sx + ny * sy < 0.0:
+            nx, ny = -nx, -ny
+        portoes.append(PortaoCheckpoint(i, cx, cy, tx, ty, nx, ny, sentido=bool(sx or sy)))
+    return portoes
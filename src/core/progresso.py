@@ -2,8 +2,14 @@
 import json
 import os
 from config import DIR_PROJETO
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
 
 CAMINHO_PROGRESSO = os.path.join(DIR_PROJETO, "data", "progresso.json")
+# Voltas fantasma (core/fantasma.py): arquivos binários ao lado do progresso, índice no progresso.json
+DIR_FANTASMAS = os.path.join(DIR_PROJETO, "data", "fantasmas")
+MAX_FANTASMAS_POR_PISTA = 5
 
 class GerenciadorProgresso:
     """Gerencia o progresso do jogador: dinheiro, carros desbloqueados, recordes e troféus"""
@@ -14,6 +20,7 @@ class GerenciadorProgresso:
         self.recordes_corrida = {}  # {numero_pista: melhor_tempo}
         self.recordes_drift = {}  # {numero_pista: melhor_score}
         self.trofeus = {}  # {numero_pista: "ouro"/"prata"/"bronze"/None}
+        self.fantasmas = {}  # {numero_pista: [{"tempo", "carro", "arquivo"}, ...] do melhor para o pior}
         self.carregar()
     
     def carregar(self):
@@ -35,6 +42,7 @@ class GerenciadorProgresso:
                         self.recordes_corrida = data.get('recordes_corrida', {})
                     self.recordes_drift = data.get('recordes_drift', {})
                     self.trofeus = data.get('trofeus', {})
+                    self.fantasmas = data.get('fantasmas', {})
                     # Converter chaves numéricas para strings se necessário (compatibilidade)
                     if self.recordes_corrida:
                         self.recordes_corrida = {str(k): v for k, v in self.recordes_corrida.items()}
@@ -43,7 +51,7 @@ class GerenciadorProgresso:
                     if self.trofeus:
                         self.trofeus = {str(k): v for k, v in self.trofeus.items()}
             except Exception as e:
-                print(f"Erro ao carregar progresso: {e}")
+                log.warning("Erro ao carregar progresso: %s", e)
                 self.dinheiro = 0
                 self.carros_desbloqueados = {'Car1'}  # Primeiro carro sempre desbloqueado
         else:
@@ -61,12 +69,13 @@ class GerenciadorProgresso:
                 'carros_desbloqueados': list(self.carros_desbloqueados),
                 'recordes_corrida': self.recordes_corrida,
                 'recordes_drift': self.recordes_drift,
-                'trofeus': self.trofeus
+                'trofeus': self.trofeus,
+                'fantasmas': self.fantasmas
             }
             with open(CAMINHO_PROGRESSO, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
-            print(f"Erro ao salvar progresso: {e}")
+            log.warning("Erro ao salvar progresso: %s", e)
     
     def adicionar_dinheiro(self, quantidade):
         """Adiciona dinheiro ao jogador"""
@@ -112,7 +121,7 @@ class GerenciadorProgresso:
         if pista_key not in self.recordes_corrida or tempo < self.recordes_corrida[pista_key]:
             self.recordes_corrida[pista_key] = tempo
             self.salvar()  # Salvar imediatamente
-            print(f"Recorde de corrida salvo para pista {pista_key}: {tempo:.2f}s")
+            log.info("Recorde de corrida salvo para pista %s: %.2fs", pista_key, tempo)
             return True
         return False
     
@@ -130,7 +139,7 @@ class GerenciadorProgresso:
         if pista_key not in self.recordes_drift or score > self.recordes_drift[pista_key]:
             self.recordes_drift[pista_key] = score
             self.salvar()  # Salvar imediatamente
-            print(f"Recorde de drift salvo para pista {pista_key}: {score:.0f} pontos")
+            log.info("Recorde de drift salvo para pista %s: %.0f pontos", pista_key, score)
             return True
         return False
     
@@ -150,7 +159,7 @@ class GerenciadorProgresso:
         if ordem.get(tipo_trofeu, 0) > ordem.get(atual, 0):
             self.trofeus[pista_key] = tipo_trofeu
             self.salvar()  # Salvar imediatamente
-            print(f"Trofeu salvo para pista {pista_key}: {tipo_trofeu}")
+            log.info("Trofeu salvo para pista %s: %s", pista_key, tipo_trofeu)
     
     def obter_trofeu(self, numero_pista):
         """Obtém o troféu ganho em uma pista"""
@@ -158,6 +167,51 @@ class GerenciadorProgresso:
         pista_key = str(numero_pista)
         return self.trofeus.get(pista_key, None)
 
+    def registrar_fantasma(self, numero_pista, fantasma):
+        """
+        Guarda a volta fantasma se ela estiver entre as MAX_FANTASMAS_POR_PISTA melhores da pista
+        Retorna a posição (0 = melhor volta) ou None se não entrou
+        """
+        pista_key = str(numero_pista)
+        lista = self.fantasmas.setdefault(pista_key, [])
+        posicao = sum(1 for item in lista if item["tempo"] <= fantasma.tempo)
+        if posicao >= MAX_FANTASMAS_POR_PISTA:
+            return None
+        # Voltas têm tempos em passos de 1/120 s: tempo e carro repetidos ganham um sufixo para não
+        # sobrescrever o arquivo de outra entrada
+        base = f"pista_{pista_key}_{fantasma.tempo:.3f}_{fantasma.prefixo}"
+        em_uso = {item["arquivo"] for item in lista}
+        arquivo, n = f"{base}.ghost", 1
+        while arquivo in em_uso or os.path.exists(os.path.join(DIR_FANTASMAS, arquivo)):
+            n += 1
+            arquivo = f"{base}_{n}.ghost"
+        try:
+            fantasma.salvar(os.path.join(DIR_FANTASMAS, arquivo))
+        except OSError as e:
+            log.warning("Erro ao salvar fantasma: %s", e)
+            return None
+        lista.insert(posicao, {"tempo": fantasma.tempo, "carro": fantasma.prefixo, "arquivo": arquivo})
+        mantidos = {item["arquivo"] for item in lista[:MAX_FANTASMAS_POR_PISTA]}
+        for item in lista[MAX_FANTASMAS_POR_PISTA:]:
+            if item["arquivo"] in mantidos:
+                continue
+            try:
+                os.remove(os.path.join(DIR_FANTASMAS, item["arquivo"]))
+            except OSError:
+                pass
+        del lista[MAX_FANTASMAS_POR_PISTA:]
+        self.salvar()
+        log.debug("Volta fantasma salva para pista %s: %.2fs (posição %s)", pista_key, fantasma.tempo, posicao + 1)
+        return posicao
+
+    def obter_fantasma(self, numero_pista, posicao=0):
+        """Carrega a volta fantasma da pista (0 = melhor volta); None se não houver"""
+        from core.fantasma import Fantasma
+        lista = self.fantasmas.get(str(numero_pista), [])
+        if posicao >= len(lista):
+            return None
+        return Fantasma.carregar(os.path.join(DIR_FANTASMAS, lista[posicao]["arquivo"]))
+
 # Instância global
 gerenciador_progresso = GerenciadorProgresso()
 
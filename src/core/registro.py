@@ -0,0 +1,151 @@
+"""
+Registro (log) do jogo sobre o logging da biblioteca padrão, sem custo no laço principal
+- Nível por módulo: configurar_registro("INFO", {"core.ia": "DEBUG"}); nível desligado custa uma comparação
+  (use argumentos no estilo % para a mensagem nem ser formatada: log.debug("x=%.1f", x))
+- Limite de taxa: cada mensagem (mesmo texto de formato, mesmo módulo) sai no máximo RAJADA_LOG vezes a cada
+  JANELA_LOG s; as suprimidas são contadas e a próxima que sair avisa quantas foram
+- Repetição: a mesma mensagem já formatada, seguida, não sai de novo dentro da janela
+- Buffer circular: os registros vão para um deque de TAMANHO_BUFFER_LOG entradas (os mais antigos caem se
+  ele encher) e uma thread em segundo plano monta as linhas e escreve no console a cada INTERVALO_ESVAZIAR_LOG s,
+  então um console lento não trava o quadro
+"""
+import atexit
+import contextlib
+import logging
+import sys
+import threading
+from collections import deque
+
+RAIZ_LOG = "turbo_racer"
+RAJADA_LOG = 5
+JANELA_LOG = 2.0
+TAMANHO_BUFFER_LOG = 2048
+INTERVALO_ESVAZIAR_LOG = 0.25
+
+_FORMATO = "%(asctime)s %(levelname)s %(modulo)s: %(message)s"
+
+_instalado = None  # _HandlerBuffer depois de _instalar()
+_trava_instalar = threading.Lock()
+
+
+class _FiltroTaxa(logging.Filter):
+    """Limite de taxa e supressão de repetições por (módulo, texto de formato); roda na thread de quem registra"""
+
+    def __init__(self):
+        super().__init__()
+        self._estado = {}  # (nome, msg) -> [inicio_janela, emitidas, suprimidas, ultima_mensagem]
+
+    def filter(self, registro):
+        chave = (registro.name, registro.msg)
+        agora = registro.created
+        estado = self._estado.get(chave)
+        if estado is None:
+            estado = self._estado[chave] = [agora, 0, 0, None]
+        elif agora - estado[0] >= JANELA_LOG:
+            estado[0], estado[1] = agora, 0
+        else:
+            mensagem = registro.getMessage() if registro.args else registro.msg
+            if estado[1] >= RAJADA_LOG or mensagem == estado[3]:
+                estado[2] += 1
+                return False
+        if registro.args:
+            # Args mutáveis (listas, dicionários) podem mudar até a thread formatar: formatar aqui
+            registro.msg, registro.args = registro.getMessage(), None
+        estado[1] += 1
+        estado[3] = registro.msg
+        registro.suprimidas = estado[2]
+        estado[2] = 0
+        return True
+
+
+class _HandlerBuffer(logging.Handler):
+    """Guarda os registros num deque; a thread de esvaziamento formata e escreve em sys.stdout"""
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = deque(maxlen=TAMANHO_BUFFER_LOG)
+        self.descartados = 0
+        self.setFormatter(logging.Formatter(_FORMATO, "%H:%M:%S"))
+        self.addFilter(_FiltroTaxa())
+        self._acordar = threading.Event()
+        self._trava_escrita = threading.Lock()
+        self._thread = threading.Thread(target=self._laco, name="registro", daemon=True)
+        self._thread.start()
+
+    def emit(self, registro):
+        if len(self.buffer) == self.buffer.maxlen:
+            self.descartados += 1
+        self.buffer.append(registro)
+
+    def _laco(self):
+        while True:
+            self._acordar.wait(INTERVALO_ESVAZIAR_LOG)
+            self._acordar.clear()
+            self.esvaziar()
+
+    def esvaziar(self):
+        """Formata e escreve tudo o que está no buffer (chamado pela thread e na saída do programa)"""
+        with self._trava_escrita:
+            linhas = []
+            while self.buffer:
+                registro = self.buffer.popleft()
+                registro.modulo = registro.name[len(RAIZ_LOG) + 1:] or RAIZ_LOG
+                linha = self.format(registro)
+                if getattr(registro, "suprimidas", 0):
+                    linha += f" [+{registro.suprimidas} suprimidas]"
+                linhas.append(linha)
+            if self.descartados:
+                linhas.append(f"registro: buffer cheio, {self.descartados} mensagens descartadas")
+                self.descartados = 0
+            if not linhas:
+                return
+            try:
+                sys.stdout.write("\n".join(linhas) + "\n")
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
+
+def _instalar():
+    global _instalado
+    with _trava_instalar:
+        if _instalado is None:
+            raiz = logging.getLogger(RAIZ_LOG)
+            raiz.setLevel(logging.INFO)
+            raiz.propagate = False
+            _instalado = _HandlerBuffer()
+            raiz.addHandler(_instalado)
+            atexit.register(_instalado.esvaziar)
+    return _instalado
+
+
+def obter_registro(nome):
+    """Logger do módulo `nome` (normalmente __name__) sob a raiz do jogo"""
+    if _instalado is None:
+        _instalar()
+    return logging.getLogger(f"{RAIZ_LOG}.{nome}")
+
+
+def configurar_registro(nivel="INFO", niveis_modulos=None):
+    """Nível geral e, opcionalmente, por módulo ({"core.ia": "DEBUG", ...}); níveis por nome ou número"""
+    _instalar()
+    logging.getLogger(RAIZ_LOG).setLevel(nivel)
+    for nome, nivel_modulo in (niveis_modulos or {}).items():
+        logging.getLogger(f"{RAIZ_LOG}.{nome}").setLevel(nivel_modulo)
+
+
+def esvaziar_registro():
+    """Escreve agora o que estiver no buffer (antes de sair ou de trocar a saída padrão)"""
+    if _instalado is not None:
+        _instalado.esvaziar()
+
+
+@contextlib.contextmanager
+def registro_silenciado():
+    """Descarta todos os registros dentro do bloco (ex.: simulação sem janela em modo silencioso)"""
+    anterior = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logging.disable(anterior)
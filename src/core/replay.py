@@ -0,0 +1,292 @@
+"""
+Gravação e reprodução determinística de corridas
+A física roda em passo fixo, então basta gravar, por passo, as entradas dos jogadores humanos
+(um byte por carro) junto com a configuração da largada; a IA e a física refazem o resto
+O arquivo fica com alguns KB por minuto de corrida (entradas comprimidas com zlib)
+O reprodutor re-simula sem janela pelo mesmo caminho (SimulacaoCorrida: CarroFisica, IA,
+GerenciadorCorrida), com avanço rápido e busca por snapshots periódicos do estado
+"""
+import os
+import json
+import zlib
+import time
+import struct
+from config import DIR_REPLAYS
+from core.simulacao import SimulacaoCorrida, DT_FIXO
+from core.dificuldade_ia import presets_dificuldade
+from core.registro import obter_registro
+
+log = obter_registro(__name__)
+
+REPLAY_MAGICO = b"TRREPLAY"
+# Incrementar quando o formato ou a física mudarem (replays antigos deixam de reproduzir igual)
+REPLAY_VERSAO = 7
+# magico, versao, tamanho do cabeçalho JSON, tamanho das entradas comprimidas
+_CABECALHO = struct.Struct("<8sHII")
+
+# Bits do byte de entrada de um carro humano em um passo
+BIT_ACELERAR = 0x01
+BIT_DIREITA = 0x02
+BIT_ESQUERDA = 0x04
+BIT_FREAR = 0x08
+BIT_TURBO = 0x10
+BIT_FREIO_MAO = 0x20
+BIT_DRIFT = 0x40
+# Carro atualizado neste passo (sem ele o carro fica parado, ex.: jogador que já terminou)
+BIT_ATUALIZADO = 0x80
+_BITS_ENTRADA = (BIT_ACELERAR, BIT_DIREITA, BIT_ESQUERDA, BIT_FREAR, BIT_TURBO, BIT_FREIO_MAO, BIT_DRIFT)
+
+# Segundos de corrida entre snapshots do reprodutor (busca re-simula no máximo isso)
+INTERVALO_SNAPSHOT = 5.0
+
+def codificar_entrada(acelerar, direita, esquerda, frear_re, turbo, freio_mao, drift):
+    """Byte de entrada de um passo em que o carro foi atualizado"""
+    byte = BIT_ATUALIZADO
+    for valor, bit in zip((acelerar, direita, esquerda, frear_re, turbo, freio_mao, drift), _BITS_ENTRADA):
+        if valor:
+            byte |= bit
+    return byte
+
+def decodificar_entrada(byte):
+    """(acelerar, direita, esquerda, frear_re, turbo, freio_mao, drift) ou None se o carro não foi atualizado"""
+    if not byte & BIT_ATUALIZADO:
+        return None
+    return tuple(bool(byte & bit) for bit in _BITS_ENTRADA)
+
+class Replay:
+    """
+    Conteúdo de um arquivo de replay
+    cabecalho: pista, voltas, dificuldade, presets da IA, semente, carros (nome, prefixo, tração, largada, controle),
+    eventos [[passo, tipo, valor], ...] e o resultado gravado no fim
+    entradas: bytes, um por carro humano por passo (passo-major)
+    """
+    def __init__(self, cabecalho, entradas):
+        self.cabecalho = cabecalho
+        self.entradas = entradas
+
+    @property
+    def humanos(self):
+        return [i for i, carro in enumerate(self.cabecalho["carros"]) if carro["controle"] == "humano"]
+
+    @property
+    def passos(self):
+        return self.cabecalho["passos"]
+
+    @property
+    def duracao(self):
+        return self.passos * self.cabecalho["dt"]
+
+    def entradas_passo(self, passo):
+        """{índice do carro: entrada decodificada} dos carros humanos no passo"""
+        humanos = self.humanos
+        inicio = passo * len(humanos)
+        return {indice: decodificar_entrada(self.entradas[inicio + i]) for i, indice in enumerate(humanos)}
+
+    def salvar(self, caminho):
+        bytes_cabecalho = json.dumps(self.cabecalho).encode("utf-8")
+        bytes_entradas = zlib.compress(bytes(self.entradas), 9)
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        caminho_tmp = caminho + ".tmp"
+        with open(caminho_tmp, 'wb') as f:
+            f.write(_CABECALHO.pack(REPLAY_MAGICO, REPLAY_VERSAO, len(bytes_cabecalho), len(bytes_entradas)))
+            f.write(bytes_cabecalho)
+            f.write(bytes_entradas)
+        os.replace(caminho_tmp, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lança ValueError se o arquivo não for um replay desta versão"""
+        with open(caminho, 'rb') as f:
+            magico, versao, n_cabecalho, n_entradas = _CABECALHO.unpack(f.read(_CABECALHO.size))
+            if magico != REPLAY_MAGICO:
+                raise ValueError(f"{caminho} não é um replay do Turbo Racer")
+            if versao != REPLAY_VERSAO:
+                raise ValueError(f"Replay na versão {versao}; esta versão do jogo reproduz a {REPLAY_VERSAO}")
+            cabecalho = json.loads(f.read(n_cabecalho).decode("utf-8"))
+            entradas = zlib.decompress(f.read(n_entradas))
+        replay = cls(cabecalho, entradas)
+        if len(entradas) != replay.passos * len(replay.humanos):
+            raise ValueError(f"{caminho}: entradas incompletas")
+        return replay
+
+class GravadorReplay:
+    """
+    Grava uma corrida do jogo
+    carros: dicionários {nome, prefixo, tracao, x, y, angulo, controle}, na ordem em que o jogo os atualiza;
+    controle é "humano" ou "ia"
+    Chamar passo() a cada passo fixo da corrida em andamento (não pausada), com as entradas dos humanos
+    """
+    def __init__(self, numero_pista, voltas, dificuldade, semente, carros, tipo_jogo="corrida", dt=DT_FIXO):
+        self.cabecalho = {
+            "pista": numero_pista,
+            "voltas": voltas,
+            "dificuldade": dificuldade,
+            # Presets em vigor na gravação: um data/ia_dificuldades.json novo não muda a reprodução
+            "presets_ia": presets_dificuldade(),
+            "semente": semente,
+            "tipo_jogo": tipo_jogo,
+            "dt": dt,
+            "carros": carros,
+            "eventos": [],
+            "passos": 0,
+            "gravado_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.entradas = bytearray()
+
+    @staticmethod
+    def descrever_carro(carro, prefixo, controle):
+        """Entrada de `carros` a partir de um CarroFisica recém-criado"""
+        return {"nome": carro.nome, "prefixo": prefixo, "tracao": carro.tipo_tracao,
+                "x": carro.x, "y": carro.y, "angulo": carro.angulo, "controle": controle}
+
+    def passo(self, entradas):
+        """entradas: uma por carro humano (na ordem de `carros`), tupla de 7 valores ou None se não atualizado"""
+        for entrada in entradas:
+            self.entradas.append(codificar_entrada(*entrada) if entrada is not None else 0)
+        self.cabecalho["passos"] += 1
+
+    def evento(self, tipo, valor):
+        """Evento que muda a simulação no passo atual (ex.: ("dificuldade", ["dificil", [índices dos carros]]))"""
+        self.cabecalho["eventos"].append([self.cabecalho["passos"], tipo, valor])
+
+    def salvar(self, carros, corrida, caminho=None):
+        """
+        Grava o replay com o resultado atual da corrida (usado para conferir a reprodução)
+        Retorna o caminho gravado ou None em caso de falha (gravar replay nunca interrompe o jogo)
+        """
+        self.cabecalho["resultado"] = [_resultado_carro(carro, corrida) for carro in carros]
+        if caminho is None:
+            nome = f"pista{self.cabecalho['pista']}_{time.strftime('%Y%m%d_%H%M%S')}.replay"
+            caminho = os.path.join(DIR_REPLAYS, nome)
+        try:
+            Replay(self.cabecalho, self.entradas).salvar(caminho)
+            return caminho
+        except Exception as e:
+            log.warning("Erro ao salvar replay: %s", e)
+            return None
+
+def entrada_jogador(carro, teclas):
+    """Entrada de um carro guiado pelo teclado no formato de GravadorReplay.passo (ler antes de carro.atualizar)"""
+    acelerar, direita, esquerda, frear_re = (bool(teclas[tecla]) for tecla in carro.controles)
+    turbo = carro.turbo_key is not None and bool(teclas[carro.turbo_key])
+    return (acelerar, direita, esquerda, frear_re, turbo, carro.freio_mao_ativo, carro.drift_ativado)
+
+def _resultado_carro(carro, corrida):
+    return {
+        "nome": carro.nome,
+        "x": carro.x,
+        "y": carro.y,
+        "voltas": corrida.voltas.get(carro, 0),
+        "finalizou": corrida.finalizou.get(carro, False),
+        "tempo_final": corrida.tempo_final.get(carro),
+    }
+
+class ReprodutorReplay:
+    """
+    Re-simula um replay sem janela
+    avancar()/executar() seguem em frente (tão rápido quanto a CPU permitir);
+    ir_para(passo) volta ou pula para qualquer passo a partir do snapshot anterior mais próximo
+    """
+    def __init__(self, replay, silencioso=True, intervalo_snapshot=INTERVALO_SNAPSHOT):
+        self.replay = replay
+        cabecalho = replay.cabecalho
+        carros = cabecalho["carros"]
+        self.dt = cabecalho["dt"]
+        self.sim = SimulacaoCorrida(
+            cabecalho["pista"],
+            carros=[(c["prefixo"], c["tracao"], c["nome"]) for c in carros],
+            voltas=cabecalho["voltas"],
+            dificuldade=cabecalho["dificuldade"],
+            silencioso=silencioso,
+            posicoes=[(c["x"], c["y"]) for c in carros],
+            humanos=replay.humanos,
+            presets_ia=cabecalho.get("presets_ia"),
+        )
+        for carro, dados in zip(self.sim.carros, carros):
+            carro.angulo = dados["angulo"]
+        self._eventos = {}
+        for passo, tipo, valor in cabecalho["eventos"]:
+            self._eventos.setdefault(passo, []).append((tipo, valor))
+        self.passos_por_snapshot = max(1, int(round(intervalo_snapshot / self.dt)))
+        self._snapshots = {0: self.sim.capturar_estado()}
+
+    @property
+    def passo_atual(self):
+        return self.sim.passos
+
+    @property
+    def carros(self):
+        return self.sim.carros
+
+    @property
+    def corrida(self):
+        return self.sim.corrida
+
+    @property
+    def terminou(self):
+        return self.sim.passos >= self.replay.passos
+
+    def _aplicar_evento(self, tipo, valor):
+        if tipo == "dificuldade":
+            dificuldade, indices = valor
+            for i in indices:
+                self.sim.ias[i].dificuldade = dificuldade
+                self.sim.ias[i]._configurar_dificuldade()
+        elif tipo == "lod":
+            self.sim.lod.definir_simplificados([self.sim.carros[i] for i in valor])
+
+    def _passo(self):
+        passo = self.sim.passos
+        for tipo, valor in self._eventos.get(passo, ()):
+            self._aplicar_evento(tipo, valor)
+        self.sim.passo(self.dt, self.replay.entradas_passo(passo))
+        if self.sim.passos % self.passos_por_snapshot == 0 and self.sim.passos not in self._snapshots:
+            self._snapshots[self.sim.passos] = self.sim.capturar_estado()
+
+    def avancar(self, passos=1):
+        """Avança até `passos` passos (para no fim do replay); retorna quantos foram simulados"""
+        fim = min(self.replay.passos, self.sim.passos + passos)
+        inicio = self.sim.passos
+        with self.sim._saida():
+            while self.sim.passos < fim:
+                self._passo()
+        return self.sim.passos - inicio
+
+    def executar(self):
+        """Reproduz até o fim e retorna os resultados (mesmo formato do resultado gravado)"""
+        self.avancar(self.replay.passos - self.sim.passos)
+        return self.resultados()
+
+    def ir_para(self, passo):
+        """Busca: restaura o snapshot anterior mais próximo e re-simula até o passo pedido"""
+        passo = max(0, min(self.replay.passos, int(passo)))
+        base = max(p for p in self._snapshots if p <= passo)
+        if passo < self.sim.passos or base > self.sim.passos:
+            self.sim.restaurar_estado(self._snapshots[base])
+        self.avancar(passo - self.sim.passos)
+
+    def ir_para_tempo(self, segundos):
+        self.ir_para(round(segundos / self.dt))
+
+    def resultados(self):
+        return [_resultado_carro(carro, self.sim.corrida) for carro in self.sim.carros]
+
+    def conferir(self, tolerancia_posicao=1e-6, tolerancia_tempo=0.05):
+        """
+        Compara o fim da reprodução com o resultado gravado
+        Retorna a lista de diferenças (vazia se a reprodução bateu)
+        Tempos de volta no jogo avançam pelo dt de cada frame e aqui pelo passo fixo: diferem até um frame
+        """
+        diferencas = []
+        for gravado, obtido in zip(self.replay.cabecalho.get("resultado", []), self.resultados()):
+            nome = gravado["nome"]
+            if abs(gravado["x"] - obtido["x"]) > tolerancia_posicao or abs(gravado["y"] - obtido["y"]) > tolerancia_posicao:
+                diferencas.append(f"{nome}: posição final {obtido['x']:.2f}, {obtido['y']:.2f} "
+                                  f"(gravado {gravado['x']:.2f}, {gravado['y']:.2f})")
+            if (gravado["voltas"], gravado["finalizou"]) != (obtido["voltas"], obtido["finalizou"]):
+                diferencas.append(f"{nome}: {obtido['voltas']} voltas, finalizou={obtido['finalizou']} "
+                                  f"(gravado {gravado['voltas']}, finalizou={gravado['finalizou']})")
+            elif gravado["tempo_final"] is not None and obtido["tempo_final"] is not None:
+                if abs(gravado["tempo_final"] - obtido["tempo_final"]) > tolerancia_tempo:
+                    diferencas.append(f"{nome}: tempo {obtido['tempo_final']:.3f}s (gravado {gravado['tempo_final']:.3f}s)")
+        return diferencas
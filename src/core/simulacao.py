@@ -0,0 +1,186 @@
+"""
+Simulação de corrida sem janela
+Carros, IA, GerenciadorCorrida e os dados de material da pista rodam sem display e sem carregar
+texturas (sprites, tiles, fontes, partículas, marcas de pneu), no passo fixo do jogo e tão rápido
+quanto a CPU permitir; útil para testar a IA e a física em máquinas sem tela
+"""
+import io
+import copy
+import random
+import contextlib
+from core.pista_tiles import PistaTiles
+from core.carro_fisica import CarroFisica
+from core.corrida import GerenciadorCorrida
+from core.ia import IA
+from core.fisica_lote import MundoFisica
+from core.colisao_carros import ColisaoCarros
+from core.lod_bots import LodBots
+from core.laps_grip import carregar_checkpoints_grip, carregar_spawn_points
+from core.registro import registro_silenciado
+
+# Mesmo passo fixo do loop do jogo
+DT_FIXO = 1.0 / 120.0
+CENTRO_MUNDO = (2500, 2500)
+OFFSET_LATERAL = 50
+CARROS_PADRAO = ("Car1", "Car2", "Car3", "Car4")
+
+class SimulacaoCorrida:
+    """
+    Corrida sem renderização, de bots e opcionalmente de carros controlados por entradas externas
+    carros: prefixos de cor (ou tuplas (prefixo, tipo_tracao[, nome])) dos carros participantes
+    semente: controla o sorteio dos spawn points, para repetir a mesma largada
+    posicoes: largada explícita [(x, y), ...] (ex.: replays); sem ela os spawn points são sorteados
+    humanos: índices dos carros sem IA, guiados pelas entradas passadas a passo()
+    silencioso: descarta os prints da pista, da IA e da corrida (milhares de linhas por corrida)
+    presets_ia: presets de dificuldade dos bots (ver core/dificuldade_ia.py); None usa os do arquivo de dados
+    """
+    def __init__(self, numero_pista=1, carros=CARROS_PADRAO, voltas=1, dificuldade="medio",
+                 semente=None, silencioso=True, posicoes=None, humanos=(), presets_ia=None):
+        self.numero_pista = numero_pista
+        self.voltas_objetivo = voltas
+        self.silencioso = silencioso
+        self.passos = 0
+        with self._saida():
+            self.pista = PistaTiles(*[2 * c for c in CENTRO_MUNDO])
+            self.pista.construir_dados_fisicos(numero_pista, posicao_centro=CENTRO_MUNDO)
+            # Só largura/altura do mundo são usadas pela física (parede invisível); nada é desenhado
+            self.mundo = self.pista.mundo_chunks
+            self.checkpoints = carregar_checkpoints_grip(numero_pista)
+            self.corrida = GerenciadorCorrida(None, self.checkpoints, voltas,
+                                              linha_corrida=self.pista.linha_corrida)
+            self.corrida.iniciada = True
+            self.corrida.contagem_regressiva = 0.0
+
+            checkpoints_ia = [(float(cp[0]), float(cp[1])) for cp in self.checkpoints]
+            if posicoes is None:
+                posicoes = self._posicoes_largada(len(carros), random.Random(semente))
+            self.fisica = MundoFisica()
+            self.colisao = ColisaoCarros()
+            # Sem câmeras: nenhum bot é simplificado, a não ser que alguém chame lod.definir_simplificados
+            self.lod = LodBots()
+            self.carros = []
+            self.ias = []
+            self.tempo_fora_pista = [0.0] * len(carros)  # s na grama antes de terminar, por carro
+            # Fases de decisão da IA pela ordem entre os bots, como no jogo (replays reproduzem igual)
+            bots = [i for i in range(len(carros)) if i not in humanos]
+            for i, (dados, (x, y)) in enumerate(zip(carros, posicoes)):
+                dados = (dados,) if isinstance(dados, str) else tuple(dados)
+                prefixo, tracao, nome = (dados + (None, None))[:3]
+                carro = CarroFisica(x, y, prefixo, (0, 0, 0, 0), nome=nome or f"IA-{i+1}",
+                                    tipo_tracao=tracao, renderizar=False)
+                carro.eh_bot = i not in humanos
+                carro.malha_materiais = self.pista.malha_materiais
+                carro.campo_distancia = self.pista.campo_distancia
+                self.corrida.registrar_carro(carro)
+                self.fisica.registrar(carro)
+                self.colisao.registrar(carro)
+                self.carros.append(carro)
+                self.ias.append(IA(checkpoints_ia, nome=carro.nome, dificuldade=dificuldade,
+                                   linha_corrida=self.pista.linha_corrida, portoes=self.corrida.portoes,
+                                   fase_decisao=bots.index(i) / len(bots), presets=presets_ia)
+                                if carro.eh_bot else None)
+                if carro.eh_bot:
+                    self.lod.registrar(carro, self.ias[-1])
+
+    @contextlib.contextmanager
+    def _saida(self):
+        if not self.silencioso:
+            yield
+            return
+        with contextlib.redirect_stdout(io.StringIO()), registro_silenciado():
+            yield
+
+    def _posicoes_largada(self, quantidade, rng):
+        """Spawn points do editor em ordem sorteada; sem eles, fila lateral a partir da posição inicial"""
+        spawn_points = list(carregar_spawn_points(self.numero_pista) or [])
+        rng.shuffle(spawn_points)
+        if spawn_points:
+            base_x, base_y = spawn_points[0]
+        else:
+            relativa = self.pista.obter_posicao_inicial()
+            base_x, base_y = CENTRO_MUNDO[0] + relativa[0], CENTRO_MUNDO[1] + relativa[1]
+        posicoes = [tuple(p) for p in spawn_points[:quantidade]]
+        for i in range(quantidade - len(posicoes)):
+            posicoes.append((base_x + OFFSET_LATERAL * (i + 1), base_y))
+        return posicoes
+
+    def passo(self, dt=DT_FIXO, entradas=None):
+        """
+        Avança a corrida um passo fixo (entradas/IA -> física em lote -> bots simplificados -> colisões -> progresso)
+        entradas: {índice do carro humano: (acelerar, direita, esquerda, frear_re, turbo, freio_mao, drift)};
+        carros humanos sem entrada no passo ficam parados, como no jogo fora do controle do jogador
+        """
+        corrida = self.corrida
+        for i, (carro, ia) in enumerate(zip(self.carros, self.ias)):
+            if ia is None:
+                entrada = entradas.get(i) if entradas else None
+                if entrada is not None:
+                    acelerar, direita, esquerda, frear_re, turbo, freio_mao, drift = entrada
+                    carro.freio_mao_ativo = freio_mao
+                    carro.drift_ativado = drift
+                    carro._step(acelerar, direita, esquerda, frear_re, turbo, None, dt, None, self.mundo)
+            elif not corrida.finalizou.get(carro, False) and not self.lod.simplificado(carro):
+                ia.controlar(carro, None, None, dt, self.mundo, corrida_iniciada=True)
+        self.fisica.passo()
+        finalizados = {carro for carro in self.carros if corrida.finalizou.get(carro, False)}
+        self.lod.passo(dt, ignorar=finalizados)
+        self.colisao.passo(ignorar=finalizados)
+        for i, carro in enumerate(self.carros):
+            corrida.atualizar_progresso_carro(carro)
+            if carro.na_grama and not corrida.finalizou.get(carro, False):
+                self.tempo_fora_pista[i] += dt
+        corrida.atualizar_tempo(dt)
+        self.passos += 1
+
+    def executar(self, tempo_max=600.0, dt=DT_FIXO):
+        """
+        Roda até todos terminarem ou tempo_max segundos de corrida simulada
+        Retorna um dicionário por carro: nome, voltas, finalizou, tempo_final, travamentos (da IA) e
+        tempo_fora_pista (s na grama)
+        """
+        passos_max = int(tempo_max / dt)
+        with self._saida():
+            while self.passos < passos_max and not self.corrida.todos_finalizados():
+                self.passo(dt)
+        return self.resultados()
+
+    def _memo_compartilhados(self):
+        compartilhados = (self.pista, self.mundo, self.checkpoints, self.fisica, self.colisao,
+                          self.pista.malha_materiais, self.pista.campo_distancia, self.pista.linha_corrida,
+                          self.corrida.portoes)
+        return {id(obj): obj for obj in compartilhados}
+
+    def capturar_estado(self):
+        """
+        Cópia independente do estado da corrida (carros, IAs, progresso, LOD dos bots); a pista e os dados
+        imutáveis (malha, campo de distância, linha de corrida, checkpoints e portões) são compartilhados, não copiados
+        """
+        return copy.deepcopy((self.carros, self.ias, self.corrida, self.lod, self.passos, self.tempo_fora_pista),
+                             self._memo_compartilhados())
+
+    def restaurar_estado(self, estado):
+        """Volta ao estado capturado (o mesmo estado pode ser restaurado várias vezes)"""
+        carros, ias, corrida, lod, passos, tempo_fora_pista = copy.deepcopy(estado, self._memo_compartilhados())
+        self.fisica.limpar()
+        self.colisao.limpar()
+        for carro in carros:
+            carro.fisica = None
+            self.fisica.registrar(carro)
+            self.colisao.registrar(carro)
+        self.carros, self.ias, self.corrida, self.lod, self.passos = carros, ias, corrida, lod, passos
+        self.tempo_fora_pista = tempo_fora_pista
+
+    @property
+    def tempo_simulado(self):
+        return self.corrida.tempo_global
+
+    def resultados(self):
+        corrida = self.corrida
+        return [{
+            "nome": carro.nome,
+            "voltas": corrida.voltas.get(carro, 0),
+            "finalizou": corrida.finalizou.get(carro, False),
+            "tempo_final": corrida.tempo_final.get(carro),
+            "travamentos": ia.travamentos if ia is not None else 0,
+            "tempo_fora_pista": fora,
+        } for carro, ia, fora in zip(self.carros, self.ias, self.tempo_fora_pista)]
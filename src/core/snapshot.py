@@ -0,0 +1,73 @@
+"""
+Snapshot do mundo da corrida
+Guarda o estado de carros, IAs, corrida, pontuação de drift e câmeras e o restaura nos próprios
+objetos: reiniciar a corrida não recria nada (pista, sprites, fontes e HUD continuam carregados)
+"""
+import copy
+from array import array
+from collections import deque
+
+# Valores imutáveis: não precisam de cópia nem de registro
+_TIPOS_IMUTAVEIS = (int, float, complex, bool, str, bytes, type(None))
+# Contêineres de dados: copiados junto com o objeto (percorridos em busca de recursos)
+_TIPOS_CONTEINER = (list, tuple, dict, set, frozenset, deque)
+# Dados sem referências a outros objetos, copiados inteiros
+_TIPOS_DADOS = (bytearray, array)
+
+
+class SnapshotMundo:
+    """
+    Estado de um conjunto de objetos, restaurado no lugar (quem guarda referências a eles continua válido)
+    Só os atributos dos próprios objetos são copiados: números, textos e contêineres de dados.
+    Qualquer outro objeto referenciado por eles (sprites, atlas, fontes, pista, física em lote) é recurso
+    compartilhado e fica como está; um auxiliar com estado próprio (ex.: skidmarks do carro) precisa
+    estar na lista de objetos. Referências entre os objetos (câmera -> carro, corrida.voltas[carro])
+    continuam apontando para os mesmos objetos
+    """
+
+    def __init__(self, objetos):
+        self.objetos = [obj for obj in objetos if obj is not None]
+        self._compartilhados = {}
+        self._estados = []
+        self.capturar()
+
+    def __len__(self):
+        return len(self.objetos)
+
+    def capturar(self):
+        """Guarda o estado atual dos objetos (substitui o anterior)"""
+        compartilhados = {id(obj): obj for obj in self.objetos}
+        for obj in self.objetos:
+            _registrar_recursos(vars(obj), compartilhados)
+        self._compartilhados = compartilhados
+        self._estados = copy.deepcopy([vars(obj) for obj in self.objetos], dict(compartilhados))
+
+    def restaurar(self):
+        """Volta os objetos ao estado capturado (o mesmo snapshot pode ser restaurado várias vezes)"""
+        # O memo do deepcopy ganha as cópias feitas: cada restauração parte de um novo
+        estados = copy.deepcopy(self._estados, dict(self._compartilhados))
+        for obj, estado in zip(self.objetos, estados):
+            # Atributos criados depois da captura (ex.: caches de hasattr) também somem
+            obj.__dict__.clear()
+            obj.__dict__.update(estado)
+
+
+def _registrar_recursos(valor, compartilhados):
+    """Registra em `compartilhados` (id -> objeto) os objetos alcançáveis por contêineres de `valor`"""
+    pendentes = [valor]
+    vistos = set()
+    while pendentes:
+        atual = pendentes.pop()
+        if isinstance(atual, _TIPOS_IMUTAVEIS) or isinstance(atual, _TIPOS_DADOS):
+            continue
+        if isinstance(atual, _TIPOS_CONTEINER):
+            if id(atual) in vistos:
+                continue
+            vistos.add(id(atual))
+            if isinstance(atual, dict):
+                pendentes.extend(atual.keys())
+                pendentes.extend(atual.values())
+            else:
+                pendentes.extend(atual)
+        elif id(atual) not in compartilhados:
+            compartilhados[id(atual)] = atual
@@ -1,11 +1,13 @@
 import os
 import math
 import random
+import time
 import pygame
 from config import (
     LARGURA, ALTURA, TURBO_P1, TURBO_P2,
-    USAR_IA_NO_CARRO_2, CONFIGURACOES,
-    obter_lista_mapas, CAMINHO_TROFEU_OURO, CAMINHO_TROFEU_PRATA, CAMINHO_TROFEU_BRONZE, CAMINHO_TROFEU_VAZIO
+    USAR_IA_NO_CARRO_2, CONFIGURACOES, MARCAS_PNEU_DESBOTAM, GRAVAR_REPLAY, LOD_BOTS,
+    obter_lista_mapas, CAMINHO_TROFEU_OURO, CAMINHO_TROFEU_PRATA, CAMINHO_TROFEU_BRONZE, CAMINHO_TROFEU_VAZIO,
+    NIVEL_LOG, NIVEIS_LOG_MODULOS
 )
 from core.checkpoint_manager import CheckpointManager
 from core.carro_fisica import CarroFisica
@@ -17,8 +19,20 @@ from core.hud import HUD
 from core.game_modes import ModoJogo, TipoJogo
 from core.drift_scoring import DriftScoring
 from core.progresso import gerenciador_progresso
+from core.assets import carregar_imagem
+from core.particulas import motor_particulas
+from core.camada_marcas import camada_marcas
+from core.fisica_lote import MundoFisica
+from core.colisao_carros import ColisaoCarros
+from core.lod_bots import LodBots
+from core.replay import GravadorReplay, entrada_jogador
+from core.fantasma import GravadorFantasma
+from core.snapshot import SnapshotMundo
+from core.registro import obter_registro, configurar_registro
 from config import CAMINHO_MENU
 
+log = obter_registro(__name__)
+
 CARROS_DISPONIVEIS = [
     {"nome": "Nissan 350Z", "prefixo_cor": "Car1", "posicao": (570, 145), "sprite_selecao": "Car1", "tipo_tracao": "Traseira", "tamanho_oficina": (850, 550), "posicao_oficina": (203, 183), "preco": 0},  # Gratuito (primeiro carro)
     {"nome": "BMW M3 95' ", "prefixo_cor": "Car2", "posicao": (570, 190), "sprite_selecao": "Car2", "tipo_tracao": "Traseira", "tamanho_oficina": (770, 415), "posicao_oficina": (233, 298), "preco": 3000},
@@ -40,6 +54,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
         delattr(principal, '_recompensa_drift_calculada')
     
     pygame.init()
+    configurar_registro(NIVEL_LOG, NIVEIS_LOG_MODULOS)
 
     from config import carregar_configuracoes
     carregar_configuracoes()
@@ -91,24 +106,23 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
     
     pista_tiles = PistaTiles(largura=5000, altura=5000)
     superficie_pista_renderizada = pista_tiles.construir_pista(numero_pista, posicao_centro=(2500, 2500))
-    print(f"Pista {numero_pista} construída usando tiles estilo GRIP ({superficie_pista_renderizada.get_width()}x{superficie_pista_renderizada.get_height()})")
+    log.debug("Pista %s construída usando tiles estilo GRIP (%sx%s, em chunks)", numero_pista,
+              superficie_pista_renderizada.get_width(), superficie_pista_renderizada.get_height())
     
     offset_x_superficie = getattr(pista_tiles, 'offset_x_superficie', 0)
     offset_y_superficie = getattr(pista_tiles, 'offset_y_superficie', 0)
     
-    img_pista = superficie_pista_renderizada.copy()
-    mask_pista = superficie_pista_renderizada.copy()
     from core.laps_grip import carregar_checkpoints_grip, carregar_spawn_points
     checkpoints_grip = carregar_checkpoints_grip(numero_pista)
     
     if checkpoints_grip:
         checkpoints = checkpoints_grip
-        print(f"Checkpoints do GRIP carregados: {len(checkpoints)}")
+        log.debug("Checkpoints do GRIP carregados: %s", len(checkpoints))
     else:
         pos_inicial_tiles = pista_tiles.obter_posicao_inicial()
         centro_x, centro_y = 2500, 2500
         checkpoints = [(centro_x + pos_inicial_tiles[0], centro_y + pos_inicial_tiles[1])]
-        print(f"Usando checkpoint padrão baseado em tiles: {checkpoints[0]}")
+        log.debug("Usando checkpoint padrão baseado em tiles: %s", checkpoints[0])
     
     minimapa_imagem = pista_tiles.carregar_minimapa(numero_pista)
     
@@ -119,13 +133,14 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
     largura_pista, altura_pista = superficie_pista_renderizada.get_size()
     
     camera = Camera(largura_atual, altura_atual, largura_pista, altura_pista, zoom=1.8)
+    camera.configurar_qualidade(qualidade_alta)
     camera.cx = 2500 + offset_x_superficie
     camera.cy = 2500 + offset_y_superficie
     camera.offset_x = -offset_x_superficie
     camera.offset_y = -offset_y_superficie
     
-    print(f"Superfície da pista: {largura_pista:.0f}x{altura_pista:.0f}")
-    print(f"Posição inicial da câmera: ({camera.cx:.0f}, {camera.cy:.0f})")
+    log.debug("Superfície da pista: %.0fx%.0f", largura_pista, altura_pista)
+    log.debug("Posição inicial da câmera: (%.0f, %.0f)", camera.cx, camera.cy)
 
     modo_drift_atual = CONFIGURACOES["jogo"]["modo_drift"]
     mostrar_fps = CONFIGURACOES["video"]["mostrar_fps"]
@@ -138,29 +153,25 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
     fonte_debug_bold = pygame.font.SysFont("consolas", 16, bold=True)
     
     try:
-        trofeu_ouro = pygame.image.load(CAMINHO_TROFEU_OURO).convert_alpha()
-        trofeu_prata = pygame.image.load(CAMINHO_TROFEU_PRATA).convert_alpha()
-        trofeu_bronze = pygame.image.load(CAMINHO_TROFEU_BRONZE).convert_alpha()
-        trofeu_vazio = pygame.image.load(CAMINHO_TROFEU_VAZIO).convert_alpha()
         tamanho_trofeu = (160, 160)
-        trofeu_ouro = pygame.transform.scale(trofeu_ouro, tamanho_trofeu)
-        trofeu_prata = pygame.transform.scale(trofeu_prata, tamanho_trofeu)
-        trofeu_bronze = pygame.transform.scale(trofeu_bronze, tamanho_trofeu)
-        trofeu_vazio = pygame.transform.scale(trofeu_vazio, tamanho_trofeu)
+        trofeu_ouro = carregar_imagem(CAMINHO_TROFEU_OURO, tamanho=tamanho_trofeu)
+        trofeu_prata = carregar_imagem(CAMINHO_TROFEU_PRATA, tamanho=tamanho_trofeu)
+        trofeu_bronze = carregar_imagem(CAMINHO_TROFEU_BRONZE, tamanho=tamanho_trofeu)
+        trofeu_vazio = carregar_imagem(CAMINHO_TROFEU_VAZIO, tamanho=tamanho_trofeu)
     except Exception as e:
-        print(f"Erro ao carregar troféus: {e}")
+        log.warning("Erro ao carregar troféus: %s", e)
         trofeu_ouro = trofeu_prata = trofeu_bronze = trofeu_vazio = None
 
     voltas_objetivo = voltas
-    print(f"Checkpoints para corrida: {len(checkpoints)} checkpoints")
+    log.debug("Checkpoints para corrida: %s checkpoints", len(checkpoints))
     if checkpoints:
-        print(f"Checkpoints: {checkpoints}")
+        log.debug("Checkpoints: %s", checkpoints)
     
-    corrida = GerenciadorCorrida(fonte, checkpoints, voltas_objetivo)
+    corrida = GerenciadorCorrida(fonte, checkpoints, voltas_objetivo, linha_corrida=pista_tiles.linha_corrida)
     
-    print(f"Checkpoints na corrida: {len(corrida.checkpoints)} checkpoints")
+    log.debug("Checkpoints na corrida: %s checkpoints", len(corrida.checkpoints))
     if corrida.checkpoints:
-        print(f"Checkpoints na corrida: {corrida.checkpoints}")
+        log.debug("Checkpoints na corrida: %s", corrida.checkpoints)
     
     def obter_posicao_jogador(carro_jogador, todos_carros):
         if not corrida.finalizou.get(carro_jogador, False):
@@ -436,6 +447,10 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
     carro_p1 = CARROS_DISPONIVEIS[carro_selecionado_p1]
     carro_p2 = CARROS_DISPONIVEIS[carro_selecionado_p2]
 
+    # Semente da corrida (sorteio da largada, carros da IA, partículas), gravada no replay
+    semente_corrida = random.randrange(2 ** 31)
+    random.seed(semente_corrida)
+
     if pista_tiles is not None:
         pos_inicial_tiles = pista_tiles.obter_posicao_inicial()
         centro_x, centro_y = 2500, 2500
@@ -443,14 +458,14 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
         
         if superficie_pista_renderizada is not None:
             if not pista_tiles.verificar_se_na_pista(pos_inicial_p1[0], pos_inicial_p1[1]):
-                print(f"AVISO: Posição inicial {pos_inicial_p1} está na grama! Tentando ajustar...")
+                log.warning("Posição inicial %s está na grama! Tentando ajustar...", pos_inicial_p1)
                 for offset_x in range(-50, 51, 10):
                     for offset_y in range(-50, 51, 10):
                         test_x = pos_inicial_p1[0] + offset_x
                         test_y = pos_inicial_p1[1] + offset_y
                         if pista_tiles.verificar_se_na_pista(test_x, test_y):
                             pos_inicial_p1 = (test_x, test_y)
-                            print(f"Posição ajustada para: {pos_inicial_p1}")
+                            log.debug("Posição ajustada para: %s", pos_inicial_p1)
                             break
                     else:
                         continue
@@ -459,7 +474,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
         spawn_points_editor = carregar_spawn_points(numero_pista)
         
         if spawn_points_editor and len(spawn_points_editor) > 0:
-            print(f"Carregados {len(spawn_points_editor)} spawn points do editor")
+            log.debug("Carregados %s spawn points do editor", len(spawn_points_editor))
             
             num_ias_1_jogador = 3
             num_ias_2_jogadores = 2
@@ -510,12 +525,11 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                 
                 pos_inicial_IA = None
             
-            print(f"Spawn points selecionados aleatoriamente:")
-            print(f"  P1: {pos_inicial_p1}")
+            log.debug("Spawn points selecionados aleatoriamente - P1: %s", pos_inicial_p1)
             if pos_inicial_p2:
-                print(f"  P2: {pos_inicial_p2}")
+                log.debug("  P2: %s", pos_inicial_p2)
             for i, pos_ia in enumerate(posicoes_ia):
-                print(f"  IA-{i+1}: {pos_ia}")
+                log.debug("  IA-%s: %s", i+1, pos_ia)
         else:
             offset_lateral = 50
             pos_base_x, pos_base_y = pos_inicial_p1
@@ -541,12 +555,12 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                 ]
                 pos_inicial_IA = None
         
-        print(f"Posição inicial P1 (tiles): {pos_inicial_p1}")
+        log.debug("Posição inicial P1 (tiles): %s", pos_inicial_p1)
         if pos_inicial_p2:
-            print(f"Posição inicial P2 (tiles): {pos_inicial_p2}")
+            log.debug("Posição inicial P2 (tiles): %s", pos_inicial_p2)
         if 'posicoes_ia' in locals():
             for i, pos in enumerate(posicoes_ia):
-                print(f"Posição inicial IA-{i+1} (tiles): {pos}")
+                log.debug("Posição inicial IA-%s (tiles): %s", i+1, pos)
 
     carros = []
 
@@ -562,7 +576,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
     
     camera.cx = carro1.x
     camera.cy = carro1.y
-    print(f"Câmera inicializada na posição do carro: ({camera.cx}, {camera.cy})")
+    log.debug("Câmera inicializada na posição do carro: (%s, %s)", camera.cx, camera.cy)
 
     carro2 = None
     if modo_jogo == ModoJogo.DOIS_JOGADORES and pos_inicial_p2 is not None:
@@ -601,13 +615,46 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                 tipo_tracao=carro_data.get("tipo_tracao", CarroFisica.TRACAO_TRASEIRA)
             )
             carro_ia.eh_bot = True
-            carro_ia.skidmarks.max_skidmarks = 80
             carros_ia.append(carro_ia)
             carros.append(carro_ia)
-            print(f"IA-{i+1} usando carro: {carro_data['nome']} ({carro_data['prefixo_cor']})")
-
+            log.debug("IA-%s usando carro: %s (%s)", i+1, carro_data['nome'], carro_data['prefixo_cor'])
+
+    # Partículas e marcas de pneu da corrida anterior não devem aparecer na nova
+    motor_particulas.limpar()
+    camada_marcas.desbotar = MARCAS_PNEU_DESBOTAM
+    camada_marcas.associar(superficie_pista_renderizada)
+    # Bots são integrados juntos (MundoFisica.passo); os carros dos jogadores continuam a passo imediato
+    fisica_bots = MundoFisica()
+    colisao_carros = ColisaoCarros()
     for c in carros:
         corrida.registrar_carro(c)
+        colisao_carros.registrar(c)
+        c.malha_materiais = pista_tiles.malha_materiais
+        c.campo_distancia = pista_tiles.campo_distancia
+    for c in carros_ia:
+        fisica_bots.registrar(c)
+    # Carros na largada (o reinício volta a eles, então a descrição serve para todas as gravações)
+    descricoes = []
+    if GRAVAR_REPLAY:
+        descricoes = [GravadorReplay.descrever_carro(carro1, carro_p1["prefixo_cor"], "humano")]
+        if carro2 is not None:
+            descricoes.append(GravadorReplay.descrever_carro(carro2, carro_p2["prefixo_cor"], "humano"))
+        for carro_ia, carro_data in zip(carros_ia, carros_selecionados_ia):
+            descricoes.append(GravadorReplay.descrever_carro(carro_ia, carro_data["prefixo_cor"], "ia"))
+
+    def novo_gravador_replay():
+        if not GRAVAR_REPLAY:
+            return None
+        return GravadorReplay(numero_pista, voltas, dificuldade_ia, semente_corrida, descricoes,
+                              tipo_jogo="drift" if tipo_jogo == TipoJogo.DRIFT else "corrida")
+
+    gravador_replay = novo_gravador_replay()
+    jogadores = [c for c in (carro1, carro2) if c is not None]
+
+    # Quadros rotacionados dos sprites no zoom inicial, antes da largada (demais faixas sob demanda)
+    for c in carros:
+        if c.atlas_sprite is not None:
+            c.atlas_sprite.preparar(camera.zoom_efetivo)
 
     camera.set_alvo(carro1)
 
@@ -625,6 +672,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
         # Usar os mesmos limites da câmera principal (superfície expandida)
         camera_p1 = Camera(metade_largura, ALTURA, largura_pista, altura_pista, zoom=1.6)
         camera_p2 = Camera(metade_largura, ALTURA, largura_pista, altura_pista, zoom=1.6)
+        camera_p1.configurar_qualidade(qualidade_alta)
+        camera_p2.configurar_qualidade(qualidade_alta)
         # Posição inicial das câmeras (centro da pista no sistema original)
         camera_p1.cx = 2500 + offset_x_superficie
         camera_p1.cy = 2500 + offset_y_superficie
@@ -642,16 +691,23 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
             if isinstance(cp, (list, tuple)) and len(cp) >= 2:
                 checkpoints_ia.append((float(cp[0]), float(cp[1])))
     
-    print(f"Checkpoints passados para IA: {len(checkpoints_ia)}")
+    log.debug("Checkpoints passados para IA: %s", len(checkpoints_ia))
     if checkpoints_ia:
-        print(f"Primeiro checkpoint da IA: {checkpoints_ia[0]}")
+        log.debug("Primeiro checkpoint da IA: %s", checkpoints_ia[0])
     
     instancias_ia = []
     for i, carro_ia in enumerate(carros_ia):
-        instancia_ia = IA(checkpoints_ia, nome=carro_ia.nome, dificuldade=dificuldade_ia)
+        instancia_ia = IA(checkpoints_ia, nome=carro_ia.nome, dificuldade=dificuldade_ia,
+                          linha_corrida=pista_tiles.linha_corrida, portoes=corrida.portoes,
+                          fase_decisao=i / len(carros_ia))
         instancias_ia.append(instancia_ia)
-        print(f"Criada {instancia_ia.nome} com {len(checkpoints_ia)} checkpoints")
+        log.debug("Criada %s com %s checkpoints", instancia_ia.nome, len(checkpoints_ia))
     
+    # Nível de detalhe dos bots: longe das câmeras e dos outros carros, modelo cinemático a 30 Hz
+    lod_bots = LodBots()
+    for carro_ia, instancia_ia in zip(carros_ia, instancias_ia):
+        lod_bots.registrar(carro_ia, instancia_ia)
+
     IA2 = instancias_ia[0] if len(instancias_ia) > 0 else None
     IA3 = instancias_ia[1] if len(instancias_ia) > 1 else None
     IA4 = instancias_ia[2] if len(instancias_ia) > 2 else None
@@ -694,8 +750,25 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
     alguem_venceu = False
     dt_fixo = 1.0 / 120.0
     acumulador_dt = 0.0
+
+    # Volta fantasma (corrida de um jogador): grava as voltas do jogador e mostra a melhor da pista
+    gravador_fantasma = None
+    fantasma_volta = None
+    if modo_jogo != ModoJogo.DOIS_JOGADORES and tipo_jogo == TipoJogo.CORRIDA:
+        gravador_fantasma = GravadorFantasma(carro1, carro_p1["prefixo_cor"], dt_fixo)
+        fantasma_volta = gerenciador_progresso.obter_fantasma(numero_pista)
     max_dt = 0.1
 
+    # Estado da largada: "Reiniciar" restaura este snapshot em vez de recriar pista, carros e HUD
+    snapshot_largada = SnapshotMundo(
+        carros
+        + [c.skidmarks for c in carros]
+        + [c.emissor_nitro for c in carros]
+        + instancias_ia
+        + [corrida, drift_scoring, drift_scoring_p2, camera, camera_p1, camera_p2, lod_bots]
+    )
+    reiniciar_corrida = False
+
     while rodando:
         dt = relogio.tick(fps_max) / 1000.0
         dt = min(dt, max_dt)
@@ -704,6 +777,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
         gerenciador_musica.verificar_fim_musica()
 
         for ev in pygame.event.get():
+            if reiniciar_corrida:
+                break
             if modo_jogo == ModoJogo.DOIS_JOGADORES:
                 evento_processado = False
                 if estado_fim_jogo_p1 is not None:
@@ -713,7 +788,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                             if acao:
                                 evento_processado = True
                                 if acao == "reiniciar":
-                                    return principal(carro_selecionado_p1, carro_selecionado_p2, mapa_selecionado, modo_jogo, tipo_jogo, voltas, dificuldade_ia)
+                                    reiniciar_corrida = True
+                                    break
                                 elif acao == "trocar_carro":
                                     from core.menu import selecionar_carros_loop
                                     resultado = selecionar_carros_loop(tela)
@@ -730,7 +806,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                             if acao:
                                 evento_processado = True
                                 if acao == "reiniciar":
-                                    return principal(carro_selecionado_p1, carro_selecionado_p2, mapa_selecionado, modo_jogo, tipo_jogo, voltas, dificuldade_ia)
+                                    reiniciar_corrida = True
+                                    break
                                 elif acao == "trocar_carro":
                                     from core.menu import selecionar_carros_loop
                                     resultado = selecionar_carros_loop(tela)
@@ -749,7 +826,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                             if acao:
                                 evento_processado = True
                                 if acao == "reiniciar":
-                                    return principal(carro_selecionado_p1, carro_selecionado_p2, mapa_selecionado, modo_jogo, tipo_jogo, voltas, dificuldade_ia)
+                                    reiniciar_corrida = True
+                                    break
                                 elif acao == "trocar_carro":
                                     from core.menu import selecionar_carros_loop
                                     resultado = selecionar_carros_loop(tela)
@@ -766,7 +844,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                             if acao:
                                 evento_processado = True
                                 if acao == "reiniciar":
-                                    return principal(carro_selecionado_p1, carro_selecionado_p2, mapa_selecionado, modo_jogo, tipo_jogo, voltas, dificuldade_ia)
+                                    reiniciar_corrida = True
+                                    break
                                 elif acao == "trocar_carro":
                                     from core.menu import selecionar_carros_loop
                                     resultado = selecionar_carros_loop(tela)
@@ -785,7 +864,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                     acao = processar_tela_fim_jogo(ev, estado_fim_jogo)
                     if acao:
                         if acao == "reiniciar":
-                            return principal(carro_selecionado_p1, carro_selecionado_p2, mapa_selecionado, modo_jogo, tipo_jogo, voltas, dificuldade_ia)
+                            reiniciar_corrida = True
+                            break
                         elif acao == "trocar_carro":
                             from core.menu import selecionar_carros_loop
                             resultado = selecionar_carros_loop(tela)
@@ -821,6 +901,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                     dificuldade_ia = "dificil"
                 
                 if ev.key in (pygame.K_1, pygame.K_2, pygame.K_3):
+                    if gravador_replay is not None:
+                        gravador_replay.evento("dificuldade", [dificuldade_ia, [carros.index(c) for c in carros_ia[:2]]])
                     if IA2:
                         IA2.dificuldade = dificuldade_ia
                         IA2._configurar_dificuldade()
@@ -845,7 +927,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                         if opcao_pausa_selecionada == 0:
                             jogo_pausado = False
                         elif opcao_pausa_selecionada == 1:
-                            return principal(carro_selecionado_p1, carro_selecionado_p2, mapa_selecionado, modo_jogo, tipo_jogo, voltas, dificuldade_ia)
+                            reiniciar_corrida = True
                         elif opcao_pausa_selecionada == 2:
                             return
 
@@ -874,7 +956,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                                 if i == 0:
                                     jogo_pausado = False
                                 elif i == 1:
-                                    return principal(carro_selecionado_p1, carro_selecionado_p2, mapa_selecionado, modo_jogo, tipo_jogo, voltas, dificuldade_ia)
+                                    reiniciar_corrida = True
                                 elif i == 2:
                                     return
                                 break
@@ -925,6 +1007,44 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                     camera.cx -= ev.rel[0] * sensibilidade
                     camera.cy -= ev.rel[1] * sensibilidade
 
+        if reiniciar_corrida:
+            # Reinício no lugar: carros, IAs, corrida, drift e câmeras voltam à largada
+            reiniciar_corrida = False
+            inicio_reinicio = time.perf_counter()
+            snapshot_largada.restaurar()
+            # A dificuldade trocada durante a corrida (teclas 1-3) vale para a nova, como ao recriar tudo
+            for instancia_ia in instancias_ia:
+                if instancia_ia.dificuldade != dificuldade_ia:
+                    instancia_ia.dificuldade = dificuldade_ia
+                    instancia_ia._configurar_dificuldade()
+            motor_particulas.limpar()
+            camada_marcas.limpar()
+            semente_corrida = random.randrange(2 ** 31)
+            random.seed(semente_corrida)
+            gravador_replay = novo_gravador_replay()
+            if gravador_fantasma is not None:
+                gravador_fantasma = GravadorFantasma(carro1, carro_p1["prefixo_cor"], dt_fixo)
+                fantasma_volta = gerenciador_progresso.obter_fantasma(numero_pista)
+            if hasattr(principal, '_recompensa_drift_calculada'):
+                delattr(principal, '_recompensa_drift_calculada')
+            jogo_pausado = False
+            jogo_terminado = False
+            pontuacao_final = 0
+            tela_fim_mostrada = False
+            acao_fim_jogo = None
+            estado_fim_jogo = None
+            tela_fim_mostrada_p1 = False
+            tela_fim_mostrada_p2 = False
+            estado_fim_jogo_p1 = None
+            estado_fim_jogo_p2 = None
+            pontuacao_final_p1 = 0
+            pontuacao_final_p2 = 0
+            opcao_pausa_selecionada = 0
+            alguem_venceu = False
+            acumulador_dt = 0.0
+            log.info("Corrida reiniciada em %.1f ms", (time.perf_counter() - inicio_reinicio) * 1000)
+            continue
+
         teclas = pygame.key.get_pressed()
 
         checkpoint_manager.processar_teclado(teclas)
@@ -948,7 +1068,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                     numero_pista = mapa_selecionado if mapa_selecionado is not None else 1
                     chave_recorde = f"{numero_pista}_{voltas_objetivo}"
                     if gerenciador_progresso.registrar_recorde_drift(chave_recorde, pontuacao_final_p1):
-                        print(f"Novo recorde de drift na pista {numero_pista} ({voltas_objetivo} voltas): {pontuacao_final_p1:.0f} pontos")
+                        log.info("Novo recorde de drift na pista %s (%s voltas): %.0f pontos", numero_pista, voltas_objetivo, pontuacao_final_p1)
                     principal._recompensa_drift_p1_calculada = recompensa_drift_p1
                 else:
                     recompensa_drift_p1 = principal._recompensa_drift_p1_calculada
@@ -978,7 +1098,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                         numero_pista = mapa_selecionado if mapa_selecionado is not None else 1
                         chave_recorde = f"{numero_pista}_{voltas_objetivo}"
                         if gerenciador_progresso.registrar_recorde_drift(chave_recorde, pontuacao_final_p2):
-                            print(f"Novo recorde de drift na pista {numero_pista} ({voltas_objetivo} voltas): {pontuacao_final_p2:.0f} pontos")
+                            log.info("Novo recorde de drift na pista %s (%s voltas): %.0f pontos", numero_pista, voltas_objetivo, pontuacao_final_p2)
                         principal._recompensa_drift_p2_calculada = recompensa_drift_p2
                     else:
                         recompensa_drift_p2 = principal._recompensa_drift_p2_calculada
@@ -1037,7 +1157,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                             numero_pista = mapa_selecionado if mapa_selecionado is not None else 1
                             
                             if gerenciador_progresso.registrar_recorde(numero_pista, tempo_final_p1):
-                                print(f"Novo recorde na pista {numero_pista}: {tempo_final_p1:.2f}s")
+                                log.info("Novo recorde na pista %s: %.2fs", numero_pista, tempo_final_p1)
                             
                             if posicao_jogador_p1 == 1:
                                 gerenciador_progresso.registrar_trofeu(numero_pista, "ouro")
@@ -1093,7 +1213,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                             numero_pista = mapa_selecionado if mapa_selecionado is not None else 1
                             
                             if gerenciador_progresso.registrar_recorde(numero_pista, tempo_final_p2):
-                                print(f"Novo recorde na pista {numero_pista}: {tempo_final_p2:.2f}s")
+                                log.info("Novo recorde na pista %s: %.2fs", numero_pista, tempo_final_p2)
                             
                             if posicao_jogador_p2 == 1:
                                 gerenciador_progresso.registrar_trofeu(numero_pista, "ouro")
@@ -1120,20 +1240,23 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
             pode_controlar_p2 = (modo_jogo != ModoJogo.DOIS_JOGADORES or estado_fim_jogo_p2 is None)
             pode_controlar_geral_p1 = (estado_fim_jogo is None and pode_controlar_p1)
             
+            entrada_p1 = entrada_p2 = None
             if corrida.pode_controlar() and not jogo_pausado and pode_controlar_geral_p1:
+                entrada_p1 = entrada_jogador(carro1, teclas)
                 pos_antes = (carro1.x, carro1.y)
                 carro1.atualizar(teclas, None, dt_fixo, camera, superficie_pista_renderizada)
                 pos_depois = (carro1.x, carro1.y)
                 dist_movimento = ((pos_depois[0] - pos_antes[0])**2 + (pos_depois[1] - pos_antes[1])**2)**0.5
                 if dist_movimento > 100:
-                    print(f"AVISO: Possível teleporte detectado! De {pos_antes} para {pos_depois} (distância: {dist_movimento})")
+                    log.warning("Possível teleporte detectado! De %s para %s (distância: %.1f)", pos_antes, pos_depois, dist_movimento)
                     if pista_tiles is not None:
                         carro1.x, carro1.y = pos_antes
-                        print(f"Posição restaurada para: {pos_antes}")
+                        log.warning("Posição restaurada para: %s", pos_antes)
 
             if carro2 is not None and not jogo_pausado:
                 if modo_jogo == ModoJogo.DOIS_JOGADORES:
                     if pode_controlar_p2 and corrida.pode_controlar():
+                        entrada_p2 = entrada_jogador(carro2, teclas)
                         carro2.atualizar(teclas, None, dt_fixo, camera, superficie_pista_renderizada)
                 elif USAR_IA_NO_CARRO_2 and corrida.iniciada:
                     if not corrida.finalizou.get(carro2, False):
@@ -1142,21 +1265,42 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                     carro2.atualizar(teclas, None, dt_fixo, camera, superficie_pista_renderizada)
 
             if not jogo_pausado and corrida.iniciada:
+                finalizados = {c for c in carros if corrida.finalizou.get(c, False)}
+                if LOD_BOTS:
+                    cameras_lod = (camera_p1, camera_p2) if camera_p1 is not None and camera_p2 is not None else (camera,)
+                    if lod_bots.atualizar(cameras_lod, carros, ignorar=finalizados) and gravador_replay is not None:
+                        gravador_replay.evento("lod", sorted(carros.index(c) for c in lod_bots.simplificados))
+                if gravador_replay is not None:
+                    gravador_replay.passo([entrada_p1, entrada_p2][:len(jogadores)])
+                pos_antes_bots = {}
                 for i, (carro_ia, instancia_ia) in enumerate(zip(carros_ia, instancias_ia)):
-                    if not corrida.finalizou.get(carro_ia, False):
-                        pos_antes_bot = (carro_ia.x, carro_ia.y)
+                    if not corrida.finalizou.get(carro_ia, False) and not lod_bots.simplificado(carro_ia):
+                        pos_antes_bots[carro_ia] = (carro_ia.x, carro_ia.y)
                         instancia_ia.controlar(carro_ia, None, None, dt_fixo, superficie_pista_renderizada, corrida_iniciada=corrida.iniciada)
-                        pos_depois_bot = (carro_ia.x, carro_ia.y)
-                        dist_movimento_bot = ((pos_depois_bot[0] - pos_antes_bot[0])**2 + (pos_depois_bot[1] - pos_antes_bot[1])**2)**0.5
-                        if dist_movimento_bot > 100:
-                            print(f"AVISO: Teleporte do bot {carro_ia.nome} detectado! De {pos_antes_bot} para {pos_depois_bot} (distância: {dist_movimento_bot})")
-                            if pista_tiles is not None:
-                                carro_ia.x, carro_ia.y = pos_antes_bot
-                                print(f"Posição do bot {carro_ia.nome} restaurada para: {pos_antes_bot}")
+                fisica_bots.passo()
+                for carro_ia, pos_antes_bot in pos_antes_bots.items():
+                    pos_depois_bot = (carro_ia.x, carro_ia.y)
+                    dist_movimento_bot = ((pos_depois_bot[0] - pos_antes_bot[0])**2 + (pos_depois_bot[1] - pos_antes_bot[1])**2)**0.5
+                    if dist_movimento_bot > 100:
+                        log.warning("Teleporte do bot %s detectado! De %s para %s (distância: %.1f)", carro_ia.nome, pos_antes_bot, pos_depois_bot, dist_movimento_bot)
+                        if pista_tiles is not None:
+                            carro_ia.x, carro_ia.y = pos_antes_bot
+                            log.warning("Posição do bot %s restaurada para: %s", carro_ia.nome, pos_antes_bot)
+                lod_bots.passo(dt_fixo, ignorar=finalizados)
+                # Colisões entre carros depois da física de todos (quem já terminou fica parado na chegada e não colide)
+                colisao_carros.passo(ignorar=finalizados)
 
                 for c in carros:
                     corrida.atualizar_progresso_carro(c)
 
+                if gravador_fantasma is not None:
+                    gravador_fantasma.passo(corrida)
+                    volta = gravador_fantasma.volta_concluida
+                    if volta is not None:
+                        gravador_fantasma.volta_concluida = None
+                        if gerenciador_progresso.registrar_fantasma(numero_pista, volta) == 0:
+                            fantasma_volta = volta
+
                 if tipo_jogo == TipoJogo.DRIFT:
                     jogo_terminado_p1 = (modo_jogo == ModoJogo.DOIS_JOGADORES and estado_fim_jogo_p1 is not None) or (modo_jogo != ModoJogo.DOIS_JOGADORES and jogo_terminado)
                     jogo_terminado_p2 = (modo_jogo == ModoJogo.DOIS_JOGADORES and estado_fim_jogo_p2 is not None)
@@ -1178,7 +1322,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                             carro1.y,
                             drift_ativado,
                             derrapando,
-                            collision_force=0.0,
+                            collision_force=carro1.forca_colisao,
                             has_skidmarks=has_skidmarks,
                             na_grama=na_grama
                         )
@@ -1201,13 +1345,24 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                                 carro2.y,
                                 drift_ativado2,
                                 derrapando2,
-                                collision_force=0.0,
+                                collision_force=carro2.forca_colisao,
                                 has_skidmarks=has_skidmarks2,
                                 na_grama=na_grama2
                             )
 
             acumulador_dt -= dt_fixo
 
+        if gravador_replay is not None and all(corrida.finalizou.get(c, False) for c in jogadores):
+            caminho_replay = gravador_replay.salvar(carros, corrida)
+            if caminho_replay:
+                log.info("Replay gravado em %s", caminho_replay)
+            gravador_replay = None
+
+        if not jogo_pausado:
+            # Partículas de todos os carros avançam juntas no motor compartilhado
+            motor_particulas.atualizar(dt)
+            camada_marcas.atualizar(dt)
+
         camera.atualizar(dt)
 
         if camera_p1 is not None and camera_p2 is not None:
@@ -1253,16 +1408,12 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                 zoom_p1 = max(0.9, min(1.6, zoom_p1))
                 camera_p1.zoom += (zoom_p1 - camera_p1.zoom) * dt * 2.0
             
-            camera_p1.desenhar_fundo(superficie_p1, img_pista)
-            carro1.skidmarks.desenhar(superficie_p1, camera_p1)
-            if carro2 is not None:
-                carro2.skidmarks.desenhar(superficie_p1, camera_p1)
-            for carro_ia in carros_ia:
-                if camera_p1.esta_visivel(carro_ia.x, carro_ia.y, 50):
-                    carro_ia.skidmarks.desenhar(superficie_p1, camera_p1)
+            # As marcas de pneu já vêm compostas nos chunks do fundo
+            camera_p1.desenhar_fundo(superficie_p1, superficie_pista_renderizada)
             carros_visiveis_p1 = [carro for carro in carros if camera_p1.esta_visivel(carro.x, carro.y, 30)]
             for carro in carros_visiveis_p1:
                 carro.desenhar(superficie_p1, camera=camera_p1)
+            motor_particulas.desenhar(superficie_p1, camera_p1)
             checkpoint_atual_p1 = corrida.proximo_checkpoint.get(carro1, 0) 
             if not corrida.finalizou.get(carro1, False) and checkpoints:
                 idx_cp = checkpoint_atual_p1 % len(checkpoints)
@@ -1313,16 +1464,11 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                 zoom_p2 = max(0.9, min(1.6, zoom_p2))
                 camera_p2.zoom += (zoom_p2 - camera_p2.zoom) * dt * 2.0
             
-            camera_p2.desenhar_fundo(superficie_p2, img_pista)
-            carro1.skidmarks.desenhar(superficie_p2, camera_p2)
-            if carro2:
-                carro2.skidmarks.desenhar(superficie_p2, camera_p2)
-            for carro_ia in carros_ia:
-                if camera_p2.esta_visivel(carro_ia.x, carro_ia.y, 50):
-                    carro_ia.skidmarks.desenhar(superficie_p2, camera_p2)
+            camera_p2.desenhar_fundo(superficie_p2, superficie_pista_renderizada)
             carros_visiveis_p2 = [carro for carro in carros if camera_p2.esta_visivel(carro.x, carro.y, 30)]
             for carro in carros_visiveis_p2:
                 carro.desenhar(superficie_p2, camera=camera_p2)
+            motor_particulas.desenhar(superficie_p2, camera_p2)
             checkpoint_atual_p2 = corrida.proximo_checkpoint.get(carro2, 0)
             if not corrida.finalizou.get(carro2, False) and checkpoints:
                 idx_cp2 = checkpoint_atual_p2 % len(checkpoints)
@@ -1364,16 +1510,10 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
             camera.set_alvo(carro1)
 
         else:
-            if pista_tiles is not None:
-                camera.desenhar_fundo(tela, superficie_pista_renderizada)
-            else:
-                camera.desenhar_fundo(tela, img_pista)
-            carro1.skidmarks.desenhar(tela, camera)
-            for carro_ia in carros_ia:
-                if camera.esta_visivel(carro_ia.x, carro_ia.y, 50):
-                    carro_ia.skidmarks.desenhar(tela, camera)
-            if carro2 is not None:
-                carro2.skidmarks.desenhar(tela, camera)
+            # As marcas de pneu já vêm compostas nos chunks do fundo
+            camera.desenhar_fundo(tela, superficie_pista_renderizada)
+            if fantasma_volta is not None and corrida.iniciada:
+                fantasma_volta.desenhar(tela, camera, corrida.tempo_global - gravador_fantasma.inicio_volta)
             carros_visiveis = [carro for carro in carros if camera.esta_visivel(carro.x, carro.y, 40)]
             if len(carros_visiveis) > 2:
                 carros_ordenados = sorted(
@@ -1383,6 +1523,8 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                 carros_ordenados = carros_visiveis
             for carro in carros_ordenados:
                 carro.desenhar(tela, camera=camera)
+            # Partículas de todos os carros em um único lote
+            motor_particulas.desenhar(tela, camera)
 
         if debug_IA or mostrar_debug:
             if modo_jogo != ModoJogo.DOIS_JOGADORES and carro2 is not None and IA2:
@@ -1511,7 +1653,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                 numero_pista = mapa_selecionado if mapa_selecionado is not None else 1
                 chave_recorde = f"{numero_pista}_{voltas_objetivo}"
                 if gerenciador_progresso.registrar_recorde_drift(chave_recorde, pontuacao_final):
-                    print(f"Novo recorde de drift na pista {numero_pista} ({voltas_objetivo} voltas): {pontuacao_final:.0f} pontos")
+                    log.info("Novo recorde de drift na pista %s (%s voltas): %.0f pontos", numero_pista, voltas_objetivo, pontuacao_final)
                 
                 principal._recompensa_drift_calculada = recompensa_drift
             else:
@@ -1580,7 +1722,7 @@ def principal(carro_selecionado_p1=0, carro_selecionado_p2=1, mapa_selecionado=N
                         numero_pista = mapa_selecionado if mapa_selecionado is not None else 1
                         
                         if gerenciador_progresso.registrar_recorde(numero_pista, tempo_final):
-                            print(f"Novo recorde na pista {numero_pista}: {tempo_final:.2f}s")
+                            log.info("Novo recorde na pista %s: %.2fs", numero_pista, tempo_final)
                         
                         if posicao_jogador == 1:
                             gerenciador_progresso.registrar_trofeu(numero_pista, "ouro")
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks da física - Turbo Racer
+========================================
+
+Mede sem janela (driver de vídeo dummy), em cada pista, o custo isolado por tick (uma chamada para
+um carro) de cada subsistema do passo fixo:
+  fisica     CarroFisica._step de um carro sozinho, com um roteiro fixo de entradas
+  ia         IA.controlar dos bots de uma corrida sem janela
+  progresso  GerenciadorCorrida.atualizar_progresso_carro na mesma corrida
+  grama      verificar_na_grama_grip no campo de distância, nas posições percorridas pelos bots
+Confere também que montar a corrida sem janela, com o bundle da pista já compilado, não decodifica
+nenhuma imagem (pygame.image.load), inclusive nas pistas expandidas além do mundo pedido.
+
+Mostra ns/tick e ticks/s e compara com a base gravada (tools/benchmark_fisica_base.json),
+apontando as regressões acima do limite (código de saída 1 se houver alguma, ou se alguma imagem
+for decodificada).
+
+Uso:
+    python tools/benchmark_fisica.py
+    python tools/benchmark_fisica.py --pistas 1 2 --repeticoes 5 --limite 0.1
+    python tools/benchmark_fisica.py --salvar-base
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import gc
+import math
+import argparse
+import platform
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+
+from core import pista_tiles
+from core.assets import assets
+from core.simulacao import SimulacaoCorrida, DT_FIXO
+from core.registro import registro_silenciado
+from core.carro_fisica import CarroFisica
+from core.pista_grip import verificar_na_grama_grip
+
+CAMINHO_BASE = os.path.join(os.path.dirname(__file__), "benchmark_fisica_base.json")
+BASE_VERSAO = 1
+SUBSISTEMAS = ("fisica", "ia", "progresso", "grama")
+PISTAS = tuple(range(1, 10))
+
+SEMENTE = 1
+CARROS_CORRIDA = ("Car1", "Car2", "Car3", "Car4")
+PASSOS_CORRIDA = 1200      # 10 s de corrida por pista
+PASSOS_FISICA = 2400
+# O roteiro não segue a pista: o carro da física volta à largada a cada ciclo
+CICLO_ROTEIRO = 480        # 4 s
+POSICOES_POR_BLOCO = 64
+# Carga de referência medida junto com cada pista (ver medir_calibracao)
+CALIBRACAO_BLOCOS = 4
+CALIBRACAO_ITERACOES = 2000
+LIMITE_REGRESSAO = 0.20
+
+
+def roteiro(passo):
+    """Entradas (acelerar, direita, esquerda, frear_re, turbo) do carro da física no passo do ciclo"""
+    t = passo % CICLO_ROTEIRO
+    return (
+        t < 420,
+        60 <= t < 120 or 300 <= t < 330,
+        180 <= t < 240,
+        t >= 420,
+        240 <= t < 300,
+    )
+
+
+def medir_fisica(sim, largada, passos):
+    """ns de cada ciclo do roteiro em CarroFisica._step, de um carro fora do MundoFisica (grama pelo campo)"""
+    x0, y0, angulo0 = largada
+    carro = CarroFisica(x0, y0, CARROS_CORRIDA[0], (0, 0, 0, 0), renderizar=False)
+    carro.malha_materiais = sim.pista.malha_materiais
+    carro.campo_distancia = sim.pista.campo_distancia
+    entradas = [roteiro(i) for i in range(CICLO_ROTEIRO)]
+    passo, mundo = carro._step, sim.mundo
+    blocos = []
+    for _ in range(max(1, passos // CICLO_ROTEIRO)):
+        carro.x, carro.y, carro.angulo = x0, y0, angulo0
+        carro.vx = carro.vy = carro.yaw_rate = carro._steer_wheel = 0.0
+        carro.turbo_carga = 100.0
+        inicio = time.perf_counter_ns()
+        for acelerar, direita, esquerda, frear_re, turbo in entradas:
+            passo(acelerar, direita, esquerda, frear_re, turbo, None, DT_FIXO, None, mundo)
+        blocos.append(time.perf_counter_ns() - inicio)
+    return blocos, len(blocos) * CICLO_ROTEIRO
+
+
+def medir_corrida(sim, passos):
+    """
+    Corrida de bots na mesma ordem de SimulacaoCorrida.passo, cronometrando só a IA e o progresso
+    Retorna ((ns por passo, chamadas) da IA, (ns por passo, chamadas) do progresso, posições percorridas)
+    """
+    corrida, mundo = sim.corrida, sim.mundo
+    ns_ia, ns_progresso = [], []
+    chamadas_ia = chamadas_progresso = 0
+    posicoes = []
+    for _ in range(passos):
+        bots = [(carro, ia) for carro, ia in zip(sim.carros, sim.ias)
+                if ia is not None and not corrida.finalizou.get(carro, False) and not sim.lod.simplificado(carro)]
+        inicio = time.perf_counter_ns()
+        for carro, ia in bots:
+            ia.controlar(carro, None, None, DT_FIXO, mundo, corrida_iniciada=True)
+        ns_ia.append(time.perf_counter_ns() - inicio)
+        chamadas_ia += len(bots)
+
+        sim.fisica.passo()
+        finalizados = {carro for carro in sim.carros if corrida.finalizou.get(carro, False)}
+        sim.lod.passo(DT_FIXO, ignorar=finalizados)
+        sim.colisao.passo(ignorar=finalizados)
+
+        inicio = time.perf_counter_ns()
+        for carro in sim.carros:
+            corrida.atualizar_progresso_carro(carro)
+        ns_progresso.append(time.perf_counter_ns() - inicio)
+        chamadas_progresso += len(sim.carros)
+        corrida.atualizar_tempo(DT_FIXO)
+        sim.passos += 1
+        posicoes.extend((carro.x, carro.y) for carro in sim.carros)
+    return (ns_ia, chamadas_ia), (ns_progresso, chamadas_progresso), posicoes
+
+
+def medir_grama(campo, posicoes):
+    """ns de cada bloco de POSICOES_POR_BLOCO chamadas a verificar_na_grama_grip (raio de CarroFisica)"""
+    blocos = []
+    for i in range(0, len(posicoes), POSICOES_POR_BLOCO):
+        bloco = posicoes[i:i + POSICOES_POR_BLOCO]
+        inicio = time.perf_counter_ns()
+        for x, y in bloco:
+            verificar_na_grama_grip(campo, x, y, 15)
+        blocos.append(time.perf_counter_ns() - inicio)
+    return blocos, len(posicoes)
+
+
+class _Corpo:
+    __slots__ = ("x", "v")
+
+
+def medir_calibracao(blocos=CALIBRACAO_BLOCOS):
+    """
+    ns de cada bloco de uma carga fixa de Python puro (aritmética, atributos, chamadas), parecida com a
+    da física; medida junto com os subsistemas, acompanha a velocidade da máquina naquele momento
+    """
+    corpo = _Corpo()
+    raiz, tanh = math.sqrt, math.tanh
+    medidas = []
+    for _ in range(blocos):
+        corpo.x, corpo.v = 0.0, 1.0
+        inicio = time.perf_counter_ns()
+        for i in range(CALIBRACAO_ITERACOES):
+            a = corpo.v * 0.5 + i * 1e-3
+            corpo.x += max(-1.0, min(tanh(a), 1.0)) * raiz(a * a + 1.0)
+            corpo.v = -corpo.v if corpo.x > 10.0 else corpo.v
+        medidas.append(time.perf_counter_ns() - inicio)
+    return medidas, blocos * CALIBRACAO_ITERACOES
+
+
+def contar_imagens_carregadas(numero_pista):
+    """
+    Imagens decodificadas ao montar a pista a partir do bundle em disco (sem a pista em memória e com o
+    cache de imagens vazio), na corrida sem janela e no início de corrida do jogo (construir_pista, antes
+    de desenhar); as duas devem ser 0: só desenhar um chunk fora do bundle precisa das tiles
+    Retorna {caminho: quantidade}
+    """
+    montagens = {
+        "sem janela": lambda: SimulacaoCorrida(numero_pista, CARROS_CORRIDA, semente=SEMENTE),
+        "jogo": lambda: pista_tiles.PistaTiles(5000, 5000).construir_pista(numero_pista, posicao_centro=(2500, 2500)),
+    }
+    carregar = pygame.image.load
+    chamadas = {}
+    with contextlib.redirect_stdout(io.StringIO()), registro_silenciado():
+        # Garante o bundle compilado (a primeira execução numa máquina nova compila a pista)
+        montagens["sem janela"]()
+        for nome, montar in montagens.items():
+            pista_tiles._PISTAS_EM_MEMORIA.clear()
+            assets.limpar()
+            chamadas[nome] = 0
+
+            def contar(*args, _nome=nome, **kwargs):
+                chamadas[_nome] += 1
+                return carregar(*args, **kwargs)
+
+            pygame.image.load = contar
+            try:
+                montar()
+            finally:
+                pygame.image.load = carregar
+    return chamadas
+
+
+def medir_pista(numero_pista, repeticoes):
+    """
+    ns/tick de cada subsistema; a carga é determinística, então cada bloco (passo da corrida, ciclo do
+    roteiro, bloco de posições) fica com o menor tempo entre as repetições: interrupções e trocas de
+    frequência da CPU em uma repetição não entram no resultado
+    """
+    minimos, ticks = {}, {}
+    for _ in range(repeticoes):
+        # Coleta de lixo desligada durante a medição (como no timeit): com a carga determinística as
+        # pausas cairiam sempre nos mesmos blocos e o mínimo entre repetições não as tiraria
+        gc.collect()
+        gc.disable()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), registro_silenciado():
+                sim = SimulacaoCorrida(numero_pista, CARROS_CORRIDA, semente=SEMENTE)
+                primeiro = sim.carros[0]
+                largada = (primeiro.x, primeiro.y, primeiro.angulo)
+                calibracao, _ = medir_calibracao()
+                ia, progresso, posicoes = medir_corrida(sim, PASSOS_CORRIDA)
+                calibracao += medir_calibracao()[0]
+                medidas = {
+                    "fisica": medir_fisica(sim, largada, PASSOS_FISICA),
+                    "ia": ia,
+                    "progresso": progresso,
+                    "grama": medir_grama(sim.pista.campo_distancia, posicoes),
+                }
+                calibracao += medir_calibracao()[0]
+                medidas["calibracao"] = (calibracao, len(calibracao) * CALIBRACAO_ITERACOES)
+        finally:
+            gc.enable()
+        for nome, (blocos, quantidade) in medidas.items():
+            anteriores = minimos.get(nome)
+            minimos[nome] = blocos if anteriores is None else list(map(min, anteriores, blocos))
+            ticks[nome] = quantidade
+    return {nome: sum(minimos[nome]) / max(1, ticks[nome]) for nome in SUBSISTEMAS + ("calibracao",)}
+
+
+def parametros():
+    return {"semente": SEMENTE, "carros": list(CARROS_CORRIDA), "passos_corrida": PASSOS_CORRIDA,
+            "passos_fisica": PASSOS_FISICA}
+
+
+def carregar_base(caminho):
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+    except Exception as e:
+        print(f"Erro ao carregar a base {caminho}: {e}")
+        return None
+    if base.get("versao") != BASE_VERSAO:
+        print(f"Base na versão {base.get('versao')}; este benchmark usa a {BASE_VERSAO}")
+        return None
+    if base.get("parametros") != parametros():
+        print("Aviso: a base foi gravada com outros parâmetros de carga; a comparação é só indicativa")
+    return base
+
+
+def salvar_base(caminho, resultados):
+    base = {
+        "versao": BASE_VERSAO,
+        "gerada_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": parametros(),
+        "pistas": {str(n): {nome: round(ns, 1) for nome, ns in tempos.items()} for n, tempos in resultados.items()},
+    }
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(base, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def variacoes(numero_pista, tempos, base):
+    """
+    Variação de cada subsistema em relação à base, normalizada pela calibração: uma máquina (ou momento)
+    mais lenta que a da base não aparece como regressão, só o custo relativo à carga de referência
+    Retorna ({subsistema: variação}, variação da calibração ou None)
+    """
+    base_pista = (base or {}).get("pistas", {}).get(str(numero_pista), {})
+    escala = 1.0
+    maquina = None
+    if base_pista.get("calibracao"):
+        escala = tempos["calibracao"] / base_pista["calibracao"]
+        maquina = escala - 1.0
+    return {nome: tempos[nome] / (base_pista[nome] * escala) - 1.0
+            for nome in SUBSISTEMAS if base_pista.get(nome)}, maquina
+
+
+def mostrar_pista(numero_pista, tempos, base):
+    variacao, maquina = variacoes(numero_pista, tempos, base)
+    cabecalho = f"Pista {numero_pista}:"
+    if maquina is not None:
+        cabecalho += f" (calibração {tempos['calibracao']:.0f} ns, máquina {maquina:+.1%} em relação à base)"
+    print(cabecalho)
+    for nome in SUBSISTEMAS:
+        ns = tempos[nome]
+        linha = f"  {nome:<10} {ns:10.0f} ns/tick {1e9 / ns:12,.0f} ticks/s"
+        if nome in variacao:
+            linha += f"   {variacao[nome]:+6.1%}"
+        print(linha)
+
+
+def resumo(resultados, base, limite):
+    """
+    Média geométrica das pistas por subsistema: uma pista sozinha varia ~20% entre execuções em uma
+    máquina ruidosa, a média das pistas bem menos; só ela conta como regressão
+    Retorna as regressões [(subsistema, variação)]
+    """
+    print("\nResumo (média geométrica das pistas):")
+    regressoes = []
+    for nome in SUBSISTEMAS:
+        ns = [tempos[nome] for tempos in resultados.values()]
+        razoes = [1.0 + v[nome] for v, _ in (variacoes(n, t, base) for n, t in resultados.items()) if nome in v]
+        media = math.exp(sum(map(math.log, ns)) / len(ns))
+        linha = f"  {nome:<10} {media:10.0f} ns/tick {1e9 / media:12,.0f} ticks/s"
+        if razoes:
+            variacao = math.exp(sum(map(math.log, razoes)) / len(razoes)) - 1.0
+            linha += f"   {variacao:+6.1%}"
+            if variacao > limite:
+                linha += "  REGRESSÃO"
+                regressoes.append((nome, variacao))
+        print(linha)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks da física, IA, progresso e grama por pista")
+    parser.add_argument("--pistas", type=int, nargs="+", default=list(PISTAS), help="números das pistas (1 ... 9)")
+    parser.add_argument("--repeticoes", type=int, default=5, help="execuções por pista (vale o melhor tempo de cada bloco)")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                        help="aumento relativo de ns/tick acima do qual é regressão (0.2 = 20%%)")
+    parser.add_argument("--base", default=CAMINHO_BASE, help="arquivo JSON da base")
+    parser.add_argument("--salvar-base", action="store_true", help="gravar os resultados como a nova base")
+    args = parser.parse_args()
+
+    base = None if args.salvar_base else carregar_base(args.base)
+    resultados = {}
+    imagens = {}
+    inicio = time.perf_counter()
+    for numero_pista in args.pistas:
+        imagens[numero_pista] = contar_imagens_carregadas(numero_pista)
+        resultados[numero_pista] = medir_pista(numero_pista, max(1, args.repeticoes))
+        mostrar_pista(numero_pista, resultados[numero_pista], base)
+    regressoes = resumo(resultados, base, args.limite)
+    print(f"\n{len(args.pistas)} pista(s) em {time.perf_counter() - inicio:.1f}s")
+
+    com_imagens = [(n, nome, qtd) for n, contagens in imagens.items() for nome, qtd in contagens.items() if qtd]
+    if com_imagens:
+        for numero_pista, nome, quantidade in com_imagens:
+            print(f"Pista {numero_pista}: {quantidade} imagem(ns) decodificada(s) ({nome}) com o bundle compilado")
+        return 1
+
+    if args.salvar_base:
+        salvar_base(args.base, resultados)
+        print(f"Base gravada em {args.base}")
+        return 0
+    if base is None:
+        print("Sem base para comparar (use --salvar-base para gravar uma)")
+        return 0
+    if regressoes:
+        print(f"{len(regressoes)} regressão(ões) acima de {args.limite:.0%}:")
+        for nome, variacao in regressoes:
+            print(f"  {nome}: {variacao:+.1%}")
+        return 1
+    print(f"Nenhuma regressão acima de {args.limite:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
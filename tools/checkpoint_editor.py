@@ -22,9 +22,6 @@ Versão: 1.0
 import sys
 import os
 import pygame
-import re
-import json
-from pathlib import Path
 
 # Adicionar o diretório src ao path para importar módulos
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -32,7 +29,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from config import LARGURA, ALTURA, FPS, MAPAS_DISPONIVEIS
 from core.camera import Camera
 from core.pista_tiles import PistaTiles
-from core.laps_grip import carregar_checkpoints_grip
+from core.pista_arquivo import carregar_arquivo_pista, salvar_arquivo_pista, caminho_arquivo_pista
 
 class CheckpointEditor:
     def __init__(self):
@@ -62,7 +59,7 @@ class CheckpointEditor:
         self.usar_tiles_grip = True  # Sempre usar tiles do GRIP
         self.numero_pista = 1  # Pista do GRIP (1-9)
         self.pista_tiles = None
-        self.surface_pista_completa = None  # Superfície completa do mapa (5000x5000)
+        self.surface_pista_completa = None  # Mundo da pista (MundoChunks) ou superfície de fallback
         self.largura_pista = 5000
         self.altura_pista = 5000
         
@@ -72,9 +69,6 @@ class CheckpointEditor:
         
         # Mapa atual
         self.mapa_atual = f"Pista_{self.numero_pista}"
-        self.img_pista = None
-        self.mask_pista = None
-        self.mask_guias = None
         
         # Câmera (com zoom controlável) - ajustada para mapa grande
         # Zoom inicial calculado para mostrar o mapa inteiro na tela
@@ -121,11 +115,6 @@ class CheckpointEditor:
             self.pista_tiles = PistaTiles(largura=self.largura_pista, altura=self.altura_pista)
             self.surface_pista_completa = self.pista_tiles.construir_pista(self.numero_pista)
             
-            # Criar imagens compatíveis para o sistema antigo (não usadas, mas mantidas para compatibilidade)
-            self.img_pista = self.surface_pista_completa.copy()
-            self.mask_pista = self.surface_pista_completa.copy()
-            self.mask_guias = pygame.Surface((self.largura_pista, self.altura_pista), pygame.SRCALPHA)
-            
             # Atualizar câmera para o tamanho correto do mapa
             self.camera.largura_pista = self.largura_pista
             self.camera.altura_pista = self.altura_pista
@@ -144,89 +133,32 @@ class CheckpointEditor:
             # Fallback: criar superfície vazia
             self.surface_pista_completa = pygame.Surface((self.largura_pista, self.altura_pista))
             self.surface_pista_completa.fill((0, 200, 0))  # Verde = grama
-            self.img_pista = self.surface_pista_completa.copy()
-            self.mask_pista = self.img_pista.copy()
-            self.mask_guias = pygame.Surface((self.largura_pista, self.altura_pista), pygame.SRCALPHA)
             # Carregar checkpoints mesmo com erro
             self.carregar_checkpoints()
     
     def obter_caminho_checkpoints_pista(self):
-        """Retorna o caminho do arquivo JSON de checkpoints para a pista atual"""
-        diretorio = os.path.join(os.path.dirname(__file__), '..', 'data')
-        os.makedirs(diretorio, exist_ok=True)
-        return os.path.join(diretorio, f"checkpoints_pista_{self.numero_pista}.json")
+        """Retorna o caminho do arquivo de definição da pista atual (data/pistas/pista_N.json)"""
+        return caminho_arquivo_pista(self.numero_pista)
     
     def carregar_checkpoints(self):
-        """Carrega checkpoints e spawn points do arquivo JSON (prioridade) ou do GRIP (fallback)"""
+        """Carrega checkpoints e spawn points do arquivo de definição da pista"""
         try:
-            # Primeiro, tentar carregar do arquivo JSON específico da pista
-            arquivo = self.obter_caminho_checkpoints_pista()
-            if os.path.exists(arquivo):
-                with open(arquivo, 'r', encoding='utf-8') as f:
-                    dados_carregados = json.load(f)
-                
-                # Verificar se é formato novo (com spawn_points) ou antigo (só checkpoints)
-                if isinstance(dados_carregados, dict):
-                    # Formato novo: {"checkpoints": [...], "spawn_points": [...]}
-                    checkpoints_carregados = dados_carregados.get("checkpoints", [])
-                    self.spawn_points = dados_carregados.get("spawn_points", [])
-                else:
-                    # Formato antigo: apenas lista de checkpoints
-                    checkpoints_carregados = dados_carregados
-                    self.spawn_points = []
-                
-                # Garantir que todos os checkpoints tenham ângulo (compatibilidade com versões antigas)
+            dados = carregar_arquivo_pista(self.numero_pista)
+            if dados is None:
                 self.checkpoints = []
-                for cp in checkpoints_carregados:
-                    if len(cp) == 2:
-                        # Formato antigo [x, y] - adicionar ângulo 0
-                        self.checkpoints.append([float(cp[0]), float(cp[1]), 0])
-                    elif len(cp) == 3:
-                        # Formato novo [x, y, angulo]
-                        self.checkpoints.append([float(cp[0]), float(cp[1]), float(cp[2])])
-                
-                # Garantir que spawn_points sejam listas de [x, y]
-                if self.spawn_points:
-                    self.spawn_points = [[float(sp[0]), float(sp[1])] for sp in self.spawn_points if len(sp) >= 2]
-                
-                print(f"Carregados {len(self.checkpoints)} checkpoints do JSON para pista {self.numero_pista}")
-                print(f"Carregados {len(self.spawn_points)} spawn points do JSON para pista {self.numero_pista}")
+                self.spawn_points = []
+                print(f"Nenhum arquivo de definição encontrado para pista {self.numero_pista}")
                 return
             
-            # Fallback: tentar carregar checkpoints do GRIP (fonte principal)
-            checkpoints_grip = carregar_checkpoints_grip(self.numero_pista)
-            if checkpoints_grip:
-                # Converter tuplas para listas (formato JSON) - adicionar ângulo padrão 0
-                self.checkpoints = []
-                for cp in checkpoints_grip:
-                    if len(cp) >= 3:
-                        self.checkpoints.append([float(cp[0]), float(cp[1]), float(cp[2])])
-                    else:
-                        self.checkpoints.append([float(cp[0]), float(cp[1]), 0])
-                # Spawn points do GRIP (se existirem) - tentar carregar do JSON da pista
-                try:
-                    arquivo_spawn = self.obter_caminho_checkpoints_pista()
-                    if os.path.exists(arquivo_spawn):
-                        with open(arquivo_spawn, 'r', encoding='utf-8') as f:
-                            dados_spawn = json.load(f)
-                        if isinstance(dados_spawn, dict):
-                            spawn_grip = dados_spawn.get("spawn_points", [])
-                            if spawn_grip:
-                                self.spawn_points = [[float(sp[0]), float(sp[1])] for sp in spawn_grip if len(sp) >= 2]
-                            else:
-                                self.spawn_points = []
-                        else:
-                            self.spawn_points = []
-                    else:
-                        self.spawn_points = []
-                except:
-                    self.spawn_points = []
-                print(f"Carregados {len(self.checkpoints)} checkpoints do GRIP (laps_grip.py) para pista {self.numero_pista}")
-                print(f"Carregados {len(self.spawn_points)} spawn points do GRIP para pista {self.numero_pista}")
-            else:
-                self.checkpoints = []
-                self.spawn_points = []
-                print(f"Nenhum checkpoint encontrado para pista {self.numero_pista}")
+            # Garantir que todos os checkpoints tenham ângulo (formato [x, y, angulo] do editor)
+            self.checkpoints = []
+            for cp in dados["checkpoints"]:
+                angulo = float(cp[2]) if len(cp) > 2 else 0
+                self.checkpoints.append([float(cp[0]), float(cp[1]), angulo])
+            self.spawn_points = [[float(sp[0]), float(sp[1])] for sp in dados["spawn_points"]]
+            
+            print(f"Carregados {len(self.checkpoints)} checkpoints para pista {self.numero_pista}")
+            print(f"Carregados {len(self.spawn_points)} spawn points para pista {self.numero_pista}")
         except Exception as e:
             print(f"Erro ao carregar checkpoints: {e}")
             import traceback
@@ -263,44 +195,21 @@ class CheckpointEditor:
         return True
     
     def salvar_checkpoints(self):
-        """Salva checkpoints e spawn points no arquivo JSON específico da pista"""
+        """Salva checkpoints e spawn points no arquivo de definição da pista (tiles são preservadas)"""
         try:
-            # Salvar em arquivo JSON específico da pista
-            arquivo = self.obter_caminho_checkpoints_pista()
-            os.makedirs(os.path.dirname(arquivo), exist_ok=True)
-            
-            # Salvar em formato: {"checkpoints": [...], "spawn_points": [...]}
-            dados_para_salvar = {
-                "checkpoints": self.checkpoints,
-                "spawn_points": self.spawn_points,
-                "numero_pista": self.numero_pista
-            }
-            
-            with open(arquivo, 'w', encoding='utf-8') as f:
-                json.dump(dados_para_salvar, f, indent=2)
-            
-            print(f"Checkpoints salvos em JSON para pista {self.numero_pista}: {len(self.checkpoints)} checkpoints, {len(self.spawn_points)} spawn points")
-            print(f"Arquivo: {arquivo}")
-            print(f"NOTA: O jogo usa checkpoints de src/core/laps_grip.py, não do JSON.")
-            print(f"Use F10 para exportar para laps_grip.py ou copie manualmente as coordenadas abaixo.\n")
+            dados = carregar_arquivo_pista(self.numero_pista)
+            if dados is None:
+                dados = {"numero_pista": self.numero_pista, "tiles": []}
             
-            # Mostrar coordenadas para copiar para laps_grip.py
-            print(f"=== COORDENADAS PARA PISTA {self.numero_pista} ===")
-            print(f"Copie e cole no arquivo src/core/laps_grip.py:")
-            print(f"    if numero_pista == {self.numero_pista}:")
-            centro_x, centro_y = 2500, 2500
-            for i, cp in enumerate(self.checkpoints):
-                x, y = cp[0], cp[1]
-                angulo = cp[2] if len(cp) > 2 else 0
-                offset_x = x - centro_x
-                offset_y = y - centro_y
-                print(f"        checkpoint_{i+1} = (centro_x + {offset_x:.0f}, centro_y + {offset_y:.0f}, {angulo:.0f})  # Ângulo: {angulo:.0f}°")
-            print(f"        checkpoints = [")
-            for i in range(len(self.checkpoints)):
-                print(f"            tuple(checkpoint_{i+1}),")
-            print(f"        ]")
-            print(f"==========================================\n")
+            dados["checkpoints"] = [
+                [round(cp[0]), round(cp[1]), round(cp[2] if len(cp) > 2 else 0)]
+                for cp in self.checkpoints
+            ]
+            dados["spawn_points"] = [[float(sp[0]), float(sp[1])] for sp in self.spawn_points]
+            salvar_arquivo_pista(self.numero_pista, dados)
             
+            print(f"Pista {self.numero_pista} salva: {len(self.checkpoints)} checkpoints, {len(self.spawn_points)} spawn points")
+            print(f"Arquivo: {self.obter_caminho_checkpoints_pista()}")
             return True
         except Exception as e:
             print(f"Erro ao salvar checkpoints: {e}")
@@ -308,79 +217,6 @@ class CheckpointEditor:
             traceback.print_exc()
             return False
     
-    def exportar_para_laps_grip(self):
-        """Exporta checkpoints diretamente para o arquivo laps_grip.py"""
-        try:
-            caminho_laps_grip = os.path.join(os.path.dirname(__file__), '..', 'src', 'core', 'laps_grip.py')
-            
-            if not os.path.exists(caminho_laps_grip):
-                print(f"Erro: Arquivo não encontrado: {caminho_laps_grip}")
-                return False
-            
-            # Ler arquivo atual
-            with open(caminho_laps_grip, 'r', encoding='utf-8') as f:
-                linhas = f.readlines()
-            
-            # Encontrar o bloco da pista atual
-            inicio_bloco = None
-            fim_bloco = None
-            for i, linha in enumerate(linhas):
-                if f'if numero_pista == {self.numero_pista}:' in linha:
-                    inicio_bloco = i
-                elif inicio_bloco is not None and (linha.strip().startswith('elif numero_pista ==') or linha.strip().startswith('else:')):
-                    fim_bloco = i
-                    break
-            
-            if inicio_bloco is None:
-                print(f"Erro: Não foi possível encontrar o bloco da pista {self.numero_pista} em laps_grip.py")
-                return False
-            
-            if fim_bloco is None:
-                # Se não encontrou fim, procurar pelo próximo if/elif ou final da função
-                for i in range(inicio_bloco + 1, len(linhas)):
-                    linha_stripped = linhas[i].strip()
-                    if linha_stripped.startswith('elif numero_pista ==') or linha_stripped.startswith('else:'):
-                        fim_bloco = i
-                        break
-                if fim_bloco is None:
-                    fim_bloco = len(linhas) - 1
-            
-            # Gerar novo código para os checkpoints
-            centro_x, centro_y = 2500, 2500
-            novo_codigo = []
-            novo_codigo.append(f"    if numero_pista == {self.numero_pista}:\n")
-            
-            # Adicionar checkpoints individuais (com ângulo)
-            for i, cp in enumerate(self.checkpoints):
-                x, y = cp[0], cp[1]
-                angulo = cp[2] if len(cp) > 2 else 0
-                offset_x = x - centro_x
-                offset_y = y - centro_y
-                # Incluir ângulo no checkpoint: (x, y, angulo)
-                novo_codigo.append(f"        checkpoint_{i+1} = (centro_x + {offset_x:.0f}, centro_y + {offset_y:.0f}, {angulo:.0f})  # Ângulo: {angulo:.0f}°\n")
-            
-            # Adicionar lista de checkpoints
-            novo_codigo.append("        # Checkpoints com ângulo: (x, y, angulo) ou (x, y) para cálculo automático\n")
-            novo_codigo.append("        checkpoints = [\n")
-            for i in range(len(self.checkpoints)):
-                novo_codigo.append(f"            tuple(checkpoint_{i+1}),\n")
-            novo_codigo.append("        ]\n")
-            
-            # Substituir o bloco
-            novas_linhas = linhas[:inicio_bloco] + novo_codigo + linhas[fim_bloco:]
-            
-            # Salvar arquivo
-            with open(caminho_laps_grip, 'w', encoding='utf-8') as f:
-                f.writelines(novas_linhas)
-            
-            print(f"Checkpoints exportados para laps_grip.py (Pista {self.numero_pista})")
-            return True
-        except Exception as e:
-            print(f"Erro ao exportar para laps_grip.py: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
-    
     def trocar_mapa_por_id(self, numero_pista):
         """Troca para uma nova pista GRIP (1-9)."""
         if 1 <= numero_pista <= 9:
@@ -559,7 +395,7 @@ class CheckpointEditor:
                         print(f"Modo de edição CHECKPOINT: {'ATIVADO' if self.modo_edicao else 'DESATIVADO'}")
                 elif event.key == pygame.K_F5:
                     if self.salvar_checkpoints():
-                        print("Checkpoints salvos em JSON (backup)!")
+                        print("Checkpoints salvos no arquivo da pista!")
                 elif event.key == pygame.K_F6:
                     self.carregar_checkpoints()
                     print("Checkpoints recarregados!")
@@ -574,12 +410,6 @@ class CheckpointEditor:
                         print("Todos os checkpoints removidos!")
                 elif event.key == pygame.K_F9:
                     self.mostrar_selecao_mapa()
-                elif event.key == pygame.K_F10:
-                    # Exportar diretamente para laps_grip.py
-                    if self.exportar_para_laps_grip():
-                        print("Checkpoints exportados para laps_grip.py!")
-                    else:
-                        print("Erro ao exportar para laps_grip.py")
                 elif event.key == pygame.K_r:
                     # Rotacionar checkpoint selecionado 90 graus
                     if self.modo_edicao and self.checkpoint_selecionado >= 0:
@@ -746,10 +576,8 @@ class CheckpointEditor:
         self.screen.fill((0, 0, 0))
         
         # Desenhar fundo da pista completa
-        if self.surface_pista_completa:
+        if self.surface_pista_completa is not None:
             self.camera.desenhar_fundo(self.screen, self.surface_pista_completa)
-        else:
-            self.camera.desenhar_fundo(self.screen, self.img_pista)
         
         # Desenhar checkpoints
         if self.checkpoints:
@@ -946,8 +774,8 @@ class CheckpointEditor:
         # Controles
         controles = [
             "F7: Toggle Checkpoint | Shift+F7: Toggle Spawn",
-            "F5: Salvar JSON (backup) | F6: Carregar | F8: Limpar",
-            "Shift+F8: Limpar Spawn | F9: Trocar Pista | F10: Exportar",
+            "F5: Salvar Pista | F6: Carregar | F8: Limpar",
+            "Shift+F8: Limpar Spawn | F9: Trocar Pista",
             "R: Rotacionar 90° | Q/E: Rotacionar ±15°",
             "H: Toggle Ajuda | +/-: Zoom | 0: Reset",
             "< >: Navegar Pistas | ESC: Sair"
@@ -993,7 +821,7 @@ class CheckpointEditor:
         print("Pressione +/- para zoom, 0 para resetar zoom")
         print("Use scroll do mouse para zoom")
         print("Pressione < > ou , . para navegar entre pistas GRIP (1-9)")
-        print("Pressione F10 para exportar checkpoints para laps_grip.py")
+        print("Pressione F5 para salvar em data/pistas/pista_N.json (usado diretamente pelo jogo)")
         print("Pressione H para mostrar/ocultar ajuda")
         print("Pressione ESC para sair")
         
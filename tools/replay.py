@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Reprodutor de replays sem janela - Turbo Racer
+==============================================
+
+Re-simula um replay gravado pelo jogo (GRAVAR_REPLAY em config.py) pelo mesmo caminho de
+física/IA/corrida, confere se o resultado bate com o gravado e mede o tempo da reprodução
+(replays servem também como carga fixa para medir regressões de desempenho).
+
+Uso:
+    python tools/replay.py data/replays/pista1_20250101_120000.replay
+    python tools/replay.py arquivo.replay --ir-para 30 --ir-para 10
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.replay import Replay, ReprodutorReplay
+
+
+def mostrar_carros(reprodutor):
+    corrida = reprodutor.corrida
+    for carro in reprodutor.carros:
+        print(f"  {carro.nome}: ({carro.x:.1f}, {carro.y:.1f}) {carro.velocidade_kmh:.0f} km/h, "
+              f"volta {corrida.voltas.get(carro, 0)}, checkpoint {carro.checkpoint_atual}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduz um replay sem janela")
+    parser.add_argument("arquivo", help="arquivo .replay")
+    parser.add_argument("--ir-para", type=float, action="append", default=[], metavar="SEGUNDOS",
+                        help="mostrar o estado em um instante da corrida (pode repetir, em qualquer ordem)")
+    parser.add_argument("--repeticoes", type=int, default=1, help="reproduzir N vezes (medição de desempenho)")
+    parser.add_argument("--verboso", action="store_true", help="mostrar os prints da IA e da corrida")
+    args = parser.parse_args()
+
+    try:
+        replay = Replay.carregar(args.arquivo)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+
+    cabecalho = replay.cabecalho
+    print(f"Replay: pista {cabecalho['pista']}, {cabecalho['voltas']} volta(s), {cabecalho['tipo_jogo']}, "
+          f"dificuldade {cabecalho['dificuldade']}, gravado em {cabecalho['gravado_em']}")
+    print(f"  {len(cabecalho['carros'])} carros ({len(replay.humanos)} humanos), {replay.passos} passos "
+          f"({replay.duracao:.1f}s), {os.path.getsize(args.arquivo)} bytes")
+
+    inicio = time.perf_counter()
+    reprodutor = ReprodutorReplay(replay, silencioso=not args.verboso)
+    carregamento = time.perf_counter() - inicio
+
+    for segundos in args.ir_para:
+        reprodutor.ir_para_tempo(segundos)
+        print(f"\nEm {segundos:.1f}s (passo {reprodutor.passo_atual}):")
+        mostrar_carros(reprodutor)
+
+    tempos = []
+    for _ in range(max(1, args.repeticoes)):
+        reprodutor.ir_para(0)
+        inicio = time.perf_counter()
+        resultados = reprodutor.executar()
+        tempos.append(time.perf_counter() - inicio)
+
+    print(f"\nResultado ({replay.duracao:.1f}s simulados em {min(tempos):.2f}s, "
+          f"{replay.duracao / max(min(tempos), 1e-9):.1f}x tempo real; carregamento {carregamento:.2f}s):")
+    for r in resultados:
+        tempo = f"{r['tempo_final']:.2f}s" if r["finalizou"] else "não terminou"
+        print(f"  {r['nome']}: {r['voltas']} volta(s), {tempo}")
+
+    diferencas = reprodutor.conferir()
+    if diferencas:
+        print("\nA reprodução NÃO bate com a gravação:")
+        for diferenca in diferencas:
+            print(f"  {diferenca}")
+        sys.exit(2)
+    print("\nA reprodução bate com a gravação")
+
+
+if __name__ == "__main__":
+    main()
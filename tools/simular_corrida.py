@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Simulador de corridas sem janela - Turbo Racer
+==============================================
+
+Roda corridas só de bots (IA + física + GerenciadorCorrida) sem display e sem carregar texturas,
+muito mais rápido que o tempo real. Útil para avaliar mudanças na IA/física e para rodar em
+máquinas de CI sem tela.
+
+Uso:
+    python tools/simular_corrida.py --pista 1 --voltas 3 --corridas 10
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.simulacao import SimulacaoCorrida, CARROS_PADRAO
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula corridas de bots sem janela")
+    parser.add_argument("--pista", type=int, default=1, help="número da pista")
+    parser.add_argument("--voltas", type=int, default=1, help="voltas por corrida")
+    parser.add_argument("--corridas", type=int, default=1, help="quantidade de corridas")
+    parser.add_argument("--carros", nargs="+", default=list(CARROS_PADRAO), help="prefixos dos carros (Car1 ... Car8)")
+    parser.add_argument("--dificuldade", default="medio", choices=["facil", "medio", "dificil"])
+    parser.add_argument("--semente", type=int, default=None, help="semente da primeira corrida (as seguintes usam semente+i)")
+    parser.add_argument("--tempo-max", type=float, default=600.0, help="tempo máximo simulado por corrida (s)")
+    parser.add_argument("--verboso", action="store_true", help="mostrar os prints da IA e da corrida")
+    args = parser.parse_args()
+
+    vitorias = {}
+    tempo_simulado = 0.0
+    inicio = time.perf_counter()
+    for i in range(args.corridas):
+        semente = None if args.semente is None else args.semente + i
+        sim = SimulacaoCorrida(args.pista, args.carros, args.voltas, args.dificuldade,
+                               semente=semente, silencioso=not args.verboso)
+        resultados = sim.executar(tempo_max=args.tempo_max)
+        tempo_simulado += sim.tempo_simulado
+        terminaram = sorted((r for r in resultados if r["finalizou"]), key=lambda r: r["tempo_final"])
+        if terminaram:
+            vitorias[terminaram[0]["nome"]] = vitorias.get(terminaram[0]["nome"], 0) + 1
+        print(f"Corrida {i + 1}/{args.corridas} ({sim.tempo_simulado:.1f}s simulados):")
+        for r in resultados:
+            tempo = f"{r['tempo_final']:.2f}s" if r["finalizou"] else "não terminou"
+            print(f"  {r['nome']}: {r['voltas']}/{args.voltas} voltas, {tempo}, "
+                  f"{r['travamentos']} travamento(s), {r['tempo_fora_pista']:.1f}s fora da pista")
+
+    decorrido = time.perf_counter() - inicio
+    print(f"\n{args.corridas} corrida(s), {tempo_simulado:.1f}s simulados em {decorrido:.1f}s "
+          f"({tempo_simulado / max(decorrido, 1e-9):.1f}x tempo real)")
+    for nome, qtd in sorted(vitorias.items(), key=lambda item: -item[1]):
+        print(f"  {nome}: {qtd} vitória(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Torneio da IA - Turbo Racer
+===========================
+
+Ajusta os presets de dificuldade da IA (core/dificuldade_ia.py) com corridas sem janela em paralelo,
+um processo por núcleo. Cada candidato corre com todos os carros em todas as pistas (mesmas sementes
+para todos os candidatos) e recebe um custo:
+  ritmo        dificil: tempo médio relativo ao dificil atual (menor é melhor)
+               facil/medio: distância até o ritmo alvo (por padrão o ritmo relativo atual do preset)
+  travamentos  vezes em que a IA se declarou travada, por carro e corrida (PESO_TRAVAMENTO)
+  fora         fração do tempo de corrida na grama (PESO_FORA)
+  abandono     fração dos carros que não terminou em --tempo-max (PESO_ABANDONO)
+Uma estratégia evolutiva (mu + lambda) muta os parâmetros de PARAMETROS_AJUSTE por algumas gerações e
+guarda os melhores; a geração 0 mede os presets atuais. Ao fim mostra, por preset, a distribuição dos
+tempos de volta, os travamentos e o tempo fora da pista, e grava o arquivo de presets (formato de
+data/ia_dificuldades.json, com o relatório do torneio).
+
+Só os parâmetros da linha de corrida são ajustados: os do modo antigo (mirando os checkpoints) não valem
+nas pistas que têm linha, e usar_turbo define o preset.
+
+Uso:
+    python tools/torneio_ia.py --geracoes 0                      # só avalia os presets atuais
+    python tools/torneio_ia.py --geracoes 6 --populacao 8
+    python tools/torneio_ia.py --dificuldades medio --ritmo medio=1.2 --saida data/ia_dificuldades.json
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import statistics
+import concurrent.futures
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.simulacao import SimulacaoCorrida, CARROS_PADRAO
+from core.dificuldade_ia import DIFICULDADES, CAMINHO_PRESETS, carregar_presets, salvar_presets
+
+PISTAS = tuple(range(1, 10))
+CAMINHO_SAIDA = os.path.join(os.path.dirname(CAMINHO_PRESETS), "ia_dificuldades_torneio.json")
+
+# Parâmetro -> (mínimo, máximo, desvio da mutação)
+PARAMETROS_AJUSTE = {
+    "fator_velocidade_linha": (0.4, 1.15, 0.05),
+    "alcance_linha_min": (30.0, 120.0, 8.0),
+    "alcance_linha_por_velocidade": (0.5, 3.0, 0.2),
+    "antecipacao_freio": (1, 10, 1.0),
+    "velocidade_grama": (8.0, 40.0, 3.0),
+    "tempo_reacao": (0.01, 0.15, 0.02),
+}
+
+PESO_TRAVAMENTO = 0.05
+PESO_FORA = 1.0
+PESO_ABANDONO = 1.0
+
+
+def _correr(tarefa):
+    """Uma corrida sem janela (roda nos processos do pool); devolve os resultados por carro"""
+    numero_pista, dificuldade, presets, semente, carros, voltas, tempo_max = tarefa
+    sim = SimulacaoCorrida(numero_pista, carros, voltas, dificuldade, semente=semente, presets_ia=presets)
+    resultados = sim.executar(tempo_max=tempo_max)
+    return sim.tempo_simulado, resultados
+
+
+def mutar(parametros, rng, escala):
+    """Cópia de `parametros` com ruído gaussiano nos parâmetros ajustáveis, dentro dos limites"""
+    filho = dict(parametros)
+    for nome, (minimo, maximo, desvio) in PARAMETROS_AJUSTE.items():
+        valor = min(maximo, max(minimo, filho[nome] + rng.gauss(0.0, desvio * escala)))
+        filho[nome] = round(valor) if isinstance(parametros[nome], int) else round(valor, 4)
+    return filho
+
+
+class Avaliacao:
+    """Resultados de um candidato: por pista, tempos de volta, travamentos, tempo fora e abandonos"""
+
+    def __init__(self, dificuldade, parametros):
+        self.dificuldade = dificuldade
+        self.parametros = parametros
+        self.tempos = {}       # pista -> [tempo da corrida por carro (tempo_max se não terminou)]
+        self.voltas = []       # tempos de volta médios dos carros que terminaram
+        self.travamentos = 0
+        self.tempo_fora = 0.0
+        self.tempo_total = 0.0
+        self.carros = 0
+        self.abandonos = 0
+        self.custo = None
+
+    def adicionar(self, numero_pista, voltas, tempo_max, resultados):
+        for r in resultados:
+            self.carros += 1
+            self.travamentos += r["travamentos"]
+            self.tempo_fora += r["tempo_fora_pista"]
+            if r["finalizou"]:
+                tempo = r["tempo_final"]
+                self.voltas.append(tempo / voltas)
+            else:
+                tempo = tempo_max
+                self.abandonos += 1
+            self.tempo_total += tempo
+            self.tempos.setdefault(numero_pista, []).append(tempo)
+
+    def tempo_medio(self, numero_pista):
+        return statistics.fmean(self.tempos[numero_pista])
+
+    def ritmo(self, referencia):
+        """Tempo médio relativo à referência, na média das pistas"""
+        return statistics.fmean(self.tempo_medio(p) / referencia[p] for p in self.tempos)
+
+    def calcular_custo(self, referencia, alvo):
+        ritmo = self.ritmo(referencia)
+        erro_ritmo = ritmo if alvo is None else abs(ritmo - alvo)
+        self.custo = (erro_ritmo
+                      + PESO_TRAVAMENTO * self.travamentos / self.carros
+                      + PESO_FORA * self.tempo_fora / max(self.tempo_total, 1e-9)
+                      + PESO_ABANDONO * self.abandonos / self.carros)
+        return self.custo
+
+    def relatorio(self, referencia):
+        voltas = sorted(self.voltas)
+        quantis = statistics.quantiles(voltas, n=10) if len(voltas) >= 2 else voltas * 9
+        return {
+            "custo": round(self.custo, 4),
+            "ritmo": round(self.ritmo(referencia), 4),
+            "volta_mediana": round(statistics.median(voltas), 2) if voltas else None,
+            "volta_p10": round(quantis[0], 2) if voltas else None,
+            "volta_p90": round(quantis[-1], 2) if voltas else None,
+            "travamentos_por_corrida": round(self.travamentos / self.carros, 3),
+            "fora_da_pista": round(self.tempo_fora / max(self.tempo_total, 1e-9), 4),
+            "abandonos": self.abandonos,
+            "pistas": {str(p): round(self.tempo_medio(p), 2) for p in sorted(self.tempos)},
+        }
+
+
+def avaliar(candidatos, presets_base, args, executor):
+    """Corre todos os candidatos [(dificuldade, parâmetros)] de uma vez no pool; devolve as Avaliacao"""
+    avaliacoes = [Avaliacao(dificuldade, parametros) for dificuldade, parametros in candidatos]
+    tarefas, donos = [], []
+    for avaliacao in avaliacoes:
+        presets = {**presets_base, avaliacao.dificuldade: avaliacao.parametros}
+        for numero_pista in args.pistas:
+            for k in range(args.corridas):
+                tarefas.append((numero_pista, avaliacao.dificuldade, presets, args.semente + k,
+                                args.carros, args.voltas, args.tempo_max))
+                donos.append(avaliacao)
+    mapa = executor.map(_correr, tarefas, chunksize=max(1, len(tarefas) // (args.processos * 4))) \
+        if executor is not None else map(_correr, tarefas)
+    tempo_simulado = 0.0
+    for tarefa, avaliacao, (simulado, resultados) in zip(tarefas, donos, mapa):
+        avaliacao.adicionar(tarefa[0], args.voltas, args.tempo_max, resultados)
+        tempo_simulado += simulado
+    return avaliacoes, tempo_simulado
+
+
+def ler_ritmos(textos):
+    """["medio=1.2", ...] -> {"medio": 1.2}"""
+    ritmos = {}
+    for texto in textos or ():
+        nome, _, valor = texto.partition("=")
+        if nome not in DIFICULDADES or not valor:
+            raise SystemExit(f"--ritmo espera dificuldade=valor ({', '.join(DIFICULDADES)}), recebeu {texto!r}")
+        ritmos[nome] = float(valor)
+    return ritmos
+
+
+def mostrar(titulo, avaliacao, referencia):
+    r = avaliacao.relatorio(referencia)
+    volta = (f"volta mediana {r['volta_mediana']:.2f}s (p10 {r['volta_p10']:.2f}s, p90 {r['volta_p90']:.2f}s)"
+             if r["volta_mediana"] is not None else "nenhuma volta completa")
+    print(f"  {titulo:<8} custo {r['custo']:.4f}  ritmo {r['ritmo']:.3f}  {volta}  "
+          f"travamentos/corrida {r['travamentos_por_corrida']:.2f}  fora {r['fora_da_pista']:.1%}  "
+          f"abandonos {r['abandonos']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajusta os presets de dificuldade da IA com corridas sem janela em paralelo")
+    parser.add_argument("--pistas", type=int, nargs="+", default=list(PISTAS), help="números das pistas (1 ... 9)")
+    parser.add_argument("--dificuldades", nargs="+", default=list(DIFICULDADES), choices=DIFICULDADES,
+                        help="presets ajustados (os demais só são medidos)")
+    parser.add_argument("--carros", nargs="+", default=list(CARROS_PADRAO), help="prefixos dos carros (Car1 ... Car8)")
+    parser.add_argument("--voltas", type=int, default=1, help="voltas por corrida")
+    parser.add_argument("--corridas", type=int, default=2, help="corridas por pista e candidato (sementes semente+i)")
+    parser.add_argument("--semente", type=int, default=1, help="semente das largadas e da evolução")
+    parser.add_argument("--geracoes", type=int, default=6, help="gerações da evolução (0: só avaliar os presets)")
+    parser.add_argument("--populacao", type=int, default=8, help="candidatos por dificuldade e geração")
+    parser.add_argument("--escala", type=float, default=1.0, help="escala dos desvios da mutação")
+    parser.add_argument("--ritmo", nargs="+", metavar="DIFICULDADE=RAZAO",
+                        help="ritmo alvo relativo ao dificil atual (padrão: o ritmo atual do preset; dificil: o mais rápido)")
+    parser.add_argument("--tempo-max", type=float, default=300.0, help="tempo máximo simulado por corrida (s)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1, help="processos do pool")
+    parser.add_argument("--base", default=CAMINHO_PRESETS, help="arquivo de presets de partida")
+    parser.add_argument("--saida", default=CAMINHO_SAIDA, help="arquivo de presets gerado")
+    args = parser.parse_args()
+    args.carros = tuple(args.carros)
+    args.processos = max(1, args.processos)
+
+    rng = random.Random(args.semente)
+    presets = carregar_presets(args.base)
+    ritmos = ler_ritmos(args.ritmo)
+    inicio = time.perf_counter()
+    tempo_simulado = 0.0
+    executor = concurrent.futures.ProcessPoolExecutor(args.processos) if args.processos > 1 else None
+    try:
+        # Geração 0: presets atuais; o dificil atual é a referência de ritmo de todas as pistas
+        atuais, simulado = avaliar([(d, presets[d]) for d in DIFICULDADES], presets, args, executor)
+        tempo_simulado += simulado
+        atuais = dict(zip(DIFICULDADES, atuais))
+        referencia = {p: atuais["dificil"].tempo_medio(p) for p in args.pistas}
+        alvos = {d: None if d == "dificil" else ritmos.get(d, atuais[d].ritmo(referencia)) for d in DIFICULDADES}
+        for d, avaliacao in atuais.items():
+            avaliacao.calcular_custo(referencia, alvos[d])
+        print(f"Geração 0 (presets atuais, {time.perf_counter() - inicio:.1f}s):")
+        for d in DIFICULDADES:
+            mostrar(d, atuais[d], referencia)
+
+        elite = max(1, args.populacao // 4)
+        populacoes = {d: [atuais[d]] for d in args.dificuldades}
+        for geracao in range(1, args.geracoes + 1):
+            # Filhos de pais sorteados entre os `elite` melhores; pais e filhos disputam as vagas
+            candidatos = [(d, mutar(rng.choice(populacoes[d][:elite]).parametros, rng, args.escala))
+                          for d in args.dificuldades for _ in range(args.populacao)]
+            novos, simulado = avaliar(candidatos, presets, args, executor)
+            tempo_simulado += simulado
+            for avaliacao in novos:
+                avaliacao.calcular_custo(referencia, alvos[avaliacao.dificuldade])
+                populacoes[avaliacao.dificuldade].append(avaliacao)
+            print(f"Geração {geracao} ({time.perf_counter() - inicio:.1f}s):")
+            for d in args.dificuldades:
+                populacoes[d].sort(key=lambda a: a.custo)
+                populacoes[d] = populacoes[d][:args.populacao]
+                mostrar(d, populacoes[d][0], referencia)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    melhores = {d: populacoes[d][0] if d in populacoes else atuais[d] for d in DIFICULDADES}
+    decorrido = time.perf_counter() - inicio
+    print(f"\n{tempo_simulado:.0f}s simulados em {decorrido:.1f}s com {args.processos} processo(s) "
+          f"({tempo_simulado / max(decorrido, 1e-9):.0f}x tempo real)")
+    print("Presets escolhidos (antes -> depois):")
+    for d in DIFICULDADES:
+        mostrar(f"{d}", atuais[d], referencia)
+        if melhores[d] is not atuais[d]:
+            mostrar("  ->", melhores[d], referencia)
+            mudancas = [f"{nome} {presets[d][nome]} -> {melhores[d].parametros[nome]}"
+                        for nome in PARAMETROS_AJUSTE if presets[d][nome] != melhores[d].parametros[nome]]
+            print(f"           {', '.join(mudancas)}")
+
+    relatorio = {
+        "gerado_em": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "pistas": args.pistas, "carros": list(args.carros), "voltas": args.voltas, "corridas": args.corridas,
+        "geracoes": args.geracoes, "populacao": args.populacao, "semente": args.semente,
+        "ritmo_alvo": {d: alvo for d, alvo in alvos.items() if alvo is not None},
+        "antes": {d: atuais[d].relatorio(referencia) for d in DIFICULDADES},
+        "depois": {d: melhores[d].relatorio(referencia) for d in DIFICULDADES},
+    }
+    salvar_presets({d: melhores[d].parametros for d in DIFICULDADES}, args.saida, relatorio)
+    print(f"Presets gravados em {args.saida}"
+          + ("" if os.path.abspath(args.saida) == os.path.abspath(CAMINHO_PRESETS)
+             else f" (copie para {CAMINHO_PRESETS} para o jogo usar)"))
+
+
+if __name__ == "__main__":
+    main()